@@ -0,0 +1,314 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import contextvars
+import inspect
+import itertools
+import os
+import queue
+import threading
+import boto3
+from check_executor import DEFAULT_SERVICE_CONCURRENCY
+from timeouts import CheckTimeout
+
+# aiobotocore is optional, it is only needed once an async Check calls an AWS API
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session as get_aio_session
+except ImportError:
+    AioConfig = None
+    get_aio_session = None
+
+# AWS API calls of async Checks in flight at the same time, across every service and Region
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("ELECTRICEYE_MAX_IN_FLIGHT", 500))
+# async Checks running at the same time
+DEFAULT_CHECK_CONCURRENCY = 200
+# findings pulled from a synchronous Check per hop to the thread pool
+SYNC_BATCH_SIZE = 50
+
+# the CheckStats of the async Check running in this task, the API calls it makes are counted there
+current_stats = contextvars.ContextVar("eeauditor_async_stats", default=None)
+
+_END = object()
+
+
+def is_async_check(check):
+    """True for Checks defined with `async def`, coroutines and async generators alike"""
+    return inspect.iscoroutinefunction(check) or inspect.isasyncgenfunction(check)
+
+
+class _BoundedClient(object):
+    """aiobotocore client whose API calls wait for a slot of the run-wide in-flight limit"""
+
+    def __init__(self, client, slots):
+        self._client = client
+        self._slots = slots
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            async with self._slots:
+                stats = current_stats.get()
+                try:
+                    response = await attribute(*args, **kwargs)
+                except Exception:
+                    if stats:
+                        stats.record_call(name, error=True)
+                    raise
+            if stats:
+                retries = (response.get("ResponseMetadata") or {}).get("RetryAttempts", 0) or 0
+                stats.record_call(name, retries=retries)
+            return response
+
+        return call
+
+
+class RegionClients(object):
+    """Handed to async Checks as `clients`: `ec2 = await clients.client("ec2")`"""
+
+    def __init__(self, run, region_name):
+        self.run = run
+        self.region_name = region_name
+
+    async def client(self, service_name, region_name=None):
+        return await self.run.client(service_name, region_name or self.region_name)
+
+
+class AsyncCache(object):
+    """Cache handed to async Checks, `await cache.load(key, factory)` runs `factory()` once per key
+
+        Unlike the RunCache used by synchronous Checks it never blocks the event loop, Checks
+        asking for a key that is being loaded await the same task.
+    """
+
+    def __init__(self):
+        self._values = {}
+
+    async def load(self, key, factory):
+        if key not in self._values:
+            self._values[key] = asyncio.ensure_future(factory())
+        return await asyncio.shield(self._values[key])
+
+    def get(self, key, default=None):
+        task = self._values.get(key)
+        if task is None or not task.done() or task.exception():
+            return default
+        return task.result()
+
+    def __setitem__(self, key, value):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._values[key] = future
+
+    def __contains__(self, key):
+        return key in self._values
+
+
+class AsyncRun(object):
+    """What the async Checks of one run share: aiobotocore clients, their in-flight limit and caches
+
+        One aiobotocore client per (service, Region) is created on first use with the
+        credentials of `session` and closed with the run.
+    """
+
+    def __init__(self, session=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT, max_pool_connections=None, retry_mode=None):
+        self.session = session
+        self.max_in_flight = max_in_flight
+        self.max_pool_connections = max_pool_connections or max_in_flight
+        self.retry_mode = retry_mode or "standard"
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._lock = asyncio.Lock()
+        self._exit_stack = contextlib.AsyncExitStack()
+        self._aio_session = None
+        self._clients = {}
+        self._caches = {}
+
+    def cache(self, namespace):
+        if namespace not in self._caches:
+            self._caches[namespace] = AsyncCache()
+        return self._caches[namespace]
+
+    def bind(self, region_name):
+        return RegionClients(self, region_name)
+
+    async def client(self, service_name, region_name=None):
+        key = (service_name, region_name)
+        if key in self._clients:
+            return self._clients[key]
+        async with self._lock:
+            if key not in self._clients:
+                if get_aio_session is None:
+                    raise RuntimeError("async Checks need aiobotocore to call AWS APIs, install it with pip3 install aiobotocore")
+                if self._aio_session is None:
+                    self._aio_session = get_aio_session()
+                credentials = (self.session or boto3.DEFAULT_SESSION or boto3.Session()).get_credentials().get_frozen_credentials()
+                client = await self._exit_stack.enter_async_context(
+                    self._aio_session.create_client(
+                        service_name,
+                        region_name=region_name,
+                        aws_access_key_id=credentials.access_key,
+                        aws_secret_access_key=credentials.secret_key,
+                        aws_session_token=credentials.token,
+                        config=AioConfig(
+                            max_pool_connections=self.max_pool_connections,
+                            retries={"mode": self.retry_mode},
+                        ),
+                    )
+                )
+                self._clients[key] = _BoundedClient(client, self._slots)
+        return self._clients[key]
+
+    async def close(self):
+        await self._exit_stack.aclose()
+        self._clients = {}
+
+
+async def collect(findings, into):
+    """Awaits the result of an async Check, coroutine or async generator, into a list"""
+    if inspect.isasyncgen(findings):
+        async for finding in findings:
+            into.append(finding)
+    else:
+        into.extend(await findings or ())
+    return into
+
+
+async def iterate_sync(findings, executor, batch_size=SYNC_BATCH_SIZE):
+    """Adapter running a synchronous Check's generator on the thread pool, a batch per hop"""
+    loop = asyncio.get_running_loop()
+    iterator = iter(findings)
+
+    def next_batch():
+        return list(itertools.islice(iterator, batch_size))
+
+    while True:
+        batch = await loop.run_in_executor(executor, next_batch)
+        if not batch:
+            return
+        for finding in batch:
+            yield finding
+
+
+class AsyncEngine(object):
+    """Runs CheckUnits on an asyncio event loop instead of a pool of threads
+
+        Async Checks run as tasks, at most `check_concurrency` at once, and their API calls
+        go through aiobotocore with at most `max_in_flight` calls in flight for the whole
+        run, so thousands of calls wait on sockets instead of threads. Synchronous Checks
+        keep running as they are on a pool of `workers` threads, with at most
+        `service_concurrency` Checks of the same service at once. Every Check is isolated,
+        an exception only ends that Check. Findings are yielded through a single generator.
+    """
+
+    def __init__(self, workers=1, service_concurrency=None, default_service_concurrency=DEFAULT_SERVICE_CONCURRENCY, check_concurrency=DEFAULT_CHECK_CONCURRENCY, max_in_flight=DEFAULT_MAX_IN_FLIGHT, session=None, max_pool_connections=None, retry_mode=None):
+        self.workers = max(int(workers or 1), 1)
+        self.service_concurrency = dict(service_concurrency or {})
+        self.default_service_concurrency = max(int(default_service_concurrency or 1), 1)
+        self.check_concurrency = max(int(check_concurrency or 1), 1)
+        self.max_in_flight = max(int(max_in_flight or 1), 1)
+        self.session = session
+        self.max_pool_connections = max_pool_connections
+        self.retry_mode = retry_mode
+
+    def service_limit(self, service_name):
+        limit = self.service_concurrency.get(service_name, self.default_service_concurrency)
+        return max(min(int(limit), self.workers), 1)
+
+    def run(self, units, runner, async_runner):
+        """Executes every CheckUnit, sync ones with `runner(unit)` and async ones with
+        `await async_runner(unit, run)`, and yields their findings"""
+        results = queue.Queue(maxsize=self.workers * 100 + self.check_concurrency)
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=lambda: asyncio.run(self._main(list(units), runner, async_runner, results, stop)),
+            name="eeauditor-asyncio",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _END:
+                    break
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    async def _main(self, units, runner, async_runner, results, stop):
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eeauditor-check")
+        run = AsyncRun(
+            session=self.session,
+            max_in_flight=self.max_in_flight,
+            max_pool_connections=self.max_pool_connections,
+            retry_mode=self.retry_mode,
+        )
+        check_slots = asyncio.Semaphore(self.check_concurrency)
+        service_slots = {}
+
+        async def put(item):
+            # a slow consumer applies backpressure, a closed generator ends the run
+            while not stop.is_set():
+                try:
+                    results.put_nowait(item)
+                    return
+                except queue.Full:
+                    await asyncio.sleep(0.01)
+            raise asyncio.CancelledError()
+
+        async def execute(unit):
+            try:
+                if is_async_check(unit.check):
+                    async with check_slots:
+                        findings = await async_runner(unit, run)
+                    for finding in findings:
+                        await put(finding)
+                    return
+                group = (unit.awsAccountId, unit.awsRegion, unit.service_name)
+                if group not in service_slots:
+                    service_slots[group] = asyncio.Semaphore(self.service_limit(unit.service_name))
+                async with service_slots[group]:
+                    async for finding in iterate_sync(runner(unit), executor):
+                        await put(finding)
+            except CheckTimeout as e:
+                print(f"Cancelled check {unit.check_name}, {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Failed to execute check {unit.check_name} with exception {e}")
+
+        try:
+            await asyncio.gather(*(execute(unit) for unit in units))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await run.close()
+            executor.shutdown(wait=False)
+            while not stop.is_set():
+                try:
+                    results.put(_END, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
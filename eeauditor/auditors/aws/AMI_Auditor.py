@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-ec2 = boto3.client("ec2")
+ec2 = client_pool.client("ec2")
 # find AMIs created by the account
 def describe_images(cache, awsAccountId):
     response = cache.get("describe_images")
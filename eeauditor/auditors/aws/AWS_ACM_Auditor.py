@@ -18,18 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-acm = boto3.client("acm")
-
-acmCerts = []
-for c in acm.list_certificates()["CertificateSummaryList"]:
-    certArn = str(c["CertificateArn"])
-    acmCerts.append(certArn)
+acm = client_pool.client("acm")
 
 def list_certificates(cache):
     response = cache.get("list_certificates")
@@ -39,11 +34,11 @@ def list_certificates(cache):
     return cache["list_certificates"]
 
 
-@registry.register_check("acm")
+@registry.register_check("acm", requires=[list_certificates])
 def certificate_revocation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ACM.1] ACM Certificates should be monitored for revocation"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for carn in acmCerts:
+    for carn in list_certificates(cache=cache):
         # Get ACM Cert Details
         cert = acm.describe_certificate(CertificateArn=carn)["Certificate"]
         cDomainName = str(cert['DomainName'])
@@ -186,11 +181,11 @@ def certificate_revocation_check(cache: dict, awsAccountId: str, awsRegion: str,
             else:
                 print(e)
 
-@registry.register_check("acm")
+@registry.register_check("acm", requires=[list_certificates])
 def certificate_in_use_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ACM.2] ACM Certificates should be in use"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for carn in acmCerts:
+    for carn in list_certificates(cache=cache):
         # Get ACM Cert Details
         cert = acm.describe_certificate(CertificateArn=carn)["Certificate"]
         cDomainName = str(cert['DomainName'])
@@ -317,11 +312,11 @@ def certificate_in_use_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             }
             yield finding
 
-@registry.register_check("acm")
+@registry.register_check("acm", requires=[list_certificates])
 def certificate_transparency_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ACM.3] ACM Certificates should have certificate transparency logs enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for carn in acmCerts:
+    for carn in list_certificates(cache=cache):
         # Get ACM Cert Details
         cert = acm.describe_certificate(CertificateArn=carn)["Certificate"]
         cDomainName = str(cert['DomainName'])
@@ -452,7 +447,7 @@ def certificate_transparency_logging_check(cache: dict, awsAccountId: str, awsRe
             yield finding
 
 
-@registry.register_check("acm")
+@registry.register_check("acm", requires=[list_certificates])
 def certificate_renewal_status_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ACM.4] ACM Certificates should be renewed successfully"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -647,7 +642,7 @@ def certificate_renewal_status_check(cache: dict, awsAccountId: str, awsRegion:
         pass
 
 
-@registry.register_check("acm")
+@registry.register_check("acm", requires=[list_certificates])
 def certificate_status_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ACM.5] ACM Certificates should be correctly validated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-amplify = boto3.client("amplify")
+amplify = client_pool.client("amplify")
 
 
 def list_apps(cache):
@@ -36,7 +36,7 @@ def list_apps(cache):
     return cache["list_apps"]
 
 
-@registry.register_check("amplify")
+@registry.register_check("amplify", requires=[list_apps])
 def amplify_basic_auth_enabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Amplify.1] AWS Amplify should have basic auth enabled for branches"""
     response = list_apps(cache)
@@ -148,7 +148,7 @@ def amplify_basic_auth_enabled_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("amplify")
+@registry.register_check("amplify", requires=[list_apps])
 def amplify_branch_auto_deletion_enabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Amplify.2] AWS Amplify apps should have auto-deletion disabled for branches"""
     response = list_apps(cache)
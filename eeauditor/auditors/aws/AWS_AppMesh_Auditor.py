@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-appmesh = boto3.client("appmesh")
+appmesh = client_pool.client("appmesh")
 # loop through AWS App Mesh meshes
 
 
@@ -36,7 +36,7 @@ def list_meshes(cache):
     return cache["list_meshes"]
 
 
-@registry.register_check("appmesh")
+@registry.register_check("appmesh", requires=[list_meshes])
 def appmesh_mesh_egress_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AppMesh.1] App Mesh meshes should have the egress filter configured to DROP_ALL"""
     mesh = list_meshes(cache=cache)
@@ -165,7 +165,7 @@ def appmesh_mesh_egress_check(cache: dict, awsAccountId: str, awsRegion: str, aw
         except Exception as e:
             print(e)
 
-@registry.register_check("appmesh")
+@registry.register_check("appmesh", requires=[list_meshes])
 def appmesh_virt_node_backed_default_tls_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AppMesh.2] App Mesh virtual nodes should enforce TLS by default for all backends"""
     mesh = list_meshes(cache=cache)
@@ -388,7 +388,7 @@ def appmesh_virt_node_backed_default_tls_policy_check(cache: dict, awsAccountId:
         except Exception as e:
             print(e)
 
-@registry.register_check("appmesh")
+@registry.register_check("appmesh", requires=[list_meshes])
 def appmesh_virt_node_listener_strict_tls_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AppMesh.3] App Mesh virtual node listeners should only accept connections with TLS enabled"""
     mesh = list_meshes(cache=cache)
@@ -547,7 +547,7 @@ def appmesh_virt_node_listener_strict_tls_check(cache: dict, awsAccountId: str,
         except Exception as e:
             print(e)
 
-@registry.register_check("appmesh")
+@registry.register_check("appmesh", requires=[list_meshes])
 def appmesh_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AppMesh.4] App Mesh virtual nodes should define an HTTP access log path to enable log exports for Envoy proxies"""
     mesh = list_meshes(cache=cache)
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import botocore.exceptions
 from dateutil.parser import parse
@@ -27,13 +27,13 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-backup = boto3.client("backup")
-ec2 = boto3.client("ec2")
-dynamodb = boto3.client("dynamodb")
-rds = boto3.client("rds")
-efs = boto3.client("efs")
-neptune = boto3.client("neptune")
-documentdb = boto3.client("docdb")
+backup = client_pool.client("backup")
+ec2 = client_pool.client("ec2")
+dynamodb = client_pool.client("dynamodb")
+rds = client_pool.client("rds")
+efs = client_pool.client("efs")
+neptune = client_pool.client("neptune")
+documentdb = client_pool.client("docdb")
 
 # loop through *in-use* EBS volumes
 def describe_volumes(cache):
@@ -126,25 +126,25 @@ def describe_file_systems(cache):
 
 # loop through Neptune clusters
 def describe_neptune_db_clusters(cache):
-    response = cache.get("describe_db_clusters")
+    response = cache.get("describe_neptune_db_clusters")
     if response:
         return response
-    cache["describe_db_clusters"] = neptune.describe_db_clusters(
+    cache["describe_neptune_db_clusters"] = neptune.describe_db_clusters(
         Filters=[{"Name": "engine", "Values": ["neptune"]}]
     )
-    return cache["describe_db_clusters"]
+    return cache["describe_neptune_db_clusters"]
 
 # loop through DocDb clusters
 def describe_doc_db_clusters(cache):
-    response = cache.get("describe_db_clusters")
+    response = cache.get("describe_doc_db_clusters")
     if response:
         return response
-    cache["describe_db_clusters"] = documentdb.describe_db_clusters(
+    cache["describe_doc_db_clusters"] = documentdb.describe_db_clusters(
         Filters=[{"Name": "engine", "Values": ["docdb"]}]
     )
-    return cache["describe_db_clusters"]
+    return cache["describe_doc_db_clusters"]
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[describe_volumes])
 def volume_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.1] EBS volumes should be protected by AWS Backup"""
     # ISO Time
@@ -260,7 +260,7 @@ def volume_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsParti
                 }
                 yield finding
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[describe_instances])
 def ec2_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.2] EC2 instances should be protected by AWS Backup"""
     # ISO Time
@@ -403,7 +403,7 @@ def ec2_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 }
                 yield finding
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[list_tables])
 def ddb_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.3] DynamoDB tables should be protected by AWS Backup"""
     # ISO Time
@@ -530,7 +530,7 @@ def ddb_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 }
                 yield finding
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[describe_db_instances])
 def rds_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.4] RDS database instances should be protected by AWS Backup"""
     # ISO Time
@@ -668,7 +668,7 @@ def rds_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 }
                 yield finding
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[describe_file_systems])
 def efs_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.5] EFS file systems should be protected by AWS Backup"""
     # ISO Time
@@ -784,7 +784,7 @@ def efs_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
                 }
                 yield finding
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[describe_neptune_db_clusters])
 def neptune_cluster_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.6] Neptune clusters should be protected by AWS Backup"""
     # ISO Time
@@ -933,7 +933,7 @@ def neptune_cluster_backup_check(cache: dict, awsAccountId: str, awsRegion: str,
                 }
                 yield finding
 
-@registry.register_check("backup")
+@registry.register_check("backup", requires=[describe_doc_db_clusters])
 def docdb_cluster_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.7] DocumentDB clusters should be protected by AWS Backup"""
     # ISO Time
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-cloud9 = boto3.client("cloud9")
+cloud9 = client_pool.client("cloud9")
 paginator = cloud9.get_paginator("list_environments")
 
 @registry.register_check("cloud9")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-cloudformation = boto3.client("cloudformation")
+cloudformation = client_pool.client("cloudformation")
 
 def describe_stacks(cache):
     response = cache.get("describe_stacks")
@@ -33,7 +33,7 @@ def describe_stacks(cache):
     cache["describe_stacks"] = cloudformation.describe_stacks()
     return cache["describe_stacks"]
 
-@registry.register_check("cloudformation")
+@registry.register_check("cloudformation", requires=[describe_stacks])
 def cfn_drift_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFormation.1] CloudFormation stacks should be monitored for configuration drift"""
     for stacks in describe_stacks(cache=cache)["Stacks"]:
@@ -144,7 +144,7 @@ def cfn_drift_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition
             }
             yield finding
 
-@registry.register_check("cloudformation")
+@registry.register_check("cloudformation", requires=[describe_stacks])
 def cfn_monitoring_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFormation.2] CloudFormation stacks should be monitored for changes"""
     for stacks in describe_stacks(cache=cache)["Stacks"]:
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import json
 import os
 from check_register import CheckRegister
 
 registry = CheckRegister()
-cloudhsm = boto3.client("cloudhsmv2")
+cloudhsm = client_pool.client("cloudhsmv2")
 
 def describe_clusters(cache):
     response = cache.get("describe_clusters")
@@ -35,7 +35,7 @@ def describe_clusters(cache):
     return cache["describe_clusters"]
 
 
-@registry.register_check("cloudhsm")
+@registry.register_check("cloudhsm", requires=[describe_clusters])
 def cloudhsm_cluster_degradation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudHsm.1] CloudHsm clusters should not be degraded"""
     hsm_clusters = describe_clusters(cache=cache)
@@ -157,7 +157,7 @@ def cloudhsm_cluster_degradation_check(cache: dict, awsAccountId: str, awsRegion
             yield finding
 
 
-@registry.register_check("cloudhsm")
+@registry.register_check("cloudhsm", requires=[describe_clusters])
 def cloudhsm_hsm_degradation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudHsm.2] CloudHsm HSMs should not be degraded"""
     hsm_clusters = describe_clusters(cache=cache)
@@ -282,7 +282,7 @@ def cloudhsm_hsm_degradation_check(cache: dict, awsAccountId: str, awsRegion: st
 
 
 
-@registry.register_check("cloudhsm")
+@registry.register_check("cloudhsm", requires=[describe_clusters])
 def cloudhsm_cluster_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudHsm.3] CloudHsm clusters should have at least 1 backup in a READY state"""
     hsm_clusters = describe_clusters(cache=cache)
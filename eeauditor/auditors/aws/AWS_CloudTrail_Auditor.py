@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-cloudtrail = boto3.client("cloudtrail")
+cloudtrail = client_pool.client("cloudtrail")
 # loop through trails
 def list_trails(cache):
     response = cache.get("list_trails")
@@ -33,7 +33,7 @@ def list_trails(cache):
     cache["list_trails"] = cloudtrail.list_trails()
     return cache["list_trails"]
 
-@registry.register_check("cloudtrail")
+@registry.register_check("cloudtrail", requires=[list_trails])
 def cloudtrail_multi_region_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.1] CloudTrail trails should be multi-region"""
     trail = list_trails(cache=cache)
@@ -146,7 +146,7 @@ def cloudtrail_multi_region_check(cache: dict, awsAccountId: str, awsRegion: str
                 }
                 yield finding
 
-@registry.register_check("cloudtrail")
+@registry.register_check("cloudtrail", requires=[list_trails])
 def cloudtrail_cloudwatch_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.2] CloudTrail trails should have CloudWatch logging configured"""
     trail = list_trails(cache=cache)
@@ -265,7 +265,7 @@ def cloudtrail_cloudwatch_logging_check(cache: dict, awsAccountId: str, awsRegio
                 else:
                     print(e)
 
-@registry.register_check("cloudtrail")
+@registry.register_check("cloudtrail", requires=[list_trails])
 def cloudtrail_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.3] CloudTrail trails should be encrypted by KMS"""
     trail = list_trails(cache=cache)
@@ -380,7 +380,7 @@ def cloudtrail_encryption_check(cache: dict, awsAccountId: str, awsRegion: str,
                 else:
                     print(e)
 
-@registry.register_check("cloudtrail")
+@registry.register_check("cloudtrail", requires=[list_trails])
 def cloudtrail_global_services_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.4] CloudTrail trails should log management events"""
     trail = list_trails(cache=cache)
@@ -493,7 +493,7 @@ def cloudtrail_global_services_check(cache: dict, awsAccountId: str, awsRegion:
                 }
                 yield finding
 
-@registry.register_check("cloudtrail")
+@registry.register_check("cloudtrail", requires=[list_trails])
 def cloudtrail_log_file_validation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.5] CloudTrail log file validation should be enabled"""
     trail = list_trails(cache=cache)
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 import json
@@ -26,7 +26,7 @@ import json
 registry = CheckRegister()
 
 # import boto3 clients
-codeartifact = boto3.client("codeartifact")
+codeartifact = client_pool.client("codeartifact")
 
 @registry.register_check("codeartifact")
 def codeartifact_repo_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
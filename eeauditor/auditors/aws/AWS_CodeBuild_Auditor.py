@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-codebuild = boto3.client("codebuild")
+codebuild = client_pool.client("codebuild")
 
 def get_code_build_projects(cache):
     response = cache.get("codebuild_projects")
@@ -39,7 +39,7 @@ def get_code_build_projects(cache):
     else:
         return {}
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_artifact_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.1] CodeBuild projects should not have artifact encryption disabled"""
     # ISO Time
@@ -202,7 +202,7 @@ def codebuild_artifact_encryption_check(cache: dict, awsAccountId: str, awsRegio
                 }
                 yield finding
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_insecure_ssl_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.2] CodeBuild projects should not have insecure SSL configured"""
     # ISO Time
@@ -384,7 +384,7 @@ def codebuild_insecure_ssl_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_plaintext_env_var_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.3] CodeBuild projects should not have plaintext environment variables"""
     # ISO Time
@@ -605,7 +605,7 @@ def codebuild_plaintext_env_var_check(cache: dict, awsAccountId: str, awsRegion:
                     yield finding
                     break
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_s3_logging_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.4] CodeBuild projects should not have S3 log encryption disabled"""
     # ISO Time
@@ -819,7 +819,7 @@ def codebuild_s3_logging_encryption_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_cloudwatch_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.5] CodeBuild projects should have CloudWatch logging enabled"""
     # ISO Time
@@ -1171,7 +1171,7 @@ def codebuild_pat_credential_usage(cache: dict, awsAccountId: str, awsRegion: st
                 }
                 yield finding
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_public_build_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.7] CodeBuild projects should not be publicly accessible"""
     # ISO Time
@@ -1303,7 +1303,7 @@ def codebuild_public_build_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("codebuild")
+@registry.register_check("codebuild", requires=[get_code_build_projects])
 def codebuild_privileged_envrionment_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CodeBuild.8] CodeBuild projects should not allow privileged builds"""
     # ISO Time
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # create boto3 clients
-dms = boto3.client("dms")
+dms = client_pool.client("dms")
 
 def describe_replication_instances(cache):
     response = cache.get("describe_replication_instances")
@@ -33,7 +33,7 @@ def describe_replication_instances(cache):
     cache["describe_replication_instances"] = dms.describe_replication_instances()
     return cache["describe_replication_instances"]
 
-@registry.register_check("dms")
+@registry.register_check("dms", requires=[describe_replication_instances])
 def dms_replication_instance_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DMS.1] Database Migration Service instances should not be publicly accessible"""
     # ISO Time
@@ -163,7 +163,7 @@ def dms_replication_instance_public_access_check(cache: dict, awsAccountId: str,
             }
             yield finding
 
-@registry.register_check("dms")
+@registry.register_check("dms", requires=[describe_replication_instances])
 def dms_replication_instance_multi_az_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DMS.2] Database Migration Service instances should have Multi-AZ configured"""
     # ISO Time
@@ -287,7 +287,7 @@ def dms_replication_instance_multi_az_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("dms")
+@registry.register_check("dms", requires=[describe_replication_instances])
 def dms_replication_instance_minor_version_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DMS.3] Database Migration Service instances should be configured to have minor version updates be automatically applied"""
     # ISO Time
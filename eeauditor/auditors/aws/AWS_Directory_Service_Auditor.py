@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-ds = boto3.client("ds")
+ds = client_pool.client("ds")
 # loop through Directory Service directories
 # not to be confused with weird ass cloud directory
 def describe_directories(cache):
@@ -35,7 +35,7 @@ def describe_directories(cache):
     return cache["describe_directories"]
 
 
-@registry.register_check("ds")
+@registry.register_check("ds", requires=[describe_directories])
 def directory_service_radius_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DirectoryService.1] Supported directories should have RADIUS enabled for multi-factor authentication (MFA)"""
     directories = describe_directories(cache=cache)
@@ -171,7 +171,7 @@ def directory_service_radius_check(cache: dict, awsAccountId: str, awsRegion: st
             print("SimpleAD does not support RADIUS, skipping")
             pass
 
-@registry.register_check("ds")
+@registry.register_check("ds", requires=[describe_directories])
 def directory_service_cloudwatch_logs_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DirectoryService.2] Directories should have log forwarding enabled"""
     directories = describe_directories(cache=cache)
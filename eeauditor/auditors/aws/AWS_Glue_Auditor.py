@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-glue = boto3.client("glue")
+glue = client_pool.client("glue")
 
 def list_crawlers(cache):
     response = cache.get("list_crawlers")
@@ -33,7 +33,7 @@ def list_crawlers(cache):
     cache["list_crawlers"] = glue.list_crawlers()
     return cache["list_crawlers"]
 
-@registry.register_check("glue")
+@registry.register_check("glue", requires=[list_crawlers])
 def crawler_s3_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Glue.1] AWS Glue crawler security configurations should enable Amazon S3 encryption"""
     crawler = list_crawlers(cache=cache)
@@ -175,7 +175,7 @@ def crawler_s3_encryption_check(cache: dict, awsAccountId: str, awsRegion: str,
             else:
                 print(e)
 
-@registry.register_check("glue")
+@registry.register_check("glue", requires=[list_crawlers])
 def crawler_cloudwatch_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Glue.2] AWS Glue crawler security configurations should enable Amazon CloudWatch Logs encryption"""
     crawler = list_crawlers(cache=cache)
@@ -317,7 +317,7 @@ def crawler_cloudwatch_encryption_check(cache: dict, awsAccountId: str, awsRegio
             else:
                 print(e)
 
-@registry.register_check("glue")
+@registry.register_check("glue", requires=[list_crawlers])
 def crawler_job_bookmark_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Glue.3] AWS Glue crawler security configurations should enable job bookmark encryption"""
     crawler = list_crawlers(cache=cache)
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import botocore
 from check_register import CheckRegister
@@ -26,13 +26,8 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-sesh = boto3.session.Session()
-currentRegion = sesh.region_name
-if currentRegion != "us-east-1":
-    session = boto3.Session(region_name="us-east-1")
-    health = session.client("health")
-else:
-    health = boto3.client("health")
+# the Health API is only available in us-east-1
+health = client_pool.client("health", region_name="us-east-1")
 
 @registry.register_check("health")
 def open_health_abuse_events_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import json
 from check_register import CheckRegister
@@ -26,8 +26,8 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-iamra = boto3.client("rolesanywhere")
-iam = boto3.client("iam")
+iamra = client_pool.client("rolesanywhere")
+iam = client_pool.client("iam")
 
 # Cache Trust Anchors
 def list_trust_anchors(cache):
@@ -45,7 +45,7 @@ def list_profiles(cache):
     cache["list_profiles"] = iamra.list_profiles()
     return cache["list_profiles"]
 
-@registry.register_check("rolesanywhere")
+@registry.register_check("rolesanywhere", requires=[list_trust_anchors])
 def iamra_self_signed_trust_anchor_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAMRA.1] IAM Roles Anywhere Trust Anchors should not use self-signed certificates"""
     # ISO Time
@@ -169,7 +169,7 @@ def iamra_self_signed_trust_anchor_check(cache: dict, awsAccountId: str, awsRegi
             }
             yield finding
 
-@registry.register_check("rolesanywhere")
+@registry.register_check("rolesanywhere", requires=[list_trust_anchors])
 def iamra_trust_anchor_crl_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAMRA.2] IAM Roles Anywhere Trust Anchors should have a CRL associated"""
     # ISO Time
@@ -296,7 +296,7 @@ def iamra_trust_anchor_crl_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("rolesanywhere")
+@registry.register_check("rolesanywhere", requires=[list_profiles])
 def iamra_profiles_session_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAMRA.3] IAM Roles Anywhere Profiles should contain a Session Policy"""
     # ISO Time
@@ -437,7 +437,7 @@ def iamra_profiles_session_policy_check(cache: dict, awsAccountId: str, awsRegio
             }
             yield finding
 
-@registry.register_check("rolesanywhere")
+@registry.register_check("rolesanywhere", requires=[list_profiles])
 def iamra_profiles_managed_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAMRA.4] IAM Roles Anywhere Profiles should contain Managed Policies"""
     # ISO Time
@@ -572,7 +572,7 @@ def iamra_profiles_managed_policy_check(cache: dict, awsAccountId: str, awsRegio
             }
             yield finding
 
-@registry.register_check("rolesanywhere")
+@registry.register_check("rolesanywhere", requires=[list_profiles])
 def iamra_role_trust_policy_condition_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAMRA.5] IAM Roles used with IAM Roles Anywhere Policies should contain a condition statement in the Trust Policy"""
     # ISO Time
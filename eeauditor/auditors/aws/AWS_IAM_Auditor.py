@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import botocore.exceptions
 import datetime
 import json
@@ -27,7 +27,7 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-iam = boto3.client("iam")
+iam = client_pool.client("iam")
 
 # loop through IAM users
 def list_users(cache):
@@ -37,7 +37,7 @@ def list_users(cache):
     cache["list_users"] = iam.list_users(MaxItems=1000)
     return cache["list_users"]
 
-@registry.register_check("iam")
+@registry.register_check("iam", requires=[list_users])
 def iam_access_key_age_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.1] IAM Access Keys should be rotated every 90 days"""
     # ISO Time
@@ -208,7 +208,7 @@ def iam_access_key_age_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             else:
                 continue
 
-@registry.register_check("iam")
+@registry.register_check("iam", requires=[list_users])
 def user_permission_boundary_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.2] IAM users should have permissions boundaries attached"""
     # ISO Time
@@ -345,7 +345,7 @@ def user_permission_boundary_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("iam")
+@registry.register_check("iam", requires=[list_users])
 def user_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.3] IAM users with passwords should have Multi-Factor Authentication (MFA) enabled"""
     # ISO Time
@@ -569,7 +569,7 @@ def user_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
             }
             yield finding
 
-@registry.register_check("iam")
+@registry.register_check("iam", requires=[list_users])
 def user_inline_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.4] IAM users should not have attached in-line policies"""
     # ISO Time
@@ -717,7 +717,7 @@ def user_inline_policy_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             }
             yield finding
 
-@registry.register_check("iam")
+@registry.register_check("iam", requires=[list_users])
 def user_direct_attached_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.5] IAM users should not have attached managed policies"""
     # ISO Time
@@ -1439,7 +1439,7 @@ def iam_created_managed_policy_least_priv_check(cache: dict, awsAccountId: str,
         print(e)
         pass
 
-@registry.register_check("iam")
+@registry.register_check("iam", requires=[list_users])
 def iam_user_policy_least_priv_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.9] User inline policies should follow least privilege principles"""
     try:
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import botocore.exceptions
 import json
 from check_register import CheckRegister
 
 registry = CheckRegister()
-kms = boto3.client("kms")
+kms = client_pool.client("kms")
 
 def list_keys(cache):
     response = cache.get("list_keys")
@@ -42,7 +42,7 @@ def list_aliases(cache):
     return cache["list_aliases"]
 
 
-@registry.register_check("kms")
+@registry.register_check("kms", requires=[list_keys])
 def kms_key_rotation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[KMS.1] KMS keys should have key rotation enabled"""
     keys = list_keys(cache=cache)
@@ -264,7 +264,7 @@ def kms_key_rotation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPa
             else:
                 print(f'We found another error! {error}')
 
-@registry.register_check("kms")
+@registry.register_check("kms", requires=[list_aliases])
 def kms_key_exposed_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[KMS.2] KMS keys should not have public access"""
     response = list_aliases(cache=cache)
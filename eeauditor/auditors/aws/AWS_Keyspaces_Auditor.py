@@ -1,12 +1,11 @@
 from check_register import CheckRegister
-import boto3
+import client_pool
 import datetime
 
 registry = CheckRegister()
 
-keyspaces = boto3.client("keyspaces")
+keyspaces = client_pool.client("keyspaces")
 
-awsKeyspaceInfo = []
 # AWS-managed Keyspaces - we need to ignore these
 defaultKeyspaceNames = [
     'system_schema',
@@ -14,46 +13,41 @@ defaultKeyspaceNames = [
     'system'
 ]
 
-# First, paginate all Keyspace names and pass them to another Paginator which will attempt to enumerate all Tables
-# Then write both of the data points to a list to be used for all Checks within this Auditor
-# We will also not include any Keyspace Name that corresponds to AWS-managed system Keyspaces
-keyspace_paginator = keyspaces.get_paginator("list_keyspaces")
-table_paginator = keyspaces.get_paginator("list_tables")
-keyspace_iterator = keyspace_paginator.paginate()
-for page in keyspace_iterator:
-    for k in page["keyspaces"]:
-        keyspaceName = k["keyspaceName"]
-        if keyspaceName in defaultKeyspaceNames:
-            continue
-        else:
+def get_keyspace_tables(cache):
+    response = cache.get("get_keyspace_tables")
+    if response:
+        return response
+    # First, paginate all Keyspace names and pass them to another Paginator which will attempt to enumerate all Tables
+    # Then write both of the data points to a list to be used for all Checks within this Auditor
+    # We will also not include any Keyspace Name that corresponds to AWS-managed system Keyspaces
+    awsKeyspaceInfo = []
+    keyspace_paginator = keyspaces.get_paginator("list_keyspaces")
+    table_paginator = keyspaces.get_paginator("list_tables")
+    for page in keyspace_paginator.paginate():
+        for k in page["keyspaces"]:
+            keyspaceName = k["keyspaceName"]
+            if keyspaceName in defaultKeyspaceNames:
+                continue
             # Now get all of the tables per Keyspace - setup a new iterator
-            table_iterator = table_paginator.paginate(keyspaceName=keyspaceName)
-            for page in table_iterator:
-                for t in page["tables"]:
-                    tableName = t["tableName"]
+            for tablePage in table_paginator.paginate(keyspaceName=keyspaceName):
+                for t in tablePage["tables"]:
                     # Write dict of Keyspace Name & Table Name to list
-                    keyspacesDict = {
-                        "KeyspaceName": keyspaceName,
-                        "TableName": tableName
-                    }
-                    awsKeyspaceInfo.append(keyspacesDict)
-
-del keyspace_iterator
-del keyspace_paginator
-del table_iterator
-del table_paginator
-
-if not awsKeyspaceInfo:
-    # If there is an empty list no need to attempt anything else
-    pass
+                    awsKeyspaceInfo.append(
+                        {
+                            "KeyspaceName": keyspaceName,
+                            "TableName": t["tableName"]
+                        }
+                    )
+    cache["get_keyspace_tables"] = awsKeyspaceInfo
+    return cache["get_keyspace_tables"]
 
-@registry.register_check("keyspaces")
+@registry.register_check("keyspaces", requires=[get_keyspace_tables])
 def keyspaces_customer_managed_encryption(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Keyspaces.1] AWS Keyspaces (Cassandra) Tables should be encrypted with customer-managed keys"""
     # ISO8061 Timestamp
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     # Grab table information from saved dict in script
-    for x in awsKeyspaceInfo:
+    for x in get_keyspace_tables(cache=cache):
         keyspaceName = x["KeyspaceName"]
         tableName = x["TableName"]
         # Retrieve information from `get_table()` API
@@ -174,13 +168,13 @@ def keyspaces_customer_managed_encryption(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("keyspaces")
+@registry.register_check("keyspaces", requires=[get_keyspace_tables])
 def keyspaces_inaccessible_status_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Keyspaces.2] AWS Keyspaces (Cassandra) Tables should not be in an inaccessible state"""
     # ISO8061 Timestamp
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     # Grab table information from saved dict in script
-    for x in awsKeyspaceInfo:
+    for x in get_keyspace_tables(cache=cache):
         keyspaceName = x["KeyspaceName"]
         tableName = x["TableName"]
         # Retrieve information from `get_table()` API
@@ -317,13 +311,13 @@ def keyspaces_inaccessible_status_check(cache: dict, awsAccountId: str, awsRegio
             }
             yield finding
 
-@registry.register_check("keyspaces")
+@registry.register_check("keyspaces", requires=[get_keyspace_tables])
 def keyspaces_pitr_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Keyspaces.3] AWS Keyspaces (Cassandra) Tables should have Point-in-Time Recovery (PITR) enabled"""
     # ISO8061 Timestamp
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     # Grab table information from saved dict in script
-    for x in awsKeyspaceInfo:
+    for x in get_keyspace_tables(cache=cache):
         keyspaceName = x["KeyspaceName"]
         tableName = x["TableName"]
         # Retrieve information from `get_table()` API
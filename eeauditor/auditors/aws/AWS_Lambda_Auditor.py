@@ -20,7 +20,7 @@
 
 import datetime
 from dateutil import parser
-import boto3
+import client_pool
 import json
 import botocore
 from check_register import CheckRegister
@@ -28,9 +28,9 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # boto3 clients
-lambdas = boto3.client("lambda")
-cloudwatch = boto3.client("cloudwatch")
-ec2 = boto3.client("ec2")
+lambdas = client_pool.client("lambda")
+cloudwatch = client_pool.client("cloudwatch")
+ec2 = client_pool.client("ec2")
 
 def get_lambda_functions(cache):
     lambdaFunctions = []
@@ -58,7 +58,7 @@ def get_lambda_layers(cache):
         cache["get_lambda_layers"] = lambdaLayers
         return cache["get_lambda_layers"]
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_functions])
 def unused_function_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.1] Lambda functions should be deleted after 30 days of no use"""
     # ISO Time
@@ -194,7 +194,7 @@ def unused_function_check(cache: dict, awsAccountId: str, awsRegion: str, awsPar
                 }
                 yield finding
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_functions])
 def function_tracing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.2] Lambda functions should use active tracing with AWS X-Ray"""
     # ISO Time
@@ -322,7 +322,7 @@ def function_tracing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPa
             }
             yield finding
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_functions])
 def function_code_signer_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.3] Lambda functions should use code signing from AWS Signer to ensure trusted code runs in a Function"""
     # ISO Time
@@ -441,7 +441,7 @@ def function_code_signer_check(cache: dict, awsAccountId: str, awsRegion: str, a
             }
             yield finding
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_layers])
 def public_lambda_layer_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.4] Lambda layers should not be publicly shared"""
     # ISO Time
@@ -595,7 +595,7 @@ def public_lambda_layer_check(cache: dict, awsAccountId: str, awsRegion: str, aw
                 }
                 yield finding
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_functions])
 def public_lambda_function_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.5] Lambda functions should not be publicly shared"""
     # ISO Time
@@ -800,7 +800,7 @@ def public_lambda_function_check(cache: dict, awsAccountId: str, awsRegion: str,
                 }
                 yield finding
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_functions])
 def lambda_supported_runtimes_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.6] Lambda functions should use supported runtimes"""
     # Supported Runtimes
@@ -942,7 +942,7 @@ def lambda_supported_runtimes_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("lambda")
+@registry.register_check("lambda", requires=[get_lambda_functions])
 def lambda_vpc_ha_subnets_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.7] Lambda functions in VPCs should use more than one Availability Zone"""
     # Create empty list to hold unique Subnet IDs - for future lookup against AZs
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import os
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-licensemanager = boto3.client("license-manager")
+licensemanager = client_pool.client("license-manager")
 
 @registry.register_check("license-manager")
 def license_manager_hard_count_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
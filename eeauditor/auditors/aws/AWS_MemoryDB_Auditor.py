@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-memorydb = boto3.client("memorydb")
+memorydb = client_pool.client("memorydb")
 
 def describe_clusters(cache):
     response = cache.get("describe_clusters")
@@ -33,7 +33,7 @@ def describe_clusters(cache):
     cache["describe_clusters"] = memorydb.describe_clusters(MaxResults=100,ShowShardDetails=False)
     return cache["describe_clusters"]
 
-@registry.register_check("memorydb")
+@registry.register_check("memorydb", requires=[describe_clusters])
 def memorydb_cluster_tls_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MemoryDB.1] MemoryDB Clusters should configured to use encryption in transit"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -179,7 +179,7 @@ def memorydb_cluster_tls_encryption_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("memorydb")
+@registry.register_check("memorydb", requires=[describe_clusters])
 def memorydb_cluster_kms_cmk_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MemoryDB.2] MemoryDB Clusters should used KMS CMKs for encryption at rest"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -322,7 +322,7 @@ def memorydb_cluster_kms_cmk_encryption_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("memorydb")
+@registry.register_check("memorydb", requires=[describe_clusters])
 def memorydb_auto_minor_version_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MemoryDB.3] MemoryDB Clusters should be configured to conduct automatic minor version updates"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -461,7 +461,7 @@ def memorydb_auto_minor_version_update_check(cache: dict, awsAccountId: str, aws
             }
             yield finding
 
-@registry.register_check("memorydb")
+@registry.register_check("memorydb", requires=[describe_clusters])
 def memorydb_sns_notification_tracking_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MemoryDB.4] MemoryDB Clusters should be actively monitored with SNS"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -603,7 +603,7 @@ def memorydb_sns_notification_tracking_check(cache: dict, awsAccountId: str, aws
             }
             yield finding
 
-@registry.register_check("memorydb")
+@registry.register_check("memorydb", requires=[describe_clusters])
 def memorydb_user_admin_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MemoryDB.5] MemoryDB Cluster Users with administrative privileges should be validated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -785,7 +785,7 @@ def memorydb_user_admin_check(cache: dict, awsAccountId: str, awsRegion: str, aw
                     }
                     yield finding
 
-@registry.register_check("memorydb")
+@registry.register_check("memorydb", requires=[describe_clusters])
 def memorydb_user_password_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MemoryDB.6] MemoryDB Cluster Users should require additional password authentication"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
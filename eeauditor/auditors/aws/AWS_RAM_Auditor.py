@@ -21,11 +21,11 @@
 import datetime
 from dateutil import parser
 import uuid
-import boto3
+import client_pool
 from check_register import CheckRegister, accumulate_paged_results
 
 registry = CheckRegister()
-ram = boto3.client("ram")
+ram = client_pool.client("ram")
 
 def get_resource_shares(cache):
     response = cache.get("get_resource_shares")
@@ -40,7 +40,7 @@ def get_resource_shares(cache):
     return cache["get_resource_shares"]
 
 
-@registry.register_check("ram")
+@registry.register_check("ram", requires=[get_resource_shares])
 def ram_resource_shares_status_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RAM.1] Resource share should not have a failed status"""
     responses = []
@@ -161,7 +161,7 @@ def ram_resource_shares_status_check(cache: dict, awsAccountId: str, awsRegion:
                 }
                 yield finding
 
-@registry.register_check("ram")
+@registry.register_check("ram", requires=[get_resource_shares])
 def ram_allow_external_principals_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RAM.2] Resource share should not allow external principals"""
     response = get_resource_shares(cache)
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-secretsmanager = boto3.client("secretsmanager")
+secretsmanager = client_pool.client("secretsmanager")
 
 def list_secrets(cache):
     response = cache.get("list_secrets")
@@ -33,7 +33,7 @@ def list_secrets(cache):
     cache["list_secrets"] = secretsmanager.list_secrets(MaxResults=100)
     return cache["list_secrets"]
 
-@registry.register_check("secretsmanager")
+@registry.register_check("secretsmanager", requires=[list_secrets])
 def secret_age_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SecretsManager.1] Secrets over 90 days old should be rotated"""
     secret = list_secrets(cache=cache)
@@ -175,7 +175,7 @@ def secret_age_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
             }
             yield finding
 
-@registry.register_check("secretsmanager")
+@registry.register_check("secretsmanager", requires=[list_secrets])
 def secret_changed_in_last_90_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SecretsManager.2] Secrets should have automatic rotation configured"""
     secret = list_secrets(cache=cache)
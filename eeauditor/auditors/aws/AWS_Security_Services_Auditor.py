@@ -18,18 +18,18 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import uuid
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-accessanalyzer = boto3.client("accessanalyzer")
-guardduty = boto3.client("guardduty")
-detective = boto3.client("detective")
-macie2 = boto3.client("macie2")
-wafv2 = boto3.client("wafv2")
+accessanalyzer = client_pool.client("accessanalyzer")
+guardduty = client_pool.client("guardduty")
+detective = client_pool.client("detective")
+macie2 = client_pool.client("macie2")
+wafv2 = client_pool.client("wafv2")
 
 @registry.register_check("accessanalyzer")
 def iam_access_analyzer_detector_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -19,14 +19,14 @@
 #under the License.
 
 import datetime
-import boto3
+import client_pool
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # Boto3 Clients
-ssm = boto3.client("ssm")
-ec2 = boto3.client("ec2")
+ssm = client_pool.client("ssm")
+ec2 = client_pool.client("ec2")
 
 def get_owned_ssm_docs(cache):
     ssmDocs = []
@@ -68,7 +68,7 @@ def describe_instances(cache):
         cache["describe_instances"] = instanceList
         return cache["describe_instances"]
 
-@registry.register_check("ssm")
+@registry.register_check("ssm", requires=[get_owned_ssm_docs])
 def ssm_self_owned_document_public_share_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SSM.1] Self-owned SSM Documents should not be publicly shared"""
     # ISO Time
@@ -202,7 +202,7 @@ def ssm_self_owned_document_public_share_check(cache: dict, awsAccountId: str, a
             }
             yield finding
 
-@registry.register_check("ssm")
+@registry.register_check("ssm", requires=[describe_instances, list_associations])
 def ssm_update_ssm_agent_association_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SSM.2] AWS State Manager should be used to update SSM Agents for all EC2 instances in your Region"""
     # ISO Time
@@ -435,7 +435,7 @@ def ssm_update_ssm_agent_association_check(cache: dict, awsAccountId: str, awsRe
                                 }
                                 yield finding
 
-@registry.register_check("ssm")
+@registry.register_check("ssm", requires=[describe_instances, list_associations])
 def ssm_patch_instances_association_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SSM.3] AWS State Manager should be used to patch all EC2 instances in your Region"""
     # ISO Time
@@ -652,7 +652,7 @@ def ssm_patch_instances_association_check(cache: dict, awsAccountId: str, awsReg
                                 }
                                 yield finding
 
-@registry.register_check("ssm")
+@registry.register_check("ssm", requires=[describe_instances, list_associations])
 def ssm_gather_software_inventory_association_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SSM.4] AWS State Manager should be used to gather software inventory data from all EC2 instances in your Region"""
     # ISO Time
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import botocore
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-support = boto3.client("support")
+support = client_pool.client("support")
 
 # loop through WAFs
 def describe_trusted_advisor_checks(cache):
@@ -35,7 +35,7 @@ def describe_trusted_advisor_checks(cache):
     cache["describe_trusted_advisor_checks"] = support.describe_trusted_advisor_checks(language='en')
     return cache["describe_trusted_advisor_checks"]
 
-@registry.register_check("support")
+@registry.register_check("support", requires=[describe_trusted_advisor_checks])
 def trusted_advisor_failing_root_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[TrustedAdvisor.1] Trusted Advisor check results for MFA on Root Account should be investigated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -189,7 +189,7 @@ def trusted_advisor_failing_root_mfa_check(cache: dict, awsAccountId: str, awsRe
     else:
         print('AWS Health Global endpoint is located in us-east-1')
 
-@registry.register_check("support")
+@registry.register_check("support", requires=[describe_trusted_advisor_checks])
 def trusted_advisor_failing_elb_listener_security_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[TrustedAdvisor.2] Trusted Advisor check results for ELB Listener Security should be investigated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -317,7 +317,7 @@ def trusted_advisor_failing_elb_listener_security_check(cache: dict, awsAccountI
     else:
         print('AWS Health Global endpoint is located in us-east-1')
 
-@registry.register_check("support")
+@registry.register_check("support", requires=[describe_trusted_advisor_checks])
 def trusted_advisor_failing_cloudfront_ssl_cert_iam_certificate_store_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[TrustedAdvisor.3] Trusted Advisor check results for CloudFront Custom SSL Certificates in the IAM Certificate Store should be investigated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -445,7 +445,7 @@ def trusted_advisor_failing_cloudfront_ssl_cert_iam_certificate_store_check(cach
     else:
         print('AWS Health Global endpoint is located in us-east-1')
 
-@registry.register_check("support")
+@registry.register_check("support", requires=[describe_trusted_advisor_checks])
 def trusted_advisor_failing_cloudfront_ssl_cert_on_origin_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[TrustedAdvisor.4] Trusted Advisor check results for CloudFront SSL Certificate on the Origin Server should be investigated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -573,7 +573,7 @@ def trusted_advisor_failing_cloudfront_ssl_cert_on_origin_check(cache: dict, aws
     else:
         print('AWS Health Global endpoint is located in us-east-1')
 
-@registry.register_check("support")
+@registry.register_check("support", requires=[describe_trusted_advisor_checks])
 def trusted_advisor_failing_exposed_access_keys_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[TrustedAdvisor.5] Trusted Advisor check results for Exposed Access Keys should be investigated"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
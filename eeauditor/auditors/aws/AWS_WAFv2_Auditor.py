@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import botocore
 from check_register import CheckRegister
@@ -26,8 +26,8 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-wafv2 = boto3.client("wafv2")
-globalWafv2 = boto3.client("wafv2", region_name="us-east-1")
+wafv2 = client_pool.client("wafv2")
+globalWafv2 = client_pool.client("wafv2", region_name="us-east-1")
 
 # loop through WAFs
 def list_wafs(cache):
@@ -38,13 +38,13 @@ def list_wafs(cache):
     return cache["list_web_acls"]
 
 def list_wafs_global(cache):
-    response = cache.get("list_web_acls")
+    response = cache.get("list_web_acls_global")
     if response:
         return response
-    cache["list_web_acls"] = globalWafv2.list_web_acls(Scope='CLOUDFRONT')
-    return cache["list_web_acls"]
+    cache["list_web_acls_global"] = globalWafv2.list_web_acls(Scope='CLOUDFRONT')
+    return cache["list_web_acls_global"]
 
-@registry.register_check("wafv2")
+@registry.register_check("wafv2", requires=[list_wafs])
 def wafv2_web_acl_metrics_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WAFv2.1] WAFv2 Web ACLs should have CloudWatch Metrics enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -170,7 +170,7 @@ def wafv2_web_acl_metrics_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("wafv2")
+@registry.register_check("wafv2", requires=[list_wafs])
 def wafv2_web_acl_sampling_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WAFv2.2] WAFv2 Web ACLs should have Request Sampling enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -296,7 +296,7 @@ def wafv2_web_acl_sampling_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("wafv2")
+@registry.register_check("wafv2", requires=[list_wafs])
 def wafv2_web_acl_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WAFv2.3] WAFv2 Web ACLs should have Logging enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -427,7 +427,7 @@ def wafv2_web_acl_logging_check(cache: dict, awsAccountId: str, awsRegion: str,
 
 ### These following checks are mirrored for the "Global" WAF for CloudFront (for now) - the Global Endpoint is only available in us-east-1
 
-@registry.register_check("wafv2")
+@registry.register_check("wafv2", requires=[list_wafs_global])
 def wafv2_web_acl_global_metrics_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WAFv2.4] WAFv2 Global Web ACLs should have CloudWatch Metrics enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -553,7 +553,7 @@ def wafv2_web_acl_global_metrics_check(cache: dict, awsAccountId: str, awsRegion
             }
             yield finding
 
-@registry.register_check("wafv2")
+@registry.register_check("wafv2", requires=[list_wafs_global])
 def wafv2_web_acl_global_sampling_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WAFv2.5] WAFv2 Global Web ACLs should have Request Sampling enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -679,7 +679,7 @@ def wafv2_web_acl_global_sampling_check(cache: dict, awsAccountId: str, awsRegio
             }
             yield finding
 
-@registry.register_check("wafv2")
+@registry.register_check("wafv2", requires=[list_wafs_global])
 def wafv2_web_acl_global_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WAFv2.6] WAFv2 Global Web ACLs should have Logging enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -17,14 +17,14 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-apigateway = boto3.client("apigateway")
+apigateway = client_pool.client("apigateway")
 
 def get_rest_apis(cache):
     response = cache.get("get_rest_apis")
@@ -33,7 +33,7 @@ def get_rest_apis(cache):
     cache["get_rest_apis"] = apigateway.get_rest_apis(limit=500)
     return cache["get_rest_apis"]
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_stage_metrics_enabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.1] API Gateway Rest API Stages should have CloudWatch Metrics enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -171,7 +171,7 @@ def api_gateway_stage_metrics_enabled_check(cache: dict, awsAccountId: str, awsR
                 }
                 yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_stage_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.2] API Gateway Rest API Stages should have CloudWatch API Logging enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -307,7 +307,7 @@ def api_gateway_stage_logging_check(cache: dict, awsAccountId: str, awsRegion: s
                 }
                 yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_stage_cacheing_enabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.3] API Gateway Rest API Stages should have Caching enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -449,7 +449,7 @@ def api_gateway_stage_cacheing_enabled_check(cache: dict, awsAccountId: str, aws
                 }
                 yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_stage_cache_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.4] API Gateway Rest API Stages should have cache encryption enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -586,7 +586,7 @@ def api_gateway_stage_cache_encryption_check(cache: dict, awsAccountId: str, aws
                 }
                 yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_stage_xray_tracing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.5] API Gateway Rest API Stages should have tracing enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -712,7 +712,7 @@ def api_gateway_stage_xray_tracing_check(cache: dict, awsAccountId: str, awsRegi
                 }
                 yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_stage_waf_check_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.6] API Gateway Rest API Stages should be protected by an AWS WAF Web ACL"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -860,7 +860,7 @@ def api_gateway_stage_waf_check_check(cache: dict, awsAccountId: str, awsRegion:
                 }
                 yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_rest_api_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.7] API Gateway Rest APIs should use an API Gateway resource policy"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -998,7 +998,7 @@ def api_gateway_rest_api_policy_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("apigateway")
+@registry.register_check("apigateway", requires=[get_rest_apis])
 def api_gateway_rest_api_authorizer_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[APIGateway.8] API Gateway Rest APIs should use an API Gateway Lambda authorizer"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import botocore.exceptions
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
-appstream = boto3.client("appstream")
+appstream = client_pool.client("appstream")
 
 @registry.register_check("appstream")
 def default_internet_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
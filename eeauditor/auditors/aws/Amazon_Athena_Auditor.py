@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-athena = boto3.client("athena")
+athena = client_pool.client("athena")
 
 # Get all Athena work groups
 def list_work_groups(cache):
@@ -35,7 +35,7 @@ def list_work_groups(cache):
     cache["list_work_groups"] = athena.list_work_groups()
     return cache["list_work_groups"]
 
-@registry.register_check("athena")
+@registry.register_check("athena", requires=[list_work_groups])
 def athena_workgroup_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Athena.1] Athena workgroups should be configured to enforce query result encryption"""
     # ISO time
@@ -225,7 +225,7 @@ def athena_workgroup_encryption_check(cache: dict, awsAccountId: str, awsRegion:
             print(f"Athena workgroup {workgroupName} has an encryption option of {encryptionOption} which was not accounted for...")
             continue
 
-@registry.register_check("athena")
+@registry.register_check("athena", requires=[list_work_groups])
 def athena_encrypted_workgroup_client_override_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Athena.2] Athena workgroups that enforce query result encryption should be configured to override client-side settings"""
     # ISO time
@@ -420,7 +420,7 @@ def athena_encrypted_workgroup_client_override_check(cache: dict, awsAccountId:
             print(f"Athena workgroup {workgroupName} has an encryption option or 'EnforceWorkGroupConfiguration' which was not accounted for...")
             continue
 
-@registry.register_check("athena")
+@registry.register_check("athena", requires=[list_work_groups])
 def athena_workgroup_metrics_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Athena.3] Athena workgroups should be configured to publish metrics"""
     # ISO time
@@ -551,7 +551,7 @@ def athena_workgroup_metrics_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("athena")
+@registry.register_check("athena", requires=[list_work_groups])
 def athena_workgroup_engine_autoupdate_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Athena.4] Athena workgroups should be configured to auto-select the latest engine version"""
     # ISO time
@@ -18,15 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # Boto3 clients
-ec2 = boto3.client("ec2")
-autoscaling = boto3.client("autoscaling")
+ec2 = client_pool.client("ec2")
+autoscaling = client_pool.client("autoscaling")
 
 def describe_auto_scaling_groups(cache):
     response = cache.get("describe_auto_scaling_groups")
@@ -35,7 +35,7 @@ def describe_auto_scaling_groups(cache):
     cache["describe_auto_scaling_groups"] = autoscaling.describe_auto_scaling_groups(MaxRecords=100)
     return cache["describe_auto_scaling_groups"]
 
-@registry.register_check("autoscaling")
+@registry.register_check("autoscaling", requires=[describe_auto_scaling_groups])
 def autoscaling_scale_in_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Autoscaling.1] Autoscaling Groups should be configured to protect instances from scale-in"""
     # ISO Time
@@ -161,7 +161,7 @@ def autoscaling_scale_in_protection_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("autoscaling")
+@registry.register_check("autoscaling", requires=[describe_auto_scaling_groups])
 def autoscaling_load_balancer_healthcheck_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Autoscaling.2] Autoscaling Groups with load balancer targets should use ELB health checks"""
     # ISO Time
@@ -335,7 +335,7 @@ def autoscaling_load_balancer_healthcheck_check(cache: dict, awsAccountId: str,
                 }
                 yield finding
 
-@registry.register_check("autoscaling")
+@registry.register_check("autoscaling", requires=[describe_auto_scaling_groups])
 def autoscaling_high_availability_az_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Autoscaling.3] Autoscaling Groups should use at least half of a Region's Availability Zones"""
     # ISO Time
@@ -19,12 +19,12 @@
 #under the License.
 
 import datetime
-import boto3
+import client_pool
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-cloudfront = boto3.client("cloudfront")
+cloudfront = client_pool.client("cloudfront")
 
 def paginate(cache):
     itemList = []
@@ -42,7 +42,7 @@ def paginate(cache):
         cache["items"] = itemList
         return cache["items"]
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_active_trusted_signers_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.1] Cloudfront Distributions with active Trusted Signers should use Key Pairs"""
     # ISO Time
@@ -221,7 +221,7 @@ def cloudfront_active_trusted_signers_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_origin_shield_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.2] Cloudfront Distributions Origins should have Origin Shield enabled"""
     # ISO Time
@@ -369,7 +369,7 @@ def cloudfront_origin_shield_check(cache: dict, awsAccountId: str, awsRegion: st
                     }
                     yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_default_viewer_cert_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.3] Cloudfront Distributions should not use the default Viewer certificate"""
     # ISO Time
@@ -496,7 +496,7 @@ def cloudfront_default_viewer_cert_check(cache: dict, awsAccountId: str, awsRegi
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_georestriction_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.4] Cloudfront Distributions should have a Georestriction configured"""
     # ISO Time
@@ -625,7 +625,7 @@ def cloudfront_georestriction_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_field_level_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.5] Cloudfront Distributions should implement Field-Level Encryption in default cache behavior"""
     # ISO Time
@@ -742,7 +742,7 @@ def cloudfront_field_level_encryption_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_waf_enabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.6] Cloudfront Distributions should use a Web Application Firewall"""
     # ISO Time
@@ -871,7 +871,7 @@ def cloudfront_waf_enabled_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_default_viewer_tls12_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.7] Cloudfront Distributions should enforce TLS 1.2 for the default viewer protocol"""
     # TLS 1.2 policies
@@ -1004,7 +1004,7 @@ def cloudfront_default_viewer_tls12_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_custom_origin_tls12_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.8] Cloudfront Distributions with Custom Origins should allow only TLSv1.2 protocols"""
     # Non compliant policies
@@ -1224,7 +1224,7 @@ def cloudfront_custom_origin_tls12_check(cache: dict, awsAccountId: str, awsRegi
                     }
                     yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_custom_origin_https_only_protcol_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.9] Cloudfront Distributions with Custom Origins should enforce HTTPS-only protocol policies"""
     # ISO Time
@@ -1436,7 +1436,7 @@ def cloudfront_custom_origin_https_only_protcol_check(cache: dict, awsAccountId:
                     }
                     yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_default_viewer_https_sni_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.10] Cloudfront Distributions should enforce Server Name Indication (SNI) to serve HTTPS requests"""
     # ISO Time
@@ -1563,7 +1563,7 @@ def cloudfront_default_viewer_https_sni_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_distro_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.11] Cloudfront Distributions should have logging enabled"""
     # ISO Time
@@ -1688,7 +1688,7 @@ def cloudfront_distro_logging_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_distro_default_root_object_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.12] Cloudfront Distributions should have a default root object configured"""
     # ISO Time
@@ -1825,7 +1825,7 @@ def cloudfront_distro_default_root_object_check(cache: dict, awsAccountId: str,
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_default_viewer_https_only_protcol_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.13] Cloudfront Distributions should enforce should enforce HTTPS-only for the default viewer protocol"""
     # ISO Time
@@ -1952,7 +1952,7 @@ def cloudfront_default_viewer_https_only_protcol_check(cache: dict, awsAccountId
             }
             yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[paginate])
 def cloudfront_s3_origin_oai_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudFront.14] Cloudfront Distributions with S3 Origins should have origin access identity enabled"""
     # ISO Time
@@ -17,7 +17,7 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import boto3
+import client_pool
 import botocore
 import datetime
 from check_register import CheckRegister, accumulate_paged_results
@@ -25,8 +25,8 @@ from check_register import CheckRegister, accumulate_paged_results
 registry = CheckRegister()
 
 # boto3 clients
-cognitoidp = boto3.client("cognito-idp")
-wafv2 = boto3.client("wafv2")
+cognitoidp = client_pool.client("cognito-idp")
+wafv2 = client_pool.client("wafv2")
 
 # loop through Cognito User Pools
 def list_user_pools(cache):
@@ -40,7 +40,7 @@ def list_user_pools(cache):
     )
     return cache["list_user_pools"]
 
-@registry.register_check("cognito-idp")
+@registry.register_check("cognito-idp", requires=[list_user_pools])
 def cognitoidp_cis_password_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Cognito.1] Cognito user pools should have a password policy that meets or exceed AWS CIS Foundations Benchmark standards"""
     # ISO Time
@@ -193,7 +193,7 @@ def cognitoidp_cis_password_check(cache: dict, awsAccountId: str, awsRegion: str
             }
             yield finding
 
-@registry.register_check("cognito-idp")
+@registry.register_check("cognito-idp", requires=[list_user_pools])
 def cognitoidp_temp_password_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Cognito.2] Cognito user pools should not allow temporary passwords to stay valid beyond 24 hours"""
     # ISO Time
@@ -340,7 +340,7 @@ def cognitoidp_temp_password_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("cognito-idp")
+@registry.register_check("cognito-idp", requires=[list_user_pools])
 def cognitoidp_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Cognito.3] Cognito user pools should enforce multi factor authentication (MFA)"""
     # ISO Time
@@ -482,7 +482,7 @@ def cognitoidp_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPart
             }
             yield finding
 
-@registry.register_check("cognito-idp")
+@registry.register_check("cognito-idp", requires=[list_user_pools])
 def cognitoidp_waf_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Cognito.4] Cognito user pools should be protected by AWS Web Application Firewall"""
     # ISO Time
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-dax = boto3.client("dax")
+dax = client_pool.client("dax")
 
 # loop through DAX clusters
 def describe_clusters(cache):
@@ -35,7 +35,7 @@ def describe_clusters(cache):
     cache["describe_clusters"] = dax.describe_clusters()
     return cache["describe_clusters"]
 
-@registry.register_check("dax")
+@registry.register_check("dax", requires=[describe_clusters])
 def dax_encryption_at_rest_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DAX.1] DynamoDB Accelerator (DAX) clusters should be encrypted at rest"""
     # ISO Time
@@ -166,7 +166,7 @@ def dax_encryption_at_rest_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("dax")
+@registry.register_check("dax", requires=[describe_clusters])
 def dax_encryption_in_transit_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DAX.2] DynamoDB Accelerator (DAX) clusters should enforce encryption in transit"""
     # ISO Time
@@ -307,7 +307,7 @@ def dax_encryption_in_transit_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("dax")
+@registry.register_check("dax", requires=[describe_clusters])
 def dax_cache_ttl_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DAX.3] DynamoDB Accelerator (DAX) clusters should enforce a cache TTL value"""
     # ISO Time
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-documentdb = boto3.client("docdb")
+documentdb = client_pool.client("docdb")
 
 # Get all DB Instances
 def describe_db_instances(cache):
@@ -61,7 +61,7 @@ def describe_db_cluster_parameter_groups(cache):
     cache["describe_db_cluster_parameter_groups"] = documentdb.describe_db_cluster_parameter_groups()
     return cache["describe_db_cluster_parameter_groups"]
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_instances])
 def docdb_public_instance_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.1] DocumentDB instances should not be exposed to the public"""
     # ISO Time
@@ -207,7 +207,7 @@ def docdb_public_instance_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_instances])
 def docdb_instance_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.2] DocumentDB instances should be encrypted"""
     # ISO Time
@@ -341,7 +341,7 @@ def docdb_instance_encryption_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_instances])
 def docdb_instance_audit_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.3] DocumentDB instances should have audit logging configured"""
     # ISO Time
@@ -478,7 +478,7 @@ def docdb_instance_audit_logging_check(cache: dict, awsAccountId: str, awsRegion
             }
             yield finding
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_clusters])
 def docdb_cluster_multiaz_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.4] DocumentDB clusters should be configured for Multi-AZ"""
     # ISO Time
@@ -624,7 +624,7 @@ def docdb_cluster_multiaz_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_clusters])
 def docdb_cluster_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.5] DocumentDB clusters should have deletion protection enabled"""
     # ISO Time
@@ -766,7 +766,7 @@ def docdb_cluster_deletion_protection_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_cluster_parameter_groups])
 def documentdb_parameter_group_audit_log_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.6] DocumentDB cluster parameter groups should enforce audit logging for DocumentDB databases"""
     # ISO Time
@@ -895,7 +895,7 @@ def documentdb_parameter_group_audit_log_check(cache: dict, awsAccountId: str, a
         else:
             continue
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_cluster_parameter_groups])
 def documentdb_parameter_group_tls_enforcement_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.7] DocumentDB cluster parameter groups should enforce TLS connections to DocumentDB databases"""
     # ISO Time
@@ -1028,7 +1028,7 @@ def documentdb_parameter_group_tls_enforcement_check(cache: dict, awsAccountId:
         else:
             continue
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_clusters])
 def documentdb_cluster_snapshot_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.8] DocumentDB cluster snapshots should be encrypted"""
     # ISO Time
@@ -1141,7 +1141,7 @@ def documentdb_cluster_snapshot_encryption_check(cache: dict, awsAccountId: str,
                 }
                 yield finding
 
-@registry.register_check("docdb")
+@registry.register_check("docdb", requires=[describe_db_clusters])
 def documentdb_cluster_snapshot_public_share_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DocumentDB.9] DocumentDB cluster snapshots should not be publicly shared"""
     # ISO Time
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-dynamodb = boto3.client("dynamodb")
+dynamodb = client_pool.client("dynamodb")
 
 # loop through DynamoDB tables
 def list_tables(cache):
@@ -41,7 +41,7 @@ def list_tables(cache):
         cache["list_tables"] = ddbTables
         return cache["list_tables"]
 
-@registry.register_check("dynamodb")
+@registry.register_check("dynamodb", requires=[list_tables])
 def ddb_kms_cmk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DynamoDB.1] DynamoDB tables should use KMS CMKs for encryption at rest"""
     # ISO Time
@@ -219,7 +219,7 @@ def ddb_kms_cmk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartiti
                 }
                 yield finding
 
-@registry.register_check("dynamodb")
+@registry.register_check("dynamodb", requires=[list_tables])
 def ddb_pitr_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DynamoDB.2] DynamoDB tables should have Point-in-Time Recovery (PITR) enabled"""
     # ISO Time
@@ -352,7 +352,7 @@ def ddb_pitr_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
             }
             yield finding
 
-@registry.register_check("dynamodb")
+@registry.register_check("dynamodb", requires=[list_tables])
 def ddb_ttl_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DynamoDB.3] DynamoDB tables should have Time to Live (TTL) enabled"""
     # ISO Time
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-ec2 = boto3.client("ec2")
+ec2 = client_pool.client("ec2")
 
 # loop through EBS volumes
 def describe_volumes(cache):
@@ -43,7 +43,7 @@ def describe_snapshots(cache, awsAccountId):
     cache["describe_snapshots"] = ec2.describe_snapshots(OwnerIds=[awsAccountId], DryRun=False)
     return cache["describe_snapshots"]
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_volumes])
 def ebs_volume_attachment_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EBS.1] EBS Volumes should be in an attached state"""
     # ISO Time
@@ -153,7 +153,7 @@ def ebs_volume_attachment_check(cache: dict, awsAccountId: str, awsRegion: str,
                 }
                 yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_volumes])
 def ebs_volume_delete_on_termination_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EBS.2] EBS Volumes should be configured to be deleted on termination"""
     # ISO Time
@@ -265,7 +265,7 @@ def ebs_volume_delete_on_termination_check(cache: dict, awsAccountId: str, awsRe
                 }
                 yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_volumes])
 def ebs_volume_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EBS.3] EBS Volumes should be encrypted"""
     # ISO Time
@@ -806,7 +806,7 @@ def ebs_account_encryption_by_default_check(cache: dict, awsAccountId: str, awsR
         }
         yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_volumes])
 def ebs_volume_snapshot_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EBS.7] EBS Volumes should have snapshots"""
     # ISO Time
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from dateutil.parser import parse
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-ec2 = boto3.client("ec2")
+ec2 = client_pool.client("ec2")
 
 def describe_instances(cache):
     instanceList = []
@@ -41,7 +41,7 @@ def describe_instances(cache):
         cache["instances"] = instanceList
         return cache["instances"]
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_imdsv2_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.1] EC2 Instances should be configured to use instance metadata service V2 (IMDSv2)"""
     # ISO Time
@@ -204,7 +204,7 @@ def ec2_imdsv2_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
         else:
             continue
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_secure_enclave_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.2] EC2 Instances should be configured to use Secure Enclaves"""
     # ISO Time
@@ -362,7 +362,7 @@ def ec2_secure_enclave_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             }
             yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_public_facing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.3] EC2 Instances should not be internet-facing"""
     # ISO Time
@@ -513,7 +513,7 @@ def ec2_public_facing_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             }
             yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_source_dest_verification_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.4] EC2 Instances should use Source-Destination checks unless absolutely not required"""
     # ISO Time
@@ -785,7 +785,7 @@ def ec2_serial_console_access_check(cache: dict, awsAccountId: str, awsRegion: s
         }
         yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_ami_age_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.5] EC2 Instances should use AMIs that are less than 3 months old"""
     # ISO Time
@@ -931,7 +931,7 @@ def ec2_ami_age_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartiti
         except IndexError or KeyError:
             pass
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_ami_status_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.6] EC2 Instances should use AMIs that are currently registered"""
     # ISO Time
@@ -1195,7 +1195,7 @@ def ec2_ami_status_check(cache: dict, awsAccountId: str, awsRegion: str, awsPart
             }
             yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_instances])
 def ec2_concentration_risk(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2.7] EC2 Instances should be deployed across multiple Availability Zones"""
     # Create empty list to hold unique Subnet IDs - for future lookup against AZs
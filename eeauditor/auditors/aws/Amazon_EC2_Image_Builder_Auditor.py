@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import json
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-imagebuilder = boto3.client("imagebuilder")
+imagebuilder = client_pool.client("imagebuilder")
 
 
 @registry.register_check("imagebuilder")
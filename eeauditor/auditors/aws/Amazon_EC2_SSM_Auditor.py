@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 from dateutil.parser import parse
@@ -33,8 +33,8 @@ config = Config(
 
 registry = CheckRegister()
 # create boto3 clients
-ec2 = boto3.client("ec2",config=config)
-ssm = boto3.client("ssm",config=config)
+ec2 = client_pool.client("ec2",config=config)
+ssm = client_pool.client("ssm",config=config)
 
 def paginate(cache):
     instanceList = []
@@ -50,7 +50,7 @@ def paginate(cache):
         cache["instances"] = instanceList
         return cache["instances"]
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[paginate])
 def ec2_instance_ssm_managed_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2-SSM.1] EC2 Instances should be managed by Systems Manager"""
     # ISO Time
@@ -189,7 +189,7 @@ def ec2_instance_ssm_managed_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[paginate])
 def ssm_instace_agent_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2-SSM.2] EC2 Linux Instances managed by Systems Manager should have the latest SSM Agent installed"""
     # ISO Time
@@ -335,7 +335,7 @@ def ssm_instace_agent_update_check(cache: dict, awsAccountId: str, awsRegion: st
                         }
                         yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[paginate])
 def ssm_instance_association_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2-SSM.3] EC2 Instances managed by Systems Manager should have a successful Association status"""
     # ISO Time
@@ -479,7 +479,7 @@ def ssm_instance_association_check(cache: dict, awsAccountId: str, awsRegion: st
                     }
                     yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[paginate])
 def ssm_instance_patch_state_state(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2-SSM.4] EC2 Instances managed by Systems Manager should have the latest patches installed by Patch Manager"""
     # ISO Time
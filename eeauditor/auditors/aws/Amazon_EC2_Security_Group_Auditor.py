@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import json
 import os
 import datetime
@@ -30,7 +30,7 @@ registry = CheckRegister()
 dirPath = os.path.dirname(os.path.realpath(__file__))
 configFile = f"{dirPath}/electriceye_secgroup_auditor_config.json"
 
-ec2 = boto3.client("ec2")
+ec2 = client_pool.client("ec2")
 
 # loop through security groups
 def describe_security_groups(cache):
@@ -40,7 +40,7 @@ def describe_security_groups(cache):
     cache["describe_security_groups"] = ec2.describe_security_groups()
     return cache["describe_security_groups"]
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_security_groups])
 def security_group_all_open_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SecurityGroup.1] Security groups should not allow unrestricted access to all ports and protocols"""
     response = describe_security_groups(cache)
@@ -181,7 +181,7 @@ def security_group_all_open_check(cache: dict, awsAccountId: str, awsRegion: str
                 else:
                     continue
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_security_groups])
 def security_group_master_auditor_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """The Security Group Master Auditor check generates findings for every configuration file entry"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import botocore
 from check_register import CheckRegister
@@ -26,7 +26,7 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-ecr = boto3.client("ecr")
+ecr = client_pool.client("ecr")
 # loop through ECR repos
 def describe_repositories(cache):
     response = cache.get("describe_repositories")
@@ -35,7 +35,7 @@ def describe_repositories(cache):
     cache["describe_repositories"] = ecr.describe_repositories(maxResults=1000)
     return cache["describe_repositories"]
 
-@registry.register_check("ecr")
+@registry.register_check("ecr", requires=[describe_repositories])
 def ecr_repo_vuln_scan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECR.1] ECR repositories should be configured to scan images on push"""
     response = describe_repositories(cache)
@@ -139,7 +139,7 @@ def ecr_repo_vuln_scan_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             }
             yield finding
 
-@registry.register_check("ecr")
+@registry.register_check("ecr", requires=[describe_repositories])
 def ecr_repo_image_lifecycle_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECR.2] ECR repositories should be have an image lifecycle policy configured"""
     response = describe_repositories(cache)
@@ -252,7 +252,7 @@ def ecr_repo_image_lifecycle_policy_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("ecr")
+@registry.register_check("ecr", requires=[describe_repositories])
 def ecr_repo_permission_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECR.3] ECR repositories should be have a repository policy configured"""
     response = describe_repositories(cache)
@@ -383,7 +383,7 @@ def ecr_repo_permission_policy_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("ecr")
+@registry.register_check("ecr", requires=[describe_repositories])
 def ecr_latest_image_vuln_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECR.4] The latest image in an ECR Repository should not have any vulnerabilities"""
     response = describe_repositories(cache)
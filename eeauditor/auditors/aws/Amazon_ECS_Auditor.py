@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-ecs = boto3.client("ecs")
+ecs = client_pool.client("ecs")
 
 def list_clusters(cache):
     response = cache.get("list_clusters")
@@ -44,7 +44,7 @@ def list_active_task_definitions(cache):
     cache["get_task_definitons"] = taskDefinitions
     return cache["get_task_definitons"]
 
-@registry.register_check("ecs")
+@registry.register_check("ecs", requires=[list_clusters])
 def ecs_cluster_container_insights_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECS.1] ECS clusters should have container insights enabled"""
     # ISO Time
@@ -166,7 +166,7 @@ def ecs_cluster_container_insights_check(cache: dict, awsAccountId: str, awsRegi
                     }
                     yield finding
 
-@registry.register_check("ecs")
+@registry.register_check("ecs", requires=[list_clusters])
 def ecs_cluster_default_provider_strategy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECS.2] ECS clusters should have a default cluster capacity provider strategy configured"""
     # ISO Time
@@ -279,7 +279,7 @@ def ecs_cluster_default_provider_strategy_check(cache: dict, awsAccountId: str,
                 }
                 yield finding
 
-@registry.register_check("ecs")
+@registry.register_check("ecs", requires=[list_active_task_definitions])
 def ecs_task_definition_privileged_container_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECS.3] ECS Task Definitions should not run privileged containers if not required"""
     # ISO Time
@@ -457,7 +457,7 @@ def ecs_task_definition_privileged_container_check(cache: dict, awsAccountId: st
                 }
                 yield finding
 
-@registry.register_check("ecs")
+@registry.register_check("ecs", requires=[list_active_task_definitions])
 def ecs_task_definition_security_labels_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECS.4] ECS Task Definitions for EC2 should have Docker Security Options (SELinux or AppArmor) configured"""
     # ISO Time
@@ -690,7 +690,7 @@ def ecs_task_definition_security_labels_check(cache: dict, awsAccountId: str, aw
                     }
                     yield finding
 
-@registry.register_check("ecs")
+@registry.register_check("ecs", requires=[list_active_task_definitions])
 def ecs_task_definition_root_user_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ECS.5] ECS Task Definitions with users defined should not be set to Root"""
     # ISO Time
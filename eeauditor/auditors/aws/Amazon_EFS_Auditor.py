@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-efs = boto3.client("efs")
+efs = client_pool.client("efs")
 
 # loop through EFS file systems
 def describe_file_systems(cache):
@@ -35,7 +35,7 @@ def describe_file_systems(cache):
     cache["describe_file_systems"] = efs.describe_file_systems()
     return cache["describe_file_systems"]
 
-@registry.register_check("efs")
+@registry.register_check("efs", requires=[describe_file_systems])
 def efs_filesys_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EFS.1] EFS File Systems should have encryption enabled"""
     # ISO Time
@@ -143,7 +143,7 @@ def efs_filesys_encryption_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("efs")
+@registry.register_check("efs", requires=[describe_file_systems])
 def efs_filesys_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EFS.2] EFS File Systems should not use the default file system policy"""
     # ISO Time
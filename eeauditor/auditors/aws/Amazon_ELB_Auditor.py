@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # create boto3 clients
-elb = boto3.client("elb")
+elb = client_pool.client("elb")
 
 def describe_clbs(cache):
     # loop through ELB load balancers
@@ -34,7 +34,7 @@ def describe_clbs(cache):
     cache["describe_load_balancers"] = elb.describe_load_balancers()
     return cache["describe_load_balancers"]
 
-@registry.register_check("elb")
+@registry.register_check("elb", requires=[describe_clbs])
 def internet_facing_clb_https_listener_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELB.1] Classic load balancers that are internet-facing should use secure listeners"""
     # ISO Time
@@ -180,7 +180,7 @@ def internet_facing_clb_https_listener_check(cache: dict, awsAccountId: str, aws
         else:
             continue
 
-@registry.register_check("elb")
+@registry.register_check("elb", requires=[describe_clbs])
 def clb_https_listener_tls12_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELB.2] Classic load balancers should use TLS 1.2 listener policies"""
     # ISO Time
@@ -325,7 +325,7 @@ def clb_https_listener_tls12_policy_check(cache: dict, awsAccountId: str, awsReg
                 }
                 yield finding
 
-@registry.register_check("elb")
+@registry.register_check("elb", requires=[describe_clbs])
 def clb_cross_zone_balancing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELB.3] Classic load balancers should have cross-zone load balancing configured"""
     # ISO Time
@@ -473,7 +473,7 @@ def clb_cross_zone_balancing_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("elb")
+@registry.register_check("elb", requires=[describe_clbs])
 def clb_connection_draining_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELB.4] Classic load balancers should have connection draining configured"""
     # ISO Time
@@ -621,7 +621,7 @@ def clb_connection_draining_check(cache: dict, awsAccountId: str, awsRegion: str
             }
             yield finding
 
-@registry.register_check("elb")
+@registry.register_check("elb", requires=[describe_clbs])
 def clb_access_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELB.5] Classic load balancers should enable access logging"""
     # ISO Time
@@ -18,16 +18,16 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # boto3 clients
-elbv2 = boto3.client("elbv2")
-ec2 = boto3.client("ec2")
-wafv2 = boto3.client("wafv2")
+elbv2 = client_pool.client("elbv2")
+ec2 = client_pool.client("ec2")
+wafv2 = client_pool.client("wafv2")
 
 def describe_load_balancers(cache):
     # loop through ELBv2 load balancers
@@ -37,7 +37,7 @@ def describe_load_balancers(cache):
     cache["describe_load_balancers"] = elbv2.describe_load_balancers()
     return cache["describe_load_balancers"]
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_alb_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.1] Application Load Balancers should have access logging enabled"""
     # ISO Time
@@ -187,7 +187,7 @@ def elbv2_alb_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         else:
             continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.2] Application and Network Load Balancers should have deletion protection enabled"""
     # ISO Time
@@ -340,7 +340,7 @@ def elbv2_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: s
             else:
                 continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_internet_facing_secure_listeners_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.3] Internet-facing Application and Network Load Balancers should have secure listeners configured"""
     # ISO Time
@@ -486,7 +486,7 @@ def elbv2_internet_facing_secure_listeners_check(cache: dict, awsAccountId: str,
                 }
                 yield finding
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_tls12_listener_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.4] Application and Network Load Balancers with HTTPS or TLS listeners should enforce TLS 1.2 or TLS 1.3 policies"""
     # ISO Time
@@ -655,7 +655,7 @@ def elbv2_tls12_listener_policy_check(cache: dict, awsAccountId: str, awsRegion:
             else:
                 continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_drop_invalid_header_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.5] Application Load Balancers should drop invalid HTTP header fields"""
     # ISO Time
@@ -800,7 +800,7 @@ def elbv2_drop_invalid_header_check(cache: dict, awsAccountId: str, awsRegion: s
             else:
                 continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_nlb_tls_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.6] Network Load Balancers with TLS listeners should have access logging enabled"""
     # ISO Time
@@ -956,7 +956,7 @@ def elbv2_nlb_tls_logging_check(cache: dict, awsAccountId: str, awsRegion: str,
         else:
             continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_alb_http_desync_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.7] Application Load Balancers should have HTTP Desync protection enabled"""
     # ISO Time
@@ -1128,7 +1128,7 @@ def elbv2_alb_http_desync_protection_check(cache: dict, awsAccountId: str, awsRe
         else:
             continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_alb_sg_risk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.8] Application Load Balancer security groups should not allow non-Listener ports access"""
     # ISO Time
@@ -1305,7 +1305,7 @@ def elbv2_alb_sg_risk_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         else:
             continue
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_alb_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ELBv2.9] Application Load Balancers should be protected by AWS Web Application Firewall"""
     # ISO Time
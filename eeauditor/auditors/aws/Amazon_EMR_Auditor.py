@@ -17,7 +17,7 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import boto3
+import client_pool
 import json
 import datetime
 from check_register import CheckRegister
@@ -25,7 +25,7 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-emr = boto3.client("emr")
+emr = client_pool.client("emr")
 # loop through non-terminated EMR clusters
 
 def list_clusters(cache):
@@ -35,7 +35,7 @@ def list_clusters(cache):
     cache["list_clusters"] = emr.list_clusters(ClusterStates=["STARTING", "RUNNING", "WAITING"])
     return cache["list_clusters"]
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_cluster_security_configuration_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.1] EMR Clusters should have a security configuration specified"""
     for cluster in list_clusters(cache)["Clusters"]:
@@ -187,7 +187,7 @@ def emr_cluster_security_configuration_check(cache: dict, awsAccountId: str, aws
             else:
                 print(e)
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_security_config_encryption_in_transit_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.2] EMR Cluster security configurations should enforce encryption in transit"""
     for cluster in list_clusters(cache)["Clusters"]:
@@ -343,7 +343,7 @@ def emr_security_config_encryption_in_transit_check(cache: dict, awsAccountId: s
             else:
                 print(e)
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_security_config_encryption_at_rest_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.3] EMR Cluster security configurations should enforce encryption at rest for EMRFS"""
     for cluster in list_clusters(cache)["Clusters"]:
@@ -487,7 +487,7 @@ def emr_security_config_encryption_at_rest_check(cache: dict, awsAccountId: str,
             else:
                 print(e)
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_security_config_config_ebs_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.4] EMR Cluster security configurations should enforce encryption at rest for EBS"""
     for cluster in list_clusters(cache)["Clusters"]:
@@ -691,7 +691,7 @@ def emr_security_config_config_ebs_encryption_check(cache: dict, awsAccountId: s
             else:
                 print(e)
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_security_config_kerberos_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.5] EMR Cluster security configurations should enable Kerberos authentication"""
     for cluster in list_clusters(cache)["Clusters"]:
@@ -853,7 +853,7 @@ def emr_security_config_kerberos_check(cache: dict, awsAccountId: str, awsRegion
             else:
                 print(e)
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_cluster_termination_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.6] EMR Clusters should have termination protection enabled"""
     for cluster in list_clusters(cache)["Clusters"]:
@@ -982,7 +982,7 @@ def emr_cluster_termination_protection_check(cache: dict, awsAccountId: str, aws
         except Exception as e:
             print(e)
 
-@registry.register_check("emr")
+@registry.register_check("emr", requires=[list_clusters])
 def emr_cluster_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EMR.7] EMR Clusters should have logging enabled"""
     for cluster in list_clusters(cache)["Clusters"]:
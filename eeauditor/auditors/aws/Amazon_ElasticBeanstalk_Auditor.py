@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticbeanstalk = boto3.client("elasticbeanstalk")
+elasticbeanstalk = client_pool.client("elasticbeanstalk")
 
 # loop through EBS volumes
 def describe_environments(cache):
@@ -35,7 +35,7 @@ def describe_environments(cache):
     cache["describe_environments"] = elasticbeanstalk.describe_environments()
     return cache["describe_environments"]
 
-@registry.register_check("elasticbeanstalk")
+@registry.register_check("elasticbeanstalk", requires=[describe_environments])
 def elasticbeanstalk_imdsv1_disabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ElasticBeanstalk.1] Elastic Beanstalk environments should disable IMDSv1"""
     # ISO Time
@@ -200,7 +200,7 @@ def elasticbeanstalk_imdsv1_disabled_check(cache: dict, awsAccountId: str, awsRe
                 else:
                     continue
 
-@registry.register_check("elasticbeanstalk")
+@registry.register_check("elasticbeanstalk", requires=[describe_environments])
 def elasticbeanstalk_platform_auto_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ElasticBeanstalk.2] Elastic Beanstalk environments should be configured to automatically apply updates and refresh instances"""
     # ISO Time
@@ -349,7 +349,7 @@ def elasticbeanstalk_platform_auto_update_check(cache: dict, awsAccountId: str,
                 else:
                     continue
 
-@registry.register_check("elasticbeanstalk")
+@registry.register_check("elasticbeanstalk", requires=[describe_environments])
 def elasticbeanstalk_enhanced_health_reporting_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ElasticBeanstalk.3] Elastic Beanstalk environments should have enhanced health reporting enabled"""
     # ISO Time
@@ -502,7 +502,7 @@ def elasticbeanstalk_enhanced_health_reporting_check(cache: dict, awsAccountId:
                 else:
                     continue
 
-@registry.register_check("elasticbeanstalk")
+@registry.register_check("elasticbeanstalk", requires=[describe_environments])
 def elasticbeanstalk_log_streaming_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ElasticBeanstalk.4] Elastic Beanstalk environments should have log streaming enabled"""
     # ISO Time
@@ -655,7 +655,7 @@ def elasticbeanstalk_log_streaming_check(cache: dict, awsAccountId: str, awsRegi
                 else:
                     continue
 
-@registry.register_check("elasticbeanstalk")
+@registry.register_check("elasticbeanstalk", requires=[describe_environments])
 def elasticbeanstalk_xray_tracing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ElasticBeanstalk.5] Elastic Beanstalk environments should have tracing enabled"""
     # ISO Time
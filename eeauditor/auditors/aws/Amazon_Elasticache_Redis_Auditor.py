@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticache = boto3.client("elasticache")
+elasticache = client_pool.client("elasticache")
 
 
 @registry.register_check("elasticache")
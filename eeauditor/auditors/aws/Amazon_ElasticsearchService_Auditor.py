@@ -19,14 +19,14 @@
 #under the License.
 
 import json
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticsearch = boto3.client("es")
+elasticsearch = client_pool.client("es")
 # loop through elasticsearch domains
 def list_domain_names(cache):
     response = cache.get("list_domain_names")
@@ -36,7 +36,7 @@ def list_domain_names(cache):
     return cache["list_domain_names"]
 
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def dedicated_master_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.1] OpenSearch/AWS ElasticSearch Service domains should use dedicated master nodes"""
     response = list_domain_names(cache)
@@ -173,7 +173,7 @@ def dedicated_master_check(cache: dict, awsAccountId: str, awsRegion: str, awsPa
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def cognito_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.2] OpenSearch/AWS ElasticSearch Service domains should use Cognito authentication for Kibana"""
     response = list_domain_names(cache)
@@ -321,7 +321,7 @@ def cognito_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def encryption_at_rest_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.3] OpenSearch/AWS ElasticSearch Service domains should be encrypted at rest"""
     response = list_domain_names(cache)
@@ -452,7 +452,7 @@ def encryption_at_rest_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def node2node_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.4] OpenSearch/AWS ElasticSearch Service domains should use node-to-node encryption"""
     response = list_domain_names(cache)
@@ -595,7 +595,7 @@ def node2node_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, a
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def https_enforcement_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.5] OpenSearch/AWS ElasticSearch Service domains should enforce HTTPS-only communications"""
     response = list_domain_names(cache)
@@ -738,7 +738,7 @@ def https_enforcement_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def tls_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.6] OpenSearch/AWS ElasticSearch Service domains that enforce HTTPS-only communications should use a TLS 1.2 security policy"""
     response = list_domain_names(cache)
@@ -895,7 +895,7 @@ def tls_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
         else:
             pass
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def elastic_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.7] OpenSearch/AWS ElasticSearch Service domains should be updated to the latest service software version"""
     response = list_domain_names(cache)
@@ -1030,7 +1030,7 @@ def elastic_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPart
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def elasticsearch_in_vpc_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.8] OpenSearch/AWS ElasticSearch Service domains should be in a VPC"""
     response = list_domain_names(cache)
@@ -1175,7 +1175,7 @@ def elasticsearch_in_vpc_check(cache: dict, awsAccountId: str, awsRegion: str, a
             }
             yield finding
 
-@registry.register_check("es")
+@registry.register_check("es", requires=[list_domain_names])
 def elasticsearch_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[OpenSearch.9] OpenSearch/AWS ElasticSearch Service domains should not be exposed to the public"""
     response = list_domain_names(cache)
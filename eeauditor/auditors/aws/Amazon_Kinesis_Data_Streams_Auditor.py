@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-kinesis = boto3.client("kinesis")
+kinesis = client_pool.client("kinesis")
 
 # loop through kinesis streams
 def list_streams(cache):
@@ -34,7 +34,7 @@ def list_streams(cache):
     cache["list_streams"] = kinesis.list_streams(Limit=100)
     return cache["list_streams"]
 
-@registry.register_check("kinesis")
+@registry.register_check("kinesis", requires=[list_streams])
 def kinesis_stream_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Kinesis.1] Kinesis Data Streams should be encrypted"""
     response = list_streams(cache)
@@ -146,7 +146,7 @@ def kinesis_stream_encryption_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("kinesis")
+@registry.register_check("kinesis", requires=[list_streams])
 def kinesis_enhanced_monitoring_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Kinesis.2] Business-critical Kinesis Data Streams should have detailed monitoring configured"""
     response = list_streams(cache)
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-firehose = boto3.client("firehose")
+firehose = client_pool.client("firehose")
 
 # loop through Firehose delivery streams
 def list_delivery_streams(cache):
@@ -34,7 +34,7 @@ def list_delivery_streams(cache):
     cache["list_delivery_streams"] = firehose.list_delivery_streams(Limit=100)
     return cache["list_delivery_streams"]
 
-@registry.register_check("firehose")
+@registry.register_check("firehose", requires=[list_delivery_streams])
 def firehose_delivery_stream_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Firehose.1] AWS Kinesis Firehose delivery streams should be encrypted"""
     response = list_delivery_streams(cache)
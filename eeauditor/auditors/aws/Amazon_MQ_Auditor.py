@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-amzmq = boto3.client("mq")
+amzmq = client_pool.client("mq")
 
 # loop through Amazon MQ Brokers
 def list_brokers(cache):
@@ -34,7 +34,7 @@ def list_brokers(cache):
     cache["list_brokers"] = amzmq.list_brokers(MaxResults=100)
     return cache["list_brokers"]
 
-@registry.register_check("mq")
+@registry.register_check("mq", requires=[list_brokers])
 def broker_kms_cmk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AmazonMQ.1] AmazonMQ message brokers should use customer-managed KMS CMKs for encryption"""
     response = list_brokers(cache)
@@ -157,7 +157,7 @@ def broker_kms_cmk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPart
         except Exception as e:
             print(e)
 
-@registry.register_check("mq")
+@registry.register_check("mq", requires=[list_brokers])
 def broker_audit_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AmazonMQ.2] AmazonMQ message brokers should have audit logging enabled"""
     response = list_brokers(cache)
@@ -281,7 +281,7 @@ def broker_audit_logging_check(cache: dict, awsAccountId: str, awsRegion: str, a
         except Exception as e:
             print(e)
 
-@registry.register_check("mq")
+@registry.register_check("mq", requires=[list_brokers])
 def broker_general_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AmazonMQ.3] AmazonMQ message brokers should have general logging enabled"""
     response = list_brokers(cache)
@@ -407,7 +407,7 @@ def broker_general_logging_check(cache: dict, awsAccountId: str, awsRegion: str,
         except Exception as e:
             print(e)
 
-@registry.register_check("mq")
+@registry.register_check("mq", requires=[list_brokers])
 def broker_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AmazonMQ.4] AmazonMQ message brokers should not be publicly accessible"""
     response = list_brokers(cache)
@@ -543,7 +543,7 @@ def broker_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, a
         except Exception as e:
             print(e)
 
-@registry.register_check("mq")
+@registry.register_check("mq", requires=[list_brokers])
 def broker_minor_version_auto_upgrade_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AmazonMQ.5] AmazonMQ message brokers should be configured to automatically upgrade to the latest minor version"""
     response = list_brokers(cache)
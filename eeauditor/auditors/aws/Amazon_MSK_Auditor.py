@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-kafka = boto3.client("kafka")
+kafka = client_pool.client("kafka")
 
 # loop through managed kafka clusters
 def list_clusters(cache):
@@ -35,7 +35,7 @@ def list_clusters(cache):
     cache["list_clusters"] = kafka.list_clusters()
     return cache["list_clusters"]
 
-@registry.register_check("kafka")
+@registry.register_check("kafka", requires=[list_clusters])
 def inter_cluster_encryption_in_transit_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MSK.1] Managed Kafka Stream clusters should have inter-cluster encryption in transit enabled"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -150,7 +150,7 @@ def inter_cluster_encryption_in_transit_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("kafka")
+@registry.register_check("kafka", requires=[list_clusters])
 def client_broker_encryption_in_transit_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MSK.2] Managed Kafka Stream clusters should enforce TLS-only communications between clients and brokers"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -265,7 +265,7 @@ def client_broker_encryption_in_transit_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("kafka")
+@registry.register_check("kafka", requires=[list_clusters])
 def client_authentication_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MSK.3] Managed Kafka Stream clusters should use TLS for client authentication"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -379,7 +379,7 @@ def client_authentication_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("kafka")
+@registry.register_check("kafka", requires=[list_clusters])
 def cluster_enhanced_monitoring_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MSK.4] Managed Kafka Stream clusters should use enhanced monitoring"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-mwaa = boto3.client("mwaa")
+mwaa = client_pool.client("mwaa")
 
 def list_environments(cache):
     response = cache.get("list_environments")
@@ -33,7 +33,7 @@ def list_environments(cache):
     cache["list_environments"] = mwaa.list_environments()
     return cache["list_environments"]
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_kms_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.1] Managed Apache Airflow Environments should be encrypted with a KMS CMK"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -162,7 +162,7 @@ def mwaa_kms_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, aw
             }
             yield finding
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.2] Managed Apache Airflow Environments should be use permit public URL access"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -298,7 +298,7 @@ def mwaa_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, aws
             }
             yield finding
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_dag_processing_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.3] Managed Apache Airflow Environments should have DAG Processing logs enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -424,7 +424,7 @@ def mwaa_dag_processing_logging_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_scheduler_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.4] Managed Apache Airflow Environments should have Scheduler logs enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -550,7 +550,7 @@ def mwaa_scheduler_logging_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_task_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.5] Managed Apache Airflow Environments should have Task logs enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -676,7 +676,7 @@ def mwaa_task_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             }
             yield finding
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_webserver_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.6] Managed Apache Airflow Environments should have Webserver logs enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -802,7 +802,7 @@ def mwaa_webserver_logging_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("mwaa")
+@registry.register_check("mwaa", requires=[list_environments])
 def mwaa_worker_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[MWAA.7] Managed Apache Airflow Environments should have Worker logs enabled"""
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
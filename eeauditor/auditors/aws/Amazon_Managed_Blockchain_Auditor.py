@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-amb = boto3.client("managedblockchain")
+amb = client_pool.client("managedblockchain")
 
 # loop through AMB Fabric networks
 def list_networks(cache):
@@ -35,7 +35,7 @@ def list_networks(cache):
     cache["list_networks"] = amb.list_networks(Framework="HYPERLEDGER_FABRIC")
     return cache["list_networks"]
 
-@registry.register_check("managedblockchain")
+@registry.register_check("managedblockchain", requires=[list_networks])
 def amb_fabric_node_chaincode_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AMB.Fabric.1] Amazon Managed Blockchain Fabric peer nodes should have chaincode logging enabled"""
     response = list_networks(cache)
@@ -198,7 +198,7 @@ def amb_fabric_node_chaincode_logging_check(cache: dict, awsAccountId: str, awsR
         except Exception as e:
             print(e)
 
-@registry.register_check("managedblockchain")
+@registry.register_check("managedblockchain", requires=[list_networks])
 def amb_fabric_node_peernode_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AMB.Fabric.2] Amazon Managed Blockchain Fabric peer nodes should have peer node logging enabled"""
     response = list_networks(cache)
@@ -361,7 +361,7 @@ def amb_fabric_node_peernode_logging_check(cache: dict, awsAccountId: str, awsRe
         except Exception as e:
             print(e)
 
-@registry.register_check("managedblockchain")
+@registry.register_check("managedblockchain", requires=[list_networks])
 def amb_fabric_member_ca_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AMB.Fabric.3] Amazon Managed Blockchain Fabric members should have certificate authority (CA) logging enabled"""
     response = list_networks(cache)
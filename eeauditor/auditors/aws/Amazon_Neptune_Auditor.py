@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-neptune = boto3.client("neptune")
+neptune = client_pool.client("neptune")
 
 # loop through neptune instances
 def describe_db_instances(cache):
@@ -55,7 +55,7 @@ def describe_db_cluster_parameter_groups(cache):
     cache["describe_db_cluster_parameter_groups"] = neptune.describe_db_cluster_parameter_groups()
     return cache["describe_db_cluster_parameter_groups"]
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_instances])
 def neptune_instance_multi_az_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.1] Neptune database instances should be configured to be highly available"""
     # ISO Time
@@ -197,7 +197,7 @@ def neptune_instance_multi_az_check(cache: dict, awsAccountId: str, awsRegion: s
             }
             yield finding
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_instances])
 def neptune_instance_storage_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.2] Neptune database instace storage should be encrypted"""
     # ISO Time
@@ -335,7 +335,7 @@ def neptune_instance_storage_encryption_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_instances])
 def neptune_instance_iam_authentication_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.3] Neptune database instaces storage should use IAM Database Authentication"""
     # ISO Time
@@ -495,7 +495,7 @@ def neptune_instance_iam_authentication_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_cluster_parameter_groups])
 def neptune_cluster_parameter_ssl_enforcement_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.4] Neptune cluster parameter groups should enforce SSL connections to Neptune databases"""
     # ISO Time
@@ -741,7 +741,7 @@ def neptune_cluster_parameter_audit_log_check(cache: dict, awsAccountId: str, aw
                 continue
 '''
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_instances])
 def neptune_instance_audit_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.5] Neptune database instaces should send audit logs to CloudWatch"""
     # ISO Time
@@ -881,7 +881,7 @@ def neptune_instance_audit_logging_check(cache: dict, awsAccountId: str, awsRegi
             }
             yield finding
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_instances])
 def neptune_instance_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.6] Neptune database instances should be protected from deletion"""
     # ISO Time
@@ -1025,7 +1025,7 @@ def neptune_instance_deletion_protection_check(cache: dict, awsAccountId: str, a
             }
             yield finding
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_instances])
 def neptune_instance_minor_version_upgrade_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.7] Neptune database instances should be protected from deletion"""
     # ISO Time
@@ -1165,7 +1165,7 @@ def neptune_instance_minor_version_upgrade_check(cache: dict, awsAccountId: str,
             }
             yield finding
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_clusters])
 def neptune_cluster_autoscaling_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.8] Neptune clusters should be configured for auto-scaling"""
     # ISO Time
@@ -1321,7 +1321,7 @@ def neptune_cluster_autoscaling_check(cache: dict, awsAccountId: str, awsRegion:
             else:
                 continue
 
-@registry.register_check("neptune")
+@registry.register_check("neptune", requires=[describe_db_clusters])
 def neptune_cluster_gremlin_query_result_cache_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Neptune.9] Neptune clusters should be configured for result caching"""
     # ISO Time
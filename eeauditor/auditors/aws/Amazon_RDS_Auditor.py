@@ -18,15 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-rds = boto3.client("rds")
-ec2 = boto3.client("ec2")
+rds = client_pool.client("rds")
+ec2 = client_pool.client("ec2")
 
 def describe_db_instances(cache):
     dbInstances = []
@@ -93,7 +93,7 @@ def describe_db_clusters(cache):
         cache["describe_db_clusters"] = dbClusters
         return cache["describe_db_clusters"]
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_ha_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.1] RDS instances should be configured for high availability"""
     # ISO Time
@@ -233,7 +233,7 @@ def rds_instance_ha_check(cache: dict, awsAccountId: str, awsRegion: str, awsPar
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.2] RDS instances should not be publicly accessible"""
     # ISO Time
@@ -380,7 +380,7 @@ def rds_instance_public_access_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_storage_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.3] RDS instances should have encrypted storage"""
     # ISO Time
@@ -512,7 +512,7 @@ def rds_instance_storage_encryption_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_iam_auth_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.4] RDS instances that support IAM Authentication should use IAM Authentication"""
     iamAuthNSupportedEngines = [
@@ -736,7 +736,7 @@ def rds_instance_iam_auth_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_domain_join_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.5] RDS instances that support Kerberos Authentication should be joined to a domain"""
     # Engines that support Kerberos AuthN
@@ -971,7 +971,7 @@ def rds_instance_domain_join_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_performance_insights_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.6] RDS instances should have performance insights enabled"""
      # ISO Time
@@ -1105,7 +1105,7 @@ def rds_instance_performance_insights_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.7] RDS instances should have deletion protection enabled"""
      # ISO Time
@@ -1245,7 +1245,7 @@ def rds_instance_deletion_protection_check(cache: dict, awsAccountId: str, awsRe
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_cloudwatch_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.8] RDS instances should publish database logs to CloudWatch Logs"""
      # ISO Time
@@ -1382,7 +1382,7 @@ def rds_instance_cloudwatch_logging_check(cache: dict, awsAccountId: str, awsReg
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_snapshots])
 def rds_snapshot_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.9] RDS snapshots should be encrypted"""
     # ISO Time
@@ -1492,7 +1492,7 @@ def rds_snapshot_encryption_check(cache: dict, awsAccountId: str, awsRegion: str
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_snapshots])
 def rds_snapshot_public_share_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.10] RDS snapshots should not be publicly shared"""
     # ISO Time
@@ -1624,7 +1624,7 @@ def rds_snapshot_public_share_check(cache: dict, awsAccountId: str, awsRegion: s
                 print("non-supported attribute encountered")
                 continue
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_clusters])
 def rds_aurora_cluster_activity_streams_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.11] RDS Aurora Clusters should use Database Activity Streams"""
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
@@ -1764,7 +1764,7 @@ def rds_aurora_cluster_activity_streams_check(cache: dict, awsAccountId: str, aw
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_clusters])
 def rds_aurora_cluster_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.12] RDS Aurora Clusters should be encrypted"""
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
@@ -1899,7 +1899,7 @@ def rds_aurora_cluster_encryption_check(cache: dict, awsAccountId: str, awsRegio
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_instance_snapshot_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.13] RDS instances should be have snapshots"""
     # ISO time
@@ -2039,7 +2039,7 @@ def rds_instance_snapshot_check(cache: dict, awsAccountId: str, awsRegion: str,
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_snapshots])
 def rds_instance_secgroup_risk_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.14] RDS instance security groups should not allow public access to DB ports"""
     # ISO time
@@ -2638,7 +2638,7 @@ def rds_instance_parameter_group_alerting_check(cache: dict, awsAccountId: str,
         }
         yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_postgresql_log_fwd_vuln_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.17] RDS instances with PostgreSQL engines should not use a version that is vulnerable to the Lightspin log_fwd internal cluster access attack"""
     # from https://aws.amazon.com/security/security-bulletins/AWS-2022-004/
@@ -2961,7 +2961,7 @@ def rds_postgresql_log_fwd_vuln_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("rds")
+@registry.register_check("rds", requires=[describe_db_instances])
 def rds_aurora_postgresql_log_fwd_vuln_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[RDS.18] Aurora instances with PostgreSQL engines should not use a version that is vulnerable to the Lightspin log_fwd internal cluster access attack"""
     # from https://aws.amazon.com/security/security-bulletins/AWS-2022-004/
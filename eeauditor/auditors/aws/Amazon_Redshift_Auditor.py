@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-redshift = boto3.client("redshift")
+redshift = client_pool.client("redshift")
 
 def describe_redshift_clusters(cache):
     redshiftClusters = []
@@ -39,7 +39,7 @@ def describe_redshift_clusters(cache):
         cache["describe_redshift_clusters"] = redshiftClusters
         return cache["describe_redshift_clusters"]
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.1] Amazon Redshift clusters should not be publicly accessible"""
     # ISO Time
@@ -207,7 +207,7 @@ def redshift_cluster_public_access_check(cache: dict, awsAccountId: str, awsRegi
             }
             yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.2] Amazon Redshift clusters should be encrypted at rest"""
     # ISO Time
@@ -363,7 +363,7 @@ def redshift_cluster_encryption_check(cache: dict, awsAccountId: str, awsRegion:
             }
             yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_enhanced_vpc_routing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.3] Amazon Redshift clusters should utilize enhanced VPC routing"""
     # ISO Time
@@ -521,7 +521,7 @@ def redshift_cluster_enhanced_vpc_routing_check(cache: dict, awsAccountId: str,
             }
             yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.4] Amazon Redshift clusters should have audit logging enabled"""
     # ISO Time
@@ -680,7 +680,7 @@ def redshift_cluster_logging_check(cache: dict, awsAccountId: str, awsRegion: st
             }
             yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_default_username_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.5] Amazon Redshift clusters should not use the default Admin username"""
     # ISO Time
@@ -868,7 +868,7 @@ def redshift_cluster_default_username_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_user_activity_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.6] Amazon Redshift clusters should have user activity logging enabled"""
     # ISO Time
@@ -1032,7 +1032,7 @@ def redshift_cluster_user_activity_logging_check(cache: dict, awsAccountId: str,
                     }
                     yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_ssl_connections_only_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.7] Amazon Redshift clusters should enforce encryption in transit"""
     # ISO Time
@@ -1198,7 +1198,7 @@ def redshift_cluster_ssl_connections_only_check(cache: dict, awsAccountId: str,
                     }
                     yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_auto_snapshot_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.8] Amazon Redshift clusters should have automatic snapshots enabled"""
     # ISO Time
@@ -1360,7 +1360,7 @@ def redshift_cluster_auto_snapshot_check(cache: dict, awsAccountId: str, awsRegi
             }
             yield finding
 
-@registry.register_check("redshift")
+@registry.register_check("redshift", requires=[describe_redshift_clusters])
 def redshift_cluster_auto_version_upgrade_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Redshift.9] Amazon Redshift should have automatic upgrades to major versions enabled"""
     # ISO Time
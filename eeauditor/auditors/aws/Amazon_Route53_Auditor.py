@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-route53 = boto3.client("route53")
+route53 = client_pool.client("route53")
 
 def get_hosted_zones(cache):
     zones = []
@@ -39,7 +39,7 @@ def get_hosted_zones(cache):
         cache["get_hosted_zones"] = zones
         return cache["get_hosted_zones"]
     
-@registry.register_check("route53")
+@registry.register_check("route53", requires=[get_hosted_zones])
 def route53_hosted_zone_query_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Route53.1] Route53 Hosted Zones should have query logging configured"""
     # ISO Time
@@ -167,7 +167,7 @@ def route53_hosted_zone_query_logging_check(cache: dict, awsAccountId: str, awsR
             }
             yield finding
 
-@registry.register_check("route53")
+@registry.register_check("route53", requires=[get_hosted_zones])
 def route53_hosted_zone_traffic_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Route53.2] Route53 Hosted Zones should have traffic policies configured"""
     # ISO Time
@@ -18,15 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # create boto3 clients
-ec2 = boto3.client("ec2")
-route53resolver = boto3.client("route53resolver")
+ec2 = client_pool.client("ec2")
+route53resolver = client_pool.client("route53resolver")
 
 # loop through vpcs
 def describe_vpcs(cache):
@@ -36,7 +36,7 @@ def describe_vpcs(cache):
     cache["describe_vpcs"] = ec2.describe_vpcs(DryRun=False)
     return cache["describe_vpcs"]
 
-@registry.register_check("route53resolver")
+@registry.register_check("route53resolver", requires=[describe_vpcs])
 def vpc_route53_query_logging_association_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Route53Resolver.1] VPCs should have Route 53 Resolver DNS Query Logging configured"""
     # ISO Time
@@ -165,7 +165,7 @@ def vpc_route53_query_logging_association_check(cache: dict, awsAccountId: str,
             }
             yield finding
 
-@registry.register_check("route53resolver")
+@registry.register_check("route53resolver", requires=[describe_vpcs])
 def vpc_route53_resolver_firewall_association_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Route53Resolver.2] VPCs should have Route 53 Resolver DNS Firewalls associated"""
     # ISO Time
@@ -286,7 +286,7 @@ def vpc_route53_resolver_firewall_association_check(cache: dict, awsAccountId: s
             }
             yield finding
 
-@registry.register_check("route53resolver")
+@registry.register_check("route53resolver", requires=[describe_vpcs])
 def vpc_route53_resolver_dnssec_validation_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Route53Resolver.3] Consider enabling DNSSEC validation in your VPC for Route 53 Public Zones"""
     # ISO Time
@@ -414,7 +414,7 @@ def vpc_route53_resolver_dnssec_validation_check(cache: dict, awsAccountId: str,
             }
             yield finding
 
-@registry.register_check("route53resolver")
+@registry.register_check("route53resolver", requires=[describe_vpcs])
 def vpc_route53_resolver_firewall_fail_open_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Route53Resolver.4] VPCs with Route 53 Resolver DNS Firewalls associated should be configured to Fail Open"""
     # ISO Time
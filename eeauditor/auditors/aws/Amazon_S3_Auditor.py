@@ -18,23 +18,23 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-s3 = boto3.client("s3")
-s3control = boto3.client("s3control")
-# loop through s3 buckets
+s3 = client_pool.client("s3")
+s3control = client_pool.client("s3control")
+# loop through s3 buckets, only those of the Region being audited as buckets are regional
 def list_buckets(cache):
     response = cache.get("list_buckets")
     if response:
         return response
-    cache["list_buckets"] = s3.list_buckets()
+    cache["list_buckets"] = s3.list_buckets(BucketRegion=s3.meta.region_name)
     return cache["list_buckets"]
 
-@registry.register_check("s3")
+@registry.register_check("s3", requires=[list_buckets])
 def bucket_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.1] S3 Buckets should be encrypted"""
     bucket = list_buckets(cache=cache)
@@ -160,7 +160,7 @@ def bucket_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             else:
                 print(e)
 
-@registry.register_check("s3")
+@registry.register_check("s3", requires=[list_buckets])
 def bucket_lifecycle_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.2] S3 Buckets should implement lifecycle policies for data archival and recovery operations"""
     bucket = list_buckets(cache=cache)
@@ -290,7 +290,7 @@ def bucket_lifecycle_check(cache: dict, awsAccountId: str, awsRegion: str, awsPa
             else:
                 print(e)
 
-@registry.register_check("s3")
+@registry.register_check("s3", requires=[list_buckets])
 def bucket_versioning_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.3] S3 Buckets should have versioning enabled"""
     bucket = list_buckets(cache=cache)
@@ -418,7 +418,7 @@ def bucket_versioning_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             else:
                 print(e)
 
-@registry.register_check("s3")
+@registry.register_check("s3", requires=[list_buckets])
 def bucket_policy_allows_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.4] S3 Bucket Policies should not allow public access to the bucket"""
     bucket = list_buckets(cache=cache)
@@ -552,7 +552,7 @@ def bucket_policy_allows_public_access_check(cache: dict, awsAccountId: str, aws
             # This bucket does not have a bucket policy and the status cannot be checked
             pass
 
-@registry.register_check("s3")
+@registry.register_check("s3", requires=[list_buckets])
 def bucket_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.5] S3 Buckets should have a bucket policy configured"""
     bucket = list_buckets(cache=cache)
@@ -683,7 +683,7 @@ def bucket_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsParti
             else:
                 print(e)
 
-@registry.register_check("s3")
+@registry.register_check("s3", requires=[list_buckets])
 def bucket_access_logging_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.6] S3 Buckets should have server access logging enabled"""
     bucket = list_buckets(cache=cache)
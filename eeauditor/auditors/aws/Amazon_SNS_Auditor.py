@@ -20,13 +20,13 @@
 
 import datetime
 import json
-import boto3
+import client_pool
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-sns = boto3.client("sns")
+sns = client_pool.client("sns")
 
 def list_topics(cache):
     response = cache.get("list_topics")
@@ -35,7 +35,7 @@ def list_topics(cache):
     cache["list_topics"] = sns.list_topics()
     return cache["list_topics"]
 
-@registry.register_check("sns")
+@registry.register_check("sns", requires=[list_topics])
 def sns_topic_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SNS.1] SNS topics should be encrypted"""
     # loop through SNS topics
@@ -156,7 +156,7 @@ def sns_topic_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, a
             }
             yield finding
 
-@registry.register_check("sns")
+@registry.register_check("sns", requires=[list_topics])
 def sns_http_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SNS.2] SNS topics should not use HTTP subscriptions"""
     # loop through SNS topics
@@ -279,7 +279,7 @@ def sns_http_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, aw
                 }
                 yield finding
 
-@registry.register_check("sns")
+@registry.register_check("sns", requires=[list_topics])
 def sns_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SNS.3] SNS topics should not have public access"""
     # loop through SNS topics
@@ -421,7 +421,7 @@ def sns_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             }
             yield finding
 
-@registry.register_check("sns")
+@registry.register_check("sns", requires=[list_topics])
 def sns_cross_account_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SNS.4] SNS topics should not allow cross-account access"""
     # loop through SNS topics
@@ -20,13 +20,13 @@
 
 import datetime
 from dateutil import parser
-import boto3
+import client_pool
 import json
 from check_register import CheckRegister
 
 registry = CheckRegister()
-sqs = boto3.client("sqs")
-cloudwatch = boto3.client("cloudwatch")
+sqs = client_pool.client("sqs")
+cloudwatch = client_pool.client("cloudwatch")
 
 def list_queues(cache):
     response = cache.get("list_queues")
@@ -35,7 +35,7 @@ def list_queues(cache):
     cache["list_queues"] = sqs.list_queues()
     return cache["list_queues"]
 
-@registry.register_check("sqs")
+@registry.register_check("sqs", requires=[list_queues])
 def sqs_old_message_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SQS.1] SQS messages should not be older than 80 percent of message retention"""
     response = list_queues(cache)
@@ -181,7 +181,7 @@ def sqs_old_message_check(cache: dict, awsAccountId: str, awsRegion: str, awsPar
         # No queues listed
         pass
 
-@registry.register_check("sqs")
+@registry.register_check("sqs", requires=[list_queues])
 def sqs_queue_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SQS.2] SQS queues should use server side encryption"""
     response = list_queues(cache)
@@ -295,7 +295,7 @@ def sqs_queue_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, a
         # No queues listed
         pass
 
-@registry.register_check("sqs")
+@registry.register_check("sqs", requires=[list_queues])
 def sqs_queue_public_accessibility_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SQS.3] SQS queues should not be unconditionally open to the public"""
     response = list_queues(cache)
@@ -18,26 +18,22 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-sesh = boto3.session.Session()
-currentRegion = sesh.region_name
-if currentRegion != "us-east-1":
-    session = boto3.Session(region_name="us-east-1")
-    shield = session.client("shield")
-else:
-    shield = boto3.client("shield")
-route53 = boto3.client("route53")
-elbclassic = boto3.client("elb")
-elbv2 = boto3.client("elbv2")
-ec2 = boto3.client("ec2")
-cloudfront = boto3.client("cloudfront")
+# the Shield API is only available in us-east-1
+shield = client_pool.client("shield", region_name="us-east-1")
+route53 = client_pool.client("route53")
+elbclassic = client_pool.client("elb")
+elbv2 = client_pool.client("elbv2")
+ec2 = client_pool.client("ec2")
+cloudfront = client_pool.client("cloudfront")
+# the Global Accelerator API is only available in us-west-2
+gax = client_pool.client("globalaccelerator", region_name="us-west-2")
 # put region conditional check in each individual function - Shield APIs only available in us-east-1
-# add a boto3.Session() to manually set Region to us-west-2 for Global Accelerators
 
 @registry.register_check("shield")
 def shield_advanced_route_53_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -1084,9 +1080,6 @@ def shield_advanced_global_accelerator_protection_check(cache: dict, awsAccountI
     """[ShieldAdvanced.9] Global Accelerator Accelerators should be protected by Shield Advanced"""
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # Create a Session is us-west-2 - which is where the Global Accelerator API is in
-    session = boto3.Session(region_name="us-west-2")
-    gax = session.client("globalaccelerator")
     paginator = gax.get_paginator("list_accelerators")
     iterator = paginator.paginate()
     for page in iterator:
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # create boto3 clients
-ec2 = boto3.client("ec2")
+ec2 = client_pool.client("ec2")
 # loop through vpcs
 def describe_vpcs(cache):
     response = cache.get("describe_vpcs")
@@ -33,7 +33,7 @@ def describe_vpcs(cache):
     cache["describe_vpcs"] = ec2.describe_vpcs(DryRun=False)
     return cache["describe_vpcs"]
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_vpcs])
 def vpc_default_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[VPC.1] Consider deleting the Default VPC if unused"""
     vpc = describe_vpcs(cache=cache)
@@ -145,7 +145,7 @@ def vpc_default_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartiti
             }
             yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_vpcs])
 def vpc_flow_logs_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[VPC.2] Flow Logs should be enabled for all VPCs"""
     vpc = describe_vpcs(cache=cache)
@@ -259,7 +259,7 @@ def vpc_flow_logs_check(cache: dict, awsAccountId: str, awsRegion: str, awsParti
             }
             yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_vpcs])
 def subnet_public_ip_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[VPC.3] Subnets should not automatically map Public IP addresses on launch"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -388,7 +388,7 @@ def subnet_public_ip_check(cache: dict, awsAccountId: str, awsRegion: str, awsPa
                 }
                 yield finding
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[describe_vpcs])
 def subnet_no_ip_space_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[VPC.4] Subnets should be monitored for available IP address space"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
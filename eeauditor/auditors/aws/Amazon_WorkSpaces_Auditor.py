@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-workspaces = boto3.client("workspaces")
+workspaces = client_pool.client("workspaces")
 # loop through workspaces
 def describe_workspaces(cache):
     response = cache.get("describe_workspaces", [])
@@ -33,7 +33,7 @@ def describe_workspaces(cache):
     cache["describe_workspaces"] = workspaces.describe_workspaces()
     return cache["describe_workspaces"]
 
-@registry.register_check("workspaces")
+@registry.register_check("workspaces", requires=[describe_workspaces])
 def workspaces_user_volume_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WorkSpaces.1] WorkSpaces should have user volume encryption enabled"""
     work = describe_workspaces(cache=cache)
@@ -152,7 +152,7 @@ def workspaces_user_volume_encryption_check(cache: dict, awsAccountId: str, awsR
         except Exception as e:
             print(e)
 
-@registry.register_check("workspaces")
+@registry.register_check("workspaces", requires=[describe_workspaces])
 def workspaces_root_volume_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WorkSpaces.2] WorkSpaces should have root volume encryption enabled"""
     work = describe_workspaces(cache=cache)
@@ -271,7 +271,7 @@ def workspaces_root_volume_encryption_check(cache: dict, awsAccountId: str, awsR
         except Exception as e:
             print(e)
 
-@registry.register_check("workspaces")
+@registry.register_check("workspaces", requires=[describe_workspaces])
 def workspaces_running_mode_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[WorkSpaces.3] WorkSpaces should be configured to auto stop after inactivity"""
     work = describe_workspaces(cache=cache)
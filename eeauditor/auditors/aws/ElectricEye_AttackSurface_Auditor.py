@@ -18,19 +18,21 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import nmap3
 import datetime
+import subprocess
+import timeouts
 from check_register import CheckRegister
 from dateutil.parser import parse
 
 registry = CheckRegister()
 # Boto3 clients
-ec2 = boto3.client("ec2")
-elbv2 = boto3.client("elbv2")
-elb = boto3.client("elb")
-cloudfront = boto3.client("cloudfront")
-route53 = boto3.client("route53")
+ec2 = client_pool.client("ec2")
+elbv2 = client_pool.client("elbv2")
+elb = client_pool.client("elb")
+cloudfront = client_pool.client("cloudfront")
+route53 = client_pool.client("route53")
 
 # Instantiate a NMAP scanner for TCP scans to define ports
 nmap = nmap3.NmapScanTechniques()
@@ -59,11 +61,11 @@ def describe_load_balancers(cache):
 
 def describe_clbs(cache):
     # loop through ELB load balancers
-    response = cache.get("describe_load_balancers")
+    response = cache.get("describe_clbs")
     if response:
         return response
-    cache["describe_load_balancers"] = elb.describe_load_balancers()
-    return cache["describe_load_balancers"]
+    cache["describe_clbs"] = elb.describe_load_balancers()
+    return cache["describe_clbs"]
 
 def cloudfront_paginate(cache):
     itemList = []
@@ -99,20 +101,27 @@ def get_public_hosted_zones(cache):
 
 # This function performs the actual NMAP Scan
 def scan_host(host_ip, host_name, asset_type):
+    # a hung scan must not outlive the time budget of the Check, see --check-timeout
+    timeouts.check()
     try:
-        results = nmap.nmap_tcp_scan(
-            host_ip,
+        xml_root = nmap.scan_command(
+            nmap.tcp_connt,
+            target=host_ip,
             # FTP, SSH, TelNet, SMTP, HTTP, POP3, NetBIOS, SMB, RDP, MSSQL, MySQL/MariaDB, NFS, Docker, Oracle, PostgreSQL, 
             # Kibana, VMWare, Proxy, Splunk, K8s, Redis, Kafka, Mongo, Rabbit/AmazonMQ, SparkUI
-            args="-Pn -p 21,22,23,25,80,110,139,445,3389,1433,3306,2049,2375,1521,5432,5601,8182,8080,8089,10250,6379,9092,27017,5672,4040"
+            args="-Pn -p 21,22,23,25,80,110,139,445,3389,1433,3306,2049,2375,1521,5432,5601,8182,8080,8089,10250,6379,9092,27017,5672,4040",
+            timeout=timeouts.remaining(),
         )
+        results = nmap.parser.filter_top_ports(xml_root)
 
         print(f"Scanning {asset_type} {host_name} on {host_ip}")
         return results
+    except subprocess.TimeoutExpired:
+        raise timeouts.CheckTimeout(f"NMAP scan of {host_name} ran out of time")
     except KeyError:
         results = None
 
-@registry.register_check("ec2")
+@registry.register_check("ec2", requires=[ec2_paginate])
 def ec2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AttackSurface.EC2.{checkIdNumber}] EC2 Instances should not be publicly reachable on {serviceName}"""
     # ISO Time
@@ -301,7 +310,7 @@ def ec2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
                         }
                         yield finding
 
-@registry.register_check("elbv2")
+@registry.register_check("elbv2", requires=[describe_load_balancers])
 def elbv2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AttackSurface.ELBv2.{checkIdNumber}] Application Load Balancers should not be publicly reachable on {serviceName}"""
     # ISO Time
@@ -485,7 +494,7 @@ def elbv2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, aws
         else:
             continue
 
-@registry.register_check("elb")
+@registry.register_check("elb", requires=[describe_clbs])
 def elb_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AttackSurface.ELB.{checkIdNumber}] Classic Load Balancers should not be publicly reachable on {serviceName}"""
     # ISO Time
@@ -845,7 +854,7 @@ def eip_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
                     }
                     yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[cloudfront_paginate])
 def cloudfront_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AttackSurface.Cloudfront.{checkIdNumber}] Cloudfront Distributions should not be publicly reachable on {serviceName}"""
     # ISO Time
@@ -1018,7 +1027,7 @@ def cloudfront_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str
                     }
                     yield finding
 
-@registry.register_check("cloudfront")
+@registry.register_check("cloudfront", requires=[get_public_hosted_zones])
 def route53_public_hz_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AttackSurface.Route53.{checkIdNumber}] Route53 Public Hosted Zones A Records should not be publicly reachable on {serviceName}"""
     # ISO Time
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import datetime
 import time
 import os
@@ -33,11 +33,11 @@ registry = CheckRegister()
 
 dirPath = os.path.dirname(os.path.realpath(__file__))
 
-codebuild = boto3.client("codebuild")
-lambdas = boto3.client("lambda")
-ec2 = boto3.client("ec2")
-cloudformation = boto3.client("cloudformation")
-ecs = boto3.client("ecs")
+codebuild = client_pool.client("codebuild")
+lambdas = client_pool.client("lambda")
+ec2 = client_pool.client("ec2")
+cloudformation = client_pool.client("cloudformation")
+ecs = client_pool.client("ecs")
 
 @registry.register_check("codebuild")
 def secret_scan_codebuild_envvar_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
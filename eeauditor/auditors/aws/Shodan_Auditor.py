@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+import client_pool
 import os
 import requests
 import socket
@@ -27,34 +27,39 @@ from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-ssm = boto3.client("ssm")
-ec2 = boto3.client("ec2")
-elbv2 = boto3.client("elbv2")
-rds = boto3.client("rds")
-elasticsearch = boto3.client("es")
-elb = boto3.client("elb")
-dms = boto3.client("dms")
-amzmq = boto3.client("mq")
-cloudfront = boto3.client("cloudfront")
+ssm = client_pool.client("ssm")
+ec2 = client_pool.client("ec2")
+elbv2 = client_pool.client("elbv2")
+rds = client_pool.client("rds")
+elasticsearch = client_pool.client("es")
+elb = client_pool.client("elb")
+dms = client_pool.client("dms")
+amzmq = client_pool.client("mq")
+cloudfront = client_pool.client("cloudfront")
+# the Global Accelerator API is only available in us-west-2
+gax = client_pool.client("globalaccelerator", region_name="us-west-2")
 
 class ShodanError(Exception):
     pass
 
-try:
+def get_shodan_api_key(cache):
+    # looked up when a Check needs it (once per account and Region), never when the Auditor is imported
+    response = cache.get("get_shodan_api_key")
+    if response:
+        return response
     apiKeyParam = os.environ["SHODAN_API_KEY_PARAM"]
-    if apiKeyParam == ("placeholder" or "" or None):
+    if apiKeyParam in ("placeholder", ""):
         raise ShodanError("No valid Shodan API Key")
-    else:
-        shodanApiKey = ssm.get_parameter(Name=apiKeyParam, WithDecryption=True)["Parameter"]["Value"]
-except KeyError:
-    raise
+    cache["get_shodan_api_key"] = ssm.get_parameter(Name=apiKeyParam, WithDecryption=True)["Parameter"]["Value"]
+    return cache["get_shodan_api_key"]
 
 # Shodan information for Requests
 shodanUrl = "https://api.shodan.io/shodan/host/"
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_ec2_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.EC2.1] EC2 instances with public IP addresses should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = ec2.describe_instances(DryRun=False, MaxResults=500)
@@ -213,9 +218,10 @@ def public_ec2_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
                 }
                 yield finding
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_alb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.ELBv2.1] Internet-facing Application Load Balancers should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = elbv2.describe_load_balancers()
@@ -374,9 +380,10 @@ def public_alb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         else:
             continue
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_rds_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.RDS.1] Public accessible RDS instances should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = rds.describe_db_instances()
@@ -541,9 +548,10 @@ def public_rds_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         else:
             continue
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_es_domain_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.Elasticsearch.1] ElasticSearch Service domains outside of a VPC should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = elasticsearch.list_domain_names()
@@ -716,9 +724,10 @@ def public_es_domain_shodan_check(cache: dict, awsAccountId: str, awsRegion: str
             else:
                 continue
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_clb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.ELB.1] Internet-facing Classic Load Balancers should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = elb.describe_load_balancers()
@@ -869,9 +878,10 @@ def public_clb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         else:
             continue
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_dms_replication_instance_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.DMS.1] Publicly accessible Database Migration Service (DMS) Replication Instances should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = dms.describe_replication_instances()
@@ -1018,9 +1028,10 @@ def public_dms_replication_instance_shodan_check(cache: dict, awsAccountId: str,
         else:
             continue
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def public_amazon_mq_broker_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.AmazonMQ.1] Publicly accessible Amazon MQ message brokers should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = amzmq.list_brokers(MaxResults=100)
@@ -1175,9 +1186,10 @@ def public_amazon_mq_broker_shodan_check(cache: dict, awsAccountId: str, awsRegi
         else:
             continue
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def cloudfront_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.CloudFront.1] CloudFront Distributions should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     paginator = cloudfront.get_paginator("list_distributions")
@@ -1325,14 +1337,12 @@ def cloudfront_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
                 }
                 yield finding
 
-@registry.register_check("shodan")
+@registry.register_check("shodan", requires=[get_shodan_api_key])
 def global_accelerator_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Shodan.CloudFront.1] CloudFront Distributions should be monitored for being indexed by Shodan"""
+    shodanApiKey = get_shodan_api_key(cache)
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # Create a Session is us-west-2 - which is where the Global Accelerator API is in
-    session = boto3.Session(region_name="us-west-2")
-    gax = session.client("globalaccelerator")
     paginator = gax.get_paginator("list_accelerators")
     iterator = paginator.paginate()
     for page in iterator:
@@ -0,0 +1,418 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from contextlib import redirect_stdout
+import datetime
+import importlib.util
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import boto3
+import click
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import UnknownServiceError
+
+here = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, here)
+
+import client_pool
+from check_register import CheckRegister
+from run_cache import RunCache
+
+AUDITORS_PATH = os.path.join(here, "auditors", "aws")
+# checked in limits every Auditor has to stay within, see check_thresholds()
+THRESHOLDS_PATH = os.path.join(here, "benchmark_thresholds.json")
+
+ACCOUNT_ID = "012345678901"
+REGION = "us-east-1"
+PARTITION = "aws"
+
+# resources returned by every account-wide listing call the profile does not mention
+DEFAULT_RESOURCE_COUNT = 100
+# resources returned by specific listing calls, {service: {operation: count}}
+PROFILES = {
+    "large": {
+        "ec2": {"DescribeInstances": 50000, "DescribeSecurityGroups": 20000},
+        "s3": {"ListBuckets": 10000},
+        "iam": {"ListUsers": 5000},
+        "cloudfront": {"ListDistributions": 2000},
+    },
+    "small": {},
+}
+
+# Auditors that reach outside of the AWS APIs and can not run offline
+EXCLUDED_AUDITORS = {
+    "ElectricEye_AttackSurface_Auditor": "runs NMAP against the resources",
+    "Shodan_Auditor": "calls the Shodan API",
+    "Secrets_Auditor": "runs detect-secrets and sleeps for every resource",
+}
+
+# member names of pagination tokens, never generated so paginators stop after one page
+PAGINATION_TOKENS = frozenset(
+    ["NextToken", "nextToken", "Marker", "NextMarker", "NextPageToken", "NextContinuationToken", "ContinuationToken", "NextPageMarker"]
+)
+# seconds an Auditor may run for before it is stopped and reported as failed
+AUDITOR_TIMEOUT = 1800
+
+SYNTHETIC_TIMESTAMP = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+SYNTHETIC_POLICY = json.dumps(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {"Effect": "Allow", "Principal": {"AWS": f"arn:aws:iam::{ACCOUNT_ID}:root"}, "Action": "*", "Resource": "*"}
+        ],
+    }
+)
+
+# map members whose keys the Auditors look up, merged over the generated response
+RESPONSE_OVERRIDES = {
+    ("sns", "GetTopicAttributes"): {
+        "Attributes": {"Policy": SYNTHETIC_POLICY, "KmsMasterKeyId": "alias/aws/sns", "Owner": ACCOUNT_ID}
+    },
+    ("sqs", "GetQueueAttributes"): {
+        "Attributes": {"Policy": SYNTHETIC_POLICY, "KmsMasterKeyId": "alias/aws/sqs", "MessageRetentionPeriod": "345600"}
+    },
+}
+
+
+def _is_identifier(name):
+    name = str(name).lower().replace("-", "").replace("_", "")
+    return name.endswith(("id", "ids", "arn", "arns"))
+
+
+def identifies_resources(params):
+    """True when a listing call is narrowed down to specific resources, e.g. Filters on InstanceIds"""
+    for name, value in (params or {}).items():
+        if _is_identifier(name):
+            return True
+        if name == "Filters" and isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict) and _is_identifier(item.get("Key") or item.get("Name") or ""):
+                    return True
+    return False
+
+
+class SyntheticAccount(object):
+    """Answers every API call with a response generated from the botocore output shape
+
+        Account-wide listing calls (no required parameters, not narrowed down to resource IDs)
+        return `count` resources, every other call describes a single resource. Values are deterministic and made unique per
+        resource, booleans alternate so both passing and failing findings are produced.
+        Responses are generated once per operation and reused.
+    """
+
+    def __init__(self, profile=None, default_count=DEFAULT_RESOURCE_COUNT, scale=1.0):
+        self.profile = profile or {}
+        self.default_count = default_count
+        self.scale = scale
+        self.calls = 0
+        # resources returned by the listing calls made so far, {(service, operation): count}
+        self.resources = {}
+        self._responses = {}
+        self._paginators = {}
+
+    def resource_count(self, service_name, operation_name):
+        count = self.profile.get(service_name, {}).get(operation_name, self.default_count)
+        return max(int(count * self.scale), 1)
+
+    def _paginator(self, session, service_name, operation_name):
+        if service_name not in self._paginators:
+            try:
+                self._paginators[service_name] = session.get_paginator_model(service_name)._paginator_config
+            except UnknownServiceError:
+                self._paginators[service_name] = {}
+        return self._paginators[service_name].get(operation_name, {})
+
+    def response(self, session, service_name, operation_model, params=None):
+        single = identifies_resources(params)
+        key = (service_name, operation_model.name, single)
+        response = self._responses.get(key)
+        if response is None:
+            response = self._responses[key] = self.generate(session, service_name, operation_model, single)
+        return response
+
+    def generate(self, session, service_name, operation_model, single=False):
+        if service_name == "sts" and operation_model.name == "GetCallerIdentity":
+            return {"Account": ACCOUNT_ID, "Arn": f"arn:aws:iam::{ACCOUNT_ID}:user/electriceye", "UserId": "AIDAELECTRICEYE"}
+        shape = operation_model.output_shape
+        if shape is None:
+            return {}
+        paginator = self._paginator(session, service_name, operation_model.name)
+        tokens = paginator.get("output_token", [])
+        tokens = set([tokens] if isinstance(tokens, str) else tokens)
+        result_key = paginator.get("result_key")
+        result_key = result_key[0] if isinstance(result_key, list) else result_key
+        listing = not single and not (operation_model.input_shape and operation_model.input_shape.required_members)
+        if not result_key:
+            result_key = next((name for name, member in shape.members.items() if member.type_name == "list"), None)
+
+        count = self.resource_count(service_name, operation_model.name) if listing else 1
+        if listing and result_key:
+            self.resources[(service_name, operation_model.name)] = count
+        response = self.structure(shape, 0, service_name, scaled=result_key.split(".") if result_key else None, count=count, skip=tokens)
+        response.update(RESPONSE_OVERRIDES.get((service_name, operation_model.name), {}))
+        return response
+
+    def structure(self, shape, index, service_name, depth=0, scaled=None, count=1, skip=()):
+        """Generates a structure, the list at the `scaled` path of member names gets `count` items"""
+        value = {}
+        for name, member in shape.members.items():
+            if name in PAGINATION_TOKENS or name in skip:
+                continue
+            if member.serialization.get("eventstream") or member.serialization.get("streaming"):
+                continue
+            if scaled and name == scaled[0]:
+                if len(scaled) == 1 and member.type_name == "list":
+                    value[name] = [self.value(member.member, name, i, service_name, depth + 1) for i in range(count)]
+                    continue
+                if len(scaled) > 1 and member.type_name == "structure":
+                    value[name] = self.structure(member, index, service_name, depth + 1, scaled[1:], count)
+                    continue
+            member_value = self.value(member, name, index, service_name, depth + 1)
+            if member_value is not None:
+                value[name] = member_value
+        return value
+
+    def value(self, shape, name, index, service_name, depth=0):
+        if depth > 6:
+            return None
+        type_name = shape.type_name
+        if type_name == "structure":
+            return self.structure(shape, index, service_name, depth)
+        if type_name == "list":
+            item = self.value(shape.member, name, index, service_name, depth + 1)
+            return [] if item is None else [item]
+        if type_name == "map":
+            item = self.value(shape.value, name, index, service_name, depth + 1)
+            return {} if item is None else {f"{name.lower()}-key": item}
+        if type_name == "string":
+            return self.string(shape, name, index, service_name)
+        if type_name in ("integer", "long"):
+            return 1
+        if type_name in ("float", "double"):
+            return 1.0
+        if type_name == "boolean":
+            if name in ("IsTruncated", "Truncated"):
+                return False
+            return index % 2 == 0
+        if type_name == "timestamp":
+            return SYNTHETIC_TIMESTAMP
+        if type_name == "blob":
+            return b"electriceye"
+        return None
+
+    def string(self, shape, name, index, service_name):
+        if shape.enum:
+            return shape.enum[index % len(shape.enum)]
+        lowered = name.lower()
+        if lowered.endswith("arn"):
+            return f"arn:{PARTITION}:{service_name}:{REGION}:{ACCOUNT_ID}:{lowered[:-3] or 'resource'}/{service_name}-{index:06d}"
+        if "policy" in lowered or "document" in lowered:
+            return SYNTHETIC_POLICY
+        if lowered in ("accountid", "ownerid", "account", "awsaccountid"):
+            return ACCOUNT_ID
+        if "region" in lowered:
+            return REGION
+        if lowered.endswith("date") or lowered.endswith("time"):
+            return SYNTHETIC_TIMESTAMP.isoformat()
+        return f"{lowered}-{index:06d}"
+
+    def attach(self, client, session, service_name, region_name):
+        """ClientPool hook: answers every call of `client` with synthetic data"""
+        botocore_session = session._session
+
+        def before_parameter_build(params, context, **kwargs):
+            context["eeauditor_benchmark_params"] = params
+
+        def before_call(model, context, **kwargs):
+            self.calls += 1
+            response = self.response(botocore_session, service_name, model, context.get("eeauditor_benchmark_params"))
+            return AWSResponse(None, 200, {}, None), response
+
+        client.meta.events.register("before-parameter-build.*.*", before_parameter_build, unique_id="eeauditor-benchmark-before-parameter-build")
+        client.meta.events.register("before-call.*.*", before_call, unique_id="eeauditor-benchmark-before-call")
+
+
+def load_auditor(auditor_name):
+    """Imports an Auditor under its own name and returns its Checks"""
+    checks = {}
+    spec = importlib.util.spec_from_file_location(
+        f"electriceye_benchmark.{auditor_name}", os.path.join(AUDITORS_PATH, f"{auditor_name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    with CheckRegister.collect(checks):
+        spec.loader.exec_module(module)
+    return checks
+
+
+def benchmark_auditor(auditor_name, profile=None, default_count=DEFAULT_RESOURCE_COUNT, scale=1.0):
+    """Runs every Check of an Auditor against a SyntheticAccount, returns its measurements
+
+        Meant to run in its own process: peak memory is the peak RSS of the process.
+    """
+    boto3.setup_default_session(region_name=REGION)
+    account = SyntheticAccount(profile=profile, default_count=default_count, scale=scale)
+    client_pool.pool.add_client_hook(account.attach)
+
+    # the Checks print progress for every resource, which would drown the results
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        checks = load_auditor(auditor_name)
+        run_cache = RunCache()
+        findings = 0
+        errors = {}
+        started = time.perf_counter()
+        for service_name, check_list in checks.items():
+            for check_name, check in check_list.items():
+                cache = run_cache.view((auditor_name, ACCOUNT_ID, REGION))
+                try:
+                    for finding in check(cache=cache, awsAccountId=ACCOUNT_ID, awsRegion=REGION, awsPartition=PARTITION):
+                        findings += 1
+                except Exception as e:
+                    errors[check_name] = f"{type(e).__name__}: {e}"
+                finally:
+                    cache.release()
+        seconds = time.perf_counter() - started
+    resources = sum(account.resources.values())
+    return {
+        "auditor": auditor_name,
+        "checks": sum(len(check_list) for check_list in checks.values()),
+        "findings": findings,
+        "seconds": round(seconds, 3),
+        "findings_per_second": round(findings / seconds, 1) if seconds else 0.0,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "api_calls": account.calls,
+        "resources": resources,
+        "api_calls_per_resource": round(account.calls / resources, 3) if resources else 0.0,
+        "errors": errors,
+    }
+
+
+def _benchmark_in_child(results, auditor_name, profile, default_count, scale):
+    try:
+        results.put(benchmark_auditor(auditor_name, profile, default_count, scale))
+    except Exception as e:
+        results.put({"auditor": auditor_name, "error": f"{type(e).__name__}: {e}"})
+
+
+def run_benchmarks(auditor_names, profile=None, default_count=DEFAULT_RESOURCE_COUNT, scale=1.0, timeout=AUDITOR_TIMEOUT):
+    """Benchmarks every Auditor in a fresh process, one after another, and yields the results"""
+    context = multiprocessing.get_context("fork")
+    for auditor_name in auditor_names:
+        results = context.Queue()
+        process = context.Process(target=_benchmark_in_child, args=(results, auditor_name, profile, default_count, scale))
+        process.start()
+        try:
+            result = results.get(timeout=timeout)
+        except Exception:
+            process.terminate()
+            result = {"auditor": auditor_name, "error": f"did not finish within {timeout} seconds"}
+        process.join()
+        yield result
+
+
+def all_auditors():
+    return sorted(
+        file_name[:-3]
+        for file_name in os.listdir(AUDITORS_PATH)
+        if file_name.endswith(".py") and not file_name.startswith("__") and file_name[:-3] not in EXCLUDED_AUDITORS
+    )
+
+
+def check_thresholds(results, thresholds):
+    """Returns a message for every result outside of its Auditor's thresholds"""
+    violations = []
+    for result in results:
+        limits = thresholds.get("auditors", {}).get(result["auditor"])
+        if not limits:
+            continue
+        if result.get("error"):
+            violations.append(f"{result['auditor']} failed: {result['error']}")
+            continue
+        if result["findings_per_second"] < limits.get("min_findings_per_second", 0):
+            violations.append(f"{result['auditor']} produced {result['findings_per_second']} findings/sec, less than {limits['min_findings_per_second']}")
+        if result["peak_rss_mb"] > limits.get("max_peak_rss_mb", float("inf")):
+            violations.append(f"{result['auditor']} peaked at {result['peak_rss_mb']} MB, more than {limits['max_peak_rss_mb']}")
+        if result["api_calls_per_resource"] > limits.get("max_api_calls_per_resource", float("inf")):
+            violations.append(f"{result['auditor']} made {result['api_calls_per_resource']} API calls per resource, more than {limits['max_api_calls_per_resource']}")
+    return violations
+
+
+def thresholds_from(results, profile_name, scale):
+    """Builds thresholds with headroom from a set of results, used with --update-thresholds"""
+    auditors = {}
+    for result in results:
+        if result.get("error"):
+            continue
+        auditors[result["auditor"]] = {
+            # leave room for slower CI machines, catch slowdowns of more than 2x
+            "min_findings_per_second": round(result["findings_per_second"] * 0.5, 1),
+            "max_peak_rss_mb": round(result["peak_rss_mb"] * 1.5 + 50, 1),
+            "max_api_calls_per_resource": round(result["api_calls_per_resource"] * 1.1 + 0.01, 3),
+        }
+    return {"profile": profile_name, "scale": scale, "auditors": auditors}
+
+
+@click.command()
+@click.option("-a", "--auditor-name", multiple=True, help="Auditor to benchmark, NOT INCLUDING .py. Defaults to every Auditor that can run offline")
+@click.option("--profile", "profile_name", default="large", show_default=True, type=click.Choice(sorted(PROFILES)), help="Size of the synthetic account")
+@click.option("--default-count", default=DEFAULT_RESOURCE_COUNT, show_default=True, help="Resources returned by listing calls the profile does not size")
+@click.option("--scale", default=1.0, show_default=True, help="Multiplies every resource count, e.g. 0.1 for a quick run")
+@click.option("--report", default="", help="Write the results as JSON to this file")
+@click.option("--check", is_flag=True, help="Exit with an error if an Auditor is outside of the checked in thresholds")
+@click.option("--update-thresholds", is_flag=True, help="Rewrite the checked in thresholds from this run")
+def main(auditor_name, profile_name, default_count, scale, report, check, update_thresholds):
+    auditor_names = list(auditor_name) or all_auditors()
+    results = []
+    print(f"| {'Auditor':<45} | {'Findings':>9} | {'Findings/sec':>12} | {'Peak MB':>8} | {'API calls':>9} | {'Calls/resource':>14} | Errors")
+    for result in run_benchmarks(auditor_names, PROFILES[profile_name], default_count, scale):
+        results.append(result)
+        if result.get("error"):
+            print(f"| {result['auditor']:<45} | failed: {result['error']}")
+            continue
+        print(
+            f"| {result['auditor']:<45} | {result['findings']:>9} | {result['findings_per_second']:>12} | {result['peak_rss_mb']:>8} "
+            f"| {result['api_calls']:>9} | {result['api_calls_per_resource']:>14} | {len(result['errors'])}"
+        )
+
+    if report:
+        with open(report, "w") as f:
+            json.dump({"profile": profile_name, "scale": scale, "results": results}, f, indent=2)
+    if update_thresholds:
+        with open(THRESHOLDS_PATH, "w") as f:
+            json.dump(thresholds_from(results, profile_name, scale), f, indent=2, sort_keys=True)
+            f.write("\n")
+    if check:
+        with open(THRESHOLDS_PATH) as f:
+            thresholds = json.load(f)
+        if thresholds.get("profile") != profile_name or thresholds.get("scale") != scale:
+            print(f"Thresholds were recorded with --profile {thresholds.get('profile')} --scale {thresholds.get('scale')}, not comparable")
+            sys.exit(2)
+        violations = check_thresholds(results, thresholds)
+        for violation in violations:
+            print(violation)
+        if violations:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full, Queue
+import threading
+from time import sleep
+from timeouts import CheckTimeout
+
+# default number of Checks of the same service allowed to run at once when running with workers
+DEFAULT_SERVICE_CONCURRENCY = 4
+
+# a single Check to execute: everything needed to call it and to report on it
+CheckUnit = namedtuple(
+    "CheckUnit",
+    ["service_name", "check_name", "check", "awsAccountId", "awsRegion", "awsPartition"],
+)
+
+# marker put on the results queue by a worker once its Check has finished
+_UnitDone = namedtuple("_UnitDone", ["unit"])
+
+
+class CheckExecutor(object):
+    """Runs Checks either one after another or on a bounded thread pool
+
+        Findings are yielded through a single generator regardless of the mode. Every Check
+        is isolated: an exception only ends that Check and is printed, the run carries on.
+    """
+
+    def __init__(self, workers=1, service_concurrency=None, default_service_concurrency=DEFAULT_SERVICE_CONCURRENCY, delay=0):
+        self.workers = max(int(workers or 1), 1)
+        # per-service overrides of the concurrency cap, e.g. {"ec2": 2, "iam": 1}
+        self.service_concurrency = dict(service_concurrency or {})
+        self.default_service_concurrency = max(int(default_service_concurrency or 1), 1)
+        self.delay = delay
+
+    def service_limit(self, service_name):
+        """Returns how many Checks of a service may be in flight at the same time"""
+        limit = self.service_concurrency.get(service_name, self.default_service_concurrency)
+        return max(min(int(limit), self.workers), 1)
+
+    def _group(self, unit):
+        # the same service in another Account or Region has its own endpoint and API limits
+        return (unit.awsAccountId, unit.awsRegion, unit.service_name)
+
+    def run(self, units, runner):
+        """Executes every CheckUnit with `runner(unit)`, which must return an iterable of findings"""
+        if self.workers == 1:
+            return self._run_sequential(units, runner)
+        return self._run_concurrent(units, runner)
+
+    def _run_sequential(self, units, runner):
+        previous_service = None
+        for unit in units:
+            # optional sleep between Auditors (services), same as the legacy behavior
+            if previous_service is not None and unit.service_name != previous_service:
+                sleep(self.delay)
+            previous_service = unit.service_name
+            try:
+                for finding in runner(unit):
+                    yield finding
+            except CheckTimeout as e:
+                print(f"Cancelled check {unit.check_name}, {e}")
+            except Exception as e:
+                print(f"Failed to execute check {unit.check_name} with exception {e}")
+        if previous_service is not None:
+            sleep(self.delay)
+
+    def _run_concurrent(self, units, runner):
+        # queue Checks per service (of each Account and Region) so they can be handed out
+        # round-robin under the service caps
+        pending = OrderedDict()
+        for unit in units:
+            pending.setdefault(self._group(unit), deque()).append(unit)
+        if not pending:
+            return
+
+        results = Queue(maxsize=self.workers * 100)
+        stop = threading.Event()
+        in_flight = {}
+        total_in_flight = 0
+
+        def put(item):
+            # a slow consumer applies backpressure, but a closed generator must not hang the workers
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def work(unit):
+            try:
+                for finding in runner(unit):
+                    if not put(finding):
+                        return
+            except CheckTimeout as e:
+                print(f"Cancelled check {unit.check_name}, {e}")
+            except Exception as e:
+                print(f"Failed to execute check {unit.check_name} with exception {e}")
+            finally:
+                put(_UnitDone(unit))
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eeauditor-check")
+        try:
+            while pending or total_in_flight:
+                # hand out as many Checks as the pool and the per-service caps allow
+                progressed = True
+                while progressed and total_in_flight < self.workers:
+                    progressed = False
+                    for group in list(pending):
+                        if total_in_flight >= self.workers:
+                            break
+                        if in_flight.get(group, 0) >= self.service_limit(group[-1]):
+                            continue
+                        unit = pending[group].popleft()
+                        if not pending[group]:
+                            del pending[group]
+                        in_flight[group] = in_flight.get(group, 0) + 1
+                        total_in_flight += 1
+                        pool.submit(work, unit)
+                        progressed = True
+
+                try:
+                    item = results.get(timeout=1)
+                except Empty:
+                    continue
+                if isinstance(item, _UnitDone):
+                    in_flight[self._group(item.unit)] -= 1
+                    total_in_flight -= 1
+                    continue
+                yield item
+        finally:
+            stop.set()
+            pool.shutdown(wait=False)
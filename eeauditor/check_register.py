@@ -17,20 +17,42 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+from contextlib import contextmanager
 from functools import wraps
+import threading
 
 class CheckRegister(object):
     checks = {}
+    _collect_lock = threading.RLock()
 
-    def register_check(self, service_name):
+    @classmethod
+    @contextmanager
+    def collect(cls, checks):
+        """Sends every Check registered inside the block to `checks` instead of the shared registry
+
+        Used to keep the Checks of Auditors imported once per Region apart from each other.
+        """
+        with cls._collect_lock:
+            previous = cls.checks
+            cls.checks = checks
+            try:
+                yield checks
+            finally:
+                cls.checks = previous
+
+    def register_check(self, service_name, requires=None):
         """Decorator registers event handlers
 
         Args:
             event_type: A string that matches the event type the wrapped function
             will process.
+            requires: The cache helpers (e.g. describe_load_balancers, or its name) that
+            load the collections the Check reads. The planner prefetches them in parallel
+            before any Check runs and skips the Check if one of them fails.
         """
 
         def decorator_register(func):
+            func.requires = tuple(requires or ())
             if service_name not in self.checks:
                 self.checks[service_name] = {func.__name__: func}
             else:
@@ -0,0 +1,156 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import os
+import threading
+import boto3
+from botocore.config import Config
+
+# size of the urllib3 connection pool of every client, botocore defaults to 10
+DEFAULT_MAX_POOL_CONNECTIONS = int(os.environ.get("ELECTRICEYE_MAX_POOL_CONNECTIONS", 25))
+# botocore retry mode (legacy, standard or adaptive) and attempts used by every client
+DEFAULT_RETRY_MODE = os.environ.get("ELECTRICEYE_RETRY_MODE", "standard")
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("ELECTRICEYE_MAX_ATTEMPTS", 5))
+
+
+class ClientPool(object):
+    """Creates one boto3 client per (Session, service, Region) on first use and shares it
+
+        Creating a client loads the service model and builds the endpoint resolver, and every
+        client owns its own connection pool, so Auditors reuse the same client for a service
+        instead of each creating their own at import. boto3 clients are thread-safe, client
+        creation from a Session is not, so it is serialized.
+    """
+
+    def __init__(self, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS, retry_mode=DEFAULT_RETRY_MODE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self._clients = {}
+        # Configs given by Auditors, kept alive so their id() is never reused
+        self._configs = []
+        # botocore event handlers registered on every client, see register()
+        self._handlers = []
+        # callables given every new client with its Session, service and Region, see add_client_hook()
+        self._client_hooks = []
+        self._lock = threading.Lock()
+        self.configure(max_pool_connections, retry_mode, max_attempts)
+
+    def configure(self, max_pool_connections=None, retry_mode=None, max_attempts=None):
+        """Changes the client configuration, only clients created afterwards are affected"""
+        self.max_pool_connections = max_pool_connections or getattr(self, "max_pool_connections", DEFAULT_MAX_POOL_CONNECTIONS)
+        self.retry_mode = retry_mode or getattr(self, "retry_mode", DEFAULT_RETRY_MODE)
+        self.max_attempts = max_attempts or getattr(self, "max_attempts", DEFAULT_MAX_ATTEMPTS)
+        self.config = Config(
+            max_pool_connections=self.max_pool_connections,
+            retries={"mode": self.retry_mode, "max_attempts": self.max_attempts},
+        )
+
+    def get(self, service_name, session=None, region_name=None, config=None):
+        """Returns the shared client, `config` is merged over the pool's own configuration"""
+        session = session or boto3._get_default_session()
+        region_name = region_name or session.region_name
+        key = (session, service_name, region_name, id(config) if config else None)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = session.client(
+                    service_name,
+                    region_name=region_name,
+                    config=self.config.merge(config) if config else self.config,
+                )
+                for event_name, handler, unique_id in self._handlers:
+                    client.meta.events.register(event_name, handler, unique_id=unique_id)
+                for hook in self._client_hooks:
+                    hook(client, session, service_name, region_name)
+                self._clients[key] = client
+                if config:
+                    self._configs.append(config)
+            return client
+
+    def register(self, event_name, handler, unique_id=None):
+        """Registers a botocore event handler on every client, current and future"""
+        with self._lock:
+            self._handlers.append((event_name, handler, unique_id))
+            for client in self._clients.values():
+                client.meta.events.register(event_name, handler, unique_id=unique_id)
+
+    def add_client_hook(self, hook):
+        """Calls hook(client, session, service_name, region_name) for every client, current and future"""
+        with self._lock:
+            self._client_hooks.append(hook)
+            for (session, service_name, region_name, _), client in self._clients.items():
+                hook(client, session, service_name, region_name)
+
+    def client(self, service_name, session=None, region_name=None, config=None):
+        """Returns a LazyClient, the real client is only created when first used"""
+        return LazyClient(self, service_name, session or boto3.DEFAULT_SESSION, region_name, config)
+
+    def clear(self):
+        with self._lock:
+            self._clients = {}
+
+    def __len__(self):
+        return len(self._clients)
+
+
+class LazyClient(object):
+    """Stands in for a boto3 client until an attribute of it is used
+
+        The Session is captured when the LazyClient is created, e.g. when an Auditor is
+        imported by a Session-bound EEAuditor. Without one, the default Session at first use
+        is taken.
+    """
+
+    def __init__(self, pool, service_name, session=None, region_name=None, config=None):
+        self._pool = pool
+        self._service_name = service_name
+        self._session = session
+        self._region_name = region_name
+        self._config = config
+        self._client = None
+
+    def resolve(self):
+        if self._client is None:
+            self._client = self._pool.get(
+                self._service_name,
+                session=self._session,
+                region_name=self._region_name,
+                config=self._config,
+            )
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return f"<LazyClient {self._service_name} {self._region_name or ''}>"
+
+
+# the pool shared by every Auditor in this process
+pool = ClientPool()
+
+
+def client(service_name, session=None, region_name=None, config=None):
+    """Module-level shortcut used by the Auditors: ec2 = client_pool.client("ec2")"""
+    return pool.client(service_name, session=session, region_name=region_name, config=config)
+
+
+def configure(max_pool_connections=None, retry_mode=None, max_attempts=None):
+    pool.configure(max_pool_connections, retry_mode, max_attempts)
@@ -18,36 +18,342 @@
 #specific language governing permissions and limitations
 #under the License.
 
+import os
+import signal
 import sys
+import threading
 import boto3
 import click
+from async_engine import DEFAULT_MAX_IN_FLIGHT, AsyncEngine
+import client_pool
+import events
+import rate_limiter
 from insights import create_sechub_insights
-from eeauditor import EEAuditor
+from journal import DEFAULT_JOURNAL_PATH, RunJournal
+from plugin_manifest import PluginManifest
+from organization import DEFAULT_ROLE_NAME, list_organization_accounts, load_account_list, run_organization_checks
+from daemon import DEFAULT_INTERVAL, DEFAULT_JITTER, DEFAULT_SHUTDOWN_GRACE, Daemon, interruptible, parse_duration
+from eeauditor import EEAuditor, enabled_regions, run_multi_region_checks
+from finding_delta import FindingDelta
+from incremental import DEFAULT_MAX_STALENESS
 from processor.main import get_providers, process_findings
+from replay import install_recorder, install_replayer
+from sharding import Shard
+from state_store import DEFAULT_STATE_PATH, StateStore
+from telemetry import Telemetry
+from timeouts import DEFAULT_AUDITOR_TIMEOUT, DEFAULT_CHECK_TIMEOUT, TimeoutPolicy
 
 
 def print_checks():
-    app = EEAuditor(name="AWS Auditor")
+    # built from the Auditor source files, nothing is imported and no AWS API is called
+    manifest = PluginManifest(os.path.join(os.path.abspath(os.path.dirname(__file__)), "auditors", "aws"))
 
-    app.load_plugins()
-    
-    app.print_checks_md()
+    manifest.print_checks_md()
 
-def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, output_file=""):
+def parse_service_concurrency(values):
+    """Turns ("ec2=2", "iam=1") from the CLI into {"ec2": 2, "iam": 1}"""
+    limits = {}
+    for value in values or []:
+        service_name, _, limit = value.partition("=")
+        try:
+            limits[service_name.strip()] = int(limit)
+        except ValueError:
+            raise click.BadParameter(f"{value} is not in the form SERVICE=NUMBER", param_hint="--service-concurrency")
+    return limits
+
+def parse_rate_limits(values):
+    """Turns ("ec2=10", "ssm=2.5") from the CLI into {"ec2": 10.0, "ssm": 2.5}"""
+    rates = {}
+    for value in values or []:
+        service_name, _, rate = value.partition("=")
+        try:
+            rates[service_name.strip()] = float(rate)
+        except ValueError:
+            raise click.BadParameter(f"{value} is not in the form SERVICE=REQUESTS_PER_SECOND", param_hint="--rate-limit")
+        if rates[service_name.strip()] <= 0:
+            raise click.BadParameter(f"{value} must allow more than 0 requests per second", param_hint="--rate-limit")
+    return rates
+
+def parse_timeouts(values):
+    """Turns ("Secrets_Auditor=600", "ec2_imdsv2_check=60") from the CLI into {"Secrets_Auditor": 600.0, ...}"""
+    overrides = {}
+    for value in values or []:
+        name, _, seconds = value.partition("=")
+        try:
+            overrides[name.strip()] = float(seconds)
+        except ValueError:
+            raise click.BadParameter(f"{value} is not in the form NAME=SECONDS", param_hint="--timeout")
+        if overrides[name.strip()] < 0:
+            raise click.BadParameter(f"{value} can not be a negative number of seconds", param_hint="--timeout")
+    return overrides
+
+def parse_replay_latency(value):
+    """Turns "0.05" or "recorded" from the CLI into the latency Replayer expects"""
+    if not value or value == "recorded":
+        return value or 0
+    try:
+        return float(value)
+    except ValueError:
+        raise click.BadParameter(f"{value} is neither a number of seconds nor 'recorded'", param_hint="--replay-latency")
+
+def parse_schedule(values):
+    """Turns ("Amazon_EC2_Auditor=1h", "AWS_TrustedAdvisor_Auditor=1d") from the CLI into {"Amazon_EC2_Auditor": 3600.0, ...}"""
+    intervals = {}
+    for value in values or []:
+        auditor_name, _, interval = value.partition("=")
+        try:
+            intervals[auditor_name.strip()] = parse_duration(interval)
+        except ValueError:
+            raise click.BadParameter(f"{value} is not in the form AUDITOR=INTERVAL e.g. Amazon_EC2_Auditor=30m", param_hint="--schedule")
+    return intervals
+
+def parse_regions(value):
+    """Turns "all" or "us-east-1,us-west-2" from the CLI into a list of Regions"""
+    if not value:
+        return []
+    if value.strip().lower() == "all":
+        return enabled_regions()
+    return [region.strip() for region in value.split(",") if region.strip()]
+
+def load_auditors(auditor_name=None, check_name=None, regions=None):
+    """Creates the EEAuditor of the current Region, or one per Region, and imports their Auditors"""
+    if not regions:
+        app = EEAuditor(name="AWS Auditor")
+        app.load_plugins(plugin_name=auditor_name, check_name=check_name)
+        return [app]
+    apps = []
+    for region in regions:
+        app = EEAuditor(name="AWS Auditor", region=region, region_index=apps[0].region_index if apps else None)
+        app.load_plugins(plugin_name=auditor_name, check_name=check_name)
+        apps.append(app)
+    return apps
+
+def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, output_file="", workers=1, service_concurrency=None, regions=None, accounts=None, assume_role_name=DEFAULT_ROLE_NAME, external_id=None, max_accounts=None, profile_name=None, run_report="", prometheus_textfile="", incremental=False, state_file=DEFAULT_STATE_PATH, max_staleness=DEFAULT_MAX_STALENESS, delta=False, full_resync=False, check_timeout=DEFAULT_CHECK_TIMEOUT, auditor_timeout=DEFAULT_AUDITOR_TIMEOUT, timeouts=None, apps=None, auditor_names=None, state_store=None, stopping=None, resource_ids=None, deleted_ids=None, shard=None, journal=None, engine=None):
+    """Runs the Checks once and sends their findings to the outputs, returns the number of findings
+
+        `apps` are EEAuditors loaded beforehand (by the daemon or event mode) to reuse,
+        `auditor_names` limits the run to these Auditors, `resource_ids` limits it to the
+        findings of these resources (`deleted_ids` of them no longer exist), `shard` to its
+        share of the Checks and setting `stopping` ends the run early. With a `journal` the finished Checks are checkpointed
+        and the findings of a resumed run are written to the file outputs again. An `engine`
+        (AsyncEngine) runs the Checks on an asyncio event loop instead of the thread pool.
+    """
     if not outputs:
         # default to AWS SecHub even if somehow Click destination is stripped
         outputs = ["sechub"]
 
-    app = EEAuditor(name="AWS Auditor")
+    # per-Check wall time, API calls, bytes, retries and findings of the whole run
+    telemetry = Telemetry()
+    # incremental mode only re-evaluates resources whose describe payload changed since the last run,
+    # delta mode only sends the findings that changed since the last run. Organization mode workers
+    # open the state file themselves, only what they staged for delta mode is committed here.
+    if not state_store:
+        state_store = StateStore(state_file) if (incremental and not accounts) or delta else None
+    finding_delta = FindingDelta(state_store, full_resync=full_resync) if delta and state_store else None
+    # Checks (or Auditors) running longer than their budget are cancelled, their findings so far are kept
+    timeout_policy = TimeoutPolicy(check_timeout=check_timeout, auditor_timeout=auditor_timeout, overrides=timeouts)
+
+    if accounts:
+        # organization mode - every account is audited in its own process with an assumed role
+        findings = run_organization_checks(
+            accounts,
+            role_name=assume_role_name,
+            regions=regions,
+            external_id=external_id,
+            auditor_name=auditor_name,
+            check_name=check_name,
+            workers=workers,
+            service_concurrency=service_concurrency,
+            max_accounts=max_accounts,
+            profile_name=profile_name,
+            max_pool_connections=client_pool.pool.max_pool_connections,
+            retry_mode=client_pool.pool.retry_mode,
+            rate_limits=rate_limiter.limiter.rates,
+            default_rate_limit=rate_limiter.limiter.default_rate,
+            telemetry=telemetry,
+            state_file=state_file if incremental or delta else None,
+            incremental=incremental,
+            max_staleness=max_staleness,
+            delta=delta,
+            full_resync=full_resync,
+            check_timeout=check_timeout,
+            auditor_timeout=auditor_timeout,
+            timeouts=timeouts,
+            run_id=finding_delta.run_id if finding_delta else None,
+        )
+    elif regions:
+        # one EEAuditor per Region, all of them feeding a single stream of findings
+        apps = apps or load_auditors(auditor_name=auditor_name, check_name=check_name, regions=regions)
+
+        findings = run_multi_region_checks(
+            apps,
+            requested_check_name=check_name,
+            delay=delay,
+            workers=workers,
+            service_concurrency=service_concurrency,
+            run_telemetry=telemetry,
+            state_store=state_store if incremental else None,
+            max_staleness=max_staleness,
+            delta=finding_delta,
+            check_timeouts=timeout_policy if timeout_policy else None,
+            auditor_names=auditor_names,
+            shard=shard,
+            journal=journal,
+            engine=engine,
+        )
+    else:
+        app = (apps or load_auditors(auditor_name=auditor_name, check_name=check_name))[0]
+
+        findings = app.run_checks(
+            requested_check_name=check_name,
+            delay=delay,
+            workers=workers,
+            service_concurrency=service_concurrency,
+            run_telemetry=telemetry,
+            state_store=state_store if incremental else None,
+            max_staleness=max_staleness,
+            delta=finding_delta,
+            check_timeouts=timeout_policy if timeout_policy else None,
+            auditor_names=auditor_names,
+            shard=shard,
+            journal=journal,
+            engine=engine,
+        )
+    if stopping:
+        findings = interruptible(findings, stopping)
+    if resource_ids:
+        findings = (finding for finding in findings if events.in_scope(finding, resource_ids))
+
+    # This function streams the findings to Security Hub, or otherwise, while the Checks run
+    try:
+        with events.scoped(resource_ids, deleted=deleted_ids or ()):
+            total = process_findings(
+                findings=findings,
+                outputs=outputs,
+                output_file=output_file,
+                replayed=journal.replay() if journal else None,
+            )
+    except Exception:
+        if finding_delta:
+            finding_delta.discard()
+        if journal:
+            # left unfinished, --resume picks it up
+            journal.close()
+        raise
+    if journal:
+        journal.complete()
+    if finding_delta:
+        # the outputs have every finding, they are the reference for the next run now
+        finding_delta.commit()
+    if finding_delta and not accounts:
+        # organization mode workers keep their own counts
+        stats = finding_delta.stats()
+        print(f"Sent {stats['forwarded']} new or changed findings ({stats['archived']} archived), {stats['unchanged']} unchanged findings were not sent again")
+
+    print(f"Done running Checks, {total} findings were sent to {', '.join(outputs)}")
+    for record in telemetry.timed_out():
+        print(f"Check {record['check_name']} in {record['account']} {record['region']} ran out of time after {record['wall_time']:.0f} seconds, {record['findings']} findings were kept")
+
+    if run_report:
+        telemetry.write_report(run_report)
+    if prometheus_textfile:
+        telemetry.write_prometheus(prometheus_textfile)
+    return total
+
+def run_daemon(auditor_name=None, check_name=None, regions=None, intervals=None, default_interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER, health_port=None, shutdown_grace=DEFAULT_SHUTDOWN_GRACE, **kwargs):
+    """Keeps the Auditors, boto3 clients and state loaded and runs every Auditor on its own interval"""
+    apps = load_auditors(auditor_name=auditor_name, check_name=check_name, regions=regions)
+    if auditor_name:
+        auditor_names = [auditor_name]
+    else:
+        auditor_names = sorted({name for app in apps for name in app.plugins_to_load(check_name)})
+    # the SQLite state is opened once and shared by every run
+    state_store = None
+    if kwargs.get("incremental") or kwargs.get("delta"):
+        state_store = StateStore(kwargs.get("state_file") or DEFAULT_STATE_PATH)
+
+    def run(names, stopping):
+        return run_auditor(
+            auditor_name=auditor_name,
+            check_name=check_name,
+            regions=regions,
+            apps=apps,
+            auditor_names=names,
+            state_store=state_store,
+            stopping=stopping,
+            **kwargs
+        )
+
+    Daemon(
+        run,
+        auditor_names,
+        intervals=intervals,
+        default_interval=default_interval,
+        jitter=jitter,
+        health_port=health_port,
+        shutdown_grace=shutdown_grace,
+    ).serve()
+
+def run_events(source, auditor_name=None, check_name=None, regions=None, window=events.DEFAULT_EVENT_WINDOW, **kwargs):
+    """Re-evaluates the Checks affected by every CloudTrail change event read from `source`
+
+        `source` is an SQS queue URL, an NDJSON file of events (or - for stdin) or a CloudTrail
+        log file. Runs until the file ends, or SIGTERM for queues and stdin.
+    """
+    apps = load_auditors(auditor_name=auditor_name, check_name=check_name, regions=regions)
+    by_region = {app.awsRegion: app for app in apps}
+    account = apps[0].awsAccountId
+    manifest = apps[0].manifest
+    auditor_names = {auditor_name} if auditor_name else {name for app in apps for name in app.plugins_to_load(check_name)}
+    events.install(client_pool.pool)
 
-    app.load_plugins(plugin_name=auditor_name)
+    stopping = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda signum, frame: stopping.set())
 
-    findings = list(app.run_checks(requested_check_name=check_name, delay=delay))
+    if source.startswith("https://sqs."):
+        items = events.read_queue(source, stopping)
+    else:
+        items = events.read_file(source)
+    print(f"Waiting for change events from {source}")
 
-    # This function writes the findings to Security Hub, or otherwise
-    process_findings(findings=findings, outputs=outputs, output_file=output_file)
+    for batch in events.windows(items, window=window, stopping=stopping):
+        changes = []
+        for record, _ in batch:
+            change = events.change_from(record, manifest)
+            if change is None:
+                continue
+            if change.account != account:
+                print(f"Ignoring {change.event_name} event {change.event_id} of account {change.account}")
+                continue
+            changes.append(change)
 
-    print("Done running Checks")
+        try:
+            for run in events.plan_runs(changes, auditor_names=auditor_names):
+                # global services log their events in us-east-1, their Checks run in the first Region
+                selected = [by_region[region] for region in run.regions if region in by_region] or apps[:1]
+                print(f"Re-evaluating {', '.join(run.auditors)} for {len(changes)} change events{f' on {len(run.resource_ids)} resources' if run.resource_ids else ''}")
+                run_auditor(
+                    auditor_name=auditor_name,
+                    check_name=check_name,
+                    regions=[app.awsRegion for app in selected] if len(selected) > 1 else None,
+                    apps=selected,
+                    auditor_names=run.auditors,
+                    resource_ids=run.resource_ids,
+                    deleted_ids=run.deleted_ids,
+                    stopping=stopping,
+                    **kwargs
+                )
+        except Exception as e:
+            # the messages are not deleted, the queue delivers them again
+            print(f"Failed to evaluate {len(batch)} change events with exception {e}")
+            continue
+        for _, ack in batch:
+            if ack:
+                ack()
+        if stopping.is_set():
+            break
 
 @click.command()
 # AWSCLI Profile
@@ -77,6 +383,244 @@ def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, outpu
     default=0, 
     help="Time in seconds to sleep between Auditors being ran, defaults to 0"
 )
+# Concurrency
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    show_default=True,
+    help="Number of Checks to run concurrently on a thread pool. 1 runs Checks one at a time"
+)
+# Per-service concurrency caps
+@click.option(
+    "--service-concurrency",
+    multiple=True,
+    help="Cap how many Checks of one service run at once when using --workers, as SERVICE=NUMBER e.g. ec2=2. Defaults to 4 per service"
+)
+# Multi-Region
+@click.option(
+    "-r",
+    "--regions",
+    default="",
+    help="Audit several Regions in parallel from one process: 'all' for every enabled Region or a comma-separated list such as us-east-1,eu-west-1. Defaults to the current Region only"
+)
+# Execution engine
+@click.option(
+    "--engine",
+    type=click.Choice(["threads", "asyncio"]),
+    default="threads",
+    show_default=True,
+    help="Run the Checks on a thread pool, or on an asyncio event loop where async Checks make their AWS API calls with aiobotocore (pip install aiobotocore). Synchronous Checks keep running on --workers threads"
+)
+@click.option(
+    "--max-in-flight",
+    default=DEFAULT_MAX_IN_FLIGHT,
+    show_default=True,
+    help="With --engine asyncio, the most AWS API calls async Checks have in flight at once"
+)
+# Organization mode
+@click.option(
+    "--organization",
+    is_flag=True,
+    help="Audit every ACTIVE account of your AWS Organization by assuming --assume-role-name in each of them"
+)
+@click.option(
+    "--accounts-file",
+    default="",
+    help="Audit the account IDs listed in this file (one per line or a JSON list) by assuming --assume-role-name in each of them"
+)
+@click.option(
+    "--assume-role-name",
+    default=DEFAULT_ROLE_NAME,
+    show_default=True,
+    help="Name of the IAM Role to assume in every account when using --organization or --accounts-file"
+)
+@click.option(
+    "--external-id",
+    default="",
+    help="External ID to pass when assuming --assume-role-name, if your Role requires one"
+)
+@click.option(
+    "--max-accounts",
+    default=0,
+    help="Maximum number of accounts audited at the same time (one process each). Defaults to the number of CPUs"
+)
+# boto3 client pool
+@click.option(
+    "--max-pool-connections",
+    default=client_pool.DEFAULT_MAX_POOL_CONNECTIONS,
+    show_default=True,
+    help="Size of the connection pool of every boto3 client, raise it together with --workers"
+)
+@click.option(
+    "--retry-mode",
+    default=client_pool.DEFAULT_RETRY_MODE,
+    show_default=True,
+    type=click.Choice(["legacy", "standard", "adaptive"]),
+    help="botocore retry mode used by every boto3 client"
+)
+# API rate limits
+@click.option(
+    "--rate-limit",
+    multiple=True,
+    help="Requests per second allowed to one service per account and Region, as SERVICE=NUMBER e.g. ec2=10. The rate is lowered automatically while AWS throttles"
+)
+@click.option(
+    "--default-rate-limit",
+    default=rate_limiter.DEFAULT_RATE,
+    show_default=True,
+    help="Requests per second allowed to services without a --rate-limit"
+)
+# Incremental mode
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only re-evaluate resources whose describe payload changed since the last run, the stored findings of unchanged resources are sent again"
+)
+@click.option(
+    "--state-file",
+    default=DEFAULT_STATE_PATH,
+    show_default=True,
+    help="SQLite file holding the resource fingerprints and findings used by --incremental and --delta"
+)
+@click.option(
+    "--max-staleness",
+    default=DEFAULT_MAX_STALENESS,
+    show_default=True,
+    help="Seconds after which a resource is evaluated again with --incremental even if it did not change"
+)
+# Finding delta
+@click.option(
+    "--delta",
+    is_flag=True,
+    help="Only send findings that are new or changed since the last run, and findings that disappeared as ARCHIVED. Uses --state-file"
+)
+@click.option(
+    "--full-resync",
+    is_flag=True,
+    help="With --delta, send every finding again and rebuild the stored state"
+)
+# Time budgets
+@click.option(
+    "--check-timeout",
+    default=DEFAULT_CHECK_TIMEOUT,
+    show_default=True,
+    help="Seconds a single Check may run for before it is cancelled (its findings so far are kept), 0 means no limit"
+)
+@click.option(
+    "--auditor-timeout",
+    default=DEFAULT_AUDITOR_TIMEOUT,
+    show_default=True,
+    help="Seconds all Checks of one Auditor may run for together in an account and Region, 0 means no limit"
+)
+@click.option(
+    "--timeout",
+    multiple=True,
+    help="Time budget of a specific Check or Auditor, as NAME=SECONDS e.g. ElectricEye_AttackSurface_Auditor=1800"
+)
+# Record and replay
+@click.option(
+    "--record",
+    default="",
+    help="Write every AWS API call of the run and its response to this directory, to be used with --replay"
+)
+@click.option(
+    "--replay",
+    default="",
+    help="Answer every AWS API call from a directory written with --record instead of calling AWS, e.g. to benchmark offline"
+)
+@click.option(
+    "--replay-latency",
+    default="0",
+    show_default=True,
+    help="With --replay, seconds to wait before every response, or 'recorded' to wait as long as AWS took during the recording"
+)
+# Daemon mode
+@click.option(
+    "--daemon",
+    is_flag=True,
+    help="Keep running and audit every Auditor on its own interval instead of running once, Auditors, clients and state stay loaded between runs"
+)
+@click.option(
+    "--schedule",
+    multiple=True,
+    help="With --daemon, interval of a specific Auditor as AUDITOR=INTERVAL e.g. AWS_IAM_Auditor=1h or AWS_TrustedAdvisor_Auditor=1d"
+)
+@click.option(
+    "--interval",
+    default=str(int(DEFAULT_INTERVAL)),
+    show_default=True,
+    help="With --daemon, interval of the Auditors without a --schedule, in seconds or with a s/m/h/d suffix"
+)
+@click.option(
+    "--jitter",
+    default=DEFAULT_JITTER,
+    show_default=True,
+    help="With --daemon, up to this many seconds are added at random to every scheduled run"
+)
+@click.option(
+    "--health-port",
+    default=0,
+    help="With --daemon, serve GET /health and GET /status on this port. Defaults to no endpoint"
+)
+@click.option(
+    "--shutdown-grace",
+    default=DEFAULT_SHUTDOWN_GRACE,
+    show_default=True,
+    help="With --daemon, seconds a run in progress may take to end after SIGTERM before the daemon exits"
+)
+# Event mode
+@click.option(
+    "--events",
+    "events_source",
+    default="",
+    help="Re-evaluate only the Checks and resources affected by CloudTrail change events read from an SQS queue URL, an NDJSON file of events or - for stdin"
+)
+@click.option(
+    "--event-window",
+    default=events.DEFAULT_EVENT_WINDOW,
+    show_default=True,
+    help="With --events, seconds events are collected for before their Checks run"
+)
+# Sharding
+@click.option(
+    "--shard",
+    default="",
+    help="Only run this share of the Checks as INDEX/COUNT e.g. 2/4, to split one scan over several tasks. Merge their outputs with sharding.py"
+)
+@click.option(
+    "--shard-runtimes",
+    default="",
+    help="With --shard, a run report (--run-report) of a previous run used to balance the shards by runtime. Every shard must be given the same file"
+)
+# Checkpoint and resume
+@click.option(
+    "--checkpoint",
+    is_flag=True,
+    help="Record every finished Check and its findings in --journal-file, so an interrupted run can be finished with --resume"
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Finish the run recorded in --journal-file: Checks that finished are not run again and the file outputs receive every finding once"
+)
+@click.option(
+    "--journal-file",
+    default=DEFAULT_JOURNAL_PATH,
+    show_default=True,
+    help="Journal written with --checkpoint and read with --resume"
+)
+# Run telemetry
+@click.option(
+    "--run-report",
+    default="",
+    help="Write a JSON report with the wall time, API calls, bytes received, retries, throttles and findings of every Check to this file"
+)
+@click.option(
+    "--prometheus-textfile",
+    default="",
+    help="Write the same per-Check metrics in the Prometheus text format to this file, e.g. for the node_exporter textfile collector"
+)
 # Outputs
 @click.option(
     "-o",
@@ -117,6 +661,46 @@ def main(
     auditor_name,
     check_name,
     delay,
+    workers,
+    service_concurrency,
+    regions,
+    engine,
+    max_in_flight,
+    organization,
+    accounts_file,
+    assume_role_name,
+    external_id,
+    max_accounts,
+    max_pool_connections,
+    retry_mode,
+    rate_limit,
+    default_rate_limit,
+    incremental,
+    state_file,
+    max_staleness,
+    delta,
+    full_resync,
+    check_timeout,
+    auditor_timeout,
+    timeout,
+    record,
+    replay,
+    replay_latency,
+    daemon,
+    schedule,
+    interval,
+    jitter,
+    health_port,
+    shutdown_grace,
+    events_source,
+    event_window,
+    shard,
+    shard_runtimes,
+    checkpoint,
+    resume,
+    journal_file,
+    run_report,
+    prometheus_textfile,
     outputs,
     output_file,
     list_options,
@@ -133,18 +717,168 @@ def main(
 
     if profile_name:
         boto3.setup_default_session(profile_name=profile_name)
+    client_pool.configure(max_pool_connections=max_pool_connections, retry_mode=retry_mode)
+    rate_limiter.configure(rates=parse_rate_limits(rate_limit), default_rate=default_rate_limit)
+
+    # record or replay the AWS API traffic of every client ElectricEye creates from here on
+    recorder = replayer = None
+    if record and replay:
+        raise click.BadParameter("can not be used together with --replay", param_hint="--record")
+    if (record or replay) and (organization or accounts_file):
+        raise click.BadParameter("only covers the current account, it can not be used with --organization or --accounts-file", param_hint="--record/--replay")
+    if record:
+        recorder = install_recorder(client_pool.pool, record)
+    if replay:
+        try:
+            replayer = install_replayer(client_pool.pool, replay, latency=parse_replay_latency(replay_latency))
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--replay")
 
     if create_insights:
         create_sechub_insights()
         sys.exit(2)
 
+    shard_plan = None
+    if shard:
+        try:
+            shard_plan = Shard.parse(shard, runtimes_path=shard_runtimes or None)
+        except (ValueError, IOError) as e:
+            raise click.BadParameter(str(e), param_hint="--shard")
+        if organization or accounts_file or events_source:
+            raise click.BadParameter("can not be used with --organization, --accounts-file or --events", param_hint="--shard")
+
+    async_engine = None
+    if engine == "asyncio":
+        if organization or accounts_file:
+            raise click.BadParameter("can not be used with --organization or --accounts-file", param_hint="--engine")
+        async_engine = AsyncEngine(
+            workers=workers,
+            service_concurrency=parse_service_concurrency(service_concurrency),
+            max_in_flight=max_in_flight,
+            max_pool_connections=client_pool.pool.max_pool_connections,
+            retry_mode=client_pool.pool.retry_mode,
+        )
+
+    accounts = []
+    if accounts_file:
+        accounts = load_account_list(accounts_file)
+    elif organization:
+        accounts = list_organization_accounts()
+
+    journal = None
+    regions = parse_regions(regions)
+    if checkpoint or resume:
+        if accounts or daemon or events_source:
+            raise click.BadParameter("can not be used with --daemon, --events, --organization or --accounts-file", param_hint="--checkpoint/--resume")
+        # resuming with other options would mix the findings of two different runs
+        config = {
+            "auditor_name": auditor_name,
+            "check_name": check_name,
+            "regions": regions,
+            "shard": shard,
+            "outputs": sorted(outputs),
+            "output_file": output_file,
+        }
+        try:
+            journal = RunJournal(journal_file, config=config, resume=resume)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--resume")
+
+    if events_source:
+        if accounts or daemon:
+            raise click.BadParameter("can not be used with --daemon, --organization or --accounts-file", param_hint="--events")
+        if incremental or delta:
+            # a scoped run only sees the changed resources, it must not replace the state of the others
+            raise click.BadParameter("can not be used with --incremental or --delta", param_hint="--events")
+        run_events(
+            events_source,
+            auditor_name=auditor_name,
+            check_name=check_name,
+            regions=regions,
+            window=event_window,
+            delay=delay,
+            outputs=outputs,
+            output_file=output_file,
+            workers=workers,
+            service_concurrency=parse_service_concurrency(service_concurrency),
+            run_report=run_report,
+            prometheus_textfile=prometheus_textfile,
+            check_timeout=check_timeout,
+            auditor_timeout=auditor_timeout,
+            timeouts=parse_timeouts(timeout),
+            engine=async_engine,
+        )
+        sys.exit(0)
+
+    if daemon:
+        if accounts:
+            raise click.BadParameter("can not be used with --organization or --accounts-file", param_hint="--daemon")
+        try:
+            default_interval = parse_duration(interval)
+        except ValueError:
+            raise click.BadParameter(f"{interval} is not a number of seconds or a duration such as 30m", param_hint="--interval")
+        run_daemon(
+            auditor_name=auditor_name,
+            check_name=check_name,
+            regions=regions,
+            intervals=parse_schedule(schedule),
+            default_interval=default_interval,
+            jitter=jitter,
+            health_port=health_port or None,
+            shutdown_grace=shutdown_grace,
+            delay=delay,
+            outputs=outputs,
+            output_file=output_file,
+            workers=workers,
+            service_concurrency=parse_service_concurrency(service_concurrency),
+            run_report=run_report,
+            prometheus_textfile=prometheus_textfile,
+            incremental=incremental,
+            state_file=state_file,
+            max_staleness=max_staleness,
+            delta=delta,
+            full_resync=full_resync,
+            check_timeout=check_timeout,
+            auditor_timeout=auditor_timeout,
+            timeouts=parse_timeouts(timeout),
+            shard=shard_plan,
+            engine=async_engine,
+        )
+        sys.exit(0)
+
     run_auditor(
         auditor_name=auditor_name,
         check_name=check_name,
         delay=delay,
         outputs=outputs,
         output_file=output_file,
+        workers=workers,
+        service_concurrency=parse_service_concurrency(service_concurrency),
+        regions=regions,
+        accounts=accounts,
+        assume_role_name=assume_role_name,
+        external_id=external_id or None,
+        max_accounts=max_accounts or None,
+        profile_name=profile_name or None,
+        run_report=run_report,
+        prometheus_textfile=prometheus_textfile,
+        incremental=incremental,
+        state_file=state_file,
+        max_staleness=max_staleness,
+        delta=delta,
+        full_resync=full_resync,
+        check_timeout=check_timeout,
+        auditor_timeout=auditor_timeout,
+        timeouts=parse_timeouts(timeout),
+        shard=shard_plan,
+        journal=journal,
+        engine=async_engine,
     )
 
+    if recorder:
+        print(f"Recorded {recorder.calls} AWS API calls to {record}")
+    if replayer:
+        print(f"Replayed {replayer.calls} AWS API calls from {replay}, {replayer.misses} of them were not recorded")
+
 if __name__ == "__main__":
     main(sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,264 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import random
+import signal
+import threading
+import time
+
+# seconds between two runs of an Auditor without its own interval
+DEFAULT_INTERVAL = float(os.environ.get("ELECTRICEYE_DAEMON_INTERVAL", 3600))
+# up to this many seconds are added at random to every scheduled run
+DEFAULT_JITTER = float(os.environ.get("ELECTRICEYE_DAEMON_JITTER", 60))
+# seconds a run may take to wind down after SIGTERM before the daemon exits anyway
+DEFAULT_SHUTDOWN_GRACE = 20
+# the scheduler loop wakes up at least this often (seconds), the health endpoint reports
+# unhealthy once it has not done so for HEALTH_STALE_AFTER heartbeats
+HEARTBEAT = 5
+HEALTH_STALE_AFTER = 3
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class DaemonStopping(Exception):
+    """Raised into a run once the daemon was asked to stop, the run is not committed"""
+
+
+def parse_duration(value):
+    """Turns "90", "90s", "15m", "1h" or "1d" into seconds"""
+    value = str(value).strip().lower()
+    multiplier = DURATION_UNITS.get(value[-1:], None)
+    if multiplier:
+        value = value[:-1]
+    seconds = float(value) * (multiplier or 1)
+    if seconds <= 0:
+        raise ValueError(f"{value} is not a positive duration")
+    return seconds
+
+
+def interruptible(findings, stopping):
+    """Passes the findings through until `stopping` is set, then ends the run with DaemonStopping"""
+    for finding in findings:
+        if stopping.is_set():
+            raise DaemonStopping("the daemon is shutting down")
+        yield finding
+
+
+class AuditorSchedule(object):
+    """When an Auditor runs next and how its previous runs went"""
+
+    def __init__(self, name, interval):
+        self.name = name
+        self.interval = interval
+        self.next_run = 0.0
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_duration = None
+        self.last_findings = None
+        self.last_error = None
+
+    def to_dict(self):
+        return {
+            "auditor": self.name,
+            "interval": self.interval,
+            "next_run": self.next_run,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started": self.last_started,
+            "last_finished": self.last_finished,
+            "last_duration": self.last_duration,
+            "last_findings": self.last_findings,
+            "last_error": self.last_error,
+        }
+
+
+class Daemon(object):
+    """Runs the Auditors on their own intervals from a single long-lived process
+
+        `run(auditor_names, stopping)` executes one run and returns its number of findings.
+        Runs never overlap: Auditors that are due together share one run, and an Auditor
+        whose run took longer than its interval is simply due again once it finished. Every
+        next run is delayed by up to `jitter` seconds so Auditors (and several daemons) do not
+        hit the APIs in lockstep. SIGTERM and SIGINT stop the scheduler, a run in progress
+        gets `shutdown_grace` seconds to end before the daemon exits.
+    """
+
+    def __init__(self, run, auditors, intervals=None, default_interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER, health_port=None, health_host="0.0.0.0", shutdown_grace=DEFAULT_SHUTDOWN_GRACE, rng=None):
+        intervals = intervals or {}
+        for name in intervals:
+            if name not in auditors:
+                print(f"Ignoring the interval of {name}, there is no such Auditor to run")
+        self.run = run
+        self.schedules = [AuditorSchedule(name, intervals.get(name, default_interval)) for name in auditors]
+        self.jitter = jitter
+        self.health_port = health_port
+        self.health_host = health_host
+        self.shutdown_grace = shutdown_grace
+        self.rng = rng or random.Random()
+        self.stopping = threading.Event()
+        self.started = None
+        self.heartbeat = None
+        self.server = None
+
+    def delay(self):
+        return self.rng.uniform(0, self.jitter) if self.jitter > 0 else 0
+
+    def stop(self, signum=None, frame=None):
+        if not self.stopping.is_set():
+            print(f"Stopping the ElectricEye daemon{f' on signal {signum}' if signum else ''}")
+        self.stopping.set()
+
+    def serve(self):
+        """Runs the scheduler until stop() is called or a SIGTERM/SIGINT is received"""
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                previous_handlers[signum] = signal.signal(signum, self.stop)
+        self.start_health_server()
+        self.started = self.heartbeat = time.time()
+        for schedule in self.schedules:
+            schedule.next_run = self.started + self.delay()
+        print(f"ElectricEye daemon scheduled {len(self.schedules)} Auditors")
+        try:
+            while not self.stopping.is_set():
+                self.heartbeat = now = time.time()
+                due = [schedule for schedule in self.schedules if schedule.next_run <= now]
+                if due:
+                    self.run_due(due)
+                    continue
+                wait = min(schedule.next_run for schedule in self.schedules) - now if self.schedules else HEARTBEAT
+                self.stopping.wait(min(wait, HEARTBEAT))
+        finally:
+            self.stop_health_server()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        print("ElectricEye daemon stopped")
+
+    def run_due(self, due):
+        names = [schedule.name for schedule in due]
+        started = time.time()
+        for schedule in due:
+            schedule.running = True
+            schedule.last_started = started
+        print(f"Starting scheduled run of {', '.join(names)}")
+        result = {}
+
+        def target():
+            try:
+                result["findings"] = self.run(names, self.stopping)
+            except DaemonStopping:
+                result["stopped"] = True
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            except SystemExit as e:
+                # outputs exit on fatal errors, that only fails this run
+                result["error"] = f"SystemExit: exit status {e.code}"
+
+        # the run happens on its own thread so the loop keeps answering signals and heartbeats
+        worker = threading.Thread(target=target, name="eeauditor-daemon-run", daemon=True)
+        worker.start()
+        stop_requested = None
+        while worker.is_alive():
+            worker.join(HEARTBEAT)
+            self.heartbeat = time.time()
+            if self.stopping.is_set():
+                stop_requested = stop_requested or self.heartbeat
+                if self.heartbeat - stop_requested >= self.shutdown_grace:
+                    print(f"Abandoning the run of {', '.join(names)} after waiting {self.shutdown_grace} seconds")
+                    break
+
+        finished = time.time()
+        for schedule in due:
+            schedule.running = worker.is_alive()
+            schedule.runs += 1
+            schedule.last_finished = finished
+            schedule.last_duration = finished - started
+            schedule.last_findings = result.get("findings")
+            schedule.last_error = result.get("error")
+            if schedule.last_error:
+                schedule.failures += 1
+            # counted from the start of the run, but never earlier than its end
+            schedule.next_run = max(started + schedule.interval, finished) + self.delay()
+        if result.get("stopped"):
+            print(f"Stopped the scheduled run of {', '.join(names)}, its findings were not committed")
+        elif result.get("error"):
+            print(f"Scheduled run of {', '.join(names)} failed with exception {result['error']}")
+        else:
+            print(f"Finished scheduled run of {', '.join(names)} in {finished - started:.0f} seconds")
+
+    def healthy(self):
+        return (
+            not self.stopping.is_set()
+            and self.heartbeat is not None
+            and time.time() - self.heartbeat < HEARTBEAT * HEALTH_STALE_AFTER
+        )
+
+    def status(self):
+        return {
+            "healthy": self.healthy(),
+            "stopping": self.stopping.is_set(),
+            "started": self.started,
+            "heartbeat": self.heartbeat,
+            "auditors": [schedule.to_dict() for schedule in self.schedules],
+        }
+
+    def start_health_server(self):
+        """Serves GET /health (200 or 503) and GET /status (the schedule as JSON)"""
+        if self.health_port is None:
+            return None
+        daemon = self
+
+        class HealthHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") in ("/health", "/healthz"):
+                    healthy = daemon.healthy()
+                    code, body = (200 if healthy else 503), {"status": "ok" if healthy else "unhealthy"}
+                elif self.path.rstrip("/") == "/status":
+                    code, body = 200, daemon.status()
+                else:
+                    code, body = 404, {"error": "not found"}
+                payload = json.dumps(body, default=str).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # probes every few seconds would drown the findings output
+                pass
+
+        self.server = ThreadingHTTPServer((self.health_host, self.health_port), HealthHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="eeauditor-daemon-health", daemon=True).start()
+        print(f"Serving the daemon health on {self.health_host}:{self.server.server_address[1]}")
+        return self.server
+
+    def stop_health_server(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
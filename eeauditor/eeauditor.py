@@ -17,18 +17,46 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+import asyncio
 from functools import partial
 import inspect
 import os
 from time import sleep
 import boto3
-from check_register import CheckRegister, accumulate_paged_results
+import async_engine
+import client_pool
+import rate_limiter
+from check_executor import CheckExecutor, CheckUnit
+from check_register import CheckRegister
+from finding import compact
+from incremental import DEFAULT_MAX_STALENESS, IncrementalCheck
+from planner import DEFAULT_PREFETCH_WORKERS, DataPlanner
+from plugin_manifest import PluginManifest
 from pluginbase import PluginBase
+from region_index import RegionIndex
+from run_cache import RunCache
+import telemetry
+from telemetry import Telemetry
+import timeouts
 
 here = os.path.abspath(os.path.dirname(__file__))
 get_path = partial(os.path.join, here)
-ssm = boto3.client("ssm")
-sts = boto3.client("sts")
+ssm = client_pool.client("ssm")
+sts = client_pool.client("sts")
+# count the API calls, bytes and retries of every Check
+telemetry.install(client_pool.pool)
+# share one adaptive request rate per account, Region and service between every Auditor
+rate_limiter.install(client_pool.pool)
+# cancel Checks that ran out of time at their next API call
+timeouts.install(client_pool.pool)
+
+# Services whose resources are account-wide - in multi-Region mode they are only audited once
+GLOBAL_SERVICES = frozenset(
+    ["cloudfront", "globalaccelerator", "health", "iam", "route53", "shield", "support"]
+)
+# Account-wide Checks of regional services (e.g. S3 buckets are regional, their account-level
+# public access block is not) - in multi-Region mode they are only audited once as well
+GLOBAL_CHECKS = frozenset(["s3_account_level_block"])
 
 class EEAuditor(object):
     """ElectricEye controller
@@ -36,7 +64,7 @@ class EEAuditor(object):
         This class manages loading auditor plugins and running checks
     """
 
-    def __init__(self, name, search_path=None):
+    def __init__(self, name, search_path=None, region=None, region_index=None, session=None):
         if not search_path:
             search_path = "./auditors/aws"
         self.name = name
@@ -44,10 +72,40 @@ class EEAuditor(object):
         # each check must be decorated with the @registry.register_check("cache_name")
         # to be discovered during plugin loading.
         self.registry = CheckRegister()
+        # API responses shared by all Checks, replaced at the start of every run
+        self.run_cache = RunCache()
+        # per-Check performance counters, replaced at the start of every run
+        self.telemetry = Telemetry()
+        # StateStore of incremental mode, None runs every Check against every resource
+        self.state_store = None
+        self.max_staleness = DEFAULT_MAX_STALENESS
+        # FindingDelta that drops findings which did not change since they were last sent, if any
+        self.delta = None
+        # TimeoutPolicy with the time budgets of the Checks and Auditors, if any
+        self.timeouts = None
+        # DataPlanner holding the collections prefetched for this run
+        self.planner = None
+        # RunJournal checkpointing the finished Checks, if any
+        self.journal = None
+        # When bound to a Region (multi-Region mode) or given a Session (e.g. an assumed role in
+        # organization mode) the Auditors are imported with that Session so their module-level
+        # clients point at its Region and account, and their Checks are kept in this instance's
+        # registry instead of the shared one
+        self.session = session
+        if region and not session:
+            # keep the profile selected with --profile-name, if any
+            profile_name = boto3.DEFAULT_SESSION._session.profile if boto3.DEFAULT_SESSION else None
+            self.session = boto3.Session(profile_name=profile_name, region_name=region)
+        if self.session:
+            region = self.session.region_name
+            self.registry.checks = {}
+            self.sts = client_pool.client("sts", session=self.session)
+        else:
+            self.sts = sts
         # vendor specific credentials dictionary
-        self.awsAccountId = sts.get_caller_identity()["Account"]
+        self.awsAccountId = self.sts.get_caller_identity()["Account"]
         # pull Region from STS Meta - we can use this to cheese which partition we are in
-        self.awsRegion = boto3.Session().region_name
+        self.awsRegion = region or boto3.Session().region_name
         # default to Commercial AWS Partition
         self.awsPartition = "aws"
         
@@ -64,94 +122,278 @@ class EEAuditor(object):
         elif self.awsRegion in ["us-iso-east-1"]:
             self.awsPartition = "aws-iso"
 
+        # Service -> Region availability, persisted on disk and refreshed from SSM in the background
+        self.region_index = region_index or RegionIndex(ssm_client=ssm)
+
+        # Auditors and their Checks as found by static analysis, used to only import the
+        # Auditors a run actually needs
+        self.manifest = PluginManifest(get_path(search_path))
+
         # If there is a desire to add support for multiple clouds, this would be
         # a great place to implement it.
         self.source = self.plugin_base.make_plugin_source(
-            searchpath=[get_path(search_path)], identifier=self.name
+            searchpath=[get_path(search_path)],
+            # Session-bound instances import their own copy of every Auditor
+            identifier=None if self.session else self.name,
         )
 
-    def load_plugins(self, plugin_name=None):
+    def load_plugins(self, plugin_name=None, check_name=None):
+        if not self.session:
+            return self._load_plugins(plugin_name, check_name)
+        # module-level client_pool.client() calls capture the default Session, so point it at
+        # this Region while importing. Imports are serialized, the default Session is global.
+        with CheckRegister.collect(self.registry.checks):
+            previous_session = boto3.DEFAULT_SESSION
+            boto3.DEFAULT_SESSION = self.session
+            try:
+                return self._load_plugins(plugin_name, check_name)
+            finally:
+                boto3.DEFAULT_SESSION = previous_session
+
+    def _load_plugins(self, plugin_name=None, check_name=None):
         if plugin_name:
             try:
                 plugin = self.source.load_plugin(plugin_name)
             except Exception as e:
                 print(f"Failed to load plugin {plugin_name} with exception {e}")
         else:
-            for plugin_name in self.source.list_plugins():
+            for plugin_name in self.plugins_to_load(check_name):
                 try:
                     plugin = self.source.load_plugin(plugin_name)
                 except Exception as e:
                     print(f"Failed to load plugin {plugin_name} with exception {e}")
 
+    def plugins_to_load(self, check_name=None):
+        """Uses the manifest to pick the Auditors a run needs without importing any of them
+
+            Only Auditors containing `check_name` (when given) and with at least one service
+            available in this Region are imported.
+        """
+        available_plugins = self.source.list_plugins()
+        plugins = []
+        for plugin_name in available_plugins:
+            if plugin_name not in self.manifest.auditors:
+                # could not be scanned, import it and let the registry decide
+                plugins.append(plugin_name)
+                continue
+            services = self.manifest.services(plugin_name)
+            if check_name and plugin_name not in self.manifest.auditors_for(check_name=check_name):
+                continue
+            if self.awsPartition == "aws" and services and not any(
+                self.region_index.is_available(service, self.awsRegion) for service in services
+            ):
+                continue
+            plugins.append(plugin_name)
+        # a Check the manifest does not know about (e.g. registered dynamically) falls back to every Auditor
+        if check_name and not plugins:
+            return available_plugins
+        return plugins
+
     def get_regions(self, service):
-        # create an empty list for Commercial Region lookups
-        values = []
-        if self.awsPartition == "aws":
-            # only check validity for AWS Commercial Region
-            # Handle the weird v2 services names - global service overrides for lookup
-            if service == 'kinesisanalyticsv2':
-                service = 'kinesisanalytics'
-            elif service == 'macie2':
-                service = 'macie'
-            elif service == 'elbv2':
-                service = 'elb'
-            elif service == 'wafv2':
-                service = 'waf'
-            else:
-                service = service
-            paginator = ssm.get_paginator("get_parameters_by_path")
-            response_iterator = paginator.paginate(
-                Path=f"/aws/service/global-infrastructure/services/{service}/regions",
-                PaginationConfig={"MaxItems": 1000, "PageSize": 10},
-            )
-            results = accumulate_paged_results(
-                page_iterator=response_iterator, key="Parameters")
-            
-            for parameter in results["Parameters"]:
-                values.append(parameter["Value"])
-        else:
+        """Returns the Regions `service` is available in, served from the persistent RegionIndex"""
+        if self.awsPartition != "aws":
             print(f"Your partition is {self.awsPartition} and therfore service endpoint validity cannot be checked which may lead to a lot of Boto3 errors, sorry!")
-            values = values
+            return []
+        return self.region_index.regions(service) or []
 
-        return values
-
-    # called from eeauditor/controller.py run_auditor()
-    def run_checks(self, requested_check_name=None, delay=0):
-        # Gather STS information
-        details = sts.get_caller_identity()
-        awsAccount = str(details["Account"])
-        awsArn = str(details["Arn"])
-        # Print some very basic orientation data
-        print(f"Running ElectricEye in AWS Region {self.awsRegion}.\n Located in Partition {self.awsPartition}.\n Profile AWS Account is {awsAccount}.\n Profile current IAM principal ARN is {awsArn}")
+    def check_units(self, requested_check_name=None, skip_services=(), auditor_names=None):
+        """Returns the CheckUnits to execute, in registry order
 
+            `auditor_names` limits the units to the Checks of these Auditors (file names without .py).
+        """
+        units = []
+        if self.awsPartition == "aws":
+            self.region_index.refresh_in_background(self.registry.checks.keys())
         for service_name, check_list in self.registry.checks.items():
+            if service_name in skip_services:
+                continue
             # only check regions if in AWS Commerical Partition
             if self.awsPartition == "aws":
-                if self.awsRegion not in self.get_regions(service_name):
-                    next
+                if not self.region_index.is_available(service_name, self.awsRegion):
+                    print(f"Skipping {service_name} Checks as the service is not available in {self.awsRegion}")
+                    continue
 
             for check_name, check in check_list.items():
-                # clearing cache for each control whithin a auditor
-                auditor_cache = {}
+                if auditor_names is not None and check.__module__.rpartition(".")[2] not in auditor_names:
+                    continue
                 # if a specific check is requested, only run that one check
                 if (
                     not requested_check_name
                     or requested_check_name
                     and requested_check_name == check_name
                 ):
-                    try:
-                        print(f"Executing Check: {check_name}")
-                        for finding in check(
-                            cache=auditor_cache,
+                    units.append(
+                        CheckUnit(
+                            service_name=service_name,
+                            check_name=check_name,
+                            check=check,
                             awsAccountId=self.awsAccountId,
                             awsRegion=self.awsRegion,
                             awsPartition=self.awsPartition,
-                        ):
-                            yield finding
-                    except Exception as e:
-                        print(f"Failed to execute check {check_name} with exception {e}")
-            # optional sleep if specified - hardcode to 0 seconds
-            sleep(delay)
+                        )
+                    )
+        return units
+
+    def run_unit(self, unit):
+        """Runs a single CheckUnit and yields the findings the outputs need to receive"""
+        reason = self.planner.skip_reason(unit) if self.planner else None
+        if not reason and async_engine.is_async_check(unit.check):
+            reason = "async Checks only run with --engine asyncio"
+        if reason:
+            print(f"Skipping Check {unit.check_name}: {reason}")
+            self.telemetry.skip(unit, reason)
+            return iter(())
+        findings = self.execute_check(unit)
+        if self.delta:
+            findings = self.delta.filter(unit, findings)
+        if self.journal:
+            findings = self.journal.record(unit, findings)
+        return findings
+
+    async def run_unit_async(self, unit, run):
+        """Runs an async CheckUnit on the AsyncEngine, returns the findings the outputs need to receive
+
+            Async Checks are called with `clients` to create aiobotocore clients from and an
+            AsyncCache shared by the async Checks of their Auditor as `cache`.
+        """
+        reason = self.planner.skip_reason(unit) if self.planner else None
+        if reason:
+            print(f"Skipping Check {unit.check_name}: {reason}")
+            self.telemetry.skip(unit, reason)
+            return []
+        check_key = (unit.check.__module__, unit.check_name)
+        deadline = self.timeouts.deadline(unit) if self.timeouts else None
+        findings = []
+        timed_out = None
+        print(f"Executing Check: {unit.check_name}")
+        with self.telemetry.track(unit) as stats:
+            token = async_engine.current_stats.set(stats)
+            try:
+                result = unit.check(
+                    cache=run.cache((unit.check.__module__, unit.awsAccountId, unit.awsRegion)),
+                    awsAccountId=unit.awsAccountId,
+                    awsRegion=unit.awsRegion,
+                    awsPartition=unit.awsPartition,
+                    clients=run.bind(unit.awsRegion),
+                )
+                try:
+                    await asyncio.wait_for(async_engine.collect(result, findings), deadline.remaining() if deadline else None)
+                except asyncio.TimeoutError:
+                    timed_out = timeouts.CheckTimeout(f"{unit.check_name} ran out of time")
+                    stats.timed_out = True
+                    stats.exception = f"CheckTimeout: {timed_out}"
+            finally:
+                async_engine.current_stats.reset(token)
+            stats.findings = len(findings)
+
+        findings = [compact(finding, check_key) for finding in findings]
+        if timed_out:
+            # the findings so far are kept, but an unfinished Check neither archives findings
+            # nor counts as finished
+            print(f"Cancelled check {unit.check_name}, {timed_out}")
+            return findings
+        if self.delta:
+            findings = self.delta.filter(unit, findings)
+        if self.journal:
+            findings = self.journal.record(unit, findings)
+        return list(findings)
+
+    def execute_check(self, unit):
+        """Runs a single CheckUnit and yields its findings"""
+        # every Check of an Auditor shares the run-scoped cache, so helpers such as
+        # describe_db_instances(cache) only hit the API once per run
+        incremental = None
+        if self.state_store:
+            incremental = IncrementalCheck(self.state_store, unit, max_staleness=self.max_staleness)
+        auditor_cache = self.run_cache.view(
+            (unit.check.__module__, unit.awsAccountId, unit.awsRegion),
+            incremental=incremental,
+        )
+        check_key = (unit.check.__module__, unit.check_name)
+        print(f"Executing Check: {unit.check_name}")
+        with self.telemetry.track(unit) as stats:
+            try:
+                with stats.active():
+                    findings = iter(
+                        unit.check(
+                            cache=auditor_cache,
+                            awsAccountId=unit.awsAccountId,
+                            awsRegion=unit.awsRegion,
+                            awsPartition=unit.awsPartition,
+                        )
+                    )
+
+                def step():
+                    # only the Check's own work is attributed to it, not the time spent
+                    # waiting on whoever consumes its findings
+                    with stats.active():
+                        return next(findings, StopIteration)
+
+                # a Check that runs out of time raises CheckTimeout, the findings it yielded
+                # so far are kept
+                deadline = self.timeouts.deadline(unit) if self.timeouts else None
+                for finding in timeouts.bounded(step, deadline):
+                    stats.findings += 1
+                    # share the constant parts (Remediation, RelatedRequirements...) between the
+                    # findings of the Check instead of keeping a copy per resource
+                    finding = compact(finding, check_key)
+                    if incremental:
+                        incremental.record(finding)
+                    yield finding
+            finally:
+                auditor_cache.release()
+
+            if incremental:
+                incremental.commit()
+                if incremental.reused:
+                    print(f"Reusing the findings of {len(incremental.reused)} unchanged resources for Check: {unit.check_name}")
+                for finding in incremental.reused_findings():
+                    stats.findings += 1
+                    yield compact(finding, check_key)
+
+    # called from eeauditor/controller.py run_auditor()
+    def run_checks(self, requested_check_name=None, delay=0, workers=1, service_concurrency=None, run_telemetry=None, state_store=None, max_staleness=DEFAULT_MAX_STALENESS, delta=None, check_timeouts=None, auditor_names=None, shard=None, journal=None, engine=None):
+        # Print some very basic orientation data
+        self.print_orientation()
+        self.telemetry = run_telemetry or Telemetry()
+        # incremental mode when given a StateStore
+        self.state_store = state_store
+        self.max_staleness = max_staleness
+        self.delta = delta
+        self.timeouts = check_timeouts
+        self.journal = journal
+
+        # workers=1 keeps the legacy one-check-at-a-time behavior, more workers run Checks on a
+        # thread pool with at most `service_concurrency` Checks of the same service at once
+        self.run_cache = RunCache()
+        executor = CheckExecutor(
+            workers=workers,
+            service_concurrency=service_concurrency,
+            delay=delay,
+        )
+        units = self.check_units(requested_check_name, auditor_names=auditor_names)
+        if shard:
+            units = shard.select(units)
+        if journal:
+            units = journal.pending(units)
+        # load every collection the Checks declared with requires= in parallel up front
+        self.planner = DataPlanner(self.run_cache, workers=max(workers, DEFAULT_PREFETCH_WORKERS))
+        self.planner.prefetch(units)
+        # an AsyncEngine runs async Checks on an event loop and the others on its threads
+        if engine:
+            findings = engine.run(units, self.run_unit, self.run_unit_async)
+        else:
+            findings = executor.run(units, self.run_unit)
+        for finding in findings:
+            yield finding
+
+        stats = self.run_cache.stats()
+        print(f"Run cache served {stats['hits']} hits and {stats['misses']} misses, {stats['deduplicated']} concurrent requests were shared")
+        print_rate_limiter_stats()
+
+    def print_orientation(self):
+        details = self.sts.get_caller_identity()
+        print(f"Running ElectricEye in AWS Region {self.awsRegion}.\n Located in Partition {self.awsPartition}.\n Profile AWS Account is {details['Account']}.\n Profile current IAM principal ARN is {details['Arn']}")
 
     # called from eeauditor/controller.py print_checks()
     def print_checks_md(self):
@@ -173,4 +415,84 @@ class EEAuditor(object):
                 table.append(
                     f"|{inspect.getfile(check).rpartition('/')[2]} | {service_name} | {description}"
                 )
-        print("\n".join(table))
\ No newline at end of file
+        print("\n".join(table))
+
+
+def print_rate_limiter_stats():
+    stats = rate_limiter.limiter.stats()
+    print(f"Rate limiter delayed {stats['delayed']} requests for {stats['waited']} seconds, AWS throttled {stats['throttles']} requests")
+
+
+def enabled_regions():
+    """Returns every Region enabled for the current account"""
+    ec2 = client_pool.client("ec2")
+    return sorted(region["RegionName"] for region in ec2.describe_regions()["Regions"])
+
+
+# called from eeauditor/controller.py run_auditor() when auditing several Regions
+def run_multi_region_checks(auditors, requested_check_name=None, delay=0, workers=1, service_concurrency=None, run_telemetry=None, state_store=None, max_staleness=DEFAULT_MAX_STALENESS, delta=None, check_timeouts=None, auditor_names=None, shard=None, journal=None, engine=None):
+    """Runs the Checks of several Region-bound EEAuditors as a single stream of findings
+
+        Global services are only audited once, by the Auditor of the home Region (the
+        default Session's Region if audited, otherwise us-east-1 if audited, otherwise the
+        first one). All Regions share one RunCache and one executor, so their Checks run in
+        parallel under the same worker and per-service limits.
+    """
+    if not auditors:
+        return
+    regions = [app.awsRegion for app in auditors]
+    home_region = boto3.Session().region_name
+    if home_region not in regions:
+        home_region = "us-east-1" if "us-east-1" in regions else regions[0]
+
+    print(f"Running ElectricEye in {len(regions)} AWS Regions: {', '.join(regions)}. Global services run in {home_region}")
+    run_cache = RunCache()
+    run_telemetry = run_telemetry or Telemetry()
+    by_region = {}
+    units = []
+    for app in auditors:
+        app.run_cache = run_cache
+        app.telemetry = run_telemetry
+        app.state_store = state_store
+        app.max_staleness = max_staleness
+        app.delta = delta
+        app.timeouts = check_timeouts
+        app.journal = journal
+        by_region[app.awsRegion] = app
+        skip_services = () if app.awsRegion == home_region else GLOBAL_SERVICES
+        region_units = app.check_units(requested_check_name, skip_services=skip_services)
+        if app.awsRegion != home_region:
+            region_units = [unit for unit in region_units if unit.check_name not in GLOBAL_CHECKS]
+        if auditor_names is not None:
+            region_units = [unit for unit in region_units if unit.check.__module__.rpartition(".")[2] in auditor_names]
+        units.extend(region_units)
+    if shard:
+        # balanced over the Checks of every Region at once
+        units = shard.select(units)
+    if journal:
+        units = journal.pending(units)
+
+    planner = DataPlanner(run_cache, workers=max(workers, DEFAULT_PREFETCH_WORKERS))
+    for app in auditors:
+        app.planner = planner
+    planner.prefetch(units)
+
+    executor = CheckExecutor(
+        workers=workers if workers > 1 else len(auditors),
+        service_concurrency=service_concurrency,
+        delay=delay,
+    )
+    if engine:
+        findings = engine.run(
+            units,
+            lambda unit: by_region[unit.awsRegion].run_unit(unit),
+            lambda unit, run: by_region[unit.awsRegion].run_unit_async(unit, run),
+        )
+    else:
+        findings = executor.run(units, lambda unit: by_region[unit.awsRegion].run_unit(unit))
+    for finding in findings:
+        yield finding
+
+    stats = run_cache.stats()
+    print(f"Run cache served {stats['hits']} hits and {stats['misses']} misses, {stats['deduplicated']} concurrent requests were shared")
+    print_rate_limiter_stats()
@@ -0,0 +1,376 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+import gzip
+import json
+from queue import Empty, Queue
+import re
+import sys
+import threading
+import time
+import client_pool
+
+# seconds change events are collected before their Checks run, a burst of changes becomes one run
+DEFAULT_EVENT_WINDOW = 5
+# events evaluated together at most
+MAX_BATCH_EVENTS = 1000
+# seconds of SQS long polling per ReceiveMessage call
+SQS_WAIT_TIME = 20
+# seconds between two looks at the stop flag while waiting for events
+POLL_INTERVAL = 1
+
+# CloudTrail eventSource prefixes whose Checks are registered under other service names
+EVENT_SOURCE_SERVICES = {
+    "access-analyzer": ("accessanalyzer",),
+    "airflow": ("mwaa",),
+    "elasticfilesystem": ("efs",),
+    "elasticloadbalancing": ("elbv2", "elb"),
+    "kinesisanalytics": ("kinesisanalyticsv2",),
+    "rds": ("rds", "neptune", "docdb"),
+}
+
+# event sources shared by several Auditors, the first pattern matching the eventName picks the
+# Auditors. Events of these sources matching no pattern (e.g. CreateTags) are ignored.
+EVENT_AUDITORS = {
+    "ec2": [
+        (re.compile(r"SecurityGroup"), ("Amazon_EC2_Security_Group_Auditor",)),
+        (re.compile(r"Volume|Snapshot|EbsEncryption|EbsDefaultKmsKey"), ("Amazon_EBS_Auditor",)),
+        (re.compile(r"Image"), ("AMI_Auditor",)),
+        (re.compile(r"Vpc|Subnet|FlowLogs|NetworkAcl|RouteTable|InternetGateway|NatGateway"), ("Amazon_VPC_Auditor",)),
+        (re.compile(r"Instance|IamInstanceProfile"), ("Amazon_EC2_Auditor", "Amazon_EC2_SSM_Auditor")),
+    ],
+}
+
+# requestParameters / responseElements keys naming the resource a change event is about
+RESOURCE_KEYS = frozenset(
+    [
+        "bucketName",
+        "certificateArn",
+        "clusterName",
+        "dBClusterIdentifier",
+        "dBInstanceIdentifier",
+        "distributionId",
+        "domainName",
+        "fileSystemId",
+        "functionName",
+        "groupId",
+        "imageId",
+        "instanceId",
+        "keyId",
+        "loadBalancerArn",
+        "loadBalancerName",
+        "networkAclId",
+        "policyArn",
+        "queueUrl",
+        "repositoryName",
+        "roleName",
+        "secretId",
+        "snapshotId",
+        "streamName",
+        "subnetId",
+        "tableName",
+        "topicArn",
+        "userName",
+        "volumeId",
+        "vpcId",
+    ]
+)
+
+# change events removing their resource, EC2 rejects describe calls naming an ID that no longer exists
+DELETE_EVENT_PREFIXES = ("Delete", "Deregister")
+
+# EC2 describe parameters narrowed to the changed resources, by the prefix of their IDs
+EC2_ID_FILTERS = {
+    "GroupIds": "sg-",
+    "ImageIds": "ami-",
+    "InstanceIds": "i-",
+    "NetworkAclIds": "acl-",
+    "SnapshotIds": "snap-",
+    "SubnetIds": "subnet-",
+    "VolumeIds": "vol-",
+    "VpcIds": "vpc-",
+}
+
+# one change to evaluate: which Auditors it affects and the resources it changed (None when
+# the change is account-wide, e.g. an account password policy), `deleted` if it removed them
+ChangeEvent = namedtuple(
+    "ChangeEvent",
+    ["event_id", "event_name", "account", "region", "auditors", "resource_ids", "deleted"],
+    defaults=(False,),
+)
+
+# one run of the Checks of `auditors` in `regions`, limited to `resource_ids` unless None.
+# `deleted_ids` are the resource_ids that no longer exist.
+EventRun = namedtuple("EventRun", ["auditors", "resource_ids", "regions", "deleted_ids"], defaults=((),))
+
+# resources the run in progress is limited to, see scoped()
+_scope = None
+
+_END = object()
+
+
+def records_from(document):
+    """Yields the CloudTrail records of an EventBridge event, an SQS or SNS message, a CloudTrail
+    log file or a bare record, given as a dict, a list or a JSON string"""
+    if isinstance(document, (str, bytes)):
+        try:
+            document = json.loads(document)
+        except ValueError:
+            return
+    if isinstance(document, list):
+        for item in document:
+            yield from records_from(item)
+        return
+    if not isinstance(document, dict):
+        return
+    if "eventSource" in document and "eventName" in document:
+        yield document
+    elif "detail" in document:
+        # EventBridge, "AWS API Call via CloudTrail"
+        yield from records_from(document["detail"])
+    elif "Records" in document:
+        # CloudTrail log file, or SQS messages handed over by Lambda
+        yield from records_from(document["Records"])
+    elif "Message" in document:
+        yield from records_from(document["Message"])
+    elif "body" in document or "Body" in document:
+        yield from records_from(document.get("body", document.get("Body")))
+
+
+def resource_ids(record):
+    """Returns the IDs, names and ARNs of the resources a CloudTrail record changed"""
+    ids = set()
+
+    def walk(value, depth):
+        if depth > 8:
+            return
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in RESOURCE_KEYS and isinstance(item, str) and item:
+                    # SQS queues are known by their URL, the findings use the queue name
+                    ids.add(item.rstrip("/").rpartition("/")[2] if item.startswith("https://") else item)
+                else:
+                    walk(item, depth + 1)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, depth + 1)
+
+    walk(record.get("requestParameters"), 0)
+    walk(record.get("responseElements"), 0)
+    for resource in record.get("resources") or []:
+        arn = resource.get("ARN") if isinstance(resource, dict) else resource
+        if isinstance(arn, str) and arn:
+            ids.add(arn)
+    return sorted(ids)
+
+
+def auditors_for(record, manifest):
+    """Returns the Auditors whose Checks a CloudTrail record can change the outcome of"""
+    source = record.get("eventSource", "").split(".")[0]
+    event_name = record.get("eventName", "")
+    if source in EVENT_AUDITORS:
+        for pattern, auditors in EVENT_AUDITORS[source]:
+            if pattern.search(event_name):
+                return [auditor for auditor in auditors if auditor in manifest.auditors]
+        return []
+    services = set(EVENT_SOURCE_SERVICES.get(source, (source,)))
+    return manifest.auditors_for(services=services)
+
+
+def change_from(record, manifest):
+    """Turns a CloudTrail record into a ChangeEvent, or None if it changed nothing ElectricEye checks"""
+    if record.get("readOnly") or record.get("errorCode"):
+        return None
+    event_name = record.get("eventName", "")
+    if event_name.startswith(("Describe", "List", "Get")):
+        return None
+    auditors = auditors_for(record, manifest)
+    if not auditors:
+        return None
+    return ChangeEvent(
+        event_id=record.get("eventID"),
+        event_name=event_name,
+        account=record.get("recipientAccountId") or record.get("userIdentity", {}).get("accountId"),
+        region=record.get("awsRegion"),
+        auditors=tuple(auditors),
+        resource_ids=tuple(resource_ids(record)) or None,
+        deleted=event_name.startswith(DELETE_EVENT_PREFIXES),
+    )
+
+
+def plan_runs(changes, auditor_names=None):
+    """Coalesces ChangeEvents into at most two EventRuns
+
+        Auditors with an account-wide change run unscoped, every other Auditor runs once
+        limited to the union of the resources changed.
+    """
+    unscoped = set()
+    scoped = set()
+    ids = set()
+    deleted = set()
+    regions = set()
+    for change in changes:
+        auditors = {a for a in change.auditors if auditor_names is None or a in auditor_names}
+        if not auditors:
+            continue
+        regions.add(change.region)
+        if change.resource_ids is None:
+            unscoped.update(auditors)
+        else:
+            scoped.update(auditors)
+            ids.update(change.resource_ids)
+            if change.deleted:
+                deleted.update(change.resource_ids)
+    runs = []
+    if unscoped:
+        runs.append(EventRun(sorted(unscoped), None, sorted(regions)))
+    if scoped - unscoped:
+        runs.append(EventRun(sorted(scoped - unscoped), sorted(ids), sorted(regions), tuple(sorted(deleted))))
+    return runs
+
+
+def in_scope(finding, ids):
+    """True if one of the Resources of the finding is one of `ids` (an ID, name or ARN)"""
+    for resource in finding.get("Resources") or ():
+        resource_id = resource.get("Id", "")
+        for changed in ids:
+            if resource_id == changed or resource_id.endswith(("/" + changed, ":" + changed)):
+                return True
+    return False
+
+
+@contextmanager
+def scoped(ids, deleted=()):
+    """Narrows the EC2 describe calls made inside the block to `ids`
+
+        The `deleted` IDs are left out, EC2 fails the whole call for an ID that no longer
+        exists. With only deleted IDs of a kind the call is not narrowed, its findings are
+        still limited to `ids` with in_scope().
+    """
+    global _scope
+    previous = _scope
+    _scope = (frozenset(ids or ()) - frozenset(deleted)) or None
+    try:
+        yield
+    finally:
+        _scope = previous
+
+
+def on_before_parameter_build(params, model, **kwargs):
+    scope = _scope
+    if not scope or "NextToken" in params or model.input_shape is None:
+        return
+    members = model.input_shape.members
+    for name, prefix in EC2_ID_FILTERS.items():
+        if name not in members or name in params:
+            continue
+        ids = sorted(i for i in scope if i.startswith(prefix))
+        if ids:
+            params[name] = ids
+            # EC2 rejects MaxResults together with a list of IDs
+            params.pop("MaxResults", None)
+
+
+def install(pool):
+    """Registers the scope of event runs on every client of the pool"""
+    pool.register("before-parameter-build.ec2.*", on_before_parameter_build, unique_id="eeauditor-events-scope")
+
+
+def read_file(path):
+    """Yields (record, None) from an NDJSON file of events or "-" for stdin, or from a (gzipped)
+    CloudTrail log file ending in .json or .json.gz"""
+    if path.endswith((".json", ".json.gz")):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt") as f:
+            for record in records_from(f.read()):
+                yield record, None
+        return
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            for record in records_from(line):
+                yield record, None
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def read_queue(queue_url, stopping, sqs=None, wait_time=SQS_WAIT_TIME):
+    """Yields (record, ack) from an SQS queue fed by an EventBridge rule, until `stopping` is set
+
+        Calling ack() deletes the message, which is only done once the run evaluating its
+        last record succeeded so failed runs are retried after the visibility timeout.
+    """
+    if sqs is None:
+        region = queue_url.split("//", 1)[-1].split(".")[1] if queue_url.startswith("https://sqs.") else None
+        sqs = client_pool.client("sqs", region_name=region)
+    while not stopping.is_set():
+        response = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10, WaitTimeSeconds=wait_time)
+        for message in response.get("Messages", []):
+            ack = partial(sqs.delete_message, QueueUrl=queue_url, ReceiptHandle=message["ReceiptHandle"])
+            records = list(records_from(message["Body"]))
+            if not records:
+                print(f"Deleting SQS message {message.get('MessageId')}, it holds no CloudTrail event")
+                ack()
+                continue
+            for index, record in enumerate(records):
+                yield record, ack if index == len(records) - 1 else None
+
+
+def windows(items, window=DEFAULT_EVENT_WINDOW, stopping=None, max_events=MAX_BATCH_EVENTS):
+    """Groups the (record, ack) items of a source into lists, each collected for at most `window` seconds"""
+    queue = Queue(maxsize=max_events)
+
+    def read():
+        try:
+            for item in items:
+                queue.put(item)
+        except Exception as e:
+            print(f"Failed to read change events with exception {e}")
+        finally:
+            queue.put(_END)
+
+    threading.Thread(target=read, name="eeauditor-events-reader", daemon=True).start()
+    while True:
+        try:
+            item = queue.get(timeout=POLL_INTERVAL)
+        except Empty:
+            if stopping is not None and stopping.is_set():
+                return
+            continue
+        if item is _END:
+            return
+        batch = [item]
+        deadline = time.monotonic() + window
+        while len(batch) < max_events:
+            try:
+                item = queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except Empty:
+                break
+            if item is _END:
+                yield batch
+                return
+            batch.append(item)
+        yield batch
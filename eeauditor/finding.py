@@ -0,0 +1,150 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from collections.abc import Mapping
+import threading
+
+# distinct values kept per key of a template, e.g. the PASSED and FAILED variants of Severity
+MAX_VARIANTS = 8
+# keys that differ for every resource, never worth interning
+PER_RESOURCE_KEYS = frozenset(["Id", "Description", "Resources", "Note", "UserDefinedFields"])
+
+
+class FindingTemplate(object):
+    """The keys and the interned constant values shared by the findings of one Check
+
+        Values such as Remediation, ProductFields or Compliance.RelatedRequirements are equal
+        for every finding of a Check. The first few distinct values seen for each key are kept
+        and every equal value of a later finding is replaced by the kept one, so the copy the
+        Check built can be freed. Interned values are shared, they must never be mutated.
+    """
+
+    __slots__ = ("keys", "index", "defaults", "_variants", "_lock")
+
+    def __init__(self, keys, defaults=None):
+        self.keys = tuple(keys)
+        self.index = {key: position for position, key in enumerate(self.keys)}
+        self._variants = {}
+        self._lock = threading.Lock()
+        self.defaults = {key: self.intern(key, value) for key, value in (defaults or {}).items()}
+
+    def __reduce__(self):
+        # the interned variants are rebuilt on the other side, e.g. in the parent of organization mode
+        return (FindingTemplate, (self.keys, self.defaults))
+
+    def intern(self, path, value):
+        """Returns the kept value equal to `value`, keeping `value` if there is room for it"""
+        if isinstance(path, str) and path in PER_RESOURCE_KEYS:
+            return value
+        variants = self._variants.get(path, ())
+        for variant in variants:
+            if variant == value:
+                return variant
+        if isinstance(value, dict):
+            # e.g. Compliance, only its RelatedRequirements are constant
+            value = {key: self.intern((path, key), item) for key, item in value.items()}
+        elif not isinstance(value, (str, list, tuple, int, float)):
+            return value
+        if len(variants) < MAX_VARIANTS:
+            with self._lock:
+                self._variants.setdefault(path, []).append(value)
+        return value
+
+    def finding(self, **fields):
+        """Builds a Finding from the per-resource fields, the defaults fill in everything else
+
+            For Checks written against a template, e.g.
+            yield template.finding(Id=..., Resources=[...], Compliance={"Status": "PASSED", ...})
+        """
+        unknown = set(fields) - set(self.index)
+        if unknown:
+            raise KeyError(f"{', '.join(sorted(unknown))} not in the template")
+        return Finding(
+            self,
+            tuple(self.intern(key, fields[key]) if key in fields else self.defaults.get(key) for key in self.keys),
+        )
+
+
+class Finding(Mapping):
+    """One ASFF finding stored as a tuple of values aligned to the keys of its FindingTemplate
+
+        Reads like a read-only dict. Outputs get a plain dict from to_asff() (see asff()).
+    """
+
+    __slots__ = ("template", "values")
+
+    def __init__(self, template, values):
+        self.template = template
+        self.values = values
+
+    def __getitem__(self, key):
+        position = self.template.index.get(key)
+        if position is None:
+            raise KeyError(key)
+        return self.values[position]
+
+    def __iter__(self):
+        return iter(self.template.keys)
+
+    def __len__(self):
+        return len(self.template.keys)
+
+    def __repr__(self):
+        return f"Finding({self.to_asff()!r})"
+
+    def __reduce__(self):
+        return (Finding, (self.template, self.values))
+
+    def to_asff(self):
+        """Returns the finding as a dict, nested values are the shared interned objects"""
+        return dict(zip(self.template.keys, self.values))
+
+
+# (Check, keys) -> FindingTemplate, shared by every Region and account the Check runs in
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def template_for(check_key, keys):
+    key = (check_key, keys)
+    template = _templates.get(key)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is None:
+                template = _templates[key] = FindingTemplate(keys)
+    return template
+
+
+def compact(finding, check_key):
+    """Turns a finding dict yielded by a Check into a Finding sharing the constant parts
+
+        This is the adapter for Checks that build a whole ASFF dict per resource.
+    """
+    if not isinstance(finding, dict):
+        return finding
+    template = template_for(check_key, tuple(finding))
+    return Finding(template, tuple(template.intern(key, value) for key, value in finding.items()))
+
+
+def asff(finding):
+    """Returns the plain ASFF dict outputs write, for Findings and dicts alike"""
+    if isinstance(finding, Finding):
+        return finding.to_asff()
+    return finding
@@ -0,0 +1,157 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from finding import asff
+
+# unchanged findings are still sent once they were last sent this long ago (seconds), so
+# Security Hub never ages them out. Defaults to 7 days.
+DEFAULT_RESEND_AFTER = int(os.environ.get("ELECTRICEYE_RESEND_AFTER", 7 * 24 * 60 * 60))
+
+
+def material_digest(finding):
+    """sha256 of the fields whose change must reach the outputs"""
+    material = {
+        "Compliance": (finding.get("Compliance") or {}).get("Status"),
+        "Severity": (finding.get("Severity") or {}).get("Label"),
+        "RecordState": finding.get("RecordState"),
+        "Resources": finding.get("Resources"),
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class FindingDelta(object):
+    """Forwards only new, changed or disappeared findings, per Check execution
+
+        Every Check execution is compared with the digests of the findings last sent for the
+        same Check, account and Region. Findings with the same digest are dropped, findings
+        that are no longer emitted are sent once more as ARCHIVED. Only Checks that finish
+        without an exception archive anything.
+
+        What was sent is staged in the StateStore under this run's ID and only becomes the
+        reference for the next run on commit(), i.e. once the outputs accepted the findings,
+        so a failed run never hides findings from the next one. Organization mode workers
+        stage under the `run_id` of the parent, which commits once its outputs are done.
+    """
+
+    def __init__(self, store, full_resync=False, resend_after=DEFAULT_RESEND_AFTER, run_id=None):
+        self.store = store
+        self.full_resync = full_resync
+        self.resend_after = resend_after
+        self.run_id = run_id or uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self.forwarded = 0
+        self.unchanged = 0
+        self.archived = 0
+
+    def filter(self, unit, findings):
+        """Wraps the findings of one CheckUnit, yielding what the outputs need to receive"""
+        scope = (unit.awsAccountId, unit.awsRegion, unit.check_name)
+        previous = self.store.load_findings(*scope)
+        now = time.time()
+        seen = set()
+        staged = []
+        unchanged = 0
+        sent = 0
+        for finding in findings:
+            finding_id = finding.get("Id")
+            digest = material_digest(finding)
+            seen.add(finding_id)
+            last = previous.get(finding_id)
+            if (
+                not self.full_resync
+                and last
+                and last[0] == digest
+                and now - last[1] < self.resend_after
+            ):
+                unchanged += 1
+                continue
+            staged.append(self._staged(scope, finding_id, digest, finding, now, archived=False))
+            sent += 1
+            yield finding
+
+        # only reached when the Check completed, a failed Check never archives anything
+        archived = 0
+        for finding_id in set(previous) - seen:
+            finding = self.store.load_finding(*scope, finding_id)
+            if finding is None:
+                continue
+            # a finding archived by an earlier run is not sent (or counted) again
+            if finding.get("RecordState") != "ARCHIVED":
+                finding["RecordState"] = "ARCHIVED"
+                finding["UpdatedAt"] = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+                archived += 1
+                sent += 1
+                yield finding
+            staged.append(self._staged(scope, finding_id, "", finding, now, archived=True))
+
+        self.store.transaction(
+            [
+                (
+                    "INSERT OR REPLACE INTO finding_pending (run_id, account, region, check_name, finding_id, digest, finding, sent_at, archived) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    staged,
+                )
+            ]
+        )
+        with self._lock:
+            self.forwarded += sent
+            self.unchanged += unchanged
+            self.archived += archived
+
+    def _staged(self, scope, finding_id, digest, finding, now, archived):
+        return (self.run_id,) + scope + (finding_id, digest, json.dumps(asff(finding), default=str), now, int(archived))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "forwarded": self.forwarded,
+                "unchanged": self.unchanged,
+                "archived": self.archived,
+            }
+
+    def commit(self):
+        """Makes what this run sent the reference for the next run, call once the outputs are done"""
+        self.store.transaction(
+            [
+                (
+                    "DELETE FROM finding_state WHERE (account, region, check_name, finding_id) IN "
+                    "(SELECT account, region, check_name, finding_id FROM finding_pending WHERE run_id = ? AND archived = 1)",
+                    (self.run_id,),
+                ),
+                (
+                    "INSERT OR REPLACE INTO finding_state (account, region, check_name, finding_id, digest, finding, sent_at) "
+                    "SELECT account, region, check_name, finding_id, digest, finding, sent_at FROM finding_pending WHERE run_id = ? AND archived = 0",
+                    (self.run_id,),
+                ),
+                ("DELETE FROM finding_pending WHERE run_id = ?", (self.run_id,)),
+            ]
+        )
+
+    def discard(self, account=None):
+        """Forgets what this run staged (for `account` only if given), e.g. when the outputs failed"""
+        if account:
+            self.store.transaction([("DELETE FROM finding_pending WHERE run_id = ? AND account = ?", (self.run_id, account))])
+        else:
+            self.store.transaction([("DELETE FROM finding_pending WHERE run_id = ?", (self.run_id,))])
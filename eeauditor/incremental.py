@@ -0,0 +1,181 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+import hashlib
+import json
+import os
+import time
+from finding import asff
+
+# cached findings older than this (seconds) are never reused, the resource is evaluated again.
+# Checks also look at data outside of the fingerprinted describe payload (policies, tags...),
+# this bounds how long a change there can go unnoticed. Defaults to 24 hours.
+DEFAULT_MAX_STALENESS = int(os.environ.get("ELECTRICEYE_MAX_STALENESS", 24 * 60 * 60))
+# identifiers shorter than this are too generic to tie a finding to a resource
+MIN_IDENTIFIER_LENGTH = 6
+
+
+def fingerprint(item):
+    """sha256 of a describe payload, stable across runs and key order"""
+    return hashlib.sha256(json.dumps(item, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def identifiers(item, found=None):
+    """Every string value of a describe payload long enough to identify the resource"""
+    found = set() if found is None else found
+    if isinstance(item, dict):
+        for value in item.values():
+            identifiers(value, found)
+    elif isinstance(item, list):
+        for value in item:
+            identifiers(value, found)
+    elif isinstance(item, str) and len(item) >= MIN_IDENTIFIER_LENGTH:
+        found.add(item)
+    return found
+
+
+def candidate_identifiers(resource_id):
+    """The values a describe payload may hold for a finding's resource
+
+        e.g. arn:aws:ec2:...:instance/i-0123 is found by its InstanceId i-0123
+    """
+    candidates = {resource_id}
+    for separator in ("/", ":"):
+        head, _, tail = resource_id.rpartition(separator)
+        if head and len(tail) >= MIN_IDENTIFIER_LENGTH:
+            candidates.add(tail)
+    return candidates
+
+
+def resource_id(finding):
+    try:
+        return finding["Resources"][0]["Id"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+class IncrementalCheck(object):
+    """Lets one Check execution skip the resources it evaluated before and that did not change
+
+        Checks read their resources through `cache` helpers (cache["describe_db_instances"]).
+        Every list of describe payloads read through the Check's AuditorCache goes through
+        filter(): a payload whose fingerprint matches the one stored with the Check's findings
+        for that resource is removed from the list the Check sees, and those stored findings
+        are re-emitted by reused_findings() instead. The Check itself is unchanged, it simply
+        iterates over fewer resources.
+
+        A Check only qualifies after a full run in which every one of its findings could be
+        tied to exactly one payload it read. Checks with account-level findings, or that read
+        their resources without `cache`, therefore always run in full. At least one payload of
+        every list is always kept so "no resources" findings are never emitted by mistake.
+    """
+
+    def __init__(self, store, unit, max_staleness=DEFAULT_MAX_STALENESS, now=None):
+        self.store = store
+        self.key = (unit.awsAccountId, unit.awsRegion, unit.check_name)
+        self.now = now or time.time()
+        eligible, self.previous = store.load_check(*self.key)
+        # fingerprint -> [(resource_arn, findings, evaluated_at)] of findings that may be reused
+        self.reusable = {}
+        if eligible:
+            for arn, (digest, findings, evaluated_at) in self.previous.items():
+                if self.now - evaluated_at <= max_staleness:
+                    self.reusable.setdefault(digest, []).append((arn, findings, evaluated_at))
+        # fingerprint -> identifiers of the payloads handed to the Check
+        self.evaluated = {}
+        # fingerprint -> entries of self.reusable that were skipped
+        self.reused = {}
+        self.findings = []
+
+    def _filter_items(self, items):
+        if not items or not all(isinstance(item, dict) for item in items):
+            return items
+        kept = []
+        for item in items:
+            digest = fingerprint(item)
+            if digest in self.reusable and digest not in self.evaluated:
+                self.reused[digest] = self.reusable[digest]
+                continue
+            self.evaluated[digest] = identifiers(item)
+            kept.append(item)
+        if not kept:
+            # keep the first one, see the class docstring
+            digest = fingerprint(items[0])
+            self.reused.pop(digest, None)
+            self.evaluated[digest] = identifiers(items[0])
+            kept.append(items[0])
+        return kept
+
+    def filter(self, value):
+        """Returns `value` (a cached list or API response) without the unchanged payloads"""
+        if isinstance(value, list):
+            return self._filter_items(value)
+        if isinstance(value, dict):
+            filtered = dict(value)
+            for key, items in value.items():
+                if key != "ResponseMetadata" and isinstance(items, list):
+                    filtered[key] = self._filter_items(items)
+            return filtered
+        return value
+
+    def record(self, finding):
+        self.findings.append(finding)
+
+    def reused_findings(self):
+        """Yields the stored findings of every skipped resource with a refreshed UpdatedAt"""
+        updated_at = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+        for entries in self.reused.values():
+            for _, findings, _ in entries:
+                for finding in findings:
+                    finding = dict(finding)
+                    finding["UpdatedAt"] = updated_at
+                    yield finding
+
+    def commit(self):
+        """Stores the fingerprints and findings of this execution for the next run"""
+        index = {}
+        for digest, ids in self.evaluated.items():
+            for identifier in ids:
+                index.setdefault(identifier, set()).add(digest)
+        resources = {}
+        eligible = True
+        for finding in self.findings:
+            arn = resource_id(finding)
+            matches = set()
+            for identifier in candidate_identifiers(arn) if arn else ():
+                matches.update(index.get(identifier, ()))
+            if len(matches) != 1:
+                eligible = False
+                break
+            digest = matches.pop()
+            previous_digest, findings, _ = resources.setdefault(arn, (digest, [], self.now))
+            if previous_digest != digest:
+                eligible = False
+                break
+            findings.append(asff(finding))
+        if not eligible:
+            self.store.save_check(*self.key, eligible=False, resources={})
+            return False
+        # skipped resources keep the time they were really evaluated, see DEFAULT_MAX_STALENESS
+        for entries in self.reused.values():
+            for arn, findings, evaluated_at in entries:
+                resources.setdefault(arn, (self.previous[arn][0], findings, evaluated_at))
+        self.store.save_check(*self.key, eligible=True, resources=resources)
+        return True
@@ -0,0 +1,157 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import os
+import threading
+from finding import asff
+
+# where the checkpoint journal of the current run is written
+DEFAULT_JOURNAL_PATH = os.environ.get(
+    "ELECTRICEYE_JOURNAL_PATH",
+    os.path.join(os.path.expanduser("~"), ".electriceye", "journal.jsonl"),
+)
+
+
+def unit_key(unit):
+    """(Auditor, Check, Region, account) of a CheckUnit, what the journal checkpoints"""
+    return (unit.check.__module__.rpartition(".")[2], unit.check_name, unit.awsRegion, unit.awsAccountId)
+
+
+class RunJournal(object):
+    """Append-only checkpoint of the Checks a run finished and the findings they sent
+
+        Every process working on a run appends a session line with the run configuration,
+        a line per finding, and a done line once a Check has finished, which is flushed and
+        fsync'ed before the Check counts as finished. On resume the findings of finished
+        Checks are replayed and only the other Checks run again, the findings an
+        interrupted Check wrote before it was interrupted are ignored.
+    """
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, config=None, resume=False):
+        self.path = path
+        self.config = config or {}
+        self.session = 0
+        # (session, key) of every Check finished by a previous session
+        self.finished = set()
+        self._lock = threading.Lock()
+        valid_size = self._load() if resume else 0
+        self.finished_keys = {key for _, key in self.finished}
+        # only the part written by previous sessions is replayed
+        self.replay_size = valid_size
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "a" if valid_size else "w")
+        # a line cut short by the interruption would corrupt the next one
+        self.file.truncate(valid_size)
+        self.session += 1
+        self._write({"session": self.session, "config": self.config})
+        self._sync()
+
+    def _load(self):
+        """Reads the journal of the interrupted run, returns the size of its intact part"""
+        if not os.path.isfile(self.path):
+            print(f"No journal found at {self.path}, starting a new run")
+            return 0
+        valid_size = 0
+        complete = False
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                if "session" in entry:
+                    if entry.get("config") != self.config:
+                        raise ValueError(f"the journal at {self.path} is of a run with other options {entry.get('config')}, resume with the same options")
+                    self.session = entry["session"]
+                elif "done" in entry:
+                    self.finished.add((entry["s"], tuple(entry["done"])))
+                elif entry.get("complete"):
+                    complete = True
+        if complete:
+            print(f"The run in {self.path} already finished, starting a new run")
+            self.finished = set()
+            self.session = 0
+            return 0
+        print(f"Resuming the run in {self.path}, {len(self.finished)} Checks finished before it was interrupted")
+        return valid_size
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry, default=str) + "\n")
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def is_finished(self, unit):
+        return unit_key(unit) in self.finished_keys
+
+    def pending(self, units):
+        """Returns the CheckUnits that did not finish before the run was interrupted"""
+        if not self.finished_keys:
+            return units
+        pending = [unit for unit in units if not self.is_finished(unit)]
+        print(f"Skipping {len(units) - len(pending)} Checks that finished before the run was interrupted")
+        return pending
+
+    def record(self, unit, findings):
+        """Journals the findings of a CheckUnit as they pass, then marks the Check finished"""
+        key = list(unit_key(unit))
+        for finding in findings:
+            with self._lock:
+                self._write({"s": self.session, "u": key, "f": asff(finding)})
+            yield finding
+        with self._lock:
+            self._write({"s": self.session, "done": key})
+            self._sync()
+
+    def replay(self):
+        """Yields the findings of the Checks finished before the run was interrupted"""
+        if not self.finished:
+            return
+        read = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                read += len(line)
+                if read > self.replay_size:
+                    break
+                if b'"f":' not in line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if (entry.get("s"), tuple(entry.get("u", ()))) in self.finished:
+                    yield entry["f"]
+
+    def complete(self):
+        """Marks the run finished, a later --resume starts a new run"""
+        with self._lock:
+            self._write({"complete": True})
+            self._sync()
+            self.file.close()
+
+    def close(self):
+        with self._lock:
+            if not self.file.closed:
+                self._sync()
+                self.file.close()
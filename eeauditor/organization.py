@@ -0,0 +1,245 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing
+import os
+import queue
+import re
+import boto3
+import client_pool
+import rate_limiter
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session
+from finding_delta import FindingDelta
+from incremental import DEFAULT_MAX_STALENESS
+from state_store import StateStore
+from telemetry import Telemetry
+from timeouts import TimeoutPolicy
+
+# role ElectricEye assumes in every member account unless --assume-role-name is given
+DEFAULT_ROLE_NAME = "ElectricEyeAuditRole"
+# STS AssumeRole session duration, credentials are refreshed automatically before they expire
+ROLE_SESSION_DURATION = 3600
+# findings sent from a worker process to the parent at a time
+FINDINGS_BATCH_SIZE = 500
+
+
+def partition_for_region(region):
+    if region.startswith("us-gov-"):
+        return "aws-us-gov"
+    if region.startswith("cn-"):
+        return "aws-cn"
+    if region.startswith("us-isob-"):
+        return "aws-isob"
+    if region.startswith("us-iso-"):
+        return "aws-iso"
+    return "aws"
+
+
+def list_organization_accounts(session=None):
+    """Returns the IDs of every ACTIVE account in the AWS Organization"""
+    session = session or boto3.Session()
+    organizations = session.client("organizations")
+    accounts = []
+    for page in organizations.get_paginator("list_accounts").paginate():
+        for account in page["Accounts"]:
+            if account["Status"] == "ACTIVE":
+                accounts.append(account["Id"])
+    return accounts
+
+
+def load_account_list(path):
+    """Reads account IDs from a JSON list or a text file (one per line, # comments allowed)"""
+    with open(path) as f:
+        content = f.read()
+    try:
+        accounts = json.loads(content)
+        if isinstance(accounts, dict):
+            accounts = accounts.get("Accounts", [])
+        accounts = [str(a["Id"] if isinstance(a, dict) else a) for a in accounts]
+    except ValueError:
+        accounts = [line.split("#", 1)[0].strip() for line in content.splitlines()]
+    accounts = [account for account in accounts if account]
+    for account in accounts:
+        if not re.fullmatch(r"\d{12}", account):
+            raise ValueError(f"{account} in {path} is not a 12 digit AWS account ID")
+    return accounts
+
+
+def assume_role_session(account_id, role_name, region, external_id=None, session_name="ElectricEye"):
+    """Returns a boto3 Session for `role_name` in `account_id` whose credentials refresh themselves"""
+    sts = boto3.client("sts", region_name=region)
+    role_arn = f"arn:{partition_for_region(region)}:iam::{account_id}:role/{role_name}"
+    assume_role_kwargs = {
+        "RoleArn": role_arn,
+        "RoleSessionName": session_name,
+        "DurationSeconds": ROLE_SESSION_DURATION,
+    }
+    if external_id:
+        assume_role_kwargs["ExternalId"] = external_id
+
+    def refresh():
+        credentials = sts.assume_role(**assume_role_kwargs)["Credentials"]
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+
+    botocore_session = get_session()
+    botocore_session._credentials = RefreshableCredentials.create_from_metadata(
+        metadata=refresh(),
+        refresh_using=refresh,
+        method="sts-assume-role",
+    )
+    botocore_session.set_config_variable("region", region)
+    return boto3.Session(botocore_session=botocore_session)
+
+
+def audit_account(account_id, role_name, regions, results, external_id=None, auditor_name=None, check_name=None, workers=1, service_concurrency=None, profile_name=None, max_pool_connections=None, retry_mode=None, rate_limits=None, default_rate_limit=None, state_file=None, incremental=False, max_staleness=None, delta=False, full_resync=False, check_timeout=None, auditor_timeout=None, timeouts=None, run_id=None):
+    """Runs the Auditors against one account, executed inside a worker process
+
+        Findings are streamed back to the parent through the `results` queue in batches,
+        followed by an (account_id, None, error, telemetry records) message once the account
+        is done so one failing account never ends the run. In delta mode the sent findings are
+        staged under `run_id`, the parent commits them once its outputs wrote them.
+    """
+    # imported here so the parent process never imports (and creates clients for) any Auditor
+    from eeauditor import EEAuditor, run_multi_region_checks
+    from processor.main import batch_findings
+
+    error = None
+    telemetry = Telemetry()
+    finding_delta = None
+    try:
+        if profile_name:
+            boto3.setup_default_session(profile_name=profile_name)
+        client_pool.configure(max_pool_connections=max_pool_connections, retry_mode=retry_mode)
+        rate_limiter.configure(rates=rate_limits, default_rate=default_rate_limit)
+        # incremental and delta mode, every worker process opens the shared SQLite file itself
+        state_store = StateStore(state_file) if state_file else None
+        finding_delta = FindingDelta(state_store, full_resync=full_resync, run_id=run_id) if delta and state_store else None
+        timeout_policy = TimeoutPolicy(check_timeout=check_timeout, auditor_timeout=auditor_timeout, overrides=timeouts)
+        apps = []
+        for region in regions:
+            session = assume_role_session(account_id, role_name, region, external_id=external_id)
+            app = EEAuditor(
+                name=f"AWS Auditor {account_id}",
+                session=session,
+                region_index=apps[0].region_index if apps else None,
+            )
+            app.load_plugins(plugin_name=auditor_name, check_name=check_name)
+            apps.append(app)
+
+        findings = run_multi_region_checks(
+            apps,
+            requested_check_name=check_name,
+            workers=workers,
+            service_concurrency=service_concurrency,
+            run_telemetry=telemetry,
+            state_store=state_store if incremental else None,
+            max_staleness=max_staleness or DEFAULT_MAX_STALENESS,
+            delta=finding_delta,
+            check_timeouts=timeout_policy if timeout_policy else None,
+        )
+        for batch in batch_findings(findings, FINDINGS_BATCH_SIZE):
+            results.put((account_id, batch, None, None))
+    except Exception as e:
+        if finding_delta:
+            # findings staged but never handed over to the parent must not count as sent
+            finding_delta.discard(account=account_id)
+        error = str(e)
+    results.put((account_id, None, error, telemetry.records()))
+
+
+# called from eeauditor/controller.py run_auditor() in organization mode
+def run_organization_checks(accounts, role_name=DEFAULT_ROLE_NAME, regions=None, external_id=None, auditor_name=None, check_name=None, workers=1, service_concurrency=None, max_accounts=None, profile_name=None, max_pool_connections=None, retry_mode=None, rate_limits=None, default_rate_limit=None, telemetry=None, state_file=None, incremental=False, max_staleness=None, delta=False, full_resync=False, check_timeout=None, auditor_timeout=None, timeouts=None, run_id=None):
+    """Audits every account on a process pool and yields all findings as one stream
+
+        Each account runs in its own process with its own assumed-role Session, so the
+        module-level clients of the Auditors never mix credentials. `max_accounts` is the
+        global limit on accounts audited at the same time. Workers stream their findings
+        through a bounded queue, so neither side ever holds a whole account in memory.
+        In delta mode workers stage what they sent under `run_id`, for the caller to commit
+        or discard with a FindingDelta of the same `run_id` once its outputs are done.
+    """
+    regions = regions or [boto3.Session().region_name]
+    max_accounts = max_accounts or os.cpu_count() or 1
+    print(f"Auditing {len(accounts)} accounts in {len(regions)} Regions with role {role_name}, {max_accounts} accounts at a time")
+
+    # spawn so workers never inherit locks or clients from the parent process
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager, ProcessPoolExecutor(max_workers=max_accounts, mp_context=context) as pool:
+        results = manager.Queue(maxsize=max_accounts * 4)
+        futures = {
+            pool.submit(
+                audit_account,
+                account_id,
+                role_name,
+                regions,
+                results,
+                external_id=external_id,
+                auditor_name=auditor_name,
+                check_name=check_name,
+                workers=workers,
+                service_concurrency=service_concurrency,
+                profile_name=profile_name,
+                max_pool_connections=max_pool_connections,
+                retry_mode=retry_mode,
+                rate_limits=rate_limits,
+                default_rate_limit=default_rate_limit,
+                state_file=state_file,
+                incremental=incremental,
+                max_staleness=max_staleness,
+                delta=delta,
+                full_resync=full_resync,
+                check_timeout=check_timeout,
+                auditor_timeout=auditor_timeout,
+                timeouts=timeouts,
+                run_id=run_id,
+            ): account_id
+            for account_id in accounts
+        }
+        remaining = set(accounts)
+        counts = {}
+        while remaining:
+            try:
+                account_id, batch, error, records = results.get(timeout=5)
+            except queue.Empty:
+                # a worker that died (e.g. OOM) never reports back, account for it here
+                for future, account_id in futures.items():
+                    if account_id in remaining and future.done() and future.exception():
+                        print(f"Failed to audit account {account_id} with exception {future.exception()}")
+                        remaining.discard(account_id)
+                continue
+            if batch is not None:
+                counts[account_id] = counts.get(account_id, 0) + len(batch)
+                for finding in batch:
+                    yield finding
+                continue
+            remaining.discard(account_id)
+            if telemetry and records:
+                telemetry.extend(records)
+            if error:
+                print(f"Failed to audit account {account_id} with exception {error}")
+            else:
+                print(f"Finished auditing account {account_id} with {counts.get(account_id, 0)} findings")
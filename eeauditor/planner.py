@@ -0,0 +1,100 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from concurrent.futures import ThreadPoolExecutor
+import sys
+
+# threads used to prefetch collections, the rate limiter keeps them within the API limits
+DEFAULT_PREFETCH_WORKERS = 8
+
+
+def requirements(check):
+    """Returns [(name, helper)] for the collections a Check declared with requires="""
+    module = sys.modules.get(check.__module__)
+    resolved = []
+    for requirement in getattr(check, "requires", ()):
+        if callable(requirement):
+            resolved.append((requirement.__name__, requirement))
+        else:
+            resolved.append((requirement, getattr(module, requirement, None)))
+    return resolved
+
+
+def namespace(unit):
+    """The RunCache namespace a Check's `cache` uses, see EEAuditor.execute_check()"""
+    return (unit.check.__module__, unit.awsAccountId, unit.awsRegion)
+
+
+class DataPlanner(object):
+    """Prefetches, in parallel, every collection the selected Checks declared they need
+
+        Collections are loaded by calling their cache helper (e.g. describe_load_balancers(cache))
+        with the same RunCache view the Checks get, so the Checks find the data in their cache.
+        The union of all declarations is loaded once per Auditor, Account and Region. A Check
+        whose collection failed to load is skipped with that reason instead of failing halfway
+        through its findings.
+    """
+
+    def __init__(self, run_cache, workers=DEFAULT_PREFETCH_WORKERS):
+        self.run_cache = run_cache
+        self.workers = max(int(workers or 1), 1)
+        # (namespace, name) -> reason the collection could not be loaded
+        self.failures = {}
+
+    def plan(self, units):
+        """Returns {(namespace, name): helper} for the union of the Checks' declarations"""
+        collections = {}
+        for unit in units:
+            for name, helper in requirements(unit.check):
+                key = (namespace(unit), name)
+                if helper is None:
+                    self.failures[key] = f"cache helper {name} does not exist"
+                    continue
+                collections.setdefault(key, helper)
+        return collections
+
+    def _load(self, key, helper):
+        cache = self.run_cache.view(key[0])
+        try:
+            helper(cache=cache)
+        finally:
+            cache.release()
+
+    def prefetch(self, units):
+        """Loads every planned collection, returns the number loaded"""
+        collections = self.plan(units)
+        if not collections:
+            return 0
+        print(f"Prefetching {len(collections)} collections for {len(units)} Checks")
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(collections)), thread_name_prefix="eeauditor-prefetch") as pool:
+            futures = {key: pool.submit(self._load, key, helper) for key, helper in collections.items()}
+        for key, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                self.failures[key] = f"{type(error).__name__}: {error}"
+                print(f"Failed to prefetch {key[1]} for {key[0][0].rpartition('.')[2]} in {key[0][2]} with exception {error}")
+        return len(collections) - len([key for key in futures if key in self.failures])
+
+    def skip_reason(self, unit):
+        """Returns why a Check cannot run, or None if all of its collections loaded"""
+        for name, _ in requirements(unit.check):
+            reason = self.failures.get((namespace(unit), name))
+            if reason:
+                return f"required collection {name} failed to load ({reason})"
+        return None
@@ -0,0 +1,174 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import ast
+import hashlib
+import json
+import os
+
+# bump when the layout of an entry changes so stale caches are rebuilt
+MANIFEST_VERSION = 1
+# where the manifest cache is persisted between runs
+DEFAULT_MANIFEST_PATH = os.environ.get(
+    "ELECTRICEYE_PLUGIN_MANIFEST_PATH",
+    os.path.join(os.path.expanduser("~"), ".electriceye", "plugin_manifest.json"),
+)
+
+
+def scan_auditor(path):
+    """Statically finds every @registry.register_check("service") function of an Auditor file"""
+    with open(path, "rb") as f:
+        source = f.read()
+    tree = ast.parse(source, filename=path)
+    checks = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if not (
+                isinstance(decorator, ast.Call)
+                and isinstance(decorator.func, ast.Attribute)
+                and decorator.func.attr == "register_check"
+                and decorator.args
+                and isinstance(decorator.args[0], ast.Constant)
+            ):
+                continue
+            checks.append(
+                {
+                    "check_name": node.name,
+                    "service_name": decorator.args[0].value,
+                    "description": ast.get_docstring(node, clean=False) or "",
+                }
+            )
+    return checks, hashlib.sha256(source).hexdigest()
+
+
+class PluginManifest(object):
+    """Index of every Auditor and its Checks, built without importing any Auditor
+
+        Each Auditor file is parsed with `ast` and its entry is cached on disk together with
+        the file's mtime, size and sha256, so only new or changed files are parsed again.
+    """
+
+    def __init__(self, search_path, path=DEFAULT_MANIFEST_PATH):
+        self.search_path = search_path
+        self.path = path
+        self.auditors = {}
+        self.refresh()
+
+    def _load_cache(self):
+        if not self.path or not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                document = json.load(f)
+        except (IOError, ValueError):
+            return {}
+        if document.get("version") != MANIFEST_VERSION:
+            return {}
+        return document.get("search_paths", {}).get(self.search_path, {})
+
+    def refresh(self):
+        cached = self._load_cache()
+        auditors = {}
+        changed = False
+        for file_name in sorted(os.listdir(self.search_path)):
+            if not file_name.endswith(".py") or file_name.startswith("__"):
+                continue
+            auditor_name = file_name[:-3]
+            file_path = os.path.join(self.search_path, file_name)
+            stat = os.stat(file_path)
+            entry = cached.get(auditor_name)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                auditors[auditor_name] = entry
+                continue
+            try:
+                checks, digest = scan_auditor(file_path)
+            except (SyntaxError, ValueError) as e:
+                print(f"Failed to scan Auditor {file_name} with exception {e}")
+                continue
+            # a touched but unchanged file keeps its entry, only the stat info is updated
+            if entry and entry["sha256"] == digest:
+                checks = entry["checks"]
+            auditors[auditor_name] = {
+                "file_name": file_name,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "checks": checks,
+            }
+            changed = True
+
+        if changed or set(auditors) != set(cached):
+            self._save(auditors)
+        self.auditors = auditors
+
+    def _save(self, auditors):
+        document = {"version": MANIFEST_VERSION, "search_paths": {}}
+        if self.path and os.path.isfile(self.path):
+            try:
+                with open(self.path) as f:
+                    previous = json.load(f)
+                if previous.get("version") == MANIFEST_VERSION:
+                    document["search_paths"] = previous.get("search_paths", {})
+            except (IOError, ValueError):
+                pass
+        document["search_paths"][self.search_path] = auditors
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(document, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except (IOError, OSError) as e:
+            print(f"Failed to save plugin manifest to {self.path} with exception {e}")
+
+    def checks(self):
+        """Yields (auditor_name, file_name, service_name, check_name, description) for every Check"""
+        for auditor_name, entry in self.auditors.items():
+            for check in entry["checks"]:
+                yield auditor_name, entry["file_name"], check["service_name"], check["check_name"], check["description"]
+
+    def auditors_for(self, check_name=None, services=None):
+        """Returns the Auditors that contain `check_name` and/or Checks of any of `services`"""
+        names = []
+        for auditor_name, entry in self.auditors.items():
+            for check in entry["checks"]:
+                if check_name and check["check_name"] != check_name:
+                    continue
+                if services is not None and check["service_name"] not in services:
+                    continue
+                names.append(auditor_name)
+                break
+        return names
+
+    def services(self, auditor_name):
+        return sorted({check["service_name"] for check in self.auditors.get(auditor_name, {}).get("checks", [])})
+
+    def print_checks_md(self):
+        table = []
+        table.append(
+            "| Auditor File Name                      | AWS Service                   | Auditor Scan Description                                                               |"
+        )
+        table.append(
+            "|----------------------------------------|-------------------------------|----------------------------------------------------------------------------------------|"
+        )
+        for auditor_name, file_name, service_name, check_name, description in self.checks():
+            table.append(f"|{file_name} | {service_name} | {description.replace(chr(10), '')}")
+        print("\n".join(table))
@@ -17,16 +17,133 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+from queue import Full, Queue
+import threading
+from finding import asff
 from processor.outputs.output_base import ElectricEyeOutput
 
-def process_findings(findings: list, outputs: list, **kwargs):
-    """Process all findings from json file and send to outputs sepecified"""
+# number of findings handed to the output providers at a time
+DEFAULT_BATCH_SIZE = 500
+# number of batches allowed to wait between the Checks and the outputs
+DEFAULT_QUEUE_BATCHES = 4
+
+_END = object()
+
+def batch_findings(findings, batch_size=DEFAULT_BATCH_SIZE):
+    """Groups any iterable of findings into lists of at most `batch_size`"""
+    batch = []
+    for finding in findings:
+        batch.append(finding)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def process_findings(findings, outputs: list, batch_size=DEFAULT_BATCH_SIZE, queue_batches=DEFAULT_QUEUE_BATCHES, replayed=None, **kwargs):
+    """Stream findings (a list or any generator, such as EEAuditor.run_checks()) to the outputs sepecified
+
+        Findings are produced on a background thread into a bounded queue and written to every
+        provider batch by batch, so memory stays flat no matter how many findings a run has and
+        outputs start receiving findings while the Checks are still running. Providers implement
+        write_batch() and close() for this, providers that only have write_findings() get all
+        findings at once when the run ends.
+
+        `replayed` findings (of a resumed run) are only written to the providers that
+        rewrite their file every run (`__file_output__`), ahead of the others, the other
+        outputs already received them before the run was interrupted.
+    """
+    providers = []
+    buffered = {}
     for output in outputs:
+        provider = ElectricEyeOutput.get_provider(output)()
+        if not hasattr(provider, "write_batch"):
+            print(f"Output provider {output} does not support streaming, findings are buffered until the run ends")
+            buffered[output] = []
+        providers.append((output, provider))
+
+    if replayed is not None:
+        file_outputs = [(output, provider) for output, provider in providers if getattr(provider, "__file_output__", False)]
+        replayed_total = 0
+        for batch in batch_findings(replayed, batch_size) if file_outputs else ():
+            replayed_total += len(batch)
+            for output, provider in file_outputs:
+                if output in buffered:
+                    buffered[output].extend(batch)
+                else:
+                    provider.write_batch(findings=batch, **kwargs)
+        if file_outputs:
+            print(f"Wrote {replayed_total} findings of the interrupted run to {', '.join(output for output, _ in file_outputs)} again")
+
+    batches = Queue(maxsize=max(queue_batches, 1))
+    failure = []
+    # set once an output failed, the producer stops instead of waiting for room in the queue forever
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        produced = batch_findings(findings, batch_size)
         try:
-            ElectricEyeOutput.get_provider(output)().write_findings(findings=findings, **kwargs)
+            for batch in produced:
+                if not put(batch):
+                    break
+        except Exception as e:
+            failure.append(e)
+        finally:
+            produced.close()
+            if stop.is_set() and hasattr(findings, "close"):
+                # ends the Checks still running, with their threads and cache leases
+                findings.close()
+            put(_END)
+
+    producer = threading.Thread(target=produce, name="eeauditor-findings-producer", daemon=True)
+    producer.start()
+
+    total = 0
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _END:
+                break
+            total += len(batch)
+            # Findings are only turned into ASFF dicts once they are written
+            written = [asff(finding) for finding in batch]
+            for output, provider in providers:
+                try:
+                    if output in buffered:
+                        buffered[output].extend(batch)
+                    else:
+                        provider.write_batch(findings=written, **kwargs)
+                except Exception as e:
+                    print(f"Error writing output: {e}")
+                    raise e
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        producer.join()
+
+    for output, provider in providers:
+        try:
+            if output in buffered:
+                provider.write_findings(findings=[asff(finding) for finding in buffered.pop(output)], **kwargs)
+            else:
+                provider.close(**kwargs)
         except Exception as e:
             print(f"Error writing output: {e}")
             raise e
 
+    if failure:
+        raise failure[0]
+    return total
+
 def get_providers():
-    return ElectricEyeOutput.get_all_providers()
\ No newline at end of file
+    return ElectricEyeOutput.get_all_providers()
@@ -27,38 +27,59 @@ from processor.outputs.output_base import ElectricEyeOutput
 @ElectricEyeOutput
 class CsvProvider(object):
     __provider__ = "csv"
+    # the file is written from scratch every run
+    __file_output__ = True
+
+    csv_columns = [
+        {"name": "Id", "path": "Id"},
+        {"name": "Title", "path": "Title"},
+        {"name": "ProductArn", "path": "ProductArn"},
+        {"name": "AwsAccountId", "path": "AwsAccountId"},
+        {"name": "Severity", "path": "Severity.Label"},
+        {"name": "Confidence", "path": "Confidence"},
+        {"name": "Description", "path": "Description"},
+        {"name": "RecordState", "path": "RecordState"},
+        {"name": "Compliance Status", "path": "Compliance.Status"},
+        {"name": "Remediation Recommendation", "path": "Remediation.Recommendation.Text",},
+        {"name": "Remediation Recommendation Link", "path": "Remediation.Recommendation.Url",},
+    ]
+
+    def __init__(self):
+        self.csvfile = None
+        self.writer = None
+        self.written = 0
 
     def write_findings(self, findings: list, output_file: str, **kwargs):
-        csv_columns = [
-            {"name": "Id", "path": "Id"},
-            {"name": "Title", "path": "Title"},
-            {"name": "ProductArn", "path": "ProductArn"},
-            {"name": "AwsAccountId", "path": "AwsAccountId"},
-            {"name": "Severity", "path": "Severity.Label"},
-            {"name": "Confidence", "path": "Confidence"},
-            {"name": "Description", "path": "Description"},
-            {"name": "RecordState", "path": "RecordState"},
-            {"name": "Compliance Status", "path": "Compliance.Status"},
-            {"name": "Remediation Recommendation", "path": "Remediation.Recommendation.Text",},
-            {"name": "Remediation Recommendation Link", "path": "Remediation.Recommendation.Url",},
-        ]
+        print(f"Writing {len(findings)} findings to {output_file}.csv")
+        if not self.write_batch(findings=findings, output_file=output_file):
+            return False
+        return self.close(output_file=output_file)
+
+    def write_batch(self, findings: list, output_file: str, **kwargs):
         csv_file = output_file + ".csv"
         try:
-            with open(csv_file, "w") as csvfile:
-                print(f"Writing {len(findings)} findings to {csv_file}")
-                writer = csv.writer(csvfile, dialect="excel")
-                writer.writerow(item["name"] for item in csv_columns)
-                for finding in findings:
-                    row_data = []
-                    for column_dict in csv_columns:
-                        row_data.append(self.deep_get(finding, column_dict["path"]))
-                    writer.writerow(row_data)
-            csvfile.close()
+            if self.csvfile is None:
+                self.csvfile = open(csv_file, "w")
+                self.writer = csv.writer(self.csvfile, dialect="excel")
+                self.writer.writerow(item["name"] for item in self.csv_columns)
+            for finding in findings:
+                row_data = []
+                for column_dict in self.csv_columns:
+                    row_data.append(self.deep_get(finding, column_dict["path"]))
+                self.writer.writerow(row_data)
+                self.written += 1
         except IOError as e:
             print(f"Error writing to file {output_file} with exception {e}")
             return False
         return True
 
+    def close(self, output_file: str, **kwargs):
+        if self.csvfile is None and not self.write_batch(findings=[], output_file=output_file):
+            return False
+        self.csvfile.close()
+        print(f"Wrote {self.written} findings to {output_file}.csv")
+        return True
+
     # Return nested dictionary values by passing in dictionary and keys separated by "."
     def deep_get(self, dictionary, keys):
         return reduce(
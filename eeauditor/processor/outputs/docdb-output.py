@@ -18,18 +18,105 @@
 #specific language governing permissions and limitations
 #under the License.
 import os
+import threading
+import time
 import boto3
 import requests
 import pymongo
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from processor.outputs.output_base import ElectricEyeOutput
 
 ssm = boto3.client("ssm")
 
+# AWS TLS cert bundle for DocumentDB, downloaded once and reused until it is older than CA_BUNDLE_MAX_AGE
+CA_BUNDLE_URL = "https://s3.amazonaws.com/rds-downloads/rds-combined-ca-bundle.pem"
+CA_BUNDLE_PATH = os.environ.get(
+    "MONGODB_CA_BUNDLE_PATH",
+    os.path.join(os.path.expanduser("~"), ".electriceye", "rds-combined-ca-bundle.pem"),
+)
+# seconds, defaults to 7 days
+CA_BUNDLE_MAX_AGE = int(os.environ.get("MONGODB_CA_BUNDLE_MAX_AGE", 7 * 24 * 60 * 60))
+# findings upserted per bulk_write() call
+BATCH_SIZE = int(os.environ.get("MONGODB_BATCH_SIZE", 500))
+
+# MongoClients are shared by every run of the process (daemon and event mode), they pool their connections
+_clients = {}
+# collections whose unique Id index is known to exist
+_indexed = set()
+_clients_lock = threading.Lock()
+
+
+def ca_bundle(path=CA_BUNDLE_PATH, max_age=CA_BUNDLE_MAX_AGE, url=CA_BUNDLE_URL):
+    """Returns the path of the CA bundle, downloading it only when missing or older than `max_age`"""
+    if os.path.isfile(path) and time.time() - os.path.getmtime(path) < max_age:
+        return path
+    try:
+        r = requests.get(url, timeout=30)
+        r.raise_for_status()
+    except requests.RequestException as e:
+        if os.path.isfile(path):
+            print(f"Failed to refresh the CA bundle with exception {e}, using {path}")
+            return path
+        raise
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(r.content)
+    os.replace(temp_path, path)
+    print(f"Downloaded CA bundle to {path}")
+    return path
+
+
+def get_client(uri):
+    with _clients_lock:
+        if uri not in _clients:
+            _clients[uri] = pymongo.MongoClient(uri)
+        return _clients[uri]
+
+
+def remove_duplicates(collection):
+    """Keeps one document per finding Id, older versions inserted every finding again on every run"""
+    removed = 0
+    pipeline = [
+        {"$group": {"_id": "$Id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    for group in collection.aggregate(pipeline, allowDiskUse=True):
+        removed += collection.delete_many({"_id": {"$in": group["ids"][1:]}}).deleted_count
+    return removed
+
+
+def ensure_id_index(collection):
+    """Creates the unique index on finding Id once per collection"""
+    key = (collection.database.name, collection.name)
+    if key in _indexed:
+        return
+    try:
+        collection.create_index([("Id", pymongo.ASCENDING)], name="Id_unique", unique=True)
+    except OperationFailure:
+        print(f"Removed {remove_duplicates(collection)} duplicate findings before creating the unique Id index")
+        collection.create_index([("Id", pymongo.ASCENDING)], name="Id_unique", unique=True)
+    _indexed.add(key)
+
+
 @ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "docdb"
 
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.mongoConn = None
+        self.mycol = None
+        self.batch_size = max(int(batch_size or 1), 1)
+        self.written = 0
+        self.failed = 0
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
+        print(f"Writing {len(findings)} findings to MongoDB")
+        self.write_batch(findings=findings)
+        return self.close()
+
+    def connect(self):
         # Ensure that the required variables are present
         try:
             mongoUname = os.environ["MONGODB_USERNAME"]
@@ -55,39 +142,44 @@ class JsonProvider(object):
         # pull out the MongoDB Password from SSM
         mongoPw = str(ssm.get_parameter(Name=mongoPwParam)["Parameter"]["Value"])
 
-        # Download the latest AWS Mongo TLS cert bundle
-        url = "https://s3.amazonaws.com/rds-downloads/rds-combined-ca-bundle.pem"
-        r = requests.get(url)
-
-        print(f"Downloaded CA bundle")
-        # Write it to where the output is happening
-        with open("./rds-combined-ca-bundle.pem", "wb") as f:
-            f.write(r.content)
-
-        mongoTlsCertPath = "./rds-combined-ca-bundle.pem"
+        mongoTlsCertPath = ca_bundle()
         # Build hostname - these are the default options for TLS sign-on into Mongo
         fullMongoHost = f"mongodb://{mongoUname}:{mongoPw}@{mongoHostname}:27017/?ssl=true&ssl_ca_certs={mongoTlsCertPath}&replicaSet=rs0&readPreference=secondaryPreferred&retryWrites=false"
 
-        print(f"Writing {len(findings)} findings to MongoDB")
-        try:
-            mongoConn = pymongo.MongoClient(fullMongoHost)
-        except Exception as e:
-            raise e
+        self.mongoConn = get_client(fullMongoHost)
+
+        print(f"Connected to MongoDB succesfully with {self.mongoConn}")
 
-        print(f"Connected to MongoDB succesfully with {mongoConn}")
+        eeMongoDb = self.mongoConn["ElectricEye"]
 
-        eeMongoDb = mongoConn["ElectricEye"]
+        self.mycol = eeMongoDb["ElectricEye-Findings"]
+        ensure_id_index(self.mycol)
 
-        mycol = eeMongoDb["ElectricEye-Findings"]
+    def write_batch(self, findings: list, **kwargs):
+        if self.mycol is None:
+            self.connect()
 
-        # write to mongo in chunks of 40 using `insert_many()` method
-        for i in range(0, len(findings), 40):
-            # here is where the fun begins
-            chunked = findings[i:i + 40]
+        # upsert in chunks of `batch_size` with unordered `bulk_write()`, one document per finding Id
+        for i in range(0, len(findings), self.batch_size):
+            # the same finding twice in one unordered batch would race for the unique index, the last one wins
+            chunked = list({finding["Id"]: finding for finding in findings[i:i + self.batch_size]}.values())
+            operations = [ReplaceOne({"Id": finding["Id"]}, finding, upsert=True) for finding in chunked]
 
             try:
-                mycol.insert_many(chunked)
+                self.mycol.bulk_write(operations, ordered=False)
+                self.written += len(chunked)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                self.written += len(chunked) - len(errors)
+                self.failed += len(errors)
+                print(f"Failed to write {len(errors)} findings to MongoDB: {errors[0].get('errmsg') if errors else e}")
             except Exception as e:
+                self.failed += len(chunked)
                 print(e)
 
-        return True
\ No newline at end of file
+    def close(self, **kwargs):
+        print(f"Wrote {self.written} findings to MongoDB")
+        if self.failed:
+            print(f"Failed to write {self.failed} findings to MongoDB")
+        # the MongoClient stays open for later runs of this process
+        return True
@@ -55,6 +55,9 @@ class DopsProvider(object):
 
     def write_findings(self, findings: list, **kwargs):
         print(f"Writing {len(findings)} results to DisruptOps")
+        self.write_batch(findings=findings)
+
+    def write_batch(self, findings: list, **kwargs):
         if self.client_id and self.api_key and self.url:
             for finding in findings:
                 requests.post(
@@ -63,4 +66,7 @@ class DopsProvider(object):
                     auth=(self.client_id, self.api_key)
                 )
         else:
-            raise ValueError("Missing credentials for client_id or api_key")
\ No newline at end of file
+            raise ValueError("Missing credentials for client_id or api_key")
+
+    def close(self, **kwargs):
+        return
@@ -23,18 +23,26 @@ from processor.outputs.output_base import ElectricEyeOutput
 @ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "json_normalized"
+    # the file is written from scratch every run
+    __file_output__ = True
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
-        # create a new empty list to store flattened findings
-        newFindings = []
-        # create another list to hold Finding IDs, this is to prevent duplicates by looking up values later on
-        allIds = []
+    def __init__(self):
+        self.jsonfile = None
+        # Finding IDs already written, this is to prevent duplicates
+        self.allIds = set()
 
+    def write_findings(self, findings: list, output_file: str, **kwargs):
         print(f"Writing {len(findings)} findings to Normalized JSON file (final total may be different due to dedupe)")
-        # create output file based on inputs
-        jsonfile = f"{output_file}-normalized.json"
+        self.write_batch(findings=findings, output_file=output_file)
+        return self.close(output_file=output_file)
 
-        print(f"Your filename is called {jsonfile}")
+    def write_batch(self, findings: list, output_file: str, **kwargs):
+        if self.jsonfile is None:
+            # create output file based on inputs
+            jsonfile = f"{output_file}-normalized.json"
+            print(f"Your filename is called {jsonfile}")
+            self.jsonfile = open(jsonfile, "w")
+            self.jsonfile.write("[")
 
         # loop the findings and create a flatter structure - better for indexing without the nested lists
         for fi in findings:
@@ -74,22 +82,21 @@ class JsonProvider(object):
                     "WorkflowStatus": str(fi["Workflow"]["Status"]),
                     "RecordState": str(fi["RecordState"])
                 }
-                # append new dict to list if we have not already
-                if findingId not in allIds:
-                    newFindings.append(fDict)
-                    # write finding ID to list for later check
-                    allIds.append(findingId)
+                # write new dict to the file if we have not already
+                if findingId not in self.allIds:
+                    self.jsonfile.write(",\n" if self.allIds else "\n")
+                    self.jsonfile.write(json.dumps(fDict, indent=4))
+                    # write finding ID to set for later check
+                    self.allIds.add(findingId)
                 continue
             except KeyError as e:
                 print(f"Issue with Finding ID {findingId} due to missing value {e}")
-        # once complete with parsing findings - write to file and purge findings from memory
-        del findings
-
-        print(f"Wrote {len(allIds)} findings to Normalized JSON file")
-
-        del allIds
 
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(newFindings, jsonfile, indent=4)
+    def close(self, output_file: str, **kwargs):
+        if self.jsonfile is None:
+            self.write_batch(findings=[], output_file=output_file)
+        self.jsonfile.write("\n]" if self.allIds else "]")
+        self.jsonfile.close()
+        print(f"Wrote {len(self.allIds)} findings to Normalized JSON file")
 
         return True
\ No newline at end of file
@@ -18,7 +18,6 @@
 #specific language governing permissions and limitations
 #under the License.
 import json
-import os
 
 from processor.outputs.output_base import ElectricEyeOutput
 
@@ -26,15 +25,36 @@ from processor.outputs.output_base import ElectricEyeOutput
 @ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "json"
+    # the file is written from scratch every run
+    __file_output__ = True
+
+    def __init__(self):
+        self.jsonfile = None
+        self.written = 0
 
     def write_findings(self, findings: list, output_file: str, **kwargs):
         print(f"Writing {len(findings)} findings to JSON file")
-        
-        # create output file based on inputs
-        jsonfile = f"{output_file}.json"
-        print(f"Your filename is called {jsonfile}")
-        
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(findings, jsonfile, indent=4, default=str)
-            
-        return True
\ No newline at end of file
+        self.write_batch(findings=findings, output_file=output_file)
+        return self.close(output_file=output_file)
+
+    def write_batch(self, findings: list, output_file: str, **kwargs):
+        if self.jsonfile is None:
+            # create output file based on inputs
+            jsonfile = f"{output_file}.json"
+            print(f"Your filename is called {jsonfile}")
+            self.jsonfile = open(jsonfile, "w")
+            self.jsonfile.write("[")
+
+        # the findings are streamed into a single JSON array, one batch at a time
+        for finding in findings:
+            self.jsonfile.write(",\n" if self.written else "\n")
+            self.jsonfile.write(json.dumps(finding, indent=4, default=str))
+            self.written += 1
+
+    def close(self, output_file: str, **kwargs):
+        if self.jsonfile is None:
+            self.write_batch(findings=[], output_file=output_file)
+        self.jsonfile.write("\n]" if self.written else "]")
+        self.jsonfile.close()
+        print(f"Wrote {self.written} findings to JSON file")
+        return True
@@ -18,7 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 class ElectricEyeOutput(object):
-    """Class to be used as a decorator to register all output providers"""
+    """Class to be used as a decorator to register all output providers
+
+        Providers receive findings either all at once with `write_findings(findings, **kwargs)`
+        or, when streaming from processor.main.process_findings(), as a series of
+        `write_batch(findings, **kwargs)` calls followed by a single `close(**kwargs)`.
+    """
 
     _outputs = {}
 
@@ -17,12 +17,102 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+import csv
+import datetime
+import io
+import threading
+import uuid
 import boto3
 import sys
 import os
 import psycopg2 as psql
+from psycopg2.pool import ThreadedConnectionPool
 from processor.outputs.output_base import ElectricEyeOutput
 
+# connections kept open per database, shared by every run of the process (daemon and event mode)
+POOL_SIZE = int(os.environ.get("POSTGRES_POOL_SIZE", 4))
+# columns of a finding, in table order
+COLUMNS = (
+    "schemaversion", "findingid", "awsaccountid", "productarn", "generatorid", "types", "createdat",
+    "severitylabel", "confidence", "title", "description", "resourcetype", "resourceid", "resourceregion",
+    "resourcepartition", "compliancestatus", "compliancecontrols", "workflowstatus", "recordstate",
+)
+# columns both tables are queried by
+INDEXED_COLUMNS = ("awsaccountid", "resourcetype", "severitylabel", "compliancestatus")
+
+_pools = {}
+_prepared = set()
+_pools_lock = threading.Lock()
+
+
+def finding_row(finding):
+    """Flattens an ASFF finding into a row of COLUMNS, None for findings without an account"""
+    # Basic parsing of ASFF to prepare for the COPY into PSQL
+    awsaccountid = finding.get('AwsAccountId', finding.get('awsAccountId'))
+    if awsaccountid is None:
+        return None
+    #TODO: Find which findings aren't mapped...
+    try:
+        confidence = str(finding['Confidence'])
+    except Exception:
+        confidence = '99'
+    try:
+        compliancecontrols = str(finding['Compliance']['RelatedRequirements'])
+    except Exception:
+        compliancecontrols = str('[]')
+    return (
+        str(finding['SchemaVersion']),
+        str(finding['Id']),
+        str(awsaccountid),
+        str(finding['ProductArn']),
+        str(finding['GeneratorId']),
+        str(finding['Types'][0]),
+        str(finding['CreatedAt']),
+        str(finding['Severity']['Label']),
+        confidence,
+        str(finding['Title']),
+        str(finding['Description']),
+        str(finding['Resources'][0]['Type']),
+        str(finding['Resources'][0]['Id']),
+        str(finding['Resources'][0]['Region']),
+        str(finding['Resources'][0]['Partition']),
+        str(finding['Compliance']['Status']),
+        compliancecontrols,
+        str(finding['Workflow']['Status']),
+        str(finding['RecordState']),
+    )
+
+
+def copy_buffer(rows):
+    """CSV for COPY ... FROM STDIN of `rows`"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def schema_statements():
+    """Statements creating the keyed findings table, the run-partitioned history table and their indexes"""
+    columns = ", ".join(f"{column} TEXT" for column in COLUMNS)
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS electriceye_findings({columns}, runid TEXT, lastseenat TIMESTAMPTZ, PRIMARY KEY (findingid));",
+        f"CREATE TABLE IF NOT EXISTS electriceye_findings_history(runid TEXT NOT NULL, runat TIMESTAMPTZ NOT NULL, {columns}) PARTITION BY LIST (runid);",
+    ]
+    for table in ("electriceye_findings", "electriceye_findings_history"):
+        for column in INDEXED_COLUMNS:
+            statements.append(f"CREATE INDEX IF NOT EXISTS {table}_{column}_idx ON {table} ({column});")
+    return statements
+
+
+def get_pool(dsn):
+    """Returns the connection pool of a database, created once per process"""
+    key = tuple(sorted(dsn.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ThreadedConnectionPool(1, max(POOL_SIZE, 1), **dsn)
+        return key, _pools[key]
+
 
 @ElectricEyeOutput
 class PostgresProvider(object):
@@ -75,77 +165,126 @@ class PostgresProvider(object):
             self.db_username = psqlUsername
             self.db_password = psqlDbPw
             self.db_name = eePsqlDbName
+            self.engine = None
+            self.cursor = None
+            self.pool = None
+            self.pool_key = None
+            self.run_id = None
+            self.run_at = None
+            self.written = 0
 
     def write_findings(self, findings: list, **kwargs):
         print(f"Writing {len(findings)} results to PostgreSQL")
+        self.write_batch(findings=findings)
+        self.close()
+
+    def prepare(self):
+        """Creates the tables once per process, a findings table left by older versions is rebuilt"""
+        self.cursor.execute(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = 'electriceye_findings' AND column_name = 'lastseenat'"
+        )
+        if self.cursor.fetchone() is None:
+            # older versions recreated this table (without a key) on every run, nothing is lost
+            self.cursor.execute("""DROP TABLE IF EXISTS electriceye_findings""")
+        for statement in schema_statements():
+            self.cursor.execute(statement)
+        self.engine.commit()
+
+    def connect(self):
+        """Takes a pooled connection and creates the tables and this run's history partition"""
         if (self.db_endpoint and self.db_port and self.db_username and self.db_password and self.db_name):
             try:
-                # Connect to DB and create a Cursor
-                engine = psql.connect(
-                    database=self.db_name,
-                    user=self.db_username,
-                    password=self.db_password,
-                    host=self.db_endpoint,
-                    port=self.db_port
+                # Connections are pooled and reused by later runs of the same process
+                self.pool_key, self.pool = get_pool(
+                    {
+                        "database": self.db_name,
+                        "user": self.db_username,
+                        "password": self.db_password,
+                        "host": self.db_endpoint,
+                        "port": self.db_port,
+                    }
                 )
-                cursor = engine.cursor()
-                
-                # drop previously existing tables
-                cursor.execute("""DROP TABLE IF EXISTS electriceye_findings""")
-                engine.commit()
-                
-                # Create a new table for the ElectricEye findings. Everything is set as Text
-                cursor.execute("""CREATE TABLE IF NOT EXISTS electriceye_findings( schemaversion TEXT, findingid TEXT, awsaccountid TEXT, productarn TEXT, generatorid TEXT, types TEXT, createdat TEXT, severitylabel TEXT, confidence TEXT, title TEXT, description TEXT, resourcetype TEXT, resourceid TEXT, resourceregion TEXT, resourcepartition TEXT, compliancestatus TEXT, compliancecontrols TEXT, workflowstatus TEXT, recordstate TEXT);""")
-
-                for finding in findings:
-                    # Basic parsing of ASFF to prepare for INSERT into PSQL
-                    try:
-                        awsaccountid = str(finding['AwsAccountId'])
-                    except Exception as e:
-                        if str(e) == "'AwsAccountId'":
-                            awsaccountid = str(finding['awsAccountId'])
-                        else:
-                            continue
-                    schemaversion = str(finding['SchemaVersion'])
-                    findingid = str(finding['Id'])
-                    productarn = str(finding['ProductArn'])
-                    generatorid = str(finding['GeneratorId'])
-                    types = str(finding['Types'][0])
-                    createdat = str(finding['CreatedAt'])
-                    severitylabel = str(finding['Severity']['Label'])
-                    #TODO: Find which findings aren't mapped...
-                    try:
-                        confidence = str(finding['Confidence'])
-                    except Exception:
-                        confidence = '99'
-                    title = str(finding['Title'])
-                    description = str(finding['Description'])
-                    resourcetype = str(finding['Resources'][0]['Type'])
-                    resourceid = str(finding['Resources'][0]['Id'])
-                    resourceregion = str(finding['Resources'][0]['Region'])
-                    resourcepartition = str(finding['Resources'][0]['Partition'])
-                    compliancestatus = str(finding['Compliance']['Status'])
-                    #TODO: Find which findings aren't mapped...
-                    try:
-                        compliancecontrols = str(finding['Compliance']['RelatedRequirements'])
-                    except Exception:
-                        compliancecontrols = str('[]')
-                    workflowstatus = str(finding['Workflow']['Status'])
-                    recordstate = str(finding['RecordState'])
-
-                    # Write into Postgres
-                    cursor.execute("INSERT INTO electriceye_findings( schemaversion, findingid, awsaccountid, productarn, generatorid, types, createdat, severitylabel, confidence, title, description, resourcetype, resourceid, resourceregion, resourcepartition, compliancestatus, compliancecontrols, workflowstatus, recordstate) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);", (schemaversion, findingid, awsaccountid, productarn, generatorid, types, createdat, severitylabel, confidence, title, description, resourcetype, resourceid, resourceregion, resourcepartition, compliancestatus, compliancecontrols, workflowstatus, recordstate))
-                
-                # commit the changes
-                engine.commit()
-                # close communication with the postgres server (rds)
-                cursor.close()
+                self.engine = self.pool.getconn()
+                self.cursor = self.engine.cursor()
+                if self.pool_key not in _prepared:
+                    self.prepare()
+                    _prepared.add(self.pool_key)
 
+                # every run gets its own history partition, old runs are removed by dropping theirs
+                self.run_at = datetime.datetime.now(datetime.timezone.utc)
+                self.run_id = f"{self.run_at.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+                self.cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS electriceye_findings_history_{self.run_id} PARTITION OF electriceye_findings_history FOR VALUES IN (%s);",
+                    (self.run_id,),
+                )
+                # findings of a batch are copied here first, then upserted in one statement
+                self.cursor.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS electriceye_findings_staging({', '.join(f'{column} TEXT' for column in COLUMNS)}) ON COMMIT DELETE ROWS;"
+                )
+                self.engine.commit()
             except psql.OperationalError:
                 print("Cannot connect to PostgreSQL! Review your Security Group settings and/or information provided to connect")
-                exit(2)
-            except Exception:
-                print("Another exception found " + Exception)
-                exit(2)
+                self.discard()
+                raise
+            except Exception as e:
+                print(f"Another exception found {e}")
+                self.discard()
+                raise
         else:
-            raise ValueError("Missing credentials or database parameters")
\ No newline at end of file
+            raise ValueError("Missing credentials or database parameters")
+
+    def write_batch(self, findings: list, **kwargs):
+        if self.cursor is None:
+            self.connect()
+        columns = ", ".join(COLUMNS)
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS if column != "findingid")
+        try:
+            rows = [row for row in (finding_row(finding) for finding in findings) if row]
+            if not rows:
+                return
+            self.cursor.copy_expert(
+                f"COPY electriceye_findings_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+                copy_buffer(rows),
+            )
+            # the same finding can be emitted twice in a batch, only one of them is upserted
+            self.cursor.execute(
+                f"INSERT INTO electriceye_findings ({columns}, runid, lastseenat) SELECT DISTINCT ON (findingid) {columns}, %s, %s FROM electriceye_findings_staging ORDER BY findingid ON CONFLICT (findingid) DO UPDATE SET {updates}, runid = EXCLUDED.runid, lastseenat = EXCLUDED.lastseenat;",
+                (self.run_id, self.run_at),
+            )
+            self.cursor.execute(
+                f"INSERT INTO electriceye_findings_history (runid, runat, {columns}) SELECT %s, %s, {columns} FROM electriceye_findings_staging;",
+                (self.run_id, self.run_at),
+            )
+            # commit the changes of every batch, this also empties the staging table
+            self.engine.commit()
+            self.written += len(rows)
+        except psql.OperationalError:
+            print("Cannot connect to PostgreSQL! Review your Security Group settings and/or information provided to connect")
+            self.discard()
+            raise
+        except Exception as e:
+            print(f"Another exception found {e}")
+            self.discard()
+            raise
+
+    def discard(self):
+        """Rolls back and closes the connection after an error, the pool opens a new one for the next run"""
+        if self.engine is not None:
+            try:
+                self.engine.rollback()
+            except psql.Error:
+                # the server connection is gone (failover, restart), there is nothing to roll back
+                pass
+            self.pool.putconn(self.engine, close=True)
+        self.engine = None
+        self.cursor = None
+
+    def close(self, **kwargs):
+        if self.cursor is None:
+            return
+        print(f"Wrote {self.written} findings to PostgreSQL (run {self.run_id})")
+        # hand the connection back to the pool for the next run
+        self.cursor.close()
+        self.pool.putconn(self.engine)
+        self.cursor = None
+        self.engine = None
@@ -17,18 +17,176 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import json
+import os
+import random
+import threading
+import time
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from processor.outputs.output_base import ElectricEyeOutput
 
+# BatchImportFindings accepts at most 100 findings and 6 MB per request, some room is left for the request envelope
+MAX_BATCH_FINDINGS = 100
+MAX_BATCH_BYTES = 6 * 1024 * 1024 - 64 * 1024
+# BatchImportFindings requests in flight at the same time
+DEFAULT_WORKERS = int(os.environ.get("ELECTRICEYE_SECHUB_WORKERS", 4))
+# attempts per batch, later attempts only send the findings that failed before
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("ELECTRICEYE_SECHUB_MAX_ATTEMPTS", 5))
+# full jitter backoff between attempts (seconds)
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20
+# request errors worth sending the batch again for, anything else fails the batch at once
+RETRYABLE_ERRORS = {
+    "InternalException",
+    "LimitExceededException",
+    "ServiceUnavailableException",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+
+
+def finding_size(finding):
+    """Serialized size of a finding in the request body, plus its separator"""
+    return len(json.dumps(finding, separators=(",", ":"), default=str).encode("utf-8")) + 1
+
+
+def pack_batches(findings, max_findings=MAX_BATCH_FINDINGS, max_bytes=MAX_BATCH_BYTES):
+    """Groups findings into batches of at most `max_findings` and `max_bytes` serialized
+
+        A finding larger than `max_bytes` on its own is sent alone, Security Hub reports it as failed.
+    """
+    batch = []
+    batch_bytes = 0
+    for finding in findings:
+        size = finding_size(finding)
+        if batch and (len(batch) >= max_findings or batch_bytes + size > max_bytes):
+            yield batch, batch_bytes
+            batch = []
+            batch_bytes = 0
+        batch.append(finding)
+        batch_bytes += size
+    if batch:
+        yield batch, batch_bytes
+
+
 @ElectricEyeOutput
 class SecHubProvider(object):
+    """Imports findings into Security Hub with several BatchImportFindings requests in flight
+
+        Batches are packed by count and serialized size, only the findings Security Hub
+        reports as failed are sent again (with backoff) and the import statistics of the
+        run are printed once it closes. Findings still failing after every attempt make
+        close() raise, so the run is not recorded as sent.
+    """
     __provider__ = "sechub"
 
+    def __init__(self, workers=DEFAULT_WORKERS, max_attempts=DEFAULT_MAX_ATTEMPTS, sechub=None, sleep=time.sleep):
+        self.workers = max(int(workers or 1), 1)
+        self.max_attempts = max(int(max_attempts or 1), 1)
+        self.sechub = sechub
+        self.sleep = sleep
+        self.executor = None
+        self.pending = set()
+        self.errors = {}
+        # Ids of the findings that were never imported
+        self.failed_ids = []
+        self.stats = {"findings": 0, "imported": 0, "failed": 0, "retried": 0, "requests": 0, "batches": 0, "bytes": 0}
+        self.started = None
+        self._lock = threading.Lock()
+
+    def _client(self):
+        if self.sechub is None:
+            self.sechub = boto3.client(
+                "securityhub",
+                config=Config(max_pool_connections=max(self.workers, 10), retries={"mode": "standard"}),
+            )
+        return self.sechub
+
     def write_findings(self, findings: list, **kwargs):
         print(f"Writing {len(findings)} results to SecurityHub")
-        if findings:
-            sechub = boto3.client("securityhub")
-            # write to securityhub in batches of 100
-            for i in range(0, len(findings), 100):
-                sechub.batch_import_findings(Findings=findings[i : i + 100])
-        return
\ No newline at end of file
+        self.write_batch(findings=findings)
+        self.close()
+        return
+
+    def write_batch(self, findings: list, **kwargs):
+        if not findings:
+            return
+        if self.executor is None:
+            self._client()
+            self.started = time.monotonic()
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eeauditor-sechub")
+        for batch, batch_bytes in pack_batches(findings):
+            # never keep more than a few batches per worker waiting, the findings stream stays bounded
+            while len(self.pending) >= self.workers * 2:
+                done, self.pending = wait(self.pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            with self._lock:
+                self.stats["findings"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["bytes"] += batch_bytes
+            self.pending.add(self.executor.submit(self._import, batch))
+
+    def _backoff(self, attempt):
+        self.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+
+    def _import(self, batch):
+        """Sends one batch, then only its failed findings again until they are imported or out of attempts"""
+        findings = batch
+        failed = []
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self._backoff(attempt)
+                with self._lock:
+                    self.stats["retried"] += len(findings)
+            try:
+                with self._lock:
+                    self.stats["requests"] += 1
+                response = self.sechub.batch_import_findings(Findings=findings)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "ClientError")
+                failed = [(finding, code) for finding in findings]
+                if code not in RETRYABLE_ERRORS:
+                    break
+                continue
+            except Exception as e:
+                failed = [(finding, type(e).__name__) for finding in findings]
+                continue
+
+            by_id = {finding["Id"]: finding for finding in findings}
+            failed = [
+                (by_id[failure["Id"]], failure.get("ErrorCode", "Unknown"))
+                for failure in response.get("FailedFindings", [])
+                if failure.get("Id") in by_id
+            ]
+            with self._lock:
+                self.stats["imported"] += len(findings) - len(failed)
+            if not failed:
+                return
+            findings = [finding for finding, _ in failed]
+
+        with self._lock:
+            self.stats["failed"] += len(failed)
+            for finding, code in failed:
+                self.failed_ids.append(finding["Id"])
+                self.errors[code] = self.errors.get(code, 0) + 1
+
+    def close(self, **kwargs):
+        if self.executor:
+            wait(self.pending)
+            self.executor.shutdown()
+            for future in self.pending:
+                future.result()
+            self.pending = set()
+            self.executor = None
+        stats = self.stats
+        elapsed = time.monotonic() - self.started if self.started else 0
+        print(f"Wrote {stats['imported']} results to SecurityHub in {stats['requests']} requests ({stats['batches']} batches, {stats['bytes'] / 1024 / 1024:.1f} MB) in {elapsed:.1f} seconds, {stats['retried']} findings were retried")
+        if stats["failed"]:
+            errors = ", ".join(f"{code}: {count}" for code, count in sorted(self.errors.items()))
+            print(f"Failed to import {stats['failed']} results to SecurityHub ({errors})")
+            raise RuntimeError(f"{stats['failed']} findings were not imported to SecurityHub ({errors})")
+        return
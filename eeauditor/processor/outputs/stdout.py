@@ -24,17 +24,19 @@ from processor.outputs.output_base import ElectricEyeOutput
 class StdoutProvider(object):
     __provider__ = "stdout"
 
+    def __init__(self):
+        self.checkedIds = set()
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
-        checkedIds = []
+        self.write_batch(findings=findings)
+        return self.close()
 
+    def write_batch(self, findings: list, **kwargs):
         for finding in findings:
-            parsedFinding = json.loads(json.dumps(finding))
-            if parsedFinding["Id"] not in checkedIds:
-                checkedIds.append(parsedFinding["Id"])
+            if finding["Id"] not in self.checkedIds:
+                self.checkedIds.add(finding["Id"])
                 print(json.dumps(finding,default=str))
-            else:
-                del parsedFinding
-                continue
-    
-        del checkedIds
-        return True
\ No newline at end of file
+
+    def close(self, **kwargs):
+        self.checkedIds.clear()
+        return True
@@ -0,0 +1,173 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import os
+import threading
+import time
+from telemetry import THROTTLE_ERROR_CODES
+
+# requests per second allowed per (account, Region, service) unless configured otherwise
+DEFAULT_RATE = float(os.environ.get("ELECTRICEYE_RATE_LIMIT", 20))
+# services with a lower default, their APIs throttle well below DEFAULT_RATE
+SERVICE_RATES = {
+    "ssm": 10,
+    "support": 5,
+}
+# requests that may be sent at once before the rate applies, as a multiple of the rate
+BURST_FACTOR = 2
+# the adaptive rate never drops below this, however often AWS throttles
+MIN_RATE = 0.5
+# on a throttle the rate is multiplied by this, every success adds RECOVERY_STEP of the limit back
+THROTTLE_BACKOFF = 0.5
+RECOVERY_STEP = 0.02
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket whose rate adapts to throttling (AIMD)
+
+        `limit` is the configured ceiling, `rate` the current rate. Every throttle response
+        halves the rate, every successful response raises it by a fraction of the limit.
+    """
+
+    def __init__(self, limit, burst=None):
+        self.limit = float(limit)
+        self.rate = self.limit
+        self.burst = float(burst or max(self.limit * BURST_FACTOR, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.throttles = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Takes a token, sleeping until one is available. Returns the seconds waited"""
+        with self._lock:
+            self._refill(time.monotonic())
+            # reserve the token now so concurrent callers queue up behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+            if wait:
+                self.delayed += 1
+                self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def throttled(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.throttles += 1
+            self.rate = max(MIN_RATE, self.rate * THROTTLE_BACKOFF)
+            # drop the saved up burst as well, AWS just told us it is not available
+            self.tokens = min(self.tokens, 0)
+
+    def succeeded(self):
+        if self.rate >= self.limit:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.limit, self.rate + self.limit * RECOVERY_STEP)
+
+
+class RateLimiter(object):
+    """Process-wide token buckets per (account, Region, service), attached to pooled clients
+
+        Every HTTP attempt of a client takes a token from its bucket (botocore before-send) and
+        every response adjusts the bucket (response-received), so all Auditors and threads
+        using the same service share one limit. Accounts are told apart by their Session, as
+        every account audited in a process has its own. Buckets are never shared between
+        processes: organization mode audits each account in exactly one process, and a forked
+        child starts with fresh buckets.
+    """
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.configure(rates, default_rate)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def configure(self, rates=None, default_rate=None):
+        """Sets the requests per second of services, e.g. {"ec2": 10}. Existing buckets are rebuilt"""
+        with self._lock:
+            self.rates = dict(SERVICE_RATES)
+            self.rates.update(rates or {})
+            self.default_rate = float(default_rate or getattr(self, "default_rate", DEFAULT_RATE))
+            self._buckets = {}
+
+    def limit(self, service_name):
+        return float(self.rates.get(service_name, self.default_rate))
+
+    def bucket(self, account, region_name, service_name):
+        key = (account, region_name, service_name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(key, TokenBucket(self.limit(service_name)))
+        return bucket
+
+    def attach(self, client, session, service_name, region_name):
+        """ClientPool hook: rate limits every request of `client`"""
+        # the account is represented by its Session, see the class docstring
+        account = id(session)
+
+        def before_send(**kwargs):
+            self.bucket(account, region_name, service_name).acquire()
+
+        def response_received(parsed_response=None, **kwargs):
+            bucket = self.bucket(account, region_name, service_name)
+            error_code = ((parsed_response or {}).get("Error") or {}).get("Code")
+            if error_code in THROTTLE_ERROR_CODES:
+                bucket.throttled()
+            elif not error_code:
+                bucket.succeeded()
+
+        client.meta.events.register("before-send", before_send, unique_id="eeauditor-rate-limiter-before-send")
+        client.meta.events.register("response-received", response_received, unique_id="eeauditor-rate-limiter-response-received")
+
+    def stats(self):
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return {
+            "delayed": sum(bucket.delayed for bucket in buckets),
+            "waited": round(sum(bucket.waited for bucket in buckets), 3),
+            "throttles": sum(bucket.throttles for bucket in buckets),
+        }
+
+
+# the limiter shared by every client of this process
+limiter = RateLimiter()
+
+
+def install(pool):
+    """Rate limits every client of a ClientPool with the process-wide limiter"""
+    pool.add_client_hook(limiter.attach)
+
+
+def configure(rates=None, default_rate=None):
+    limiter.configure(rates, default_rate)
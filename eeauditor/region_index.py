@@ -0,0 +1,218 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+here = os.path.abspath(os.path.dirname(__file__))
+
+# bundled fallback used until (and whenever) a fresh index cannot be built from SSM
+SEED_PATH = os.path.join(here, "region_index_seed.json")
+# where the refreshed index is persisted between runs
+DEFAULT_INDEX_PATH = os.environ.get(
+    "ELECTRICEYE_REGION_INDEX_PATH",
+    os.path.join(os.path.expanduser("~"), ".electriceye", "region_index.json"),
+)
+# refresh the index from SSM once it is older than this (seconds), defaults to 7 days
+DEFAULT_TTL = int(os.environ.get("ELECTRICEYE_REGION_INDEX_TTL", 7 * 24 * 60 * 60))
+
+# Handle the weird v2 services names - global service overrides for SSM lookup
+SSM_SERVICE_NAMES = {
+    "kinesisanalyticsv2": "kinesisanalytics",
+    "macie2": "macie",
+    "elbv2": "elb",
+    "wafv2": "waf",
+}
+
+# Check registry names whose client (and therefore endpoints) differ from the name, used to build the seed
+BOTOCORE_SERVICE_NAMES = {
+    "cloudhsm": "cloudhsmv2",
+}
+
+
+class RegionIndex(object):
+    """Service -> Region availability for the AWS Commercial Partition
+
+        Lookups are answered from an in-memory dict of sets. The index is loaded from
+        DEFAULT_INDEX_PATH if present, otherwise from the bundled seed file, and is
+        rebuilt from the SSM global-infrastructure parameters on a background thread
+        once it is older than the TTL. Services (or Regions) the index does not know
+        about are always treated as available, so a stale index never hides Checks.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, ttl=DEFAULT_TTL, seed_path=SEED_PATH, ssm_client=None):
+        self.path = path
+        self.ttl = ttl
+        self.seed_path = seed_path
+        self.ssm_client = ssm_client
+        self.generated_at = 0
+        self.source = None
+        self._services = {}
+        self._regions = frozenset()
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        for candidate in (self.path, self.seed_path):
+            if not candidate or not os.path.isfile(candidate):
+                continue
+            try:
+                with open(candidate) as f:
+                    self._apply(json.load(f))
+                return True
+            except (IOError, ValueError, KeyError) as e:
+                print(f"Failed to load Region index {candidate} with exception {e}")
+        return False
+
+    def _apply(self, document):
+        services = {
+            service: frozenset(regions) for service, regions in document["services"].items()
+        }
+        known_regions = set()
+        for regions in services.values():
+            known_regions.update(regions)
+        # swap whole objects so concurrent lookups never see a half-built index
+        self._services = services
+        self._regions = frozenset(known_regions)
+        self.generated_at = document.get("generated_at", 0)
+        self.source = document.get("source")
+
+    def is_stale(self):
+        return time.time() - self.generated_at > self.ttl
+
+    def lookup_name(self, service):
+        return SSM_SERVICE_NAMES.get(service, service)
+
+    def regions(self, service):
+        """Returns the Regions a service is available in, or None if the service is not indexed"""
+        regions = self._services.get(self.lookup_name(service))
+        if regions is None:
+            return None
+        return sorted(regions)
+
+    def is_available(self, service, region):
+        regions = self._services.get(self.lookup_name(service))
+        if regions is None or region not in self._regions:
+            return True
+        return region in regions
+
+    def refresh(self, services):
+        """Rebuilds the index for `services` from SSM and persists it"""
+        if not self.ssm_client:
+            return False
+        updated = {service: sorted(regions) for service, regions in self._services.items()}
+        for service in sorted({self.lookup_name(s) for s in services}):
+            try:
+                paginator = self.ssm_client.get_paginator("get_parameters_by_path")
+                regions = []
+                for page in paginator.paginate(
+                    Path=f"/aws/service/global-infrastructure/services/{service}/regions",
+                    PaginationConfig={"PageSize": 10},
+                ):
+                    regions.extend(parameter["Value"] for parameter in page["Parameters"])
+            except Exception as e:
+                print(f"Failed to refresh Region availability for {service} with exception {e}")
+                continue
+            # SSM does not know every service name we register, never record those as unavailable
+            if regions:
+                updated[service] = sorted(regions)
+
+        document = {"generated_at": time.time(), "source": "ssm", "services": updated}
+        self._apply(document)
+        self.save(document)
+        return True
+
+    def save(self, document):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(document, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except (IOError, OSError) as e:
+            print(f"Failed to save Region index to {self.path} with exception {e}")
+
+    def refresh_in_background(self, services):
+        """Starts a single background refresh if the index is stale, lookups keep using current data"""
+        with self._lock:
+            if not self.is_stale() or not self.ssm_client:
+                return None
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            self._refresh_thread = threading.Thread(
+                target=self.refresh,
+                args=(list(services),),
+                name="eeauditor-region-index",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+
+def build_seed(services):
+    """Builds a seed document for `services` from the endpoint data bundled with botocore"""
+    import boto3
+
+    session = boto3.session.Session()
+    endpoints = session._session.get_component("data_loader").load_data("endpoints")
+    partition = [p for p in endpoints["partitions"] if p["partition"] == "aws"][0]
+    partition_regions = set(partition["regions"])
+
+    seed = {}
+    for service in sorted(set(services)):
+        try:
+            model = session._session.get_service_model(BOTOCORE_SERVICE_NAMES.get(service, service))
+        except Exception:
+            continue
+        service_endpoints = partition["services"].get(model.endpoint_prefix, {}).get("endpoints", {})
+        regions = sorted(partition_regions.intersection(service_endpoints))
+        # global services (IAM, CloudFront...) are reachable from every Region
+        if any("global" in endpoint for endpoint in service_endpoints):
+            regions = sorted(partition_regions)
+        if regions:
+            seed[SSM_SERVICE_NAMES.get(service, service)] = regions
+
+    return {
+        "generated_at": time.time(),
+        "generated": datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat(),
+        "source": "botocore-endpoints",
+        "services": seed,
+    }
+
+
+def registered_services(search_path=os.path.join(here, "auditors", "aws")):
+    """Finds every service name used with @registry.register_check() in the Auditors"""
+    services = set()
+    for file_name in os.listdir(search_path):
+        if file_name.endswith(".py"):
+            with open(os.path.join(search_path, file_name)) as f:
+                services.update(re.findall(r"register_check\(\s*[\"']([^\"']+)[\"']", f.read()))
+    return services
+
+
+if __name__ == "__main__":
+    # regenerate the bundled seed: python3 eeauditor/region_index.py > eeauditor/region_index_seed.json
+    json.dump(build_seed(registered_services()), sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
@@ -0,0 +1,220 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import base64
+from collections import deque
+import datetime
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from botocore.awsrequest import AWSResponse
+from botocore.response import StreamingBody
+
+# error code of the ClientError raised when a replayed call was never recorded
+REPLAY_MISSING_ERROR_CODE = "ElectricEyeReplayMissing"
+
+
+def encode(value):
+    """Turns a botocore request or response into something json can store"""
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def decode(value):
+    """Rebuilds, as new objects, what encode() stored"""
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return datetime.datetime.fromisoformat(value["__datetime__"])
+        if "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        if "__stream__" in value:
+            data = base64.b64decode(value["__stream__"])
+            return StreamingBody(io.BytesIO(data), len(data))
+        return {key: decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
+
+def request_key(operation_name, params):
+    """Identifies an API call by its operation and parameters"""
+    canonical = json.dumps(encode(params), sort_keys=True, default=str)
+    return hashlib.sha1(f"{operation_name}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def recording_path(path, service_name, region_name):
+    return os.path.join(path, service_name, f"{region_name or 'global'}.jsonl")
+
+
+def _before_parameter_build(params, model, context, **kwargs):
+    context["eeauditor_replay_key"] = request_key(model.name, params)
+    context["eeauditor_replay_params"] = params
+    context["eeauditor_replay_started"] = time.perf_counter()
+
+
+class Recorder(object):
+    """Appends every API call and its parsed response to <path>/<service>/<region>.jsonl
+
+        Recording happens after botocore parsed the response, so what is stored is exactly
+        what the Auditors receive (errors included). Streaming bodies are read into memory
+        and handed to the caller as a fresh stream.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def attach(self, client, session, service_name, region_name):
+        """ClientPool hook: records every call of `client`"""
+        path = recording_path(self.path, service_name, region_name)
+
+        def after_call(http_response, parsed, model, context, **kwargs):
+            if "eeauditor_replay_key" not in context:
+                return
+            response = dict(parsed)
+            for key, value in parsed.items():
+                if isinstance(value, StreamingBody):
+                    # the caller gets a fresh stream over the data that was read for the recording
+                    data = value.read()
+                    parsed[key] = StreamingBody(io.BytesIO(data), len(data))
+                    response[key] = {"__stream__": base64.b64encode(data).decode("ascii")}
+            entry = {
+                "operation": model.name,
+                "key": context["eeauditor_replay_key"],
+                "params": context["eeauditor_replay_params"],
+                "status_code": http_response.status_code,
+                "elapsed": round(time.perf_counter() - context["eeauditor_replay_started"], 6),
+                "response": response,
+            }
+            line = json.dumps(encode(entry), default=str) + "\n"
+            with self._lock:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # one write per line in append mode, so several processes can record to the same files
+                with open(path, "a") as f:
+                    f.write(line)
+                self.calls += 1
+
+        client.meta.events.register("before-parameter-build.*.*", _before_parameter_build, unique_id="eeauditor-record-before-parameter-build")
+        client.meta.events.register("after-call.*.*", after_call, unique_id="eeauditor-record-after-call")
+
+
+class Replayer(object):
+    """Answers every API call from a recording made with Recorder, nothing is sent to AWS
+
+        Calls are matched by operation and parameters. Calls whose parameters differ from
+        the recording (e.g. a time window computed from the current time) get the recorded
+        responses of the same operation in the order they were recorded. `latency` is slept
+        before every response, either seconds or "recorded" to replay the recorded latency.
+    """
+
+    def __init__(self, path, latency=0):
+        self.path = path
+        self.latency = latency
+        self.calls = 0
+        self.misses = 0
+        self._recordings = {}
+        self._lock = threading.Lock()
+
+    def _load(self, service_name, region_name):
+        key = (service_name, region_name)
+        with self._lock:
+            recording = self._recordings.get(key)
+            if recording is not None:
+                return recording
+            recording = {"by_key": {}, "by_operation": {}}
+            path = recording_path(self.path, service_name, region_name)
+            if os.path.isfile(path):
+                with open(path) as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        entry = json.loads(line)
+                        recording["by_key"].setdefault(entry["key"], deque()).append(entry)
+                        recording["by_operation"].setdefault(entry["operation"], deque()).append(entry)
+            self._recordings[key] = recording
+            return recording
+
+    def lookup(self, service_name, region_name, operation_name, key):
+        """Returns the recorded entry for a call, or None if the operation was never recorded"""
+        recording = self._load(service_name, region_name)
+        with self._lock:
+            self.calls += 1
+            entries = recording["by_key"].get(key)
+            if entries:
+                # identical calls get the recorded answers in order, the last one is kept for any further calls
+                return entries.popleft() if len(entries) > 1 else entries[0]
+            entries = recording["by_operation"].get(operation_name)
+            if entries:
+                # the parameters changed since the recording, cycle through the operation's answers
+                entry = entries[0]
+                entries.rotate(-1)
+                return entry
+            self.misses += 1
+            return None
+
+    def attach(self, client, session, service_name, region_name):
+        """ClientPool hook: answers every call of `client` from the recording"""
+
+        def before_call(model, context, **kwargs):
+            entry = self.lookup(service_name, region_name, model.name, context.get("eeauditor_replay_key"))
+            if entry is None:
+                parsed = {
+                    "Error": {
+                        "Code": REPLAY_MISSING_ERROR_CODE,
+                        "Message": f"{service_name}.{model.name} in {region_name} was not recorded in {self.path}",
+                    },
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                }
+                return AWSResponse(None, 400, {}, None), parsed
+            latency = entry.get("elapsed", 0) if self.latency == "recorded" else self.latency
+            if latency:
+                time.sleep(latency)
+            # every caller gets its own copy, e.g. a fresh stream
+            parsed = decode(entry["response"])
+            return AWSResponse(None, entry["status_code"], {}, None), parsed
+
+        client.meta.events.register("before-parameter-build.*.*", _before_parameter_build, unique_id="eeauditor-replay-before-parameter-build")
+        client.meta.events.register("before-call.*.*", before_call, unique_id="eeauditor-replay-before-call")
+
+
+def install_recorder(pool, path):
+    """Records every call of every client of a ClientPool to `path`, returns the Recorder"""
+    recorder = Recorder(path)
+    pool.add_client_hook(recorder.attach)
+    return recorder
+
+
+def install_replayer(pool, path, latency=0):
+    """Answers every call of every client of a ClientPool from `path`, returns the Replayer"""
+    if not os.path.isdir(path):
+        raise ValueError(f"{path} is not a directory recorded with --record")
+    replayer = Replayer(path, latency=latency)
+    pool.add_client_hook(replayer.attach)
+    return replayer
@@ -0,0 +1,198 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from concurrent.futures import Future
+import json
+import threading
+
+# how long a Check waits for another Check that is already fetching the same cache key
+LEASE_TIMEOUT = 60
+
+
+class _Lease(object):
+    """Marks a cache key that a Check is currently fetching"""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.event = threading.Event()
+
+
+class RunCache(object):
+    """API response cache shared by every Check of a single run
+
+        Checks keep using the `cache` dict-style interface (`cache.get("describe_db_instances")`
+        and `cache["describe_db_instances"] = ...`) through an AuditorCache view, which keys
+        entries by the Auditor, Account and Region so helpers of different Auditors never
+        collide. A miss hands the caller a lease on the key, Checks asking for the same key
+        while it is being fetched wait for that result instead of repeating the API calls.
+
+        `call()` and `paginate()` cache boto3 calls directly, keyed by (client, operation, params).
+    """
+
+    def __init__(self, lease_timeout=LEASE_TIMEOUT):
+        self.lease_timeout = lease_timeout
+        self._lock = threading.Lock()
+        self._values = {}
+        self._leases = {}
+        self._calls = {}
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+
+    def view(self, namespace, incremental=None):
+        """Returns the dict-style cache handed to a single Check execution"""
+        return AuditorCache(self, namespace, incremental)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "deduplicated": self.deduplicated,
+                "entries": len(self._values) + len(self._calls),
+            }
+
+    def _get(self, key, owner, default):
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+            lease = self._leases.get(key)
+            if lease is None or lease.owner is owner:
+                self._leases[key] = lease or _Lease(owner)
+                self.misses += 1
+                return default
+
+        # another Check is fetching this key right now - wait for its result
+        lease.event.wait(self.lease_timeout)
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                self.deduplicated += 1
+                return self._values[key]
+            self.misses += 1
+            return default
+
+    def _set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+            lease = self._leases.pop(key, None)
+        if lease:
+            lease.event.set()
+
+    def _release(self, owner):
+        """Drops every lease held by `owner`, waking up anyone waiting on those keys"""
+        with self._lock:
+            released = [key for key, lease in self._leases.items() if lease.owner is owner]
+            leases = [self._leases.pop(key) for key in released]
+        for lease in leases:
+            lease.event.set()
+
+    def _call_key(self, client, operation_name, params):
+        return (
+            client.meta.service_model.service_name,
+            client.meta.region_name,
+            client.meta.endpoint_url,
+            operation_name,
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+    def _dedupe(self, key, fetch):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = Future()
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.hits += 1
+                if not future.done():
+                    self.deduplicated += 1
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(fetch())
+        except Exception as e:
+            # failed calls are not cached so a later Check can retry them
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_exception(e)
+        return future.result()
+
+    def call(self, client, operation_name, **params):
+        """Returns the (shared) response of `client.<operation_name>(**params)`"""
+        return self._dedupe(
+            self._call_key(client, operation_name, params),
+            lambda: getattr(client, operation_name)(**params),
+        )
+
+    def paginate(self, client, operation_name, result_key, **params):
+        """Returns every `result_key` item across all pages of a paginated operation"""
+
+        def fetch():
+            results = []
+            for page in client.get_paginator(operation_name).paginate(**params):
+                results.extend(page.get(result_key, []))
+            return results
+
+        return self._dedupe(
+            self._call_key(client, operation_name, dict(params, __paginate__=result_key)),
+            fetch,
+        )
+
+
+class AuditorCache(object):
+    """Dict-style view of a RunCache handed to one Check execution as its `cache`
+
+        In incremental mode values are passed through the Check's IncrementalCheck, which
+        hides the resources that did not change since they were last evaluated. The shared
+        RunCache always holds the complete values.
+    """
+
+    def __init__(self, run_cache, namespace, incremental=None):
+        self.run_cache = run_cache
+        self.namespace = namespace
+        self.incremental = incremental
+
+    def get(self, key, default=None):
+        value = self.run_cache._get((self.namespace, key), self, default)
+        if self.incremental and value is not default:
+            return self.incremental.filter(value)
+        return value
+
+    def __getitem__(self, key):
+        value = self.run_cache._get((self.namespace, key), self, KeyError)
+        if value is KeyError:
+            raise KeyError(key)
+        if self.incremental:
+            return self.incremental.filter(value)
+        return value
+
+    def __setitem__(self, key, value):
+        self.run_cache._set((self.namespace, key), value)
+
+    def __contains__(self, key):
+        with self.run_cache._lock:
+            return (self.namespace, key) in self.run_cache._values
+
+    def release(self):
+        """Called once the Check is done so keys it never filled can be fetched by others"""
+        self.run_cache._release(self)
@@ -0,0 +1,205 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import datetime
+import json
+import os
+import sys
+import click
+from telemetry import Telemetry
+
+# cost given to Checks without a runtime in the run report, when the report has no runtimes at all
+DEFAULT_RUNTIME = 1.0
+
+
+def unit_key(unit):
+    """(Auditor, Check, Region) of a CheckUnit, what a shard is assigned"""
+    return (unit.check.__module__.rpartition(".")[2], unit.check_name, unit.awsRegion)
+
+
+def load_runtimes(path):
+    """Reads {(auditor, check_name, region): seconds} from a run report written with --run-report"""
+    with open(path) as f:
+        report = json.load(f)
+    runtimes = {}
+    for record in report.get("checks", []):
+        if record.get("skipped"):
+            continue
+        key = (record["auditor"], record["check_name"], record["region"])
+        # the same Check of several accounts (organization mode) counts once, at its slowest
+        runtimes[key] = max(runtimes.get(key, 0.0), float(record.get("wall_time") or 0.0))
+    return runtimes
+
+
+class Shard(object):
+    """One of `count` shards of a run, selecting its CheckUnits deterministically
+
+        Every (Auditor, Check, Region) is assigned to exactly one shard. Units are handed out
+        slowest first to the shard with the least estimated runtime so far (longest processing
+        time first), using the runtimes of a previous run report. Checks without a runtime
+        cost as much as the average of the same Check in other Regions, or the median of all
+        known runtimes. Every shard computes the same assignment from the same units and
+        report, so all shards of a run must be given the same run report.
+    """
+
+    def __init__(self, index, count, runtimes=None):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"shard {index}/{count} must be between 1/{count} and {count}/{count}")
+        self.index = index
+        self.count = count
+        self.runtimes = runtimes or {}
+        known = sorted(self.runtimes.values())
+        self.default_runtime = known[len(known) // 2] if known else DEFAULT_RUNTIME
+        self.by_check = {}
+        for (auditor, check_name, region), seconds in self.runtimes.items():
+            self.by_check.setdefault((auditor, check_name), []).append(seconds)
+
+    @classmethod
+    def parse(cls, value, runtimes_path=None):
+        """Builds a Shard from "i/N" as given on the command line"""
+        index, _, count = value.partition("/")
+        try:
+            index, count = int(index), int(count)
+        except ValueError:
+            raise ValueError(f"{value} is not in the form INDEX/COUNT e.g. 1/4")
+        return cls(index, count, load_runtimes(runtimes_path) if runtimes_path else None)
+
+    def cost(self, key):
+        if key in self.runtimes:
+            return self.runtimes[key]
+        other_regions = self.by_check.get(key[:2])
+        if other_regions:
+            return sum(other_regions) / len(other_regions)
+        return self.default_runtime
+
+    def assign(self, keys):
+        """Returns {key: shard index} for every (Auditor, Check, Region) key"""
+        costs = {key: round(self.cost(key), 6) for key in set(keys)}
+        loads = [0.0] * self.count
+        owners = {}
+        for key in sorted(costs, key=lambda key: (-costs[key], key)):
+            shard = min(range(self.count), key=lambda i: (loads[i], i))
+            owners[key] = shard + 1
+            loads[shard] += costs[key]
+        return owners
+
+    def select(self, units):
+        """Returns the CheckUnits of this shard, in their original order"""
+        owners = self.assign(unit_key(unit) for unit in units)
+        selected = [unit for unit in units if owners[unit_key(unit)] == self.index]
+        estimate = sum(self.cost(unit_key(unit)) for unit in selected)
+        print(f"Shard {self.index}/{self.count} runs {len(selected)} of {len(units)} Checks, estimated at {estimate:.0f} seconds")
+        return selected
+
+    def __repr__(self):
+        return f"Shard({self.index}/{self.count})"
+
+
+def _newer(finding, other):
+    return str(finding.get("UpdatedAt", "")) >= str(other.get("UpdatedAt", ""))
+
+
+def merge_findings(documents):
+    """Merges lists of ASFF findings, keeping the most recently updated finding of every Id"""
+    merged = {}
+    for findings in documents:
+        for finding in findings:
+            finding_id = finding.get("Id")
+            if finding_id not in merged or _newer(finding, merged[finding_id]):
+                merged[finding_id] = finding
+    return list(merged.values())
+
+
+def merge_reports(reports):
+    """Merges run reports into one, e.g. to balance the shards of the next run"""
+    telemetry = Telemetry()
+    seen = set()
+    started = []
+    finished = []
+    for report in reports:
+        started.append(datetime.datetime.fromisoformat(report["started"]).timestamp())
+        finished.append(datetime.datetime.fromisoformat(report["finished"]).timestamp())
+        for record in report.get("checks", []):
+            key = (record["auditor"], record["check_name"], record["account"], record["region"])
+            if key not in seen:
+                seen.add(key)
+                telemetry.extend([record])
+    if started:
+        telemetry.started, telemetry.finished = min(started), max(finished)
+    return telemetry.report()
+
+
+def merge_csv(paths, output):
+    """Concatenates CSV outputs, keeping the first row of every finding Id"""
+    seen = set()
+    written = 0
+    with open(output, "w", newline="") as out:
+        writer = None
+        for path in paths:
+            with open(path, newline="") as f:
+                reader = csv.reader(f, dialect="excel")
+                header = next(reader, None)
+                if header is None:
+                    continue
+                if writer is None:
+                    writer = csv.writer(out, dialect="excel")
+                    writer.writerow(header)
+                for row in reader:
+                    if row and row[0] in seen:
+                        continue
+                    seen.add(row[0] if row else None)
+                    writer.writerow(row)
+                    written += 1
+    return written
+
+
+@click.command()
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("-o", "--output", required=True, help="File to write the merged result to")
+def main(inputs, output):
+    """Merges the JSON or CSV outputs, or the run reports, of the shards of a run
+
+        python3 eeauditor/sharding.py -o merged.json shard-1.json shard-2.json
+    """
+    if all(path.endswith(".csv") for path in inputs):
+        print(f"Merged {merge_csv(inputs, output)} findings into {output}")
+        return
+    documents = []
+    for path in inputs:
+        with open(path) as f:
+            documents.append(json.load(f))
+    if all(isinstance(document, dict) and "checks" in document for document in documents):
+        merged = merge_reports(documents)
+        description = f"{len(merged['checks'])} Checks"
+    elif all(isinstance(document, list) for document in documents):
+        merged = merge_findings(documents)
+        description = f"{len(merged)} findings"
+    else:
+        print("Inputs must all be JSON outputs (-o json), CSV outputs (-o csv) or run reports (--run-report)")
+        sys.exit(2)
+    temp_path = f"{output}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(merged, f, indent=2, default=str)
+    os.replace(temp_path, output)
+    print(f"Merged {description} from {len(inputs)} shards into {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# where run state (resource fingerprints, cached and sent findings) is kept between runs
+DEFAULT_STATE_PATH = os.environ.get(
+    "ELECTRICEYE_STATE_PATH",
+    os.path.join(os.path.expanduser("~"), ".electriceye", "state.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS check_state (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    eligible INTEGER NOT NULL,
+    evaluated_at REAL NOT NULL,
+    PRIMARY KEY (account, region, check_name)
+);
+CREATE TABLE IF NOT EXISTS resource_state (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    resource_arn TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    findings TEXT NOT NULL,
+    evaluated_at REAL NOT NULL,
+    PRIMARY KEY (account, region, check_name, resource_arn)
+);
+CREATE TABLE IF NOT EXISTS finding_state (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    finding_id TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    finding TEXT NOT NULL,
+    sent_at REAL NOT NULL,
+    PRIMARY KEY (account, region, check_name, finding_id)
+);
+CREATE TABLE IF NOT EXISTS finding_pending (
+    run_id TEXT NOT NULL,
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    finding_id TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    finding TEXT NOT NULL,
+    sent_at REAL NOT NULL,
+    archived INTEGER NOT NULL,
+    PRIMARY KEY (run_id, account, region, check_name, finding_id)
+);
+"""
+
+
+class StateStore(object):
+    """SQLite file holding the state ElectricEye keeps between runs
+
+        One connection is shared by every thread behind a lock. Several processes (e.g.
+        organization mode) may use the same file, SQLite serializes their writes.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def execute(self, sql, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def executescript(self, script):
+        with self._lock, self._connection:
+            self._connection.executescript(script)
+
+    def transaction(self, statements):
+        """Runs [(sql, parameters), ...] in one transaction"""
+        with self._lock, self._connection:
+            for sql, parameters in statements:
+                if isinstance(parameters, list):
+                    self._connection.executemany(sql, parameters)
+                else:
+                    self._connection.execute(sql, parameters)
+
+    def load_check(self, account, region, check_name):
+        """Returns (eligible, {resource_arn: (fingerprint, findings, evaluated_at)}) of a Check's last run"""
+        rows = self.execute(
+            "SELECT eligible FROM check_state WHERE account = ? AND region = ? AND check_name = ?",
+            (account, region, check_name),
+        )
+        if not rows:
+            return False, {}
+        resources = {
+            resource_arn: (fingerprint, json.loads(findings), evaluated_at)
+            for resource_arn, fingerprint, findings, evaluated_at in self.execute(
+                "SELECT resource_arn, fingerprint, findings, evaluated_at FROM resource_state WHERE account = ? AND region = ? AND check_name = ?",
+                (account, region, check_name),
+            )
+        }
+        return bool(rows[0][0]), resources
+
+    def save_check(self, account, region, check_name, eligible, resources):
+        """Replaces the state of a Check with {resource_arn: (fingerprint, findings, evaluated_at)}"""
+        key = (account, region, check_name)
+        self.transaction(
+            [
+                ("DELETE FROM resource_state WHERE account = ? AND region = ? AND check_name = ?", key),
+                (
+                    "INSERT OR REPLACE INTO check_state (account, region, check_name, eligible, evaluated_at) VALUES (?, ?, ?, ?, ?)",
+                    key + (int(eligible), time.time()),
+                ),
+                (
+                    "INSERT INTO resource_state (account, region, check_name, resource_arn, fingerprint, findings, evaluated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        key + (resource_arn, fingerprint, json.dumps(findings, default=str), evaluated_at)
+                        for resource_arn, (fingerprint, findings, evaluated_at) in resources.items()
+                    ],
+                ),
+            ]
+        )
+
+    def load_findings(self, account, region, check_name):
+        """Returns {finding_id: (digest, sent_at)} of the findings last sent for a Check"""
+        return {
+            finding_id: (digest, sent_at)
+            for finding_id, digest, sent_at in self.execute(
+                "SELECT finding_id, digest, sent_at FROM finding_state WHERE account = ? AND region = ? AND check_name = ?",
+                (account, region, check_name),
+            )
+        }
+
+    def load_finding(self, account, region, check_name, finding_id):
+        rows = self.execute(
+            "SELECT finding FROM finding_state WHERE account = ? AND region = ? AND check_name = ? AND finding_id = ?",
+            (account, region, check_name, finding_id),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,311 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from contextlib import contextmanager
+import datetime
+import json
+import os
+import threading
+import time
+from timeouts import CheckTimeout
+
+# error codes botocore (and the Auditors) treat as API throttling
+THROTTLE_ERROR_CODES = frozenset(
+    [
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "RequestThrottled",
+        "SlowDown",
+        "EC2ThrottledException",
+    ]
+)
+
+# the CheckStats of the Check currently running on this thread, if any
+_current = threading.local()
+
+
+class CheckStats(object):
+    """Performance counters of a single Check execution"""
+
+    def __init__(self, unit):
+        self.check_name = unit.check_name
+        self.service_name = unit.service_name
+        self.auditor = unit.check.__module__.rpartition(".")[2]
+        self.account = unit.awsAccountId
+        self.region = unit.awsRegion
+        self.wall_time = 0.0
+        self.active_time = 0.0
+        self.api_calls = {}
+        self.bytes_received = 0
+        self.retries = 0
+        self.throttles = 0
+        self.api_errors = 0
+        self.findings = 0
+        self.exception = None
+        self.skipped = None
+        self.timed_out = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def active(self):
+        """Attributes the API calls made inside the block to this Check and times it
+
+            Only the Check's own code runs inside the block, time spent waiting for a consumer
+            of its findings is not counted.
+        """
+        previous = getattr(_current, "stats", None)
+        _current.stats = self
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.active_time += time.perf_counter() - started
+            _current.stats = previous
+
+    def record_call(self, operation_name, retries=0, error=False):
+        with self._lock:
+            self.api_calls[operation_name] = self.api_calls.get(operation_name, 0) + 1
+            self.retries += retries
+            if error:
+                self.api_errors += 1
+
+    def record_response(self, size, throttled=False):
+        with self._lock:
+            self.bytes_received += size
+            if throttled:
+                self.throttles += 1
+
+    def to_dict(self):
+        return {
+            "check_name": self.check_name,
+            "service_name": self.service_name,
+            "auditor": self.auditor,
+            "account": self.account,
+            "region": self.region,
+            "wall_time": round(self.wall_time, 6),
+            "active_time": round(self.active_time, 6),
+            "api_calls": dict(sorted(self.api_calls.items())),
+            "api_call_count": sum(self.api_calls.values()),
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+            "throttles": self.throttles,
+            "api_errors": self.api_errors,
+            "findings": self.findings,
+            "exception": self.exception,
+            "skipped": self.skipped,
+            "timed_out": self.timed_out,
+        }
+
+
+def _retry_attempts(response):
+    return ((response or {}).get("ResponseMetadata") or {}).get("RetryAttempts", 0) or 0
+
+
+# botocore event handlers, registered once on every pooled client by install()
+def on_after_call(http_response, parsed, model, **kwargs):
+    """Called once per API call, error responses from AWS included"""
+    stats = getattr(_current, "stats", None)
+    if stats is not None:
+        stats.record_call(
+            model.name,
+            retries=_retry_attempts(parsed),
+            error=http_response.status_code >= 300,
+        )
+
+
+def on_after_call_error(exception, event_name, **kwargs):
+    """Called when an API call fails without a response, e.g. on connection errors"""
+    stats = getattr(_current, "stats", None)
+    if stats is not None:
+        stats.record_call(
+            event_name.rpartition(".")[2],
+            retries=_retry_attempts(getattr(exception, "response", None)),
+            error=True,
+        )
+
+
+def on_response_received(response_dict, parsed_response, **kwargs):
+    """Called for every HTTP attempt, including the ones that are retried"""
+    stats = getattr(_current, "stats", None)
+    if stats is None or response_dict is None:
+        return
+    body = response_dict.get("body")
+    if isinstance(body, (bytes, bytearray)):
+        size = len(body)
+    else:
+        # streaming bodies are not read here, rely on the header
+        size = int(response_dict.get("headers", {}).get("content-length", 0) or 0)
+    error_code = ((parsed_response or {}).get("Error") or {}).get("Code")
+    stats.record_response(size, throttled=error_code in THROTTLE_ERROR_CODES)
+
+
+def install(pool):
+    """Registers the telemetry event handlers on every client of a ClientPool"""
+    pool.register("after-call.*.*", on_after_call, unique_id="eeauditor-telemetry-after-call")
+    pool.register("after-call-error.*.*", on_after_call_error, unique_id="eeauditor-telemetry-after-call-error")
+    pool.register("response-received.*.*", on_response_received, unique_id="eeauditor-telemetry-response-received")
+
+
+class Telemetry(object):
+    """Collects CheckStats for a run and writes them as a JSON report or a Prometheus textfile"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+        self.checks = []
+
+    @contextmanager
+    def track(self, unit):
+        """Yields the CheckStats of one Check execution, exceptions are recorded and re-raised"""
+        stats = CheckStats(unit)
+        started = time.perf_counter()
+        try:
+            yield stats
+        except Exception as e:
+            stats.exception = f"{type(e).__name__}: {e}"
+            stats.timed_out = isinstance(e, CheckTimeout)
+            raise
+        finally:
+            stats.wall_time = time.perf_counter() - started
+            with self._lock:
+                self.checks.append(stats)
+
+    def timed_out(self):
+        """Returns the records of the Checks that were cancelled because they ran out of time"""
+        return [record for record in self.records() if record.get("timed_out")]
+
+    def skip(self, unit, reason):
+        """Records a Check that was not run"""
+        stats = CheckStats(unit)
+        stats.skipped = reason
+        with self._lock:
+            self.checks.append(stats)
+
+    def extend(self, records):
+        """Adds CheckStats dicts collected elsewhere, e.g. by organization mode worker processes"""
+        with self._lock:
+            self.checks.extend(records)
+
+    def records(self):
+        with self._lock:
+            return [stats if isinstance(stats, dict) else stats.to_dict() for stats in self.checks]
+
+    def report(self):
+        self.finished = self.finished or time.time()
+        checks = sorted(self.records(), key=lambda record: record["active_time"], reverse=True)
+        return {
+            "started": datetime.datetime.fromtimestamp(self.started, datetime.timezone.utc).isoformat(),
+            "finished": datetime.datetime.fromtimestamp(self.finished, datetime.timezone.utc).isoformat(),
+            "wall_time": round(self.finished - self.started, 6),
+            "totals": {
+                "checks": len(checks),
+                "failed_checks": sum(1 for record in checks if record["exception"]),
+                "skipped_checks": sum(1 for record in checks if record.get("skipped")),
+                "timed_out_checks": sum(1 for record in checks if record.get("timed_out")),
+                "findings": sum(record["findings"] for record in checks),
+                "api_calls": sum(record["api_call_count"] for record in checks),
+                "bytes_received": sum(record["bytes_received"] for record in checks),
+                "retries": sum(record["retries"] for record in checks),
+                "throttles": sum(record["throttles"] for record in checks),
+            },
+            "checks": checks,
+        }
+
+    def write_report(self, path):
+        _write_atomic(path, json.dumps(self.report(), indent=2, default=str))
+        print(f"Run report written to {path}")
+
+    def write_prometheus(self, path):
+        """Writes the report in the Prometheus text format, for the node_exporter textfile collector"""
+        report = self.report()
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP electriceye_{name} {help_text}")
+            lines.append(f"# TYPE electriceye_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+                lines.append(f"electriceye_{name}{{{label_text}}} {value}")
+
+        metric("run_duration_seconds", "Wall time of the whole run", [({}, report["wall_time"])])
+        metric("run_last_finished_timestamp_seconds", "When the run finished", [({}, round(self.finished, 3))])
+
+        def labels(record):
+            return {
+                "check": record["check_name"],
+                "service": record["service_name"],
+                "account": record["account"],
+                "region": record["region"],
+            }
+
+        for name, key, help_text in (
+            ("check_duration_seconds", "active_time", "Time spent running the Check"),
+            ("check_bytes_received", "bytes_received", "Bytes received from AWS APIs"),
+            ("check_retries", "retries", "AWS API call retries"),
+            ("check_throttles", "throttles", "Throttled AWS API responses"),
+            ("check_findings", "findings", "Findings emitted"),
+        ):
+            metric(name, help_text, [(labels(record), record[key]) for record in report["checks"]])
+        metric(
+            "check_failed",
+            "1 if the Check raised an exception",
+            [(labels(record), int(bool(record["exception"]))) for record in report["checks"]],
+        )
+        metric(
+            "check_skipped",
+            "1 if the Check was skipped, e.g. because its data failed to load",
+            [(labels(record), int(bool(record.get("skipped")))) for record in report["checks"]],
+        )
+        metric(
+            "check_timed_out",
+            "1 if the Check was cancelled because it ran out of time",
+            [(labels(record), int(bool(record.get("timed_out")))) for record in report["checks"]],
+        )
+        metric(
+            "check_api_calls",
+            "AWS API calls by operation",
+            [
+                (dict(labels(record), operation=operation), count)
+                for record in report["checks"]
+                for operation, count in record["api_calls"].items()
+            ],
+        )
+        _write_atomic(path, "\n".join(lines) + "\n")
+        print(f"Prometheus metrics written to {path}")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _write_atomic(path, content):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(content)
+    os.replace(temp_path, path)
@@ -0,0 +1,154 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import asyncio
+import threading
+
+import pytest
+
+from . import context
+import async_engine
+from async_engine import AsyncCache, AsyncEngine, AsyncRun, _BoundedClient
+from check_executor import CheckUnit
+from telemetry import CheckStats
+
+
+async def async_generator_check(cache, awsAccountId, awsRegion, awsPartition, clients):
+    for i in range(3):
+        await asyncio.sleep(0)
+        yield {"Id": f"{awsRegion}-agen-{i}"}
+
+
+async def coroutine_check(cache, awsAccountId, awsRegion, awsPartition, clients):
+    await asyncio.sleep(0)
+    return [{"Id": f"{awsRegion}-coroutine"}]
+
+
+async def failing_check(cache, awsAccountId, awsRegion, awsPartition, clients):
+    raise ValueError("boom")
+
+
+def sync_check(cache, awsAccountId, awsRegion, awsPartition):
+    for i in range(120):
+        yield {"Id": f"{awsRegion}-sync-{i}"}
+
+
+def unit(check, service_name="ec2", region="us-east-1"):
+    return CheckUnit(service_name, check.__name__, check, "012345678901", region, "aws")
+
+
+def run_sync(unit):
+    return unit.check(cache={}, awsAccountId=unit.awsAccountId, awsRegion=unit.awsRegion, awsPartition=unit.awsPartition)
+
+
+async def run_async(unit, run):
+    findings = []
+    result = unit.check(
+        cache=run.cache(unit.check.__module__),
+        awsAccountId=unit.awsAccountId,
+        awsRegion=unit.awsRegion,
+        awsPartition=unit.awsPartition,
+        clients=run.bind(unit.awsRegion),
+    )
+    return await async_engine.collect(result, findings)
+
+
+def test_is_async_check():
+    assert async_engine.is_async_check(async_generator_check)
+    assert async_engine.is_async_check(coroutine_check)
+    assert not async_engine.is_async_check(sync_check)
+
+
+def test_engine_runs_async_and_sync_checks_and_isolates_failures(capsys):
+    units = [unit(async_generator_check), unit(coroutine_check), unit(failing_check), unit(sync_check, service_name="s3")]
+    ids = [finding["Id"] for finding in AsyncEngine(workers=2).run(units, run_sync, run_async)]
+
+    assert sorted(ids) == sorted(
+        [f"us-east-1-agen-{i}" for i in range(3)]
+        + ["us-east-1-coroutine"]
+        + [f"us-east-1-sync-{i}" for i in range(120)]
+    )
+    assert "Failed to execute check failing_check with exception boom" in capsys.readouterr().out
+
+
+def test_closing_the_generator_ends_the_run():
+    units = [unit(sync_check, region=f"region-{i}") for i in range(20)]
+    findings = AsyncEngine(workers=2).run(units, run_sync, run_async)
+    assert next(findings)
+    findings.close()
+    assert not [thread for thread in threading.enumerate() if thread.name == "eeauditor-asyncio"]
+
+
+def test_cache_loads_each_key_once():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["vpc-1"]
+
+    async def main():
+        cache = AsyncCache()
+        results = await asyncio.gather(*(cache.load("vpcs", load) for _ in range(10)))
+        return cache, results
+
+    cache, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [["vpc-1"]] * 10
+    assert "vpcs" in cache and cache.get("vpcs") == ["vpc-1"]
+
+
+def test_bounded_client_limits_calls_in_flight_and_records_them():
+    in_flight = []
+    peak = []
+
+    class FakeClient(object):
+        async def describe_instances(self, **kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return {"Reservations": [], "ResponseMetadata": {"RetryAttempts": 1}}
+
+    stats = CheckStats(unit(coroutine_check))
+
+    async def main():
+        client = _BoundedClient(FakeClient(), asyncio.Semaphore(3))
+        async_engine.current_stats.set(stats)
+        await asyncio.gather(*(client.describe_instances() for _ in range(12)))
+
+    asyncio.run(main())
+    assert max(peak) == 3
+    assert stats.api_calls == {"describe_instances": 12}
+    assert stats.retries == 12
+
+
+def test_client_needs_aiobotocore(monkeypatch):
+    monkeypatch.setattr(async_engine, "get_aio_session", None)
+
+    async def main():
+        run = AsyncRun()
+        try:
+            await run.client("ec2", "us-east-1")
+        finally:
+            await run.close()
+
+    with pytest.raises(RuntimeError, match="aiobotocore"):
+        asyncio.run(main())
+
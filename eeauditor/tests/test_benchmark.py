@@ -0,0 +1,77 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import boto3
+
+from . import context
+from benchmark import SyntheticAccount, check_thresholds, run_benchmarks
+
+session = boto3.Session(region_name="us-east-1")._session
+
+
+def operation(service_name, operation_name):
+    return session.get_service_model(service_name).operation_model(operation_name)
+
+
+def test_listing_calls_return_the_profiled_number_of_resources():
+    account = SyntheticAccount(profile={"ec2": {"DescribeInstances": 25}}, default_count=3)
+    response = account.response(session, "ec2", operation("ec2", "DescribeInstances"))
+    assert len(response["Reservations"]) == 25
+    assert "NextToken" not in response
+    instance_ids = {reservation["Instances"][0]["InstanceId"] for reservation in response["Reservations"]}
+    assert len(instance_ids) == 25
+    # nested listings (dotted paginator result keys) are scaled too
+    distributions = account.response(session, "cloudfront", operation("cloudfront", "ListDistributions"))
+    assert len(distributions["DistributionList"]["Items"]) == 3
+    assert account.resources == {("ec2", "DescribeInstances"): 25, ("cloudfront", "ListDistributions"): 3}
+
+
+def test_per_resource_calls_describe_one_resource():
+    account = SyntheticAccount(default_count=50)
+    response = account.response(session, "s3", operation("s3", "GetBucketEncryption"))
+    assert len(response["ServerSideEncryptionConfiguration"]["Rules"]) == 1
+    assert account.resources == {}
+
+
+def test_benchmark_auditor_reports_rates_and_calls():
+    # in its own process like every benchmark, the synthetic answers never reach other tests
+    result = next(run_benchmarks(["Amazon_SNS_Auditor"], default_count=5))
+    assert result["checks"] > 0
+    assert result["findings"] > 0
+    assert result["api_calls"] > 0
+    assert result["resources"] == 5
+    assert result["findings_per_second"] > 0
+
+
+def test_check_thresholds():
+    results = [
+        {"auditor": "Amazon_SNS_Auditor", "findings_per_second": 10.0, "peak_rss_mb": 90.0, "api_calls_per_resource": 4.5},
+        {"auditor": "Amazon_SQS_Auditor", "error": "did not finish within 1800 seconds"},
+        {"auditor": "Amazon_EFS_Auditor", "findings_per_second": 1.0, "peak_rss_mb": 900.0, "api_calls_per_resource": 1.0},
+    ]
+    thresholds = {
+        "auditors": {
+            "Amazon_SNS_Auditor": {"min_findings_per_second": 5, "max_peak_rss_mb": 100, "max_api_calls_per_resource": 4},
+            "Amazon_SQS_Auditor": {"min_findings_per_second": 5},
+        }
+    }
+    violations = check_thresholds(results, thresholds)
+    assert len(violations) == 2
+    assert "API calls per resource" in violations[0]
+    assert "failed" in violations[1]
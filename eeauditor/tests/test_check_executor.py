@@ -0,0 +1,104 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+import time
+
+from . import context
+from check_executor import CheckExecutor, CheckUnit
+
+
+def make_unit(service_name, check_name, check):
+    return CheckUnit(
+        service_name=service_name,
+        check_name=check_name,
+        check=check,
+        awsAccountId="012345678901",
+        awsRegion="us-east-1",
+        awsPartition="aws",
+    )
+
+
+def run_unit(unit):
+    return unit.check(
+        cache={},
+        awsAccountId=unit.awsAccountId,
+        awsRegion=unit.awsRegion,
+        awsPartition=unit.awsPartition,
+    )
+
+
+def finding_check(finding_id, count=1):
+    def check(cache, awsAccountId, awsRegion, awsPartition):
+        for i in range(count):
+            yield {"Id": f"{finding_id}-{i}"}
+
+    return check
+
+
+def failing_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {"Id": "before-failure"}
+    raise ValueError("boom")
+
+
+def test_sequential_keeps_order():
+    units = [
+        make_unit("ec2", "a", finding_check("a", 2)),
+        make_unit("s3", "b", finding_check("b", 1)),
+    ]
+    ids = [f["Id"] for f in CheckExecutor().run(units, run_unit)]
+    assert ids == ["a-0", "a-1", "b-0"]
+
+
+def test_concurrent_yields_all_findings():
+    units = [make_unit(f"svc{i % 3}", f"check{i}", finding_check(f"check{i}", 5)) for i in range(12)]
+    ids = sorted(f["Id"] for f in CheckExecutor(workers=4).run(units, run_unit))
+    assert ids == sorted(f"check{i}-{j}" for i in range(12) for j in range(5))
+
+
+def test_exceptions_are_isolated_per_check():
+    units = [
+        make_unit("ec2", "failing", failing_check),
+        make_unit("ec2", "ok", finding_check("ok")),
+    ]
+    for workers in (1, 3):
+        ids = sorted(f["Id"] for f in CheckExecutor(workers=workers).run(units, run_unit))
+        assert ids == ["before-failure", "ok-0"]
+
+
+def test_service_concurrency_cap():
+    lock = threading.Lock()
+    running = {"ec2": 0}
+    peak = {"ec2": 0}
+
+    def slow_check(cache, awsAccountId, awsRegion, awsPartition):
+        with lock:
+            running["ec2"] += 1
+            peak["ec2"] = max(peak["ec2"], running["ec2"])
+        time.sleep(0.05)
+        with lock:
+            running["ec2"] -= 1
+        yield {"Id": "slow"}
+
+    units = [make_unit("ec2", f"slow{i}", slow_check) for i in range(8)]
+    units.append(make_unit("s3", "other", finding_check("other")))
+    executor = CheckExecutor(workers=6, service_concurrency={"ec2": 2})
+    findings = list(executor.run(units, run_unit))
+    assert len(findings) == 9
+    assert peak["ec2"] <= 2
@@ -0,0 +1,64 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import boto3
+from botocore.config import Config
+from botocore.stub import Stubber
+
+from . import context
+from client_pool import ClientPool
+
+
+def test_clients_are_created_on_first_use_and_shared():
+    pool = ClientPool()
+    session = boto3.Session(region_name="us-east-1")
+    ec2 = pool.client("ec2", session=session)
+    other_ec2 = pool.client("ec2", session=session)
+    assert len(pool) == 0
+    assert ec2.meta.region_name == "us-east-1"
+    assert other_ec2.resolve() is ec2.resolve()
+    assert len(pool) == 1
+    # another Region or Session gets its own client
+    assert pool.client("ec2", session=session, region_name="us-west-2").resolve() is not ec2.resolve()
+    assert pool.client("ec2", session=boto3.Session(region_name="us-east-1")).resolve() is not ec2.resolve()
+    assert len(pool) == 3
+
+
+def test_pool_configuration_is_merged_with_auditor_config():
+    pool = ClientPool(max_pool_connections=64, retry_mode="standard", max_attempts=3)
+    session = boto3.Session(region_name="us-east-1")
+    ssm = pool.get("ssm", session=session)
+    assert ssm.meta.config.max_pool_connections == 64
+    assert ssm.meta.config.retries["mode"] == "standard"
+
+    config = Config(retries={"max_attempts": 10, "mode": "adaptive"})
+    throttled_ssm = pool.get("ssm", session=session, config=config)
+    assert throttled_ssm is not ssm
+    assert throttled_ssm.meta.config.max_pool_connections == 64
+    assert throttled_ssm.meta.config.retries["mode"] == "adaptive"
+
+
+def test_lazy_client_can_be_stubbed():
+    pool = ClientPool()
+    sqs = pool.client("sqs", session=boto3.Session(region_name="us-east-1"))
+    stubber = Stubber(sqs)
+    stubber.add_response("list_queues", {"QueueUrls": []})
+    stubber.activate()
+    assert sqs.list_queues()["QueueUrls"] == []
+    stubber.deactivate()
@@ -0,0 +1,170 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from . import context
+import daemon
+from daemon import Daemon, DaemonStopping, interruptible, parse_duration
+
+
+@pytest.fixture(autouse=True)
+def fast_heartbeat(monkeypatch):
+    monkeypatch.setattr(daemon, "HEARTBEAT", 0.05)
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("15m") == 900
+    assert parse_duration("1h") == 3600
+    assert parse_duration("1D") == 86400
+    for value in ("0", "-5", "1w", "soon"):
+        with pytest.raises(ValueError):
+            parse_duration(value)
+
+
+def test_runs_each_auditor_on_its_interval_without_overlap():
+    runs = []
+    active = []
+
+    def run(names, stopping):
+        active.append(1)
+        assert len(active) == 1, "runs must never overlap"
+        runs.append((time.time(), tuple(names)))
+        time.sleep(0.05)
+        active.pop()
+        if len(runs) >= 6:
+            stopping.set()
+        return len(names)
+
+    app = Daemon(run, ["Fast_Auditor", "Slow_Auditor"], intervals={"Fast_Auditor": 0.1}, default_interval=60, jitter=0)
+    app.serve()
+
+    # both are due at start and share the first run, the slow one never comes back
+    assert runs[0][1] == ("Fast_Auditor", "Slow_Auditor")
+    assert all(names == ("Fast_Auditor",) for _, names in runs[1:])
+    fast, slow = app.schedules
+    assert fast.runs == len(runs) and slow.runs == 1
+    assert slow.next_run >= slow.last_started + 60
+    assert fast.last_findings == 1 and fast.last_error is None
+
+
+def test_failed_runs_are_recorded_and_rescheduled():
+    calls = []
+
+    def run(names, stopping):
+        calls.append(names)
+        if len(calls) == 2:
+            stopping.set()
+        raise RuntimeError("AccessDenied")
+
+    app = Daemon(run, ["Broken_Auditor"], default_interval=0.01, jitter=0)
+    app.serve()
+    schedule = app.schedules[0]
+    assert schedule.failures == 2
+    assert schedule.last_error == "RuntimeError: AccessDenied"
+
+
+def test_exiting_outputs_fail_only_their_run():
+    def run(names, stopping):
+        stopping.set()
+        raise SystemExit(2)
+
+    app = Daemon(run, ["Exiting_Auditor"], default_interval=0.01, jitter=0)
+    app.serve()
+    schedule = app.schedules[0]
+    assert schedule.failures == 1
+    assert schedule.last_error == "SystemExit: exit status 2"
+
+
+def test_jitter_delays_runs():
+    app = Daemon(lambda names, stopping: 0, ["A_Auditor"], jitter=30)
+    delays = [app.delay() for _ in range(100)]
+    assert all(0 <= delay <= 30 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_interruptible_ends_the_run():
+    stopping = threading.Event()
+
+    def findings():
+        yield {"Id": "1"}
+        stopping.set()
+        yield {"Id": "2"}
+
+    received = []
+    with pytest.raises(DaemonStopping):
+        for finding in interruptible(findings(), stopping):
+            received.append(finding)
+    assert received == [{"Id": "1"}]
+
+
+def test_stop_waits_for_the_run_in_progress():
+    finished = threading.Event()
+
+    def run(names, stopping):
+        stopping.wait(5)
+        finished.set()
+        raise DaemonStopping("the daemon is shutting down")
+
+    app = Daemon(run, ["A_Auditor"], jitter=0)
+    threading.Timer(0.1, app.stop).start()
+    app.serve()
+    assert finished.is_set()
+    assert app.schedules[0].failures == 0
+
+
+def test_health_and_status_endpoints():
+    started = threading.Event()
+    release = threading.Event()
+
+    def run(names, stopping):
+        started.set()
+        release.wait(5)
+        return 0
+
+    app = Daemon(run, ["A_Auditor"], jitter=0, health_port=0, health_host="127.0.0.1")
+    thread = threading.Thread(target=app.serve)
+    thread.start()
+    try:
+        assert started.wait(5)
+        base = f"http://127.0.0.1:{app.server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/health") as response:
+            assert response.status == 200
+            assert json.load(response) == {"status": "ok"}
+        with urllib.request.urlopen(f"{base}/status") as response:
+            status = json.load(response)
+        assert status["auditors"][0]["auditor"] == "A_Auditor"
+        assert status["auditors"][0]["running"] is True
+
+        app.stopping.set()
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(f"{base}/health")
+        assert e.value.code == 503
+    finally:
+        app.stop()
+        release.set()
+        thread.join(5)
+    assert app.server is None
@@ -55,3 +55,56 @@ def test_eeauditor_plugin_run_one_check():
     app.load_plugins(plugin_name="plugin1")
     for result in app.run_checks(requested_check_name="plugin_func_1"):
         assert result == {"SchemaVersion": "2018-10-08", "Id": "test-finding"}
+
+
+def test_check_register_collect():
+    from check_register import CheckRegister
+
+    registry = CheckRegister()
+    collected = {}
+    with CheckRegister.collect(collected):
+
+        @registry.register_check("regional")
+        def regional_check(cache, awsAccountId, awsRegion, awsPartition):
+            yield {"Id": "regional"}
+
+    assert list(collected["regional"]) == ["regional_check"]
+    assert "regional" not in CheckRegister.checks
+
+
+def test_multi_region_runs_global_services_once():
+    from check_executor import CheckUnit
+    from eeauditor import run_multi_region_checks
+
+    def finding_check(cache, awsAccountId, awsRegion, awsPartition):
+        yield {"Id": f"{awsRegion}-finding"}
+
+    class RegionAuditor(object):
+        def __init__(self, region):
+            self.awsRegion = region
+            self.checks = {
+                "iam": {"iam_check": finding_check},
+                "ec2": {"ec2_check": finding_check},
+                "s3": {"bucket_versioning_check": finding_check, "s3_account_level_block": finding_check},
+            }
+
+        def check_units(self, requested_check_name=None, skip_services=()):
+            return [
+                CheckUnit(service_name, check_name, check, "012345678901", self.awsRegion, "aws")
+                for service_name, check_list in self.checks.items()
+                if service_name not in skip_services
+                for check_name, check in check_list.items()
+            ]
+
+        def run_unit(self, unit):
+            return unit.check(
+                cache={}, awsAccountId=unit.awsAccountId, awsRegion=unit.awsRegion, awsPartition=unit.awsPartition
+            )
+
+    apps = [RegionAuditor("eu-west-1"), RegionAuditor("us-east-1"), RegionAuditor("us-west-2")]
+    ids = sorted(finding["Id"] for finding in run_multi_region_checks(apps, workers=4))
+    # iam and the account-level S3 Check only run in us-east-1 (the default test Region),
+    # ec2 and the S3 bucket Checks run everywhere
+    assert ids == sorted(
+        ["eu-west-1-finding"] * 2 + ["us-east-1-finding"] * 4 + ["us-west-2-finding"] * 2
+    )
@@ -0,0 +1,232 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import os
+import threading
+
+import boto3
+from botocore.stub import Stubber
+import pytest
+
+from . import context
+import events
+from events import ChangeEvent, change_from, in_scope, plan_runs, read_file, read_queue, records_from, resource_ids, windows
+from finding import compact
+from plugin_manifest import PluginManifest
+
+here = os.path.abspath(os.path.dirname(__file__))
+AUDITORS = os.path.join(os.path.dirname(here), "auditors", "aws")
+
+authorize_ingress = {
+    "eventVersion": "1.08",
+    "eventID": "5d3a1c51-0000-0000-0000-000000000001",
+    "eventSource": "ec2.amazonaws.com",
+    "eventName": "AuthorizeSecurityGroupIngress",
+    "awsRegion": "us-east-1",
+    "recipientAccountId": "012345678901",
+    "readOnly": False,
+    "requestParameters": {
+        "groupId": "sg-0123456789abcdef0",
+        "ipPermissions": {"items": [{"ipProtocol": "tcp", "fromPort": 22, "toPort": 22}]},
+    },
+    "responseElements": {"_return": True},
+}
+
+put_bucket_policy = {
+    "eventID": "5d3a1c51-0000-0000-0000-000000000002",
+    "eventSource": "s3.amazonaws.com",
+    "eventName": "PutBucketPolicy",
+    "awsRegion": "us-east-1",
+    "recipientAccountId": "012345678901",
+    "requestParameters": {"bucketName": "example-bucket", "policy": {"Statement": []}},
+    "resources": [{"ARN": "arn:aws:s3:::example-bucket", "type": "AWS::S3::Bucket"}],
+}
+
+
+@pytest.fixture(scope="module")
+def manifest(tmp_path_factory):
+    return PluginManifest(AUDITORS, path=str(tmp_path_factory.mktemp("manifest") / "manifest.json"))
+
+
+def test_records_from_every_envelope():
+    eventbridge = {"detail-type": "AWS API Call via CloudTrail", "source": "aws.ec2", "detail": authorize_ingress}
+    sqs_message = {"MessageId": "1", "Body": json.dumps(eventbridge)}
+    lambda_sqs_event = {"Records": [{"messageId": "1", "body": json.dumps(eventbridge)}]}
+    cloudtrail_log = {"Records": [authorize_ingress, put_bucket_policy]}
+    sns_notification = {"Type": "Notification", "Message": json.dumps(eventbridge)}
+
+    for document in (authorize_ingress, eventbridge, sqs_message, lambda_sqs_event, sns_notification, json.dumps(eventbridge)):
+        assert list(records_from(document)) == [authorize_ingress]
+    assert list(records_from(cloudtrail_log)) == [authorize_ingress, put_bucket_policy]
+    assert list(records_from("not json")) == []
+
+
+def test_resource_ids():
+    assert resource_ids(authorize_ingress) == ["sg-0123456789abcdef0"]
+    assert resource_ids(put_bucket_policy) == ["arn:aws:s3:::example-bucket", "example-bucket"]
+    run_instances = {
+        "requestParameters": {"instancesSet": {"items": [{"imageId": "ami-0abc"}]}},
+        "responseElements": {"instancesSet": {"items": [{"instanceId": "i-1"}, {"instanceId": "i-2"}]}},
+    }
+    assert resource_ids(run_instances) == ["ami-0abc", "i-1", "i-2"]
+    set_queue_attributes = {"requestParameters": {"queueUrl": "https://sqs.us-east-1.amazonaws.com/012345678901/orders"}}
+    assert resource_ids(set_queue_attributes) == ["orders"]
+
+
+def test_change_from_maps_events_to_auditors(manifest):
+    change = change_from(authorize_ingress, manifest)
+    assert change.auditors == ("Amazon_EC2_Security_Group_Auditor",)
+    assert change.resource_ids == ("sg-0123456789abcdef0",)
+    assert change.account == "012345678901" and change.region == "us-east-1"
+
+    assert "Amazon_S3_Auditor" in change_from(put_bucket_policy, manifest).auditors
+
+    password_policy = {"eventSource": "iam.amazonaws.com", "eventName": "UpdateAccountPasswordPolicy", "requestParameters": {"minimumPasswordLength": 14}}
+    change = change_from(password_policy, manifest)
+    assert "AWS_IAM_Auditor" in change.auditors
+    assert change.resource_ids is None
+
+    # read only, failed and unrelated calls change nothing
+    assert change_from(dict(authorize_ingress, readOnly=True), manifest) is None
+    assert change_from(dict(authorize_ingress, errorCode="UnauthorizedOperation"), manifest) is None
+    assert change_from(dict(authorize_ingress, eventName="CreateTags"), manifest) is None
+    assert change_from(dict(put_bucket_policy, eventName="GetBucketPolicy"), manifest) is None
+
+
+def test_plan_runs_coalesces_changes():
+    changes = [
+        ChangeEvent("1", "AuthorizeSecurityGroupIngress", "012345678901", "us-east-1", ("Amazon_EC2_Security_Group_Auditor",), ("sg-1",)),
+        ChangeEvent("2", "RevokeSecurityGroupEgress", "012345678901", "us-east-1", ("Amazon_EC2_Security_Group_Auditor",), ("sg-2",)),
+        ChangeEvent("3", "PutBucketPolicy", "012345678901", "eu-west-1", ("Amazon_S3_Auditor",), ("example-bucket",)),
+        ChangeEvent("4", "UpdateAccountPasswordPolicy", "012345678901", "us-east-1", ("AWS_IAM_Auditor",), None),
+    ]
+    unscoped, scoped = plan_runs(changes)
+    assert unscoped.auditors == ["AWS_IAM_Auditor"] and unscoped.resource_ids is None
+    assert scoped.auditors == ["Amazon_EC2_Security_Group_Auditor", "Amazon_S3_Auditor"]
+    assert scoped.resource_ids == ["example-bucket", "sg-1", "sg-2"]
+    assert scoped.regions == ["eu-west-1", "us-east-1"]
+
+    assert plan_runs(changes, auditor_names={"Amazon_S3_Auditor"}) == [
+        events.EventRun(["Amazon_S3_Auditor"], ["example-bucket"], ["eu-west-1"])
+    ]
+
+
+def test_in_scope():
+    finding = {"Id": "x", "Resources": [{"Type": "AwsEc2SecurityGroup", "Id": "arn:aws:ec2:us-east-1:012345678901:security-group/sg-1"}]}
+    assert in_scope(finding, ["sg-1"])
+    assert in_scope(compact(dict(finding), ("events", "test")), ["sg-1"])
+    assert not in_scope(finding, ["sg-10"])
+    assert in_scope({"Resources": [{"Id": "arn:aws:s3:::example-bucket"}]}, ["example-bucket"])
+    assert not in_scope({"Resources": [{"Id": "arn:aws:s3:::my-example-bucket"}]}, ["example-bucket"])
+
+
+def test_scope_narrows_ec2_describe_calls():
+    model = boto3.client("ec2", region_name="us-east-1").meta.service_model
+    describe_security_groups = model.operation_model("DescribeSecurityGroups")
+
+    params = {"MaxResults": 5}
+    with events.scoped(["sg-1", "i-1", "example-bucket"]):
+        events.on_before_parameter_build(params=params, model=describe_security_groups)
+    assert params == {"GroupIds": ["sg-1"]}
+
+    # nothing changes outside of a scoped run, for later pages or for IDs the caller gave
+    for params in ({"MaxResults": 5}, {"GroupIds": ["sg-2"]}):
+        expected = dict(params)
+        events.on_before_parameter_build(params=params, model=describe_security_groups)
+        assert params == expected
+    with events.scoped(["sg-1"]):
+        params = {"NextToken": "abc"}
+        events.on_before_parameter_build(params=params, model=describe_security_groups)
+        assert params == {"NextToken": "abc"}
+        params = {}
+        events.on_before_parameter_build(params=params, model=model.operation_model("DescribeVolumes"))
+        assert params == {}
+
+
+def test_deleted_resources_are_not_described(manifest):
+    delete_group = {
+        "eventID": "5",
+        "eventSource": "ec2.amazonaws.com",
+        "eventName": "DeleteSecurityGroup",
+        "awsRegion": "us-east-1",
+        "recipientAccountId": "012345678901",
+        "requestParameters": {"groupId": "sg-deleted"},
+    }
+    deleted = change_from(delete_group, manifest)
+    assert deleted.deleted and deleted.resource_ids == ("sg-deleted",)
+    changed = change_from(authorize_ingress, manifest)
+    assert not changed.deleted
+
+    (run,) = plan_runs([deleted, changed])
+    assert run.deleted_ids == ("sg-deleted",)
+    assert "sg-deleted" in run.resource_ids
+
+    model = boto3.client("ec2", region_name="us-east-1").meta.service_model
+    describe_security_groups = model.operation_model("DescribeSecurityGroups")
+    params = {}
+    with events.scoped(run.resource_ids, deleted=run.deleted_ids):
+        events.on_before_parameter_build(params=params, model=describe_security_groups)
+    assert params == {"GroupIds": ["sg-0123456789abcdef0"]}
+
+    # with only deleted groups the call is not narrowed, in_scope() limits its findings
+    params = {}
+    with events.scoped(["sg-deleted"], deleted=["sg-deleted"]):
+        events.on_before_parameter_build(params=params, model=describe_security_groups)
+    assert params == {}
+
+
+def test_read_file_and_windows(tmp_path):
+    path = tmp_path / "events.ndjson"
+    eventbridge = {"detail-type": "AWS API Call via CloudTrail", "detail": authorize_ingress}
+    path.write_text("\n".join([json.dumps(eventbridge), "", json.dumps(put_bucket_policy)]) + "\n")
+    batches = list(windows(read_file(str(path)), window=5))
+    assert batches == [[(authorize_ingress, None), (put_bucket_policy, None)]]
+
+    log_file = tmp_path / "cloudtrail.json"
+    log_file.write_text(json.dumps({"Records": [authorize_ingress]}))
+    assert list(read_file(str(log_file))) == [(authorize_ingress, None)]
+
+
+def test_read_queue_acknowledges_after_the_last_record():
+    sqs = boto3.client("sqs", region_name="us-east-1")
+    queue_url = "https://sqs.us-east-1.amazonaws.com/012345678901/electriceye-events"
+    stopping = threading.Event()
+    with Stubber(sqs) as stubber:
+        stubber.add_response(
+            "receive_message",
+            {
+                "Messages": [
+                    {"MessageId": "1", "ReceiptHandle": "r1", "Body": json.dumps({"Records": [authorize_ingress, put_bucket_policy]})},
+                    {"MessageId": "2", "ReceiptHandle": "r2", "Body": json.dumps({"unrelated": True})},
+                ]
+            },
+            {"QueueUrl": queue_url, "MaxNumberOfMessages": 10, "WaitTimeSeconds": 1},
+        )
+        stubber.add_response("delete_message", {}, {"QueueUrl": queue_url, "ReceiptHandle": "r2"})
+        stubber.add_response("delete_message", {}, {"QueueUrl": queue_url, "ReceiptHandle": "r1"})
+
+        items = read_queue(queue_url, stopping, sqs=sqs, wait_time=1)
+        (first, first_ack), (second, second_ack) = next(items), next(items)
+        assert (first, first_ack) == (authorize_ingress, None)
+        assert second == put_bucket_policy
+        stopping.set()
+        assert list(items) == []
+        second_ack()
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,107 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import pickle
+
+import pytest
+
+from . import context
+from finding import Finding, FindingTemplate, asff, compact
+from processor.main import process_findings
+from processor.outputs.output_base import ElectricEyeOutput
+
+check_key = ("Amazon_SNS_Auditor", "sns_topic_encryption_check")
+
+
+def finding_dict(topic, status):
+    # built from scratch for every resource, like the Checks do
+    return {
+        "SchemaVersion": "2018-10-08",
+        "Id": f"arn:aws:sns:us-east-1:012345678901:{topic}/sns-topic-encryption-check",
+        "Severity": {"Label": "INFORMATIONAL" if status == "PASSED" else "MEDIUM"},
+        "Title": "[SNS.1] SNS topics should be encrypted",
+        "Remediation": {"Recommendation": {"Text": "Refer to the SNS Developer Guide", "Url": "https://docs.aws.amazon.com/sns/"}},
+        "Resources": [{"Type": "AwsSnsTopic", "Id": f"arn:aws:sns:us-east-1:012345678901:{topic}"}],
+        "Compliance": {"Status": status, "RelatedRequirements": ["NIST CSF PR.DS-1", "ISO 27001:2013 A.8.2.3"]},
+    }
+
+
+def test_compact_shares_the_constant_parts():
+    first = compact(finding_dict("a", "PASSED"), check_key)
+    second = compact(finding_dict("b", "FAILED"), check_key)
+    third = compact(finding_dict("c", "PASSED"), check_key)
+    assert isinstance(first, Finding)
+    assert first.template is second.template
+    assert first["Remediation"] is second["Remediation"]
+    assert first["Compliance"]["RelatedRequirements"] is second["Compliance"]["RelatedRequirements"]
+    assert first["Severity"] is third["Severity"]
+    assert second["Compliance"]["Status"] == "FAILED"
+    assert first["Id"] != second["Id"]
+    # reads like the dict the Check yielded
+    assert first == finding_dict("a", "PASSED")
+    assert first.get("Missing") is None
+    assert list(first) == list(finding_dict("a", "PASSED"))
+
+
+def test_asff_and_pickle_round_trip():
+    finding = compact(finding_dict("a", "PASSED"), check_key)
+    assert json.loads(json.dumps(asff(finding))) == finding_dict("a", "PASSED")
+    # organization mode sends the findings between processes
+    restored = pickle.loads(pickle.dumps([finding, compact(finding_dict("b", "FAILED"), check_key)]))
+    assert restored[0] == finding
+    assert restored[0].template is restored[1].template
+    plain = {"Id": "plain"}
+    assert asff(plain) is plain
+    assert compact(finding, check_key) is finding
+
+
+def test_template_findings():
+    template = FindingTemplate(
+        ["SchemaVersion", "Id", "Title", "Compliance"],
+        defaults={"SchemaVersion": "2018-10-08", "Title": "[SNS.1] SNS topics should be encrypted"},
+    )
+    finding = template.finding(Id="topic", Compliance={"Status": "PASSED"})
+    assert asff(finding) == {
+        "SchemaVersion": "2018-10-08",
+        "Id": "topic",
+        "Title": "[SNS.1] SNS topics should be encrypted",
+        "Compliance": {"Status": "PASSED"},
+    }
+    with pytest.raises(KeyError):
+        template.finding(Unknown=1)
+
+
+@ElectricEyeOutput
+class RecordingProvider(object):
+    __provider__ = "test_finding_recording"
+    written = []
+
+    def write_batch(self, findings, **kwargs):
+        RecordingProvider.written.extend(findings)
+
+    def close(self, **kwargs):
+        return True
+
+
+def test_outputs_receive_plain_dicts():
+    findings = [compact(finding_dict(topic, "PASSED"), check_key) for topic in "abc"]
+    assert process_findings(findings, outputs=["test_finding_recording"]) == 3
+    assert all(type(finding) is dict for finding in RecordingProvider.written)
+    assert RecordingProvider.written[0] == finding_dict("a", "PASSED")
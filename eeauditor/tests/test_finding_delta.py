@@ -0,0 +1,119 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import pytest
+
+from . import context
+from check_executor import CheckUnit
+from finding_delta import FindingDelta
+from state_store import StateStore
+
+
+def example_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {}
+
+
+UNIT = CheckUnit("ec2", "example_check", example_check, "012345678901", "us-east-1", "aws")
+
+
+def finding(finding_id, status="PASSED", record_state="ARCHIVED", updated_at="then"):
+    return {
+        "Id": finding_id,
+        "Compliance": {"Status": status},
+        "Severity": {"Label": "INFORMATIONAL" if status == "PASSED" else "HIGH"},
+        "RecordState": record_state,
+        "Resources": [{"Id": finding_id, "Type": "AwsEc2Instance"}],
+        "UpdatedAt": updated_at,
+    }
+
+
+def send(delta, findings):
+    sent = list(delta.filter(UNIT, iter(findings)))
+    delta.commit()
+    return sent
+
+
+@pytest.fixture(scope="function")
+def store():
+    return StateStore(":memory:")
+
+
+def test_only_new_and_changed_findings_are_sent(store):
+    assert len(send(FindingDelta(store), [finding("a"), finding("b")])) == 2
+
+    sent = send(FindingDelta(store), [finding("a", updated_at="now"), finding("b", "FAILED", "ACTIVE"), finding("c")])
+    assert [f["Id"] for f in sent] == ["b", "c"]
+
+
+def test_disappeared_findings_are_archived_once(store):
+    send(FindingDelta(store), [finding("a"), finding("b", "FAILED", "ACTIVE")])
+
+    sent = send(FindingDelta(store), [finding("a")])
+    assert [(f["Id"], f["RecordState"]) for f in sent] == [("b", "ARCHIVED")]
+    assert send(FindingDelta(store), [finding("a")]) == []
+
+
+def test_stats_count_only_sent_findings(store):
+    send(FindingDelta(store), [finding("a"), finding("b", "FAILED", "ACTIVE")])
+
+    # "a" was already archived, it disappears without being sent again
+    delta = FindingDelta(store)
+    sent = send(delta, [finding("c")])
+    assert sorted(f["Id"] for f in sent) == ["b", "c"]
+    assert delta.stats() == {"forwarded": 2, "unchanged": 0, "archived": 1}
+
+
+def test_failed_check_archives_nothing(store):
+    send(FindingDelta(store), [finding("a"), finding("b")])
+
+    def failing_findings():
+        yield finding("a")
+        raise RuntimeError("boom")
+
+    delta = FindingDelta(store)
+    with pytest.raises(RuntimeError):
+        list(delta.filter(UNIT, failing_findings()))
+    delta.commit()
+    assert delta.stats()["archived"] == 0
+    assert send(FindingDelta(store), [finding("a"), finding("b")]) == []
+
+
+def test_nothing_is_stored_until_commit(store):
+    delta = FindingDelta(store)
+    list(delta.filter(UNIT, iter([finding("a")])))
+    delta.discard()
+    assert len(send(FindingDelta(store), [finding("a")])) == 1
+
+
+def test_full_resync_sends_everything(store):
+    send(FindingDelta(store), [finding("a")])
+    assert len(send(FindingDelta(store, full_resync=True), [finding("a")])) == 1
+
+
+def test_workers_stage_for_the_parent_to_commit(store):
+    parent = FindingDelta(store)
+    other = CheckUnit("ec2", "example_check", example_check, "109876543210", "us-east-1", "aws")
+    list(FindingDelta(store, run_id=parent.run_id).filter(UNIT, iter([finding("a")])))
+    failed_worker = FindingDelta(store, run_id=parent.run_id)
+    list(failed_worker.filter(other, iter([finding("b")])))
+    failed_worker.discard(account=other.awsAccountId)
+
+    parent.commit()
+    assert send(FindingDelta(store), [finding("a")]) == []
+    assert len(list(FindingDelta(store).filter(other, iter([finding("b")])))) == 1
@@ -0,0 +1,114 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import pytest
+
+from . import context
+from check_executor import CheckUnit
+from incremental import IncrementalCheck
+from run_cache import RunCache
+from state_store import StateStore
+
+evaluated = []
+
+
+def volume_check(cache, awsAccountId, awsRegion, awsPartition):
+    """Stands in for an Auditor Check reading its resources through a cache helper"""
+    response = cache.get("describe_volumes")
+    if not response:
+        cache["describe_volumes"] = describe_volumes_response
+        response = cache["describe_volumes"]
+    for volume in response["Volumes"]:
+        evaluated.append(volume["VolumeId"])
+        yield {
+            "Id": f"{volume['VolumeId']}/ebs-volume-encryption-check",
+            "Resources": [{"Id": f"arn:aws:ec2:us-east-1:012345678901:volume/{volume['VolumeId']}"}],
+            "Compliance": {"Status": "PASSED" if volume["Encrypted"] else "FAILED"},
+            "UpdatedAt": "run",
+        }
+
+
+def account_check(cache, awsAccountId, awsRegion, awsPartition):
+    response = cache.get("describe_volumes") or describe_volumes_response
+    yield {"Id": "account", "Resources": [{"Id": f"AWS::::Account:{awsAccountId}"}], "Count": len(response["Volumes"])}
+
+
+# what ec2.describe_volumes() returns in the current run
+describe_volumes_response = {}
+
+
+def make_unit(check):
+    return CheckUnit("ec2", check.__name__, check, "012345678901", "us-east-1", "aws")
+
+
+def run(store, check, volumes, max_staleness=3600, now=None):
+    global describe_volumes_response
+    describe_volumes_response = {"Volumes": volumes, "ResponseMetadata": {}}
+    del evaluated[:]
+    unit = make_unit(check)
+    incremental = IncrementalCheck(store, unit, max_staleness=max_staleness, now=now)
+    cache = RunCache().view("ec2", incremental=incremental)
+    findings = []
+    for finding in check(cache, unit.awsAccountId, unit.awsRegion, unit.awsPartition):
+        incremental.record(finding)
+        findings.append(finding)
+    incremental.commit()
+    findings.extend(incremental.reused_findings())
+    return findings
+
+
+@pytest.fixture(scope="function")
+def store():
+    return StateStore(":memory:")
+
+
+def volumes(*encrypted):
+    return [{"VolumeId": f"vol-00000{i}", "Encrypted": e} for i, e in enumerate(encrypted)]
+
+
+def test_only_changed_resources_are_evaluated(store):
+    first = run(store, volume_check, volumes(True, True, False))
+    assert evaluated == ["vol-000000", "vol-000001", "vol-000002"]
+    assert len(first) == 3
+
+    second = run(store, volume_check, volumes(True, False, False))
+    # vol-000001 changed, the others reuse their findings
+    assert evaluated == ["vol-000001"]
+    assert sorted(f["Compliance"]["Status"] for f in second) == ["FAILED", "FAILED", "PASSED"]
+    assert all(f["UpdatedAt"] != "run" for f in second if f["Resources"][0]["Id"].endswith(("0", "2")))
+
+
+def test_at_least_one_resource_is_always_evaluated(store):
+    run(store, volume_check, volumes(True, True))
+    findings = run(store, volume_check, volumes(True, True))
+    assert evaluated == ["vol-000000"]
+    assert len(findings) == 2
+
+
+def test_stale_findings_are_evaluated_again(store):
+    run(store, volume_check, volumes(True, True), now=1000)
+    run(store, volume_check, volumes(True, True), max_staleness=60, now=2000)
+    assert evaluated == ["vol-000000", "vol-000001"]
+
+
+def test_account_level_checks_always_run_in_full(store):
+    run(store, account_check, volumes(True, True))
+    assert store.load_check("012345678901", "us-east-1", "account_check")[0] is False
+    findings = run(store, account_check, volumes(True, True, True))
+    assert findings[0]["Count"] == 3
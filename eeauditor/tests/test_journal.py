@@ -0,0 +1,128 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+
+import pytest
+
+from . import context
+from check_executor import CheckUnit
+from journal import RunJournal
+from processor.main import process_findings
+from processor.outputs.output_base import ElectricEyeOutput
+
+config = {"auditor_name": "", "check_name": "", "regions": [], "shard": "", "outputs": ["json"], "output_file": "output"}
+
+
+def make_check(name):
+    def check(cache, awsAccountId, awsRegion, awsPartition):
+        return iter(())
+
+    check.__name__ = name
+    check.__module__ = "electriceye.Amazon_EC2_Auditor"
+    return check
+
+
+unit_a = CheckUnit("ec2", "check_a", make_check("check_a"), "012345678901", "us-east-1", "aws")
+unit_b = CheckUnit("ec2", "check_b", make_check("check_b"), "012345678901", "us-east-1", "aws")
+
+
+def findings(prefix, count):
+    return ({"Id": f"{prefix}-{i}", "UpdatedAt": "2022-08-08T00:00:00Z"} for i in range(count))
+
+
+def interrupted_run(path):
+    """A run that finished check_a and was killed halfway through check_b"""
+    journal = RunJournal(path, config=config)
+    assert list(journal.record(unit_a, findings("a", 3))) == list(findings("a", 3))
+    partial = journal.record(unit_b, findings("b", 5))
+    next(partial), next(partial)
+    journal.file.write('{"s": 1, "u": ["Amazon_EC2_Auditor", "check_b"')
+    journal.file.flush()
+
+
+def test_resume_skips_finished_checks_and_replays_their_findings(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    interrupted_run(path)
+
+    journal = RunJournal(path, config=config, resume=True)
+    assert journal.is_finished(unit_a) and not journal.is_finished(unit_b)
+    assert journal.pending([unit_a, unit_b]) == [unit_b]
+    assert [finding["Id"] for finding in journal.replay()] == ["a-0", "a-1", "a-2"]
+
+    # the cut short line was dropped, the journal stays readable
+    assert list(journal.record(unit_b, findings("b", 5)))
+    journal.complete()
+    with open(path) as f:
+        entries = [json.loads(line) for line in f]
+    assert entries[-1] == {"complete": True}
+    assert [entry["done"][1] for entry in entries if "done" in entry] == ["check_a", "check_b"]
+
+    # a finished run is not resumed again
+    journal = RunJournal(path, config=config, resume=True)
+    assert journal.pending([unit_a, unit_b]) == [unit_a, unit_b]
+    assert list(journal.replay()) == []
+    journal.close()
+
+
+def test_findings_of_an_interrupted_attempt_are_not_replayed(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    interrupted_run(path)
+    # the resumed run finishes check_b, then is interrupted again
+    journal = RunJournal(path, config=config, resume=True)
+    list(journal.record(unit_b, findings("b", 1)))
+    journal.close()
+
+    journal = RunJournal(path, config=config, resume=True)
+    assert journal.pending([unit_a, unit_b]) == []
+    assert sorted(finding["Id"] for finding in journal.replay()) == ["a-0", "a-1", "a-2", "b-0"]
+    journal.close()
+
+
+def test_resume_with_other_options_is_refused(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    interrupted_run(path)
+    with pytest.raises(ValueError):
+        RunJournal(path, config=dict(config, check_name="check_a"), resume=True)
+
+
+@ElectricEyeOutput
+class RecordingProvider(object):
+    __provider__ = "test_journal_recording"
+    received = []
+
+    def write_batch(self, findings, **kwargs):
+        RecordingProvider.received.extend(finding["Id"] for finding in findings)
+
+    def close(self, **kwargs):
+        return True
+
+
+def test_replayed_findings_only_go_to_file_outputs(tmp_path):
+    output_file = str(tmp_path / "findings")
+    total = process_findings(
+        findings=findings("b", 2),
+        outputs=["json", "test_journal_recording"],
+        output_file=output_file,
+        replayed=findings("a", 3),
+    )
+    assert total == 2
+    with open(f"{output_file}.json") as f:
+        assert [finding["Id"] for finding in json.load(f)] == ["a-0", "a-1", "a-2", "b-0", "b-1"]
+    assert RecordingProvider.received == ["b-0", "b-1"]
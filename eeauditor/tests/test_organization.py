@@ -0,0 +1,88 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+
+import boto3
+from botocore.stub import Stubber
+import pytest
+
+from . import context
+from organization import list_organization_accounts, load_account_list, partition_for_region
+
+
+def test_load_account_list_text(tmp_path):
+    accounts_file = tmp_path / "accounts.txt"
+    accounts_file.write_text("# prod\n012345678901\n\n109876543210  # dev\n")
+    assert load_account_list(str(accounts_file)) == ["012345678901", "109876543210"]
+
+
+def test_load_account_list_json(tmp_path):
+    accounts_file = tmp_path / "accounts.json"
+    accounts_file.write_text(json.dumps(["012345678901", {"Id": "109876543210"}]))
+    assert load_account_list(str(accounts_file)) == ["012345678901", "109876543210"]
+
+
+def test_load_account_list_rejects_bad_ids(tmp_path):
+    accounts_file = tmp_path / "accounts.txt"
+    accounts_file.write_text("not-an-account\n")
+    with pytest.raises(ValueError):
+        load_account_list(str(accounts_file))
+
+
+def test_list_organization_accounts_skips_inactive():
+    organizations = boto3.client("organizations", region_name="us-east-1")
+    stubber = Stubber(organizations)
+    stubber.add_response(
+        "list_accounts",
+        {
+            "Accounts": [
+                {"Id": "012345678901", "Status": "ACTIVE"},
+                {"Id": "109876543210", "Status": "SUSPENDED"},
+            ]
+        },
+    )
+    stubber.activate()
+
+    class StubbedSession(object):
+        def client(self, service_name):
+            return organizations
+
+    assert list_organization_accounts(StubbedSession()) == ["012345678901"]
+    stubber.deactivate()
+
+
+def test_partition_for_region():
+    assert partition_for_region("us-east-1") == "aws"
+    assert partition_for_region("us-gov-west-1") == "aws-us-gov"
+    assert partition_for_region("cn-north-1") == "aws-cn"
+
+
+def test_audit_account_reports_setup_errors(monkeypatch):
+    import queue
+    import organization
+
+    def configure(**kwargs):
+        raise RuntimeError("bad retry mode")
+
+    monkeypatch.setattr(organization.client_pool, "configure", configure)
+    results = queue.Queue()
+    organization.audit_account("012345678901", "ElectricEyeAuditRole", ["us-east-1"], results, delta=True)
+    account_id, batch, error, records = results.get_nowait()
+    assert (account_id, batch, error) == ("012345678901", None, "bad retry mode")
@@ -0,0 +1,163 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+
+from . import context
+from check_executor import CheckUnit
+from check_register import CheckRegister
+from planner import DataPlanner, namespace
+from run_cache import RunCache
+
+calls = []
+calls_lock = threading.Lock()
+
+
+def list_topics(cache):
+    response = cache.get("list_topics")
+    if response:
+        return response
+    with calls_lock:
+        calls.append("list_topics")
+    cache["list_topics"] = {"Topics": [{"TopicArn": "arn:aws:sns:us-east-1:012345678901:topic"}]}
+    return cache["list_topics"]
+
+
+def list_subscriptions(cache):
+    with calls_lock:
+        calls.append("list_subscriptions")
+    raise RuntimeError("AccessDenied")
+
+
+registry = CheckRegister()
+
+
+@registry.register_check("sns", requires=[list_topics])
+def topic_check(cache, awsAccountId, awsRegion, awsPartition):
+    for topic in list_topics(cache)["Topics"]:
+        yield {"Id": topic["TopicArn"]}
+
+
+@registry.register_check("sns", requires=["list_topics"])
+def other_topic_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {"Id": "other"}
+
+
+@registry.register_check("sns", requires=[list_topics, list_subscriptions])
+def subscription_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {"Id": "subscription"}
+
+
+def make_unit(check, region="us-east-1"):
+    return CheckUnit("sns", check.__name__, check, "012345678901", region, "aws")
+
+
+def test_register_check_records_requirements():
+    assert topic_check.requires == (list_topics,)
+    assert other_topic_check.requires == ("list_topics",)
+
+
+def test_plan_is_the_union_of_declarations():
+    units = [make_unit(topic_check), make_unit(other_topic_check), make_unit(topic_check, "us-west-2")]
+    collections = DataPlanner(RunCache()).plan(units)
+    assert sorted((key[0][2], key[1]) for key in collections) == [
+        ("us-east-1", "list_topics"),
+        ("us-west-2", "list_topics"),
+    ]
+
+
+def test_prefetch_fills_the_checks_cache():
+    del calls[:]
+    run_cache = RunCache()
+    unit = make_unit(topic_check)
+    planner = DataPlanner(run_cache, workers=4)
+    assert planner.prefetch([unit, make_unit(other_topic_check)]) == 1
+    assert calls == ["list_topics"]
+
+    cache = run_cache.view(namespace(unit))
+    findings = list(unit.check(cache=cache, awsAccountId=unit.awsAccountId, awsRegion=unit.awsRegion, awsPartition="aws"))
+    cache.release()
+    assert findings == [{"Id": "arn:aws:sns:us-east-1:012345678901:topic"}]
+    # the Check found its collection in the cache
+    assert calls == ["list_topics"]
+    assert planner.skip_reason(unit) is None
+
+
+def test_failed_collection_skips_only_its_checks():
+    run_cache = RunCache()
+    planner = DataPlanner(run_cache)
+    planner.prefetch([make_unit(topic_check), make_unit(subscription_check)])
+    assert planner.skip_reason(make_unit(topic_check)) is None
+    reason = planner.skip_reason(make_unit(subscription_check))
+    assert "list_subscriptions" in reason
+    assert "AccessDenied" in reason
+
+
+def test_helpers_of_one_auditor_keep_their_own_collections(monkeypatch):
+    import auditors.aws.AWS_WAFv2_Auditor as waf_auditor
+
+    class FakeWafv2(object):
+        def __init__(self, scope):
+            self.scope = scope
+
+        def list_web_acls(self, Scope):
+            assert Scope == self.scope
+            return {"WebACLs": [{"Name": Scope}]}
+
+    monkeypatch.setattr(waf_auditor, "wafv2", FakeWafv2("REGIONAL"))
+    monkeypatch.setattr(waf_auditor, "globalWafv2", FakeWafv2("CLOUDFRONT"))
+
+    # both helpers load into the same cache, prefetched in parallel
+    run_cache = RunCache()
+    units = [
+        CheckUnit("wafv2", check.__name__, check, "012345678901", "us-east-1", "aws")
+        for check in waf_auditor.registry.checks["wafv2"].values()
+    ]
+    assert DataPlanner(run_cache, workers=4).prefetch(units) == 2
+
+    cache = run_cache.view(namespace(units[0]))
+    assert waf_auditor.list_wafs(cache)["WebACLs"] == [{"Name": "REGIONAL"}]
+    assert waf_auditor.list_wafs_global(cache)["WebACLs"] == [{"Name": "CLOUDFRONT"}]
+    cache.release()
+
+
+def test_cache_helpers_never_share_a_key():
+    import ast
+    import os
+
+    search_path = os.path.join(os.path.dirname(context.__file__), "..", "auditors", "aws")
+    for file_name in sorted(os.listdir(search_path)):
+        if not file_name.endswith(".py"):
+            continue
+        with open(os.path.join(search_path, file_name)) as f:
+            tree = ast.parse(f.read())
+        owners = {}
+        for node in tree.body:
+            if not isinstance(node, ast.FunctionDef) or node.decorator_list:
+                continue
+            for child in ast.walk(node):
+                if (
+                    isinstance(child, ast.Subscript)
+                    and isinstance(child.ctx, ast.Store)
+                    and isinstance(child.value, ast.Name)
+                    and child.value.id == "cache"
+                    and isinstance(child.slice, ast.Constant)
+                ):
+                    owner = owners.setdefault(child.slice.value, node.name)
+                    assert owner == node.name, f"{file_name}: {owner} and {node.name} both cache {child.slice.value}"
@@ -0,0 +1,60 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import os
+import shutil
+
+import pytest
+
+from . import context
+from plugin_manifest import PluginManifest, scan_auditor
+
+here = os.path.abspath(os.path.dirname(__file__))
+TEST_MODULES = os.path.join(here, "test_modules")
+
+
+@pytest.fixture(scope="function")
+def search_path(tmp_path):
+    path = tmp_path / "auditors"
+    path.mkdir()
+    shutil.copy(os.path.join(TEST_MODULES, "plugin1.py"), str(path / "plugin1.py"))
+    return str(path)
+
+
+def test_scan_auditor_finds_checks_without_importing():
+    checks, digest = scan_auditor(os.path.join(TEST_MODULES, "plugin1.py"))
+    assert checks == [{"check_name": "plugin_func_1", "service_name": "test", "description": ""}]
+    assert len(digest) == 64
+
+
+def test_manifest_is_cached_and_rescanned_on_change(tmp_path, search_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    manifest = PluginManifest(search_path, path=manifest_path)
+    assert manifest.auditors_for(check_name="plugin_func_1") == ["plugin1"]
+    assert manifest.services("plugin1") == ["test"]
+    with open(manifest_path) as f:
+        assert search_path in json.load(f)["search_paths"]
+
+    with open(os.path.join(search_path, "plugin2.py"), "w") as f:
+        f.write('@registry.register_check("other")\ndef plugin_func_2(cache, awsAccountId, awsRegion, awsPartition):\n    """Second check"""\n    yield {}\n')
+    manifest = PluginManifest(search_path, path=manifest_path)
+    assert manifest.auditors_for(services={"other"}) == ["plugin2"]
+    assert ("plugin2", "plugin2.py", "other", "plugin_func_2", "Second check") in list(manifest.checks())
+    assert manifest.auditors_for(check_name="missing") == []
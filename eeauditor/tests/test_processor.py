@@ -0,0 +1,367 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import json
+
+import pytest
+
+from . import context
+from processor.main import batch_findings, process_findings
+
+
+def generate_findings(count):
+    for i in range(count):
+        yield {
+            "SchemaVersion": "2018-10-08",
+            "Id": f"finding-{i}",
+            "Title": "[Test.1] Test finding",
+            "Severity": {"Label": "LOW"},
+        }
+
+
+def test_batch_findings():
+    batches = list(batch_findings(generate_findings(7), batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+
+def test_process_findings_streams_json_and_csv(tmp_path):
+    output_file = str(tmp_path / "findings")
+    total = process_findings(
+        findings=generate_findings(1201),
+        outputs=["json", "csv"],
+        output_file=output_file,
+        batch_size=100,
+    )
+    assert total == 1201
+    with open(f"{output_file}.json") as f:
+        findings = json.load(f)
+    assert [finding["Id"] for finding in findings] == [f"finding-{i}" for i in range(1201)]
+    with open(f"{output_file}.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == "Id"
+    assert len(rows) == 1202
+
+
+def test_process_findings_without_findings(tmp_path):
+    output_file = str(tmp_path / "empty")
+    assert process_findings(findings=iter([]), outputs=["json"], output_file=output_file) == 0
+    with open(f"{output_file}.json") as f:
+        assert json.load(f) == []
+
+
+def test_json_provider_write_findings(tmp_path):
+    from processor.outputs.output_base import ElectricEyeOutput
+
+    output_file = str(tmp_path / "legacy")
+    provider = ElectricEyeOutput.get_provider("json")()
+    assert provider.write_findings(findings=list(generate_findings(2)), output_file=output_file)
+    with open(f"{output_file}.json") as f:
+        assert len(json.load(f)) == 2
+
+
+def test_sechub_batches_by_count_and_size():
+    from processor.outputs.sechub import finding_size, pack_batches
+
+    findings = list(generate_findings(250))
+    assert [len(batch) for batch, _ in pack_batches(findings)] == [100, 100, 50]
+
+    large = [dict(finding, Details={"Other": {"Blob": "x" * 1000}}) for finding in generate_findings(10)]
+    batches = list(pack_batches(large, max_bytes=3 * finding_size(large[0])))
+    assert [len(batch) for batch, _ in batches] == [3, 3, 3, 1]
+    assert all(size <= 3 * finding_size(large[0]) for _, size in batches)
+
+
+def test_sechub_retries_only_failed_findings():
+    import threading
+    from botocore.exceptions import ClientError
+    from processor.outputs.sechub import SecHubProvider
+
+    class FakeSecHub(object):
+        def __init__(self):
+            self.calls = []
+            self.lock = threading.Lock()
+
+        def batch_import_findings(self, Findings):
+            ids = [finding["Id"] for finding in Findings]
+            with self.lock:
+                self.calls.append(ids)
+            if "finding-5" in ids and len([call for call in self.calls if "finding-5" in call]) == 1:
+                raise ClientError({"Error": {"Code": "ThrottlingException"}}, "BatchImportFindings")
+            failed = [
+                {"Id": id_, "ErrorCode": "InvalidInput"} if id_ == "finding-150" else {"Id": id_, "ErrorCode": "Throttled"}
+                for id_ in ids
+                if id_ == "finding-150" or (id_ == "finding-120" and len([c for c in self.calls if id_ in c]) == 1)
+            ]
+            return {"FailedCount": len(failed), "SuccessCount": len(ids) - len(failed), "FailedFindings": failed}
+
+    sechub = FakeSecHub()
+    provider = SecHubProvider(workers=3, max_attempts=3, sechub=sechub, sleep=lambda seconds: None)
+    provider.write_batch(findings=list(generate_findings(150)))
+    provider.write_batch(findings=[dict(next(generate_findings(1)), Id="finding-150")])
+    # findings that never made it fail the run, delta mode and the journal do not commit them
+    with pytest.raises(RuntimeError):
+        provider.close()
+
+    # a failed request is sent again whole, failed findings are sent again alone
+    assert sorted(call for call in sechub.calls if len(call) == 1) == [["finding-120"], ["finding-150"], ["finding-150"], ["finding-150"]]
+    assert provider.stats["imported"] == 150
+    assert provider.stats["failed"] == 1
+    assert provider.errors == {"InvalidInput": 1}
+    assert provider.failed_ids == ["finding-150"]
+
+
+def asff_finding(index, status="FAILED"):
+    return {
+        "SchemaVersion": "2018-10-08",
+        "Id": f"finding-{index}",
+        "AwsAccountId": "012345678901",
+        "ProductArn": "arn:aws:securityhub:us-east-1:012345678901:product/012345678901/default",
+        "GeneratorId": "generator",
+        "Types": ["Software and Configuration Checks"],
+        "CreatedAt": "2022-08-08T00:00:00Z",
+        "Severity": {"Label": "LOW"},
+        "Title": "[Test.1] Test finding",
+        "Description": 'A "quoted", multi\nline description',
+        "Resources": [{"Type": "AwsEc2Instance", "Id": f"i-{index}", "Region": "us-east-1", "Partition": "aws"}],
+        "Compliance": {"Status": status},
+        "Workflow": {"Status": "NEW"},
+        "RecordState": "ACTIVE",
+    }
+
+
+def fake_postgres(monkeypatch, failures=()):
+    """The PostgreSQL output with a fake pool recording statements, COPY rows and returned connections"""
+    import csv as csv_module
+    from processor.outputs import postgresql
+
+    statements = []
+    copied = []
+    failures = list(failures)
+
+    class FakeCursor(object):
+        def execute(self, statement, params=None):
+            statements.append(statement)
+
+        def fetchone(self):
+            return None
+
+        def copy_expert(self, statement, buffer):
+            if failures:
+                raise failures.pop(0)
+            copied.extend(csv_module.reader(buffer))
+
+        def close(self):
+            pass
+
+    class FakeConnection(object):
+        def cursor(self):
+            return FakeCursor()
+
+        def commit(self):
+            statements.append("COMMIT")
+
+        def rollback(self):
+            statements.append("ROLLBACK")
+
+    class FakePool(object):
+        def __init__(self, minconn, maxconn, **dsn):
+            self.returned = []
+
+        def getconn(self):
+            return FakeConnection()
+
+        def putconn(self, connection, close=False):
+            self.returned.append(close)
+
+    class FakeSSM(object):
+        def get_parameter(self, Name, WithDecryption):
+            return {"Parameter": {"Value": "password"}}
+
+    for name in ("POSTGRES_USERNAME", "ELECTRICEYE_POSTGRESQL_DB_NAME", "POSTGRES_DB_ENDPOINT", "POSTGRES_DB_PORT", "POSTGRES_PASSWORD_SSM_PARAM_NAME"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setattr(postgresql.boto3, "client", lambda service_name: FakeSSM())
+    monkeypatch.setattr(postgresql, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setattr(postgresql, "_pools", {})
+    monkeypatch.setattr(postgresql, "_prepared", set())
+    return postgresql, statements, copied
+
+
+def test_postgres_copies_batches_and_upserts(monkeypatch):
+    postgresql, statements, copied = fake_postgres(monkeypatch)
+
+    provider = postgresql.PostgresProvider()
+    provider.write_batch(findings=[asff_finding(0), asff_finding(1), asff_finding(0, status="PASSED")])
+    provider.write_batch(findings=[asff_finding(2), {"Id": "no-account"}])
+    provider.close()
+
+    assert len(copied) == 4
+    assert copied[0] == list(postgresql.finding_row(asff_finding(0)))
+    assert sum("ON CONFLICT (findingid) DO UPDATE" in statement for statement in statements) == 2
+    assert sum(statement.startswith("INSERT INTO electriceye_findings_history") for statement in statements) == 2
+    assert any("PARTITION OF electriceye_findings_history" in statement for statement in statements)
+    assert any("electriceye_findings_history_severitylabel_idx" in statement for statement in statements)
+    assert provider.written == 4
+    assert provider.pool.returned == [False]
+
+    # a later run reuses the pool and does not set the tables up again
+    provider = postgresql.PostgresProvider()
+    statements.clear()
+    provider.write_batch(findings=[asff_finding(3)])
+    assert not any(statement.startswith("CREATE TABLE IF NOT EXISTS electriceye_findings(") for statement in statements)
+    assert len(postgresql._pools) == 1
+
+
+def test_postgres_discards_the_connection_of_a_failed_batch(monkeypatch):
+    import psycopg2
+
+    postgresql, statements, copied = fake_postgres(monkeypatch, failures=[psycopg2.OperationalError("server closed the connection")])
+    provider = postgresql.PostgresProvider()
+    with pytest.raises(psycopg2.OperationalError):
+        provider.write_batch(findings=[asff_finding(0)])
+    assert statements[-1] == "ROLLBACK"
+    pool = provider.pool
+    assert pool.returned == [True]
+
+    # the next run gets a new connection from the same pool
+    provider = postgresql.PostgresProvider()
+    provider.write_batch(findings=[asff_finding(1)])
+    provider.close()
+    assert pool.returned == [True, False]
+    assert len(copied) == 1
+
+
+def test_docdb_upserts_unordered_batches(monkeypatch):
+    import sys
+    from pymongo import ReplaceOne
+    from pymongo.errors import OperationFailure
+    from processor.outputs.output_base import ElectricEyeOutput
+
+    provider_class = ElectricEyeOutput.get_provider("docdb")
+    docdb = sys.modules[provider_class.__module__]
+
+    class FakeCollection(object):
+        name = "ElectricEye-Findings"
+
+        class database(object):
+            name = "ElectricEye"
+
+        def __init__(self):
+            self.bulk_writes = []
+            self.indexes = []
+            self.deleted = []
+
+        def create_index(self, keys, name, unique):
+            self.indexes.append((keys, name, unique))
+            if len(self.indexes) == 1:
+                raise OperationFailure("E11000 duplicate key error")
+
+        def aggregate(self, pipeline, allowDiskUse):
+            return [{"_id": "finding-0", "ids": [1, 2, 3], "count": 3}]
+
+        def delete_many(self, query):
+            self.deleted.extend(query["_id"]["$in"])
+
+            class Result(object):
+                deleted_count = len(query["_id"]["$in"])
+
+            return Result()
+
+        def bulk_write(self, operations, ordered):
+            assert ordered is False
+            self.bulk_writes.append(operations)
+
+    collection = FakeCollection()
+    monkeypatch.setattr(docdb, "_indexed", set())
+    docdb.ensure_id_index(collection)
+    docdb.ensure_id_index(collection)
+    assert collection.deleted == [2, 3]
+    assert [unique for _, _, unique in collection.indexes] == [True, True]
+
+    provider = provider_class(batch_size=2)
+    provider.mycol = collection
+    provider.write_batch(findings=[{"Id": "finding-0"}, {"Id": "finding-1"}, {"Id": "finding-1", "New": True}])
+    provider.close()
+
+    assert [len(operations) for operations in collection.bulk_writes] == [2, 1]
+    assert collection.bulk_writes[1][0] == ReplaceOne({"Id": "finding-1"}, {"Id": "finding-1", "New": True}, upsert=True)
+    assert provider.written == 3
+
+
+def test_docdb_ca_bundle_is_cached(tmp_path, monkeypatch):
+    import os
+    import sys
+    import time
+    from processor.outputs.output_base import ElectricEyeOutput
+
+    docdb = sys.modules[ElectricEyeOutput.get_provider("docdb").__module__]
+    downloads = []
+
+    class Response(object):
+        content = b"-----BEGIN CERTIFICATE-----"
+
+        def raise_for_status(self):
+            pass
+
+    def get(url, timeout):
+        downloads.append(url)
+        return Response()
+
+    monkeypatch.setattr(docdb.requests, "get", get)
+    path = str(tmp_path / "bundle.pem")
+    assert docdb.ca_bundle(path=path, max_age=3600) == path
+    assert docdb.ca_bundle(path=path, max_age=3600) == path
+    assert len(downloads) == 1
+
+    stale = time.time() - 7200
+    os.utime(path, (stale, stale))
+    docdb.ca_bundle(path=path, max_age=3600)
+    assert len(downloads) == 2
+
+
+def test_failed_output_ends_the_producer():
+    import threading
+    from processor.outputs.output_base import ElectricEyeOutput
+
+    @ElectricEyeOutput
+    class FailingProvider(object):
+        __provider__ = "failing_test"
+
+        def write_batch(self, findings, **kwargs):
+            raise IOError("disk full")
+
+        def close(self, **kwargs):
+            pass
+
+    closed = []
+
+    def findings():
+        try:
+            for finding in generate_findings(10000):
+                yield finding
+        finally:
+            closed.append(True)
+
+    try:
+        with pytest.raises(IOError):
+            process_findings(findings=findings(), outputs=["failing_test"], batch_size=10, queue_batches=1)
+    finally:
+        ElectricEyeOutput._outputs.pop("failing_test")
+    assert closed == [True]
+    assert not [thread for thread in threading.enumerate() if thread.name == "eeauditor-findings-producer"]
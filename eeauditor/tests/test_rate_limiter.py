@@ -0,0 +1,87 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+
+import boto3
+
+from . import context
+from client_pool import ClientPool
+from rate_limiter import MIN_RATE, RateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_waits(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("rate_limiter.time.sleep", sleeps.append)
+    bucket = TokenBucket(limit=10, burst=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0
+    assert bucket.delayed == 1
+    assert len(sleeps) == 1
+
+
+def test_bucket_backs_off_on_throttles_and_recovers():
+    bucket = TokenBucket(limit=10)
+    bucket.throttled()
+    assert bucket.rate == 5
+    for _ in range(100):
+        bucket.throttled()
+    assert bucket.rate == MIN_RATE
+    for _ in range(100):
+        bucket.succeeded()
+    assert bucket.rate == 10
+
+
+def test_bucket_is_thread_safe(monkeypatch):
+    monkeypatch.setattr("rate_limiter.time.sleep", lambda seconds: None)
+    # freeze the clock so no tokens are refilled while the threads run
+    monkeypatch.setattr("rate_limiter.time.monotonic", lambda: 1000.0)
+    bucket = TokenBucket(limit=1000, burst=10)
+    bucket.updated = 1000.0
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(100)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # every token was handed out exactly once
+    assert bucket.tokens == 10 - 800
+    assert bucket.delayed == 790
+
+
+def test_limiter_is_attached_to_pooled_clients():
+    limiter = RateLimiter(rates={"sqs": 4})
+    pool = ClientPool()
+    pool.add_client_hook(limiter.attach)
+    session = boto3.Session(region_name="us-east-1")
+    sqs = pool.get("sqs", session=session)
+
+    sqs.meta.events.emit("before-send.sqs.ListQueues", request=None)
+    sqs.meta.events.emit(
+        "response-received.sqs.ListQueues",
+        parsed_response={"Error": {"Code": "RequestThrottled"}},
+    )
+    bucket = limiter.bucket(id(session), "us-east-1", "sqs")
+    assert bucket.limit == 4
+    assert bucket.rate == 2
+    assert bucket.tokens < bucket.burst
+    assert limiter.stats()["throttles"] == 1
+    # other services, Regions and accounts have their own buckets
+    assert limiter.bucket(id(session), "us-west-2", "sqs") is not bucket
+    assert limiter.bucket(id(session), "us-east-1", "ssm").limit == 10
@@ -0,0 +1,89 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import time
+
+import boto3
+from botocore.stub import Stubber
+import pytest
+
+from . import context
+from region_index import RegionIndex, SEED_PATH
+
+
+@pytest.fixture(scope="function")
+def seed_file(tmp_path):
+    seed = tmp_path / "seed.json"
+    seed.write_text(
+        json.dumps(
+            {
+                "generated_at": time.time(),
+                "services": {
+                    "ec2": ["us-east-1", "us-west-2"],
+                    "elb": ["us-east-1"],
+                },
+            }
+        )
+    )
+    return str(seed)
+
+
+def test_lookups_come_from_seed(tmp_path, seed_file):
+    index = RegionIndex(path=str(tmp_path / "missing.json"), seed_path=seed_file)
+    assert index.regions("ec2") == ["us-east-1", "us-west-2"]
+    assert index.is_available("ec2", "us-west-2")
+    # elbv2 is looked up with the SSM service name
+    assert index.is_available("elbv2", "us-east-1")
+    assert not index.is_available("elbv2", "us-west-2")
+
+
+def test_unknown_services_and_regions_are_available(tmp_path, seed_file):
+    index = RegionIndex(path=str(tmp_path / "missing.json"), seed_path=seed_file)
+    assert index.regions("shodan") is None
+    assert index.is_available("shodan", "us-west-2")
+    assert index.is_available("elb", "xx-future-1")
+
+
+def test_refresh_persists_ssm_results(tmp_path, seed_file):
+    ssm = boto3.client("ssm", region_name="us-east-1")
+    stubber = Stubber(ssm)
+    stubber.add_response(
+        "get_parameters_by_path",
+        {"Parameters": [{"Value": "us-east-1"}, {"Value": "eu-west-1"}]},
+        {"Path": "/aws/service/global-infrastructure/services/ec2/regions", "MaxResults": 10},
+    )
+    stubber.activate()
+    path = tmp_path / "index.json"
+    index = RegionIndex(path=str(path), seed_path=seed_file, ssm_client=ssm, ttl=0)
+    assert index.is_stale()
+    index.refresh_in_background(["ec2"]).join()
+    stubber.deactivate()
+    assert index.regions("ec2") == ["eu-west-1", "us-east-1"]
+    # untouched services keep their previous data
+    assert index.regions("elb") == ["us-east-1"]
+    reloaded = RegionIndex(path=str(path), seed_path=seed_file)
+    assert reloaded.source == "ssm"
+    assert reloaded.regions("ec2") == ["eu-west-1", "us-east-1"]
+
+
+def test_bundled_seed_loads(tmp_path):
+    index = RegionIndex(path=str(tmp_path / "missing.json"), seed_path=SEED_PATH)
+    assert index.is_available("ec2", "us-east-1")
+    assert index.is_available("iam", "eu-west-1")
@@ -0,0 +1,92 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+import time
+
+import boto3
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+import pytest
+
+from . import context
+from client_pool import ClientPool
+from replay import REPLAY_MISSING_ERROR_CODE, install_recorder, install_replayer
+
+created = datetime.datetime(2021, 3, 1, 12, 0, tzinfo=datetime.timezone.utc)
+volumes = {
+    "Volumes": [{"VolumeId": "vol-000000", "Encrypted": False, "CreateTime": created}],
+    "NextToken": "",
+}
+
+
+def make_client(pool):
+    return pool.client("ec2", session=boto3.Session(region_name="us-east-1"))
+
+
+@pytest.fixture(scope="function")
+def recording(tmp_path):
+    pool = ClientPool()
+    recorder = install_recorder(pool, str(tmp_path))
+    ec2 = make_client(pool)
+    stubber = Stubber(ec2)
+    stubber.add_response("describe_volumes", volumes, {"MaxResults": 10})
+    stubber.add_client_error("describe_snapshots", service_error_code="UnauthorizedOperation", http_status_code=403)
+    stubber.activate()
+    ec2.describe_volumes(MaxResults=10)
+    with pytest.raises(ClientError):
+        ec2.describe_snapshots()
+    stubber.deactivate()
+    assert recorder.calls == 2
+    return str(tmp_path)
+
+
+def test_replay_answers_from_the_recording(recording):
+    pool = ClientPool()
+    replayer = install_replayer(pool, recording)
+    ec2 = make_client(pool)
+
+    response = ec2.describe_volumes(MaxResults=10)
+    assert response["Volumes"] == volumes["Volumes"]
+    # calls with other parameters get the answers recorded for the operation
+    assert ec2.describe_volumes(MaxResults=20)["Volumes"][0]["CreateTime"] == created
+
+    with pytest.raises(ClientError) as error:
+        ec2.describe_snapshots()
+    assert error.value.response["Error"]["Code"] == "UnauthorizedOperation"
+
+    with pytest.raises(ClientError) as error:
+        ec2.describe_instances()
+    assert error.value.response["Error"]["Code"] == REPLAY_MISSING_ERROR_CODE
+    assert replayer.calls == 4
+    assert replayer.misses == 1
+
+
+def test_replay_latency(recording):
+    pool = ClientPool()
+    install_replayer(pool, recording, latency=0.1)
+    ec2 = make_client(pool)
+    started = time.perf_counter()
+    ec2.describe_volumes(MaxResults=10)
+    assert time.perf_counter() - started >= 0.1
+
+
+def test_replay_needs_a_recording(tmp_path):
+    with pytest.raises(ValueError):
+        install_replayer(ClientPool(), str(tmp_path / "missing"))
@@ -0,0 +1,98 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+import time
+
+import boto3
+from botocore.stub import Stubber
+
+from . import context
+from run_cache import RunCache
+
+
+def test_views_share_entries_within_a_namespace():
+    run_cache = RunCache()
+    first = run_cache.view(("Amazon_RDS_Auditor", "012345678901", "us-east-1"))
+    second = run_cache.view(("Amazon_RDS_Auditor", "012345678901", "us-east-1"))
+    other = run_cache.view(("Amazon_EC2_Auditor", "012345678901", "us-east-1"))
+    assert first.get("describe_db_instances") is None
+    first["describe_db_instances"] = [{"DBInstanceIdentifier": "db1"}]
+    assert second.get("describe_db_instances") == [{"DBInstanceIdentifier": "db1"}]
+    assert second["describe_db_instances"] == [{"DBInstanceIdentifier": "db1"}]
+    assert other.get("describe_db_instances") is None
+    stats = run_cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_in_flight_keys_are_fetched_once():
+    run_cache = RunCache()
+    fetches = []
+
+    def helper(cache):
+        response = cache.get("list_buckets")
+        if response:
+            return response
+        fetches.append(1)
+        time.sleep(0.1)
+        cache["list_buckets"] = ["bucket"]
+        return cache["list_buckets"]
+
+    results = []
+
+    def check():
+        view = run_cache.view(("Amazon_S3_Auditor", "012345678901", "us-east-1"))
+        results.append(helper(view))
+        view.release()
+
+    threads = [threading.Thread(target=check) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fetches) == 1
+    assert results == [["bucket"]] * 5
+    assert run_cache.stats()["deduplicated"] == 4
+
+
+def test_release_unblocks_waiters():
+    run_cache = RunCache(lease_timeout=5)
+    owner = run_cache.view("ns")
+    waiter = run_cache.view("ns")
+    assert owner.get("key") is None
+    owner.release()
+    started = time.time()
+    assert waiter.get("key") is None
+    assert time.time() - started < 1
+
+
+def test_call_is_keyed_by_operation_and_params():
+    kms = boto3.client("kms", region_name="us-east-1")
+    stubber = Stubber(kms)
+    stubber.add_response("list_keys", {"Keys": [{"KeyId": "a"}]}, {"Limit": 10})
+    stubber.add_response("list_keys", {"Keys": [{"KeyId": "b"}]}, {"Limit": 20})
+    stubber.activate()
+    run_cache = RunCache()
+    assert run_cache.call(kms, "list_keys", Limit=10)["Keys"][0]["KeyId"] == "a"
+    assert run_cache.call(kms, "list_keys", Limit=10)["Keys"][0]["KeyId"] == "a"
+    assert run_cache.call(kms, "list_keys", Limit=20)["Keys"][0]["KeyId"] == "b"
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+    assert run_cache.stats()["hits"] == 1
@@ -0,0 +1,157 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import json
+
+from click.testing import CliRunner
+import pytest
+
+from . import context
+from check_executor import CheckUnit
+import sharding
+from sharding import Shard, load_runtimes, merge_findings, merge_reports
+
+
+def make_check(name, module):
+    def check(cache, awsAccountId, awsRegion, awsPartition):
+        return iter(())
+
+    check.__name__ = name
+    check.__module__ = f"electriceye.{module}"
+    return check
+
+
+def make_units(regions=("us-east-1", "eu-west-1")):
+    units = []
+    for module, checks in (("Amazon_EC2_Auditor", 6), ("AWS_IAM_Auditor", 3), ("Amazon_S3_Auditor", 4)):
+        for number in range(checks):
+            check = make_check(f"{module.lower()}_check_{number}", module)
+            for region in regions:
+                units.append(CheckUnit("ec2", check.__name__, check, "012345678901", region, "aws"))
+    return units
+
+
+def write_report(path, checks):
+    path.write_text(
+        json.dumps(
+            {
+                "started": "2022-08-08T00:00:00+00:00",
+                "finished": "2022-08-08T01:00:00+00:00",
+                "wall_time": 3600,
+                "checks": checks,
+            }
+        )
+    )
+
+
+def record(auditor, check_name, region, wall_time, account="012345678901"):
+    return {
+        "auditor": auditor,
+        "check_name": check_name,
+        "service_name": "ec2",
+        "account": account,
+        "region": region,
+        "wall_time": wall_time,
+        "active_time": wall_time,
+        "api_call_count": 1,
+        "bytes_received": 0,
+        "retries": 0,
+        "throttles": 0,
+        "findings": 1,
+        "exception": None,
+    }
+
+
+def test_every_unit_runs_in_exactly_one_shard():
+    units = make_units()
+    selected = [Shard(index, 3).select(units) for index in (1, 2, 3)]
+    assert sorted(id(unit) for shard in selected for unit in shard) == sorted(id(unit) for unit in units)
+    assert max(len(shard) for shard in selected) - min(len(shard) for shard in selected) <= 1
+    # the same units always end up in the same shard, whatever their order
+    assert Shard(2, 3).select(list(reversed(units))) == list(reversed(selected[1]))
+
+
+def test_shards_are_balanced_by_runtime():
+    units = make_units(regions=("us-east-1",))
+    runtimes = {sharding.unit_key(unit): 1.0 for unit in units}
+    runtimes[("Amazon_EC2_Auditor", "amazon_ec2_auditor_check_0", "us-east-1")] = 100.0
+    shards = [Shard(index, 2, runtimes) for index in (1, 2)]
+    slow = [shard for shard in shards if any(unit.check_name == "amazon_ec2_auditor_check_0" for unit in shard.select(units))]
+    # the slow Check gets a shard on its own
+    assert len(slow) == 1 and len(slow[0].select(units)) == 1
+
+
+def test_cost_of_checks_without_runtime():
+    runtimes = {
+        ("A_Auditor", "a_check", "us-east-1"): 10.0,
+        ("A_Auditor", "a_check", "eu-west-1"): 20.0,
+        ("B_Auditor", "b_check", "us-east-1"): 2.0,
+    }
+    shard = Shard(1, 2, runtimes)
+    assert shard.cost(("A_Auditor", "a_check", "us-west-2")) == 15.0
+    assert shard.cost(("C_Auditor", "c_check", "us-east-1")) == 10.0
+    assert Shard(1, 2).cost(("C_Auditor", "c_check", "us-east-1")) == sharding.DEFAULT_RUNTIME
+
+
+def test_parse(tmp_path):
+    path = tmp_path / "report.json"
+    write_report(path, [record("A_Auditor", "a_check", "us-east-1", 5.0), record("A_Auditor", "a_check", "us-east-1", 7.0, account="111111111111")])
+    shard = Shard.parse("2/4", runtimes_path=str(path))
+    assert (shard.index, shard.count) == (2, 4)
+    assert load_runtimes(str(path)) == {("A_Auditor", "a_check", "us-east-1"): 7.0}
+    for value in ("0/4", "5/4", "two/4", "1"):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+def test_merge_findings_keeps_latest_update():
+    first = [{"Id": "a", "UpdatedAt": "2022-08-08T00:00:00Z"}, {"Id": "b", "UpdatedAt": "2022-08-08T00:00:00Z"}]
+    second = [{"Id": "a", "UpdatedAt": "2022-08-08T00:05:00Z"}, {"Id": "c", "UpdatedAt": "2022-08-08T00:00:00Z"}]
+    merged = merge_findings([first, second])
+    assert sorted(finding["Id"] for finding in merged) == ["a", "b", "c"]
+    assert [finding for finding in merged if finding["Id"] == "a"][0]["UpdatedAt"] == "2022-08-08T00:05:00Z"
+
+
+def test_merge_reports():
+    first = {"started": "2022-08-08T00:00:00+00:00", "finished": "2022-08-08T00:30:00+00:00", "checks": [record("A_Auditor", "a_check", "us-east-1", 5.0)]}
+    second = {"started": "2022-08-08T00:01:00+00:00", "finished": "2022-08-08T00:45:00+00:00", "checks": [record("B_Auditor", "b_check", "us-east-1", 3.0), record("A_Auditor", "a_check", "us-east-1", 9.0)]}
+    merged = merge_reports([first, second])
+    assert merged["totals"]["checks"] == 2
+    assert merged["wall_time"] == 45 * 60
+    assert merged["checks"][0]["wall_time"] == 5.0
+
+
+def test_merge_command(tmp_path):
+    for index, ids in ((1, ["a", "b"]), (2, ["b", "c"])):
+        (tmp_path / f"shard-{index}.json").write_text(json.dumps([{"Id": i, "UpdatedAt": "2022-08-08T00:00:00Z"} for i in ids]))
+        with open(tmp_path / f"shard-{index}.csv", "w", newline="") as f:
+            writer = csv.writer(f, dialect="excel")
+            writer.writerow(["Id", "Title"])
+            writer.writerows([i, f"title {i}"] for i in ids)
+
+    runner = CliRunner()
+    result = runner.invoke(sharding.main, ["-o", str(tmp_path / "merged.json"), str(tmp_path / "shard-1.json"), str(tmp_path / "shard-2.json")])
+    assert result.exit_code == 0, result.output
+    assert sorted(finding["Id"] for finding in json.loads((tmp_path / "merged.json").read_text())) == ["a", "b", "c"]
+
+    result = runner.invoke(sharding.main, ["-o", str(tmp_path / "merged.csv"), str(tmp_path / "shard-1.csv"), str(tmp_path / "shard-2.csv")])
+    assert result.exit_code == 0, result.output
+    with open(tmp_path / "merged.csv", newline="") as f:
+        assert [row[0] for row in csv.reader(f)] == ["Id", "a", "b", "c"]
@@ -0,0 +1,116 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+
+import boto3
+from botocore.stub import Stubber
+import pytest
+
+from . import context
+from check_executor import CheckUnit
+from client_pool import ClientPool
+from telemetry import Telemetry, install
+
+
+def sqs_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {"Id": "finding"}
+
+
+def make_unit():
+    return CheckUnit(
+        service_name="sqs",
+        check_name="sqs_check",
+        check=sqs_check,
+        awsAccountId="012345678901",
+        awsRegion="us-east-1",
+        awsPartition="aws",
+    )
+
+
+@pytest.fixture(scope="function")
+def sqs():
+    pool = ClientPool()
+    install(pool)
+    return pool.client("sqs", session=boto3.Session(region_name="us-east-1"))
+
+
+def test_api_calls_are_attributed_to_the_running_check(sqs):
+    telemetry = Telemetry()
+    stubber = Stubber(sqs)
+    stubber.add_response("list_queues", {"QueueUrls": [], "ResponseMetadata": {"RetryAttempts": 2}})
+    stubber.add_client_error("get_queue_url", service_error_code="ThrottlingException")
+    stubber.add_response("list_queues", {"QueueUrls": []})
+    stubber.activate()
+
+    with telemetry.track(make_unit()) as stats:
+        with stats.active():
+            sqs.list_queues()
+            with pytest.raises(Exception):
+                sqs.get_queue_url(QueueName="queue")
+        stats.findings += 1
+    # calls made outside of a tracked Check are not counted
+    sqs.list_queues()
+    stubber.deactivate()
+
+    record = telemetry.records()[0]
+    assert record["api_calls"] == {"GetQueueUrl": 1, "ListQueues": 1}
+    assert record["retries"] == 2
+    assert record["api_errors"] == 1
+    assert record["findings"] == 1
+    assert record["exception"] is None
+
+
+def test_exceptions_are_recorded_and_reraised():
+    telemetry = Telemetry()
+    with pytest.raises(ValueError):
+        with telemetry.track(make_unit()):
+            raise ValueError("boom")
+    report = telemetry.report()
+    assert report["totals"]["failed_checks"] == 1
+    assert report["checks"][0]["exception"] == "ValueError: boom"
+
+
+def test_report_and_prometheus_textfile(tmp_path):
+    telemetry = Telemetry()
+    with telemetry.track(make_unit()) as stats:
+        stats.findings += 3
+        stats.record_call("ListQueues")
+    telemetry.extend([dict(telemetry.records()[0], region="us-west-2")])
+
+    report_path = tmp_path / "report.json"
+    telemetry.write_report(str(report_path))
+    report = json.loads(report_path.read_text())
+    assert report["totals"]["checks"] == 2
+    assert report["totals"]["findings"] == 6
+
+    metrics_path = tmp_path / "electriceye.prom"
+    telemetry.write_prometheus(str(metrics_path))
+    metrics = metrics_path.read_text()
+    assert "# TYPE electriceye_check_findings gauge" in metrics
+    assert 'electriceye_check_findings{check="sqs_check",service="sqs",account="012345678901",region="us-west-2"} 3' in metrics
+    assert 'operation="ListQueues"} 1' in metrics
+
+
+def test_skipped_checks_are_reported():
+    telemetry = Telemetry()
+    telemetry.skip(make_unit(), "required collection list_queues failed to load")
+    report = telemetry.report()
+    assert report["totals"]["skipped_checks"] == 1
+    assert report["checks"][0]["skipped"] == "required collection list_queues failed to load"
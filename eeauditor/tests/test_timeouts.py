@@ -0,0 +1,131 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+import time
+
+import boto3
+from botocore.stub import Stubber
+import pytest
+
+from . import context
+from check_executor import CheckExecutor, CheckUnit
+from client_pool import ClientPool
+from telemetry import Telemetry
+import timeouts
+from timeouts import CheckTimeout, Deadline, TimeoutPolicy
+
+# set to release the Checks that hang
+release = threading.Event()
+
+
+def hanging_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {"Id": "first"}
+    yield {"Id": "second"}
+    # stands in for an API call or scan that never returns
+    release.wait(30)
+    yield {"Id": "never"}
+
+
+def quick_check(cache, awsAccountId, awsRegion, awsPartition):
+    yield {"Id": "quick"}
+
+
+def make_unit(check):
+    return CheckUnit("ec2", check.__name__, check, "012345678901", "us-east-1", "aws")
+
+
+def run(units, policy, telemetry, workers=1):
+    """Runs CheckUnits the way EEAuditor.execute_check() does"""
+
+    def runner(unit):
+        with telemetry.track(unit) as stats:
+            findings = iter(unit.check(None, unit.awsAccountId, unit.awsRegion, unit.awsPartition))
+
+            def step():
+                return next(findings, StopIteration)
+
+            for finding in timeouts.bounded(step, policy.deadline(unit)):
+                stats.findings += 1
+                yield finding
+
+    return list(CheckExecutor(workers=workers).run(units, runner))
+
+
+@pytest.fixture(autouse=True)
+def release_hanging_checks():
+    release.clear()
+    yield
+    release.set()
+
+
+def test_check_that_runs_out_of_time_is_cancelled_and_keeps_its_findings():
+    telemetry = Telemetry()
+    started = time.monotonic()
+    findings = run([make_unit(hanging_check), make_unit(quick_check)], TimeoutPolicy(check_timeout=0.2), telemetry)
+    assert time.monotonic() - started < 5
+    assert findings == [{"Id": "first"}, {"Id": "second"}, {"Id": "quick"}]
+
+    records = {record["check_name"]: record for record in telemetry.records()}
+    assert records["hanging_check"]["timed_out"] is True
+    assert records["hanging_check"]["findings"] == 2
+    assert records["quick_check"]["timed_out"] is False
+    assert [record["check_name"] for record in telemetry.timed_out()] == ["hanging_check"]
+    assert telemetry.report()["totals"]["timed_out_checks"] == 1
+
+
+def test_overrides_and_no_budget():
+    policy = TimeoutPolicy(overrides={"quick_check": 10})
+    assert policy.deadline(make_unit(hanging_check)) is None
+    assert policy.deadline(make_unit(quick_check)).remaining() > 9
+    assert not TimeoutPolicy()
+    findings = run([make_unit(quick_check)], TimeoutPolicy(), Telemetry())
+    assert findings == [{"Id": "quick"}]
+
+
+def test_auditor_budget_is_shared_by_its_checks():
+    policy = TimeoutPolicy(check_timeout=60, auditor_timeout=0.2)
+    first = policy.deadline(make_unit(hanging_check))
+    second = policy.deadline(make_unit(quick_check))
+    assert first.parent is second.parent
+    time.sleep(0.25)
+    with pytest.raises(CheckTimeout, match="Auditor"):
+        second.check()
+    # a Check that starts after its Auditor ran out of time does not run at all
+    telemetry = Telemetry()
+    assert run([make_unit(quick_check)], policy, telemetry) == []
+    assert telemetry.records()[0]["timed_out"] is True
+
+
+def test_api_calls_are_cancelled_once_the_deadline_passed():
+    pool = ClientPool()
+    timeouts.install(pool)
+    sqs = pool.client("sqs", session=boto3.Session(region_name="us-east-1"))
+    stubber = Stubber(sqs)
+    stubber.add_response("list_queues", {"QueueUrls": []})
+    stubber.add_response("list_queues", {"QueueUrls": []})
+    stubber.activate()
+
+    deadline = Deadline(60, "sqs_check")
+    with timeouts.active(deadline):
+        sqs.list_queues()
+        deadline.cancel()
+        with pytest.raises(CheckTimeout):
+            sqs.list_queues()
+    stubber.deactivate()
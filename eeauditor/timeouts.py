@@ -0,0 +1,197 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from contextlib import contextmanager
+import os
+from queue import Empty, Queue
+import threading
+import time
+
+# seconds a single Check may run for, 0 means no limit
+DEFAULT_CHECK_TIMEOUT = float(os.environ.get("ELECTRICEYE_CHECK_TIMEOUT", 0))
+# seconds all Checks of one Auditor (per account and Region) may run for together, 0 means no limit
+DEFAULT_AUDITOR_TIMEOUT = float(os.environ.get("ELECTRICEYE_AUDITOR_TIMEOUT", 0))
+
+# the Deadline of the Check running on this thread, if any
+_current = threading.local()
+
+
+class CheckTimeout(Exception):
+    """Raised when a Check ran out of its (or its Auditor's) time budget"""
+
+
+class Deadline(object):
+    """Wall-clock budget of one Check, bounded by the budget of its Auditor if any"""
+
+    def __init__(self, seconds, label, parent=None):
+        self.label = label
+        self.parent = parent
+        self.expires = time.monotonic() + seconds if seconds else None
+        self.cancelled = False
+
+    def remaining(self):
+        """Seconds left, or None when neither the Check nor its Auditor has a budget"""
+        remaining = [self.expires - time.monotonic()] if self.expires is not None else []
+        parent = self.parent.remaining() if self.parent else None
+        if parent is not None:
+            remaining.append(parent)
+        return max(min(remaining), 0) if remaining else None
+
+    def expired(self):
+        if self.cancelled:
+            return True
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self):
+        if self.expired():
+            owner = self.label
+            if self.parent and self.parent.expired():
+                owner = f"Auditor {self.parent.label}"
+            raise CheckTimeout(f"{owner} ran out of time")
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimeoutPolicy(object):
+    """Hands out the Deadline of every Check from the per-Check and per-Auditor budgets
+
+        `overrides` maps a Check or Auditor name to its own budget in seconds, e.g.
+        {"ElectricEye_AttackSurface_Auditor": 1800}. The budget of an Auditor starts when its
+        first Check starts and is shared by all of its Checks in the same account and Region.
+    """
+
+    def __init__(self, check_timeout=DEFAULT_CHECK_TIMEOUT, auditor_timeout=DEFAULT_AUDITOR_TIMEOUT, overrides=None):
+        self.check_timeout = check_timeout or 0
+        self.auditor_timeout = auditor_timeout or 0
+        self.overrides = dict(overrides or {})
+        self._auditors = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.check_timeout or self.auditor_timeout or any(self.overrides.values()))
+
+    def deadline(self, unit):
+        """Returns the Deadline of a CheckUnit, or None if it may run for as long as it takes"""
+        auditor = unit.check.__module__.rpartition(".")[2]
+        parent = None
+        auditor_timeout = self.overrides.get(auditor, self.auditor_timeout)
+        if auditor_timeout:
+            with self._lock:
+                key = (unit.check.__module__, unit.awsAccountId, unit.awsRegion)
+                parent = self._auditors.get(key)
+                if parent is None:
+                    parent = self._auditors[key] = Deadline(auditor_timeout, auditor)
+        check_timeout = self.overrides.get(unit.check_name, self.check_timeout)
+        if not check_timeout and parent is None:
+            return None
+        return Deadline(check_timeout, unit.check_name, parent=parent)
+
+
+def remaining():
+    """Seconds left for the Check running on this thread, None if it has no budget
+
+        For Checks that wait on something other than AWS APIs, e.g. a subprocess.
+    """
+    deadline = getattr(_current, "deadline", None)
+    return deadline.remaining() if deadline else None
+
+
+def check():
+    """Raises CheckTimeout if the Check running on this thread ran out of time"""
+    deadline = getattr(_current, "deadline", None)
+    if deadline:
+        deadline.check()
+
+
+@contextmanager
+def active(deadline):
+    previous = getattr(_current, "deadline", None)
+    _current.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _current.deadline = previous
+
+
+# botocore event handler, registered once on every pooled client by install()
+def on_before_call(**kwargs):
+    """Cancels a Check that ran out of time at its next API call (or retry)"""
+    check()
+
+
+def install(pool):
+    """Registers the cancellation handler on every client of a ClientPool"""
+    pool.register("before-call.*.*", on_before_call, unique_id="eeauditor-timeouts-before-call")
+    pool.register("before-send.*.*", on_before_call, unique_id="eeauditor-timeouts-before-send")
+
+
+# wraps whatever a driver thread raised so it can be re-raised to the consumer
+class _Failure(object):
+    def __init__(self, error):
+        self.error = error
+
+
+def bounded(step, deadline):
+    """Yields what `step()` returns until it returns StopIteration or `deadline` expires
+
+        Without a budget `step` runs on the calling thread. Otherwise it runs on a daemon
+        thread so a hung API call or subprocess cannot hold up the run: once the deadline
+        expires CheckTimeout is raised here, the items yielded so far stay with the caller,
+        and the abandoned thread is cancelled at its next API call.
+    """
+    if deadline is None or deadline.remaining() is None:
+        while True:
+            item = step()
+            if item is StopIteration:
+                return
+            yield item
+
+    deadline.check()
+    results = Queue()
+
+    def drive():
+        with active(deadline):
+            try:
+                while not deadline.cancelled:
+                    item = step()
+                    results.put(item)
+                    if item is StopIteration:
+                        return
+            except BaseException as e:
+                results.put(_Failure(e))
+
+    threading.Thread(target=drive, name=f"eeauditor-{deadline.label}", daemon=True).start()
+    try:
+        while True:
+            try:
+                item = results.get(timeout=deadline.remaining())
+            except Empty:
+                deadline.check()
+                # the budget changed under us (cancelled), wait again
+                continue
+            if isinstance(item, _Failure):
+                raise item.error
+            if item is StopIteration:
+                return
+            yield item
+    finally:
+        # stops the driver thread if it is still running, e.g. after a timeout
+        deadline.cancel()